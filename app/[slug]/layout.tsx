@@ -73,19 +73,16 @@ export async function generateMetadata({ params }: { params: { slug: string } })
   };
 }
 
+// 文章列表取自 npm run export-data 生成的 index.json（包含 source/_posts 子目录中的文章）
 export async function generateStaticParams() {
-  const postsDir = path.join(process.cwd(), 'source/_posts');
-  const params = [];
+  const indexPath = path.join(process.cwd(), 'public', 'data', 'index.json');
 
-  if (fs.existsSync(postsDir)) {
-    const files = fs.readdirSync(postsDir).filter(file => file.endsWith('.md'));
-    files.forEach(file => {
-      const slug = file.replace('.md', '');
-      params.push({ slug });
-    });
+  if (!fs.existsSync(indexPath)) {
+    return [];
   }
 
-  return params;
+  const { posts } = JSON.parse(fs.readFileSync(indexPath, 'utf-8'));
+  return posts.map((post: { slug: string }) => ({ slug: post.slug }));
 }
 
 export default function Layout({ children }: { children: React.ReactNode }) {
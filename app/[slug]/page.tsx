@@ -7,6 +7,7 @@ import LiquidBackground from '../components/LiquidBackground';
 import MagicNavbar from '../components/MagicNavbar';
 import PostView from '../components/PostView';
 import { Post, BlogData } from '../components/types';
+import { loadPost } from '../components/dataBundle';
 
 export default function PostPage() {
   const params = useParams();
@@ -32,14 +33,8 @@ export default function PostPage() {
         setBlogData(indexData);
       }
 
-      // 加载当前文章的完整数据
-      const postResponse = await fetch(`/data/posts/${params.slug}.json`);
-      if (postResponse.ok) {
-        const postData = await postResponse.json();
-        setPost(postData);
-      } else {
-        setPost(null);
-      }
+      // 加载当前文章的完整数据（带内容哈希的数据包，含相关文章）
+      setPost(await loadPost(params.slug as string));
     } catch (error) {
       console.error('Failed to load post:', error);
       setPost(null);
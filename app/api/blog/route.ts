@@ -2,13 +2,30 @@ import { NextResponse } from 'next/server';
 import fs from 'fs';
 import path from 'path';
 
-export async function GET() {
+export async function GET(request: Request) {
   try {
-    const dataPath = path.join(process.cwd(), 'public/data/blog-data.json');
+    const view = new URL(request.url).searchParams.get('view');
+
+    // 标签/分类聚合索引（由 blog_writer.py taxonomy 生成）
+    if (view === 'taxonomy') {
+      const taxonomyPath = path.join(process.cwd(), 'public/data/taxonomy.json');
+
+      if (!fs.existsSync(taxonomyPath)) {
+        return NextResponse.json(
+          { error: 'Taxonomy data not found. Please run python blog_writer.py taxonomy first.' },
+          { status: 404 }
+        );
+      }
+
+      const taxonomy = JSON.parse(fs.readFileSync(taxonomyPath, 'utf8'));
+      return NextResponse.json(taxonomy);
+    }
+
+    const dataPath = path.join(process.cwd(), 'public/data/index.json');
 
     if (!fs.existsSync(dataPath)) {
       return NextResponse.json(
-        { error: 'Blog data not found. Please run npm run extract-data first.' },
+        { error: 'Blog data not found. Please run npm run export-data first.' },
         { status: 404 }
       );
     }
@@ -24,4 +41,4 @@ export async function GET() {
       { status: 500 }
     );
   }
-}
\ No newline at end of file
+}
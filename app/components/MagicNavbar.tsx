@@ -2,6 +2,7 @@ import React, { useState, useEffect, useRef, useCallback } from 'react';
 import { motion, useScroll, useTransform, AnimatePresence } from 'framer-motion';
 import { Search, X, Sun, Moon, MoreHorizontal, FileText, Hash, Folder, Wrench, Home, User, Mail } from 'lucide-react';
 import { SearchResultSkeleton } from './SkeletonLoaders';
+import { searchStaticIndex } from './searchIndex';
 
 // Types for our blog data
 export interface Post {
@@ -191,66 +192,91 @@ const MagicNavbar: React.FC<MagicNavbarProps> = ({ onNavigate, activePage, posts
 
     // Show loading state
     setIsSearching(true);
+    let cancelled = false;
 
     // Debounce search
-    searchTimeoutRef.current = setTimeout(() => {
+    searchTimeoutRef.current = setTimeout(async () => {
       const query = searchQuery.toLowerCase();
       const results: SearchResult[] = [];
 
-    // Search posts
-    posts.filter(post => {
-      const titleMatch = (post.title?.toLowerCase() || '').includes(query);
-      const categoryMatch = (post.categories?.[0]?.toLowerCase() || '').includes(query);
-      const tagMatch = post.tags.some(tag => tag.toLowerCase().includes(query));
-      const excerptMatch = (post.excerpt?.toLowerCase() || '').includes(query);
-
-      // Clean HTML from content before searching
-      const cleanContent = post.content
-        ?.replace(/<[^>]*>/g, '')
-        .replace(/\s+/g, ' ')
-        .trim()
-        .toLowerCase() || '';
-      const contentMatch = cleanContent.includes(query);
-
-      return titleMatch || categoryMatch || tagMatch || excerptMatch || contentMatch;
-    }).forEach(post => {
-      // Find matched tags
-      const matchedTags = post.tags.filter(tag => tag.toLowerCase().includes(query));
-
-      // Extract highlighted content from best match
-      let highlightedContent = '';
-      const titleMatch = (post.title?.toLowerCase() || '').includes(query);
-      const excerptMatch = (post.excerpt?.toLowerCase() || '').includes(query);
-
-      // Clean HTML from content before checking
-      const cleanContent = post.content
-        ?.replace(/<[^>]*>/g, '')
-        .replace(/\s+/g, ' ')
-        .trim()
-        .toLowerCase() || '';
-      const contentMatch = cleanContent.includes(query);
-
-      if (titleMatch) {
-        highlightedContent = extractSnippet(post.title, searchQuery);
-      } else if (excerptMatch) {
-        highlightedContent = extractSnippet(post.excerpt || '', searchQuery);
-      } else if (contentMatch) {
-        highlightedContent = extractSnippet(post.content || '', searchQuery);
-      }
-
-      results.push({
-        id: post.id,
-        title: post.title,
-        type: 'post',
-        excerpt: post.excerpt,
-        highlightedContent,
-        matchedTags,
-        onClick: () => {
-          onNavigate('post', post.id);
-          closeSearch();
+    // Search posts: static index from `npm run export-data` (whole words, ranked by term
+    // frequency); falls back to substring matching over the loaded posts when the index
+    // is unavailable or finds nothing (e.g. partial words)
+    const indexed = await searchStaticIndex(searchQuery);
+    if (cancelled) return;
+
+    if (indexed && indexed.length > 0) {
+      const postsBySlug = new Map(posts.map(post => [post.slug, post]));
+      indexed.forEach(hit => {
+        const post = postsBySlug.get(hit.slug);
+        results.push({
+          id: hit.slug,
+          title: hit.title,
+          type: 'post',
+          excerpt: post?.excerpt,
+          highlightedContent: extractSnippet(hit.snippet, searchQuery),
+          matchedTags: post ? post.tags.filter(tag => tag.toLowerCase().includes(query)) : [],
+          onClick: () => {
+            onNavigate('post', hit.slug);
+            closeSearch();
+          }
+        });
+      });
+    } else {
+      posts.filter(post => {
+        const titleMatch = (post.title?.toLowerCase() || '').includes(query);
+        const categoryMatch = (post.categories?.[0]?.toLowerCase() || '').includes(query);
+        const tagMatch = post.tags.some(tag => tag.toLowerCase().includes(query));
+        const excerptMatch = (post.excerpt?.toLowerCase() || '').includes(query);
+
+        // Clean HTML from content before searching
+        const cleanContent = post.content
+          ?.replace(/<[^>]*>/g, '')
+          .replace(/\s+/g, ' ')
+          .trim()
+          .toLowerCase() || '';
+        const contentMatch = cleanContent.includes(query);
+
+        return titleMatch || categoryMatch || tagMatch || excerptMatch || contentMatch;
+      }).forEach(post => {
+        // Find matched tags
+        const matchedTags = post.tags.filter(tag => tag.toLowerCase().includes(query));
+
+        // Extract highlighted content from best match
+        let highlightedContent = '';
+        const titleMatch = (post.title?.toLowerCase() || '').includes(query);
+        const excerptMatch = (post.excerpt?.toLowerCase() || '').includes(query);
+
+        // Clean HTML from content before checking
+        const cleanContent = post.content
+          ?.replace(/<[^>]*>/g, '')
+          .replace(/\s+/g, ' ')
+          .trim()
+          .toLowerCase() || '';
+        const contentMatch = cleanContent.includes(query);
+
+        if (titleMatch) {
+          highlightedContent = extractSnippet(post.title, searchQuery);
+        } else if (excerptMatch) {
+          highlightedContent = extractSnippet(post.excerpt || '', searchQuery);
+        } else if (contentMatch) {
+          highlightedContent = extractSnippet(post.content || '', searchQuery);
         }
+
+        results.push({
+          id: post.id,
+          title: post.title,
+          type: 'post',
+          excerpt: post.excerpt,
+          highlightedContent,
+          matchedTags,
+          onClick: () => {
+            onNavigate('post', post.id);
+            closeSearch();
+          }
+        });
       });
-    });
+    }
 
     // Search pages (static pages)
     const pages = [
@@ -342,6 +368,7 @@ const MagicNavbar: React.FC<MagicNavbarProps> = ({ onNavigate, activePage, posts
   }, 300); // 300ms debounce
 
     return () => {
+      cancelled = true;
       if (searchTimeoutRef.current) {
         clearTimeout(searchTimeoutRef.current);
       }
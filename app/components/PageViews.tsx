@@ -3,7 +3,7 @@ import { motion, AnimatePresence } from 'framer-motion';
 import { Tag, Folder, Mail, Send, Filter, X } from 'lucide-react';
 import Sidebar from './Sidebar';
 import ArticleCard from './ArticleCard';
-import { Post, BlogData } from './types';
+import { Post, BlogData, Taxonomy } from './types';
 import ReactMarkdown from 'react-markdown';
 import remarkGfm from 'remark-gfm';
 
@@ -19,13 +19,23 @@ interface PageViewProps {
   onOpenPost: (id: string) => void;
   posts: Post[];
   blogData?: BlogData;
+  taxonomy?: Taxonomy | null;
 }
 
-export const TagsView: React.FC<PageViewProps> = ({ onOpenPost, posts }) => {
+// Resolve a taxonomy posting list (post ids, newest first) to posts
+const postsFromIds = (ids: string[], posts: Post[]): Post[] => {
+  const byId = new Map(posts.map(post => [post.id, post]));
+  return ids.map(id => byId.get(id)).filter((post): post is Post => Boolean(post));
+};
+
+export const TagsView: React.FC<PageViewProps> = ({ onOpenPost, posts, taxonomy }) => {
   const [activeTag, setActiveTag] = useState<string | null>(null);
 
   // Extract all unique tags from posts with counts
   const allTags = useMemo(() => {
+    if (taxonomy) {
+      return taxonomy.tags.map(({ name, count }) => ({ name, count }));
+    }
     const tagMap = new Map<string, number>();
     posts.forEach(post => {
       post.tags?.forEach(tag => {
@@ -33,12 +43,14 @@ export const TagsView: React.FC<PageViewProps> = ({ onOpenPost, posts }) => {
       });
     });
     return Array.from(tagMap.entries()).map(([name, count]) => ({ name, count }));
-  }, [posts]);
+  }, [posts, taxonomy]);
 
   const filteredPosts = useMemo(() => {
     if (!activeTag) return posts;
+    const entry = taxonomy?.tags.find(tag => tag.name === activeTag);
+    if (entry) return postsFromIds(entry.posts, posts);
     return posts.filter(post => post.tags?.includes(activeTag));
-  }, [activeTag, posts]);
+  }, [activeTag, posts, taxonomy]);
 
   return (
     <motion.div variants={pageVariants} initial="initial" animate="animate" exit="exit" transition={transition} className="w-full max-w-7xl mx-auto px-4 pt-32 pb-20">
@@ -105,11 +117,14 @@ export const TagsView: React.FC<PageViewProps> = ({ onOpenPost, posts }) => {
   );
 };
 
-export const CategoriesView: React.FC<PageViewProps> = ({ onOpenPost, posts }) => {
+export const CategoriesView: React.FC<PageViewProps> = ({ onOpenPost, posts, taxonomy }) => {
   const [activeCategory, setActiveCategory] = useState<string | null>(null);
 
   // Dynamic Categories with counts
   const categories = useMemo(() => {
+    if (taxonomy) {
+      return taxonomy.categories.map(({ name, count }) => ({ name, count }));
+    }
     const catMap = new Map<string, number>();
     posts.forEach(post => {
       post.categories?.forEach(cat => {
@@ -117,12 +132,14 @@ export const CategoriesView: React.FC<PageViewProps> = ({ onOpenPost, posts }) =
       });
     });
     return Array.from(catMap.entries()).map(([name, count]) => ({ name, count }));
-  }, [posts]);
+  }, [posts, taxonomy]);
 
   const filteredPosts = useMemo(() => {
     if (!activeCategory) return posts;
+    const entry = taxonomy?.categories.find(cat => cat.name === activeCategory);
+    if (entry) return postsFromIds(entry.posts, posts);
     return posts.filter(post => post.categories?.includes(activeCategory));
-  }, [activeCategory, posts]);
+  }, [activeCategory, posts, taxonomy]);
 
   return (
     <motion.div variants={pageVariants} initial="initial" animate="animate" exit="exit" transition={transition} className="w-full max-w-7xl mx-auto px-4 pt-32 pb-20">
@@ -10,6 +10,7 @@ import rehypeRaw from 'rehype-raw';
 import { Prism as SyntaxHighlighter } from 'react-syntax-highlighter';
 import { oneDark, oneLight } from 'react-syntax-highlighter/dist/esm/styles/prism';
 import MediaLightbox from './MediaLightbox';
+import { ImageAsset, loadImageAssets } from './dataBundle';
 
 interface PostViewProps {
   post: Post | undefined;
@@ -48,6 +49,13 @@ const PostView: React.FC<PostViewProps> = ({ post, onBack, blogData }) => {
     return () => observer.disconnect();
   }, []);
 
+  // Responsive variants from public/data/assets.json (empty when the assets step has not run)
+  const [imageAssets, setImageAssets] = useState<Record<string, ImageAsset>>({});
+
+  useEffect(() => {
+    loadImageAssets().then(setImageAssets);
+  }, []);
+
   const syntaxTheme = isDarkMode ? oneDark : oneLight;
 
   const handleImageClick = (src: string, alt: string) => {
@@ -170,9 +178,13 @@ const PostView: React.FC<PostViewProps> = ({ post, onBack, blogData }) => {
                     )
                   },
                   img({ src, alt, ...props }) {
-                    return (
+                    const asset = src ? imageAssets[src] : undefined;
+                    const image = (
                       <img
                         src={src}
+                        srcSet={asset?.srcset || undefined}
+                        width={asset?.width}
+                        height={asset?.height}
                         alt={alt}
                         loading="lazy"
                         decoding="async"
@@ -195,7 +207,16 @@ const PostView: React.FC<PostViewProps> = ({ post, onBack, blogData }) => {
                         }}
                         {...props}
                       />
-                    )
+                    );
+                    if (!asset?.webpSrcset) {
+                      return image;
+                    }
+                    return (
+                      <picture>
+                        <source type="image/webp" srcSet={asset.webpSrcset} sizes="(max-width: 768px) 100vw, 80vw" />
+                        {image}
+                      </picture>
+                    );
                   },
                   video({ src, poster, ...props }) {
                     if (!src) return null;
@@ -336,6 +357,25 @@ const PostView: React.FC<PostViewProps> = ({ post, onBack, blogData }) => {
                 作者：{post.author}
               </div>
             </div>
+
+            {/* Related Posts */}
+            {post.related && post.related.length > 0 && (
+              <div className="mt-10">
+                <h3 className="text-lg font-bold text-[var(--text-primary)] mb-4">相关文章</h3>
+                <ul className="space-y-2">
+                  {post.related.map((item) => (
+                    <li key={item.slug}>
+                      <a
+                        href={`/${item.slug}/`}
+                        className="text-[var(--text-secondary)] hover:text-[var(--accent-color)] transition-colors"
+                      >
+                        {item.title}
+                      </a>
+                    </li>
+                  ))}
+                </ul>
+              </div>
+            )}
           </div>
         </div>
 
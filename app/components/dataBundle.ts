@@ -0,0 +1,69 @@
+// Client for the data bundle written by `python blog_writer.py export` (public/data/v1).
+// manifest.json is the only file with a fixed name; every other file name carries a
+// content hash, so a post file can be cached for as long as its name stays the same.
+
+import { Post } from './types';
+
+interface BundleManifest {
+  version: number;
+  postsCount: number;
+  pageSize: number;
+  pages: string[];
+  posts: Record<string, { file: string }>;
+  taxonomy: string;
+  search: string[];
+}
+
+const BUNDLE_BASE = '/data/v1';
+
+let manifestPromise: Promise<BundleManifest | null> | null = null;
+
+function loadManifest(): Promise<BundleManifest | null> {
+  if (!manifestPromise) {
+    manifestPromise = fetch(`${BUNDLE_BASE}/manifest.json`, { cache: 'no-cache' })
+      .then(res => (res.ok ? res.json() : null))
+      .catch(() => null);
+  }
+  return manifestPromise;
+}
+
+async function fetchJson<T>(url: string): Promise<T | null> {
+  try {
+    const res = await fetch(url);
+    return res.ok ? await res.json() : null;
+  } catch {
+    return null;
+  }
+}
+
+// Full post (content + related) from the hashed bundle; falls back to the
+// unversioned /data/posts/<slug>.json written alongside it.
+export async function loadPost(slug: string): Promise<Post | null> {
+  const manifest = await loadManifest();
+  const entry = manifest?.posts[slug];
+  if (entry) {
+    const post = await fetchJson<Post>(`${BUNDLE_BASE}/${entry.file}`);
+    if (post) {
+      return post;
+    }
+  }
+  return fetchJson<Post>(`/data/posts/${encodeURIComponent(slug)}.json`);
+}
+
+// Responsive image variants written by `python blog_writer.py assets`
+// (keyed by the image address used in the post)
+export interface ImageAsset {
+  width: number;
+  height: number;
+  srcset: string;
+  webpSrcset: string;
+}
+
+let assetsPromise: Promise<Record<string, ImageAsset>> | null = null;
+
+export function loadImageAssets(): Promise<Record<string, ImageAsset>> {
+  if (!assetsPromise) {
+    assetsPromise = fetchJson<Record<string, ImageAsset>>('/data/assets.json').then(assets => assets || {});
+  }
+  return assetsPromise;
+}
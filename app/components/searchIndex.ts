@@ -0,0 +1,143 @@
+// Client for the static search index built by `python blog_writer.py build-search-index`.
+// Only the manifest, the term shards covering the query terms and the doc shards
+// holding the top results are downloaded.
+
+interface SearchManifest {
+  version: number;
+  docs: number;
+  terms: number;
+  shards: [string, string][]; // [first term, file name], sorted by term
+  docs_shards: [number, string][]; // [first doc number, file name], sorted by doc number
+}
+
+interface TermShard {
+  v: number;
+  terms: Record<string, [number[], number[]]>; // term -> [doc deltas, term freqs]
+}
+
+interface DocShard {
+  v: number;
+  docs: Record<string, [string, string, string]>; // doc -> [slug, title, snippet]
+}
+
+export interface StaticSearchResult {
+  slug: string;
+  title: string;
+  snippet: string;
+  score: number;
+}
+
+const SEARCH_BASE = '/search';
+
+// Same ranges as blog_tools/text.py
+const CJK = '\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\u3040-\u30ff\uac00-\ud7af';
+const TOKEN_RE = new RegExp(`[a-z0-9]+|[${CJK}]+`, 'g');
+const CJK_RE = new RegExp(`^[${CJK}]`);
+
+// Latin words as-is, CJK runs as overlapping bigrams (mirrors blog_tools/text.py tokenize)
+export function tokenize(text: string): string[] {
+  const tokens: string[] = [];
+  for (const word of text.toLowerCase().match(TOKEN_RE) || []) {
+    if (!CJK_RE.test(word) || word.length === 1) {
+      tokens.push(word);
+    } else {
+      for (let i = 0; i < word.length - 1; i++) {
+        tokens.push(word.slice(i, i + 2));
+      }
+    }
+  }
+  return tokens;
+}
+
+let manifestPromise: Promise<SearchManifest | null> | null = null;
+const shardCache = new Map<string, Promise<any>>();
+
+function loadManifest(): Promise<SearchManifest | null> {
+  if (!manifestPromise) {
+    manifestPromise = fetch(`${SEARCH_BASE}/manifest.json`)
+      .then(res => (res.ok ? res.json() : null))
+      .catch(() => null);
+  }
+  return manifestPromise;
+}
+
+function loadShard<T>(file: string): Promise<T | null> {
+  let shard = shardCache.get(file);
+  if (!shard) {
+    // Shard file names are content-hashed, so they can be cached forever
+    shard = fetch(`${SEARCH_BASE}/${file}`)
+      .then(res => (res.ok ? res.json() : null))
+      .catch(() => null);
+    shardCache.set(file, shard);
+  }
+  return shard;
+}
+
+// The shard holding `key` is the last one whose first key is <= key
+function shardFor<K extends string | number>(shards: [K, string][], key: K): string | null {
+  let lo = 0;
+  let hi = shards.length - 1;
+  let found = -1;
+  while (lo <= hi) {
+    const mid = (lo + hi) >> 1;
+    if (shards[mid][0] <= key) {
+      found = mid;
+      lo = mid + 1;
+    } else {
+      hi = mid - 1;
+    }
+  }
+  return found === -1 ? null : shards[found][1];
+}
+
+export async function searchStaticIndex(query: string, limit = 20): Promise<StaticSearchResult[] | null> {
+  const manifest = await loadManifest();
+  if (!manifest) return null;
+
+  const terms = Array.from(new Set(tokenize(query)));
+  if (terms.length === 0) return [];
+
+  const scores = new Map<number, number>();
+  const hits = new Map<number, number>();
+
+  const shards = await Promise.all(terms.map(term => {
+    const file = shardFor(manifest.shards, term);
+    return file ? loadShard<TermShard>(file) : Promise.resolve(null);
+  }));
+
+  for (let t = 0; t < terms.length; t++) {
+    const postings = shards[t]?.terms[terms[t]];
+    if (!postings) return [];
+
+    const [deltas, freqs] = postings;
+    let doc = 0;
+    deltas.forEach((delta, i) => {
+      doc += delta;
+      scores.set(doc, (scores.get(doc) || 0) + freqs[i]);
+      hits.set(doc, (hits.get(doc) || 0) + 1);
+    });
+  }
+
+  // All query terms must match
+  const top = Array.from(scores.entries())
+    .filter(([doc]) => hits.get(doc) === terms.length)
+    .sort((a, b) => b[1] - a[1])
+    .slice(0, limit);
+
+  // Fetch only the doc shards holding the top results
+  const docFiles = Array.from(new Set(top.map(([doc]) => shardFor(manifest.docs_shards, doc))));
+  const docShards = new Map<string | null, DocShard | null>();
+  await Promise.all(docFiles.map(async file => {
+    docShards.set(file, file ? await loadShard<DocShard>(file) : null);
+  }));
+
+  const results: StaticSearchResult[] = [];
+  for (const [doc, score] of top) {
+    const entry = docShards.get(shardFor(manifest.docs_shards, doc))?.docs[String(doc)];
+    if (entry) {
+      const [slug, title, snippet] = entry;
+      results.push({ slug, title, snippet, score });
+    }
+  }
+  return results;
+}
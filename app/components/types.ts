@@ -14,6 +14,13 @@ export interface Post {
   coverImage?: string;
   readTime?: string;
   views?: number;
+  related?: RelatedPost[];
+}
+
+export interface RelatedPost {
+  slug: string;
+  title: string;
+  score?: number;
 }
 
 export interface ToolItem {
@@ -53,4 +60,24 @@ export interface BlogData {
     tagsCount: number;
   };
   lastUpdated: string;
-}
\ No newline at end of file
+}
+
+export interface TaxonomyEntry {
+  name: string;
+  count: number;
+  posts: string[];
+}
+
+export interface CategoryNode extends TaxonomyEntry {
+  path: string;
+  children: CategoryNode[];
+}
+
+export interface Taxonomy {
+  version: number;
+  postsCount: number;
+  tags: TaxonomyEntry[];
+  categories: TaxonomyEntry[];
+  categoryTree: CategoryNode[];
+  generated?: string;
+}
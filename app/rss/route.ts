@@ -116,6 +116,18 @@ function generateRSS(data: BlogData): string {
 
 export async function GET() {
   try {
+    // Prefer the feed maintained by `python blog_writer.py feeds`
+    const prebuiltPath = path.join(process.cwd(), 'public/rss.xml');
+    if (fs.existsSync(prebuiltPath)) {
+      return new NextResponse(fs.readFileSync(prebuiltPath, 'utf8'), {
+        status: 200,
+        headers: {
+          'Content-Type': 'application/xml; charset=utf-8',
+          'Cache-Control': 'public, max-age=3600, s-maxage=3600',
+        },
+      });
+    }
+
     const dataPath = path.join(process.cwd(), 'public/data/index.json');
 
     // Check if file exists
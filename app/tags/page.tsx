@@ -6,11 +6,12 @@ import { motion } from 'framer-motion';
 import LiquidBackground from '../components/LiquidBackground';
 import MagicNavbar from '../components/MagicNavbar';
 import { TagsView } from '../components/PageViews';
-import { Post } from '../components/types';
+import { Post, Taxonomy } from '../components/types';
 
 export default function TagsPage() {
   const router = useRouter();
   const [posts, setPosts] = useState<Post[]>([]);
+  const [taxonomy, setTaxonomy] = useState<Taxonomy | null>(null);
   const [loading, setLoading] = useState(true);
 
   useEffect(() => {
@@ -19,11 +20,18 @@ export default function TagsPage() {
 
   const loadBlogData = async () => {
     try {
-      const response = await fetch('/data/index.json');
+      const [response, taxonomyResponse] = await Promise.all([
+        fetch('/data/index.json'),
+        // Precomputed tag/category index (python blog_writer.py taxonomy), optional
+        fetch('/data/taxonomy.json').catch(() => null),
+      ]);
       if (response.ok) {
         const data = await response.json();
         setPosts(data.posts);
       }
+      if (taxonomyResponse && taxonomyResponse.ok) {
+        setTaxonomy(await taxonomyResponse.json());
+      }
     } catch (error) {
       console.error('Failed to load blog data:', error);
     } finally {
@@ -77,6 +85,7 @@ export default function TagsPage() {
           <TagsView
             onOpenPost={(id) => router.push(`/${id}`)}
             posts={posts}
+            taxonomy={taxonomy}
           />
         </motion.div>
       </main>
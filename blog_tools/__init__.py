@@ -0,0 +1,5 @@
+"""
+Hexo 博客写作工具 - 辅助模块
+
+blog_writer.py 与 Web 界面共用的索引、导出等功能。
+"""
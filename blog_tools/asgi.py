@@ -0,0 +1,284 @@
+"""
+异步（ASGI）只读 API
+
+与 Flask Web 界面使用同一个 HexoBlogWriter 与 .blog_cache/ 数据，面向高并发的只读接口:
+
+    GET  /api/posts            文章列表（与 Flask 版相同）
+    GET  /api/search?q=关键词   全文搜索
+    GET  /api/taxonomy         标签/分类聚合索引
+    GET  /git_status           Git 状态（异步 git 子进程）
+    GET  /api/server_status    本地 Hexo 服务器状态（异步端口探测）
+
+- 读文件、解析等阻塞操作放到线程池执行，事件循环只负责调度
+- git / hexo 通过 asyncio 子进程执行，不占用线程
+- 相同的请求合并：同一时刻 50 个相同的搜索只计算一次，其余请求等待同一个结果
+- 只提供读取接口，不执行 Hexo 命令（构建、部署等写操作只在 Flask Web 界面中提供）
+
+不依赖任何 Web 框架，可直接用任意 ASGI 服务器运行:
+
+    python -m blog_tools.asgi --port 5001                        # 需要 uvicorn
+    uvicorn --factory blog_tools.asgi:create_asgi_app --port 5001
+"""
+
+import os
+import sys
+import json
+import asyncio
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, Hashable, Optional, Tuple
+from urllib.parse import parse_qs
+
+from .coordination import ServerRegistry
+
+# 本地 Hexo 服务器默认端口（与 Flask 版 /api/server_status 一致）
+HEXO_PORT = 4000
+
+
+class Coalescer:
+    """合并相同键的并发调用：进行中的计算结果由所有等待者共享"""
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self.computations = 0
+        self.coalesced = 0
+
+    async def run(self, key: Hashable, factory: Callable[[], Awaitable]):
+        future = self._inflight.get(key)
+        if future is None:
+            self.computations += 1
+            future = asyncio.ensure_future(factory())
+            self._inflight[key] = future
+
+            def _done(done, key=key):
+                if self._inflight.get(key) is done:
+                    del self._inflight[key]
+
+            future.add_done_callback(_done)
+        else:
+            self.coalesced += 1
+        # shield: 某个等待者被取消时不影响其他等待者
+        return await asyncio.shield(future)
+
+
+def parse_git_status(output: bytes) -> Dict:
+    """解析 git status --porcelain=v1 --branch -z 的输出（与 HexoBlogWriter.git_status 的结构一致）"""
+    entries = output.decode('utf-8', errors='replace').split('\0')
+    branch = None
+    untracked, modified, staged = [], [], []
+
+    i = 0
+    while i < len(entries):
+        entry = entries[i]
+        i += 1
+        if not entry:
+            continue
+        if entry.startswith('## '):
+            head = entry[3:]
+            if head.startswith('No commits yet on '):
+                branch = head[len('No commits yet on '):]
+            else:
+                branch = head.split('...', 1)[0].split(' ', 1)[0]
+            continue
+
+        x, y, path = entry[0], entry[1], entry[3:]
+        if x in 'RC':
+            i += 1  # 重命名/复制记录后面跟着原路径
+        if x == '?':
+            untracked.append(path)
+            continue
+        if x != ' ':
+            staged.append(path)
+        if y != ' ':
+            modified.append(path)
+
+    return {
+        "is_clean": not (untracked or modified or staged),
+        "branch": branch,
+        "untracked_files": untracked,
+        "modified_files": modified,
+        "staged_files": staged
+    }
+
+
+class BlogAPI:
+    """ASGI 应用"""
+
+    def __init__(self, writer, max_workers: Optional[int] = None):
+        self.writer = writer
+        self.executor = ThreadPoolExecutor(max_workers=max_workers or min(32, (os.cpu_count() or 1) + 4),
+                                           thread_name_prefix='blog-api')
+        self.coalescer = Coalescer()
+        self.registry = ServerRegistry(writer.cache_dir / "servers.sqlite3")
+        self.routes: Dict[Tuple[str, str], Callable] = {
+            ('GET', '/api/posts'): self.api_posts,
+            ('GET', '/api/search'): self.api_search,
+            ('GET', '/api/taxonomy'): self.api_taxonomy,
+            ('GET', '/git_status'): self.git_status,
+            ('GET', '/api/server_status'): self.api_server_status,
+        }
+
+    # ------------------------------------------------------------------
+    # 工具
+    # ------------------------------------------------------------------
+
+    async def offload(self, fn, *args):
+        """在线程池中执行阻塞函数"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, fn, *args)
+
+    @staticmethod
+    async def run_process(*command, cwd: Optional[Path] = None, timeout: float = 120) -> Tuple[int, bytes, bytes]:
+        process = await asyncio.create_subprocess_exec(
+            *command, cwd=str(cwd) if cwd else None,
+            stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
+        try:
+            stdout, stderr = await asyncio.wait_for(process.communicate(), timeout)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            raise
+        return process.returncode, stdout, stderr
+
+    # ------------------------------------------------------------------
+    # 接口
+    # ------------------------------------------------------------------
+
+    async def api_posts(self, query: Dict, body: bytes):
+        def _posts():
+            return self.writer.annotate_history(self.writer.index.filter_posts())
+
+        return await self.coalescer.run('posts', lambda: self.offload(_posts))
+
+    async def api_search(self, query: Dict, body: bytes):
+        keyword = query.get('q', [''])[0]
+        if not keyword:
+            return {'error': '搜索关键词不能为空'}
+        if query.get('mode', [''])[0] == 'regex':
+            return await self.coalescer.run(('regex', keyword),
+                                            lambda: self.offload(self.writer.find_posts_regex, keyword))
+        return await self.coalescer.run(('search', keyword.lower()),
+                                        lambda: self.offload(self.writer.find_posts, keyword))
+
+    async def api_taxonomy(self, query: Dict, body: bytes):
+        return await self.coalescer.run('taxonomy', lambda: self.offload(self.writer.get_taxonomy))
+
+    async def git_status(self, query: Dict, body: bytes):
+        # 只需要仓库目录，不加载 GitPython
+        repo_dir = self.writer.repo_dir
+        if not repo_dir:
+            return {'error': '博客管理器未初始化'}
+
+        async def _status():
+            code, stdout, stderr = await self.run_process(
+                'git', 'status', '--porcelain=v1', '--branch', '-z', '--untracked-files=all',
+                cwd=repo_dir)
+            if code != 0:
+                return {'error': stderr.decode('utf-8', errors='replace').strip()}
+            return parse_git_status(stdout)
+
+        return await self.coalescer.run('git_status', _status)
+
+    async def api_server_status(self, query: Dict, body: bytes):
+        async def _status():
+            try:
+                _, writer = await asyncio.wait_for(asyncio.open_connection('localhost', HEXO_PORT), 1)
+                writer.close()
+                port_in_use = True
+            except (OSError, asyncio.TimeoutError):
+                port_in_use = False
+
+            managed = await self.offload(self.registry.get, HEXO_PORT) is not None
+            if managed:
+                return {'status': 'running', 'port': HEXO_PORT, 'managed_by_us': True,
+                        'message': 'Hexo服务器正在运行（由本工具启动）'}
+            if port_in_use:
+                return {'status': 'running', 'port': HEXO_PORT, 'managed_by_us': False,
+                        'message': f'端口{HEXO_PORT}被占用，但不是由本工具启动的服务器'}
+            return {'status': 'stopped', 'port': HEXO_PORT, 'managed_by_us': False,
+                    'message': 'Hexo服务器未运行'}
+
+        return await self.coalescer.run('server_status', _status)
+
+    # ------------------------------------------------------------------
+    # ASGI
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    async def _send_json(send, status: int, payload):
+        data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        await send({'type': 'http.response.start', 'status': status,
+                    'headers': [(b'content-type', b'application/json; charset=utf-8'),
+                                (b'content-length', str(len(data)).encode())]})
+        await send({'type': 'http.response.body', 'body': data})
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                self.executor.shutdown(wait=False)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+            return
+        if scope['type'] != 'http':
+            return
+
+        handler = self.routes.get((scope['method'], scope['path']))
+        if handler is None:
+            await self._send_json(send, 404, {'error': '接口不存在'})
+            return
+
+        body = b''
+        if scope['method'] == 'POST':
+            more = True
+            while more:
+                message = await receive()
+                body += message.get('body', b'')
+                more = message.get('more_body', False)
+
+        query = parse_qs(scope.get('query_string', b'').decode('utf-8'))
+        try:
+            payload = await handler(query, body)
+        except Exception as e:
+            payload = {'error': str(e)}
+        await self._send_json(send, 200, payload)
+
+
+def create_asgi_app(blog_path: str = None) -> BlogAPI:
+    """ASGI 应用工厂（uvicorn --factory blog_tools.asgi:create_asgi_app）"""
+    root = Path(__file__).resolve().parent.parent
+    if str(root) not in sys.path:
+        sys.path.insert(0, str(root))
+    from blog_writer import HexoBlogWriter
+
+    blog_path = blog_path or os.environ.get('BLOG_PATH') or str(root)
+    writer = HexoBlogWriter(blog_path)
+    writer.resident = True
+    return BlogAPI(writer)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Hexo 博客写作工具 - 异步只读 API')
+    parser.add_argument('--host', default='127.0.0.1', help='监听地址')
+    parser.add_argument('--port', type=int, default=5001, help='端口号')
+    parser.add_argument('--path', help='博客路径 (默认: 项目根目录)')
+    args = parser.parse_args()
+
+    try:
+        import uvicorn
+    except ImportError:
+        print("❌ 未安装uvicorn，请运行: pip install uvicorn")
+        sys.exit(1)
+
+    uvicorn.run(create_asgi_app(args.path), host=args.host, port=args.port)
+
+
+if __name__ == '__main__':
+    main()
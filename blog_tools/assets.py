@@ -0,0 +1,249 @@
+"""
+图片资源处理
+
+扫描文章（正文图片与 cover）引用的本地图片，在进程池中并行生成多种宽度的
+响应式版本及 WebP 版本：
+
+    public/images/_generated/<源文件哈希>/<文件名>-<宽度>.webp
+    public/images/_generated/<源文件哈希>/<文件名>-<宽度>.<原格式>
+
+输出目录以源文件内容哈希命名，源图片未变化时不会重复处理；
+源文件哈希按 mtime/size 缓存，未变化的图片也不会重新读取。
+处理结果（尺寸、srcset）写入 public/data/assets.json，供前端渲染 <img srcset>。
+
+依赖 Pillow（可选）: pip install Pillow
+"""
+
+import os
+import re
+import json
+import hashlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .export import dump_json, write_if_changed
+
+try:
+    from PIL import Image
+except ImportError:  # pragma: no cover - 可选依赖
+    Image = None
+
+# 响应式宽度（不会放大原图）
+DEFAULT_WIDTHS = (480, 960, 1600)
+
+IMAGE_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.webp', '.gif'}
+
+GENERATED_DIR = "images/_generated"
+
+_MD_IMAGE_RE = re.compile(r'!\[[^\]]*\]\(\s*([^)\s]+)(?:\s+"[^"]*")?\s*\)')
+_HTML_IMAGE_RE = re.compile(r'<img\b[^>]*?\bsrc=["\']([^"\']+)["\']', re.IGNORECASE)
+
+
+def _file_hash(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _process_image(source: str, out_dir: str, url_prefix: str, widths: Tuple[int, ...],
+                   quality: int) -> Dict:
+    """生成单张图片的各尺寸版本（在子进程中执行）"""
+    source_path = Path(source)
+    out_path = Path(out_dir)
+    out_path.mkdir(parents=True, exist_ok=True)
+
+    with Image.open(source_path) as img:
+        width, height = img.size
+        animated = getattr(img, 'is_animated', False)
+        fmt = (img.format or source_path.suffix.lstrip('.')).lower()
+        stem = re.sub(r'[^\w.-]', '_', source_path.stem)
+        ext = 'jpg' if fmt == 'jpeg' else fmt
+
+        targets = sorted({w for w in widths if w < width} | {width})
+        variants = []
+        for target in targets:
+            target_height = round(height * target / width)
+            resized = img if target == width else img.resize((target, target_height), Image.LANCZOS)
+
+            webp_name = f"{stem}-{target}.webp"
+            if not (out_path / webp_name).exists() and not animated:
+                save_img = resized if resized.mode in ('RGB', 'RGBA') else resized.convert('RGBA')
+                save_img.save(out_path / webp_name, 'WEBP', quality=quality, method=4)
+
+            fallback_name = f"{stem}-{target}.{ext}"
+            if not (out_path / fallback_name).exists() and target != width and not animated:
+                save_img = resized
+                if ext == 'jpg' and save_img.mode not in ('RGB', 'L'):
+                    save_img = save_img.convert('RGB')
+                save_img.save(out_path / fallback_name, quality=quality, optimize=True)
+
+            variants.append({
+                'width': target,
+                'height': target_height,
+                'webp': None if animated else f"{url_prefix}/{webp_name}",
+                'fallback': f"{url_prefix}/{fallback_name}" if target != width and not animated else None
+            })
+
+    return {'width': width, 'height': height, 'format': fmt, 'variants': variants}
+
+
+class AssetPipeline:
+    """扫描并处理文章引用的本地图片"""
+
+    def __init__(self, writer, widths: Tuple[int, ...] = DEFAULT_WIDTHS, quality: int = 80,
+                 workers: Optional[int] = None):
+        self.writer = writer
+        self.public_dir = writer.blog_path / "public"
+        self.output_dir = self.public_dir / GENERATED_DIR
+        self.metadata_file = self.public_dir / "data" / "assets.json"
+        self.cache_file = writer.cache_dir / "assets.json"
+        self.widths = tuple(sorted(set(widths)))
+        self.quality = quality
+        self.workers = workers or os.cpu_count() or 2
+
+    # ------------------------------------------------------------------
+    # 发现图片
+    # ------------------------------------------------------------------
+
+    def resolve(self, src: str, post_path: Path) -> Optional[Path]:
+        """把文章中的图片地址解析为本地文件（外部链接返回 None）"""
+        src = src.split('#', 1)[0].split('?', 1)[0]
+        if not src or src.startswith(('http://', 'https://', '//', 'data:')):
+            return None
+
+        if src.startswith('/'):
+            # 站点根路径: Next.js 的 public/ 优先，其次 Hexo 的 source/
+            candidates = [self.public_dir / src[1:], self.writer.pages_dir / src[1:]]
+        else:
+            candidates = [post_path.parent / src, post_path.parent / post_path.stem / src]
+
+        for candidate in candidates:
+            if candidate.is_file():
+                return candidate.resolve()
+        return None
+
+    def discover(self) -> Dict[str, Path]:
+        """返回 {文章中的图片地址: 本地文件路径}"""
+        found: Dict[str, Path] = {}
+        for record in self.writer.index.all_posts():
+            post_path = Path(record['path'])
+            try:
+                with open(post_path, 'r', encoding='utf-8') as f:
+                    content = f.read()
+            except OSError:
+                continue
+
+            sources = _MD_IMAGE_RE.findall(content) + _HTML_IMAGE_RE.findall(content)
+            if record.get('cover'):
+                sources.append(record['cover'])
+
+            for src in sources:
+                path = self.resolve(src, post_path)
+                if path and path.suffix.lower() in IMAGE_EXTENSIONS and GENERATED_DIR not in path.as_posix():
+                    found[src] = path
+        return found
+
+    # ------------------------------------------------------------------
+    # 处理
+    # ------------------------------------------------------------------
+
+    def _load_cache(self) -> Dict:
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+            if cache.get('widths') == list(self.widths) and cache.get('quality') == self.quality:
+                return cache
+        except (OSError, ValueError):
+            pass
+        return {'widths': list(self.widths), 'quality': self.quality, 'sources': {}, 'results': {}}
+
+    @staticmethod
+    def srcset(variants: List[Dict], key: str) -> str:
+        return ', '.join(f"{v[key]} {v['width']}w" for v in variants if v.get(key))
+
+    def run(self) -> Dict:
+        if Image is None:
+            raise ImportError("未安装Pillow，请运行: pip install Pillow")
+
+        self.writer.index.refresh(force=True)
+        images = self.discover()
+        cache = self._load_cache()
+        sources, results = cache['sources'], cache['results']
+
+        # 计算源文件哈希（mtime/size 未变时沿用缓存）
+        hashes: Dict[str, str] = {}
+        for path in set(images.values()):
+            key = str(path)
+            st = path.stat()
+            signature = [st.st_mtime_ns, st.st_size]
+            cached = sources.get(key)
+            if cached and cached['stat'] == signature:
+                hashes[key] = cached['hash']
+            else:
+                hashes[key] = _file_hash(path)
+                sources[key] = {'stat': signature, 'hash': hashes[key]}
+
+        # 只处理没有缓存结果（或输出目录被删除）的图片
+        pending = {}
+        for key, digest in hashes.items():
+            out_dir = self.output_dir / digest[:16]
+            if digest not in results or not out_dir.exists():
+                pending[digest] = (key, out_dir)
+
+        processed, failed = 0, []
+        if pending:
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                futures = {
+                    pool.submit(_process_image, key, str(out_dir),
+                                f"/{GENERATED_DIR}/{digest[:16]}", self.widths, self.quality): (digest, key)
+                    for digest, (key, out_dir) in pending.items()
+                }
+                for future in as_completed(futures):
+                    digest, key = futures[future]
+                    try:
+                        results[digest] = future.result()
+                        processed += 1
+                    except Exception as e:
+                        failed.append(f"{key}: {e}")
+
+        # 输出前端使用的元数据
+        metadata = {}
+        for src, path in sorted(images.items()):
+            result = results.get(hashes[str(path)])
+            if not result:
+                continue
+            # 原尺寸直接使用源图片
+            variants = [dict(v, fallback=v['fallback'] or src) for v in result['variants']]
+            metadata[src] = {
+                'width': result['width'],
+                'height': result['height'],
+                'srcset': self.srcset(variants, 'fallback'),
+                'webpSrcset': self.srcset(variants, 'webp')
+            }
+        write_if_changed(self.metadata_file, dump_json(metadata, pretty=True))
+
+        # 清理不再被引用的输出与缓存
+        live = {digest[:16] for digest in hashes.values()}
+        removed = 0
+        if self.output_dir.exists():
+            import shutil
+            for item in self.output_dir.iterdir():
+                if item.is_dir() and item.name not in live:
+                    shutil.rmtree(item)
+                    removed += 1
+        cache['sources'] = {k: v for k, v in sources.items() if k in hashes}
+        live_hashes = set(hashes.values())
+        cache['results'] = {k: v for k, v in results.items() if k in live_hashes}
+        write_if_changed(self.cache_file, dump_json(cache))
+
+        return {
+            'images': len(images),
+            'processed': processed,
+            'cached': len(set(hashes.values())) - len(pending),
+            'failed': failed,
+            'removed': removed,
+            'metadata': str(self.metadata_file)
+        }
@@ -0,0 +1,515 @@
+"""
+性能基准测试
+
+在合成语料（见 corpus.py）上测量 HexoBlogWriter 常用操作与 Web 接口的耗时和内存：
+
+    python -m blog_tools.benchmark --posts 2000 --output bench.json
+    python -m blog_tools.benchmark --posts 2000 --compare bench.json --threshold 0.2
+
+每个用例在独立的子进程中运行（spawn），从而得到真实的冷启动耗时与该用例的峰值 RSS：
+- cold: 删除 .blog_cache 后，创建 HexoBlogWriter 并执行第一次操作的耗时
+- warm: 同一进程中重复执行的耗时中位数
+- peak_rss_kb: 子进程峰值常驻内存
+
+启动用例（startup_*）每次以新的解释器运行 blog_writer.py 命令，并用 -X importtime 统计导入耗时。
+热运行耗时拆成两部分:
+- startup_overhead_s: 不带命令运行 blog_writer.py（编译脚本、导入模块、构建命令行解析器）减去 python -c pass
+- command_s: 热运行耗时减去不带命令的运行耗时，即命令本身的工作量（随语料规模增长，用 --compare 跟踪）
+启动开销超出 --startup-budget-ms 时退出码为 1。这些命令不导入 git/flask 等模块由
+tests/test_startup_imports.py 检查，不依赖计时。
+
+并发用例（concurrent_*）同时发出 --concurrency 个相同请求，分别测量 Flask（线程池 + test client）
+与异步 API（blog_tools.asgi，进程内直接调用 ASGI 应用）完成一轮的耗时，以及异步 API 实际计算的次数。
+
+结果以 JSON 保存，--compare 与之前的结果比较，超过阈值的用例视为回归（退出码 1）。
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import statistics
+import subprocess
+import tempfile
+import datetime
+import contextlib
+import multiprocessing
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - Windows
+    resource = None
+
+from .corpus import generate_corpus
+
+BENCHMARK_VERSION = 1
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+BLOG_WRITER_FILE = ROOT_DIR / "blog_writer.py"
+WEB_APP_FILE = ROOT_DIR / "blog_tools" / "web" / "app.py"
+
+# 低于该耗时（秒）的差异视为噪声，不判定为回归
+NOISE_FLOOR = 0.005
+
+
+def _backup(writer):
+    target = Path(tempfile.mkdtemp(prefix='blog-bench-backup-'))
+    try:
+        writer.backup_blog(str(target / "backup"))
+    finally:
+        shutil.rmtree(target, ignore_errors=True)
+
+
+# create_batch 每次创建的文章数
+CREATE_BATCH_POSTS = 1000
+
+
+def _create_batch(writer):
+    """批量创建文章（标题与标签含冒号、#、引号等需要转义的字符），结束后删除，不改变其他用例的语料"""
+    specs = [{'title': f'Bench: post #{i} "{i % 7}"', 'slug': f'bench-{i}', 'tags': ['bench', "it's: #x"],
+              'content': f'body {i}'} for i in range(CREATE_BATCH_POSTS)]
+    result = writer.create_posts(specs, on_conflict='rename')
+    for path in result['files']:
+        os.unlink(path)
+
+
+# 用例名 -> 对 HexoBlogWriter 执行的操作
+WRITER_CASES: Dict[str, Callable] = {
+    'list_posts': lambda w: w.list_posts(limit=50),
+    'list_posts_tag': lambda w: w.list_posts(limit=50, tag='CTF'),
+    'search_posts_cjk': lambda w: w.search_posts('漏洞'),
+    'search_posts_latin': lambda w: w.search_posts('exploit'),
+    'validate_posts': lambda w: w.validate_posts(),
+    'check_links': lambda w: w.check_links(),
+    'get_blog_stats': lambda w: w.get_blog_stats(),
+    'backup_blog': _backup,
+    'create_batch': _create_batch,
+}
+
+# 用例名 -> Web 接口路径（通过 Flask test client 请求）
+WEB_CASES: Dict[str, str] = {
+    'web_index': '/',
+    'web_pages': '/pages',
+    'web_api_posts': '/api/posts',
+    'web_api_search': '/api/search?q=exploit',
+    'web_api_taxonomy': '/api/taxonomy',
+    'web_api_tag': '/api/tags/CTF',
+}
+
+# 用例名 -> 并发请求的接口路径（Flask 与 ASGI 对比）
+CONCURRENT_CASES: Dict[str, str] = {
+    'concurrent_posts': '/api/posts',
+    'concurrent_search': '/api/search?q=exploit',
+    'concurrent_taxonomy': '/api/taxonomy',
+}
+
+# 用例名 -> 命令行参数（每次启动新的解释器运行 blog_writer.py，测量启动开销）
+STARTUP_CASES: Dict[str, List[str]] = {
+    'startup_list': ['list', '--limit', '1'],
+    'startup_search': ['search', '漏洞'],
+    'startup_validate': ['debug', 'validate'],
+}
+
+# 启动预算（毫秒）：热运行耗时减去解释器自身启动耗时（python -c pass）
+STARTUP_BUDGET_MS = 100
+
+ALL_CASES = list(WRITER_CASES) + list(WEB_CASES) + list(CONCURRENT_CASES) + list(STARTUP_CASES)
+
+# 需要比较的耗时指标
+TIME_METRICS = ('cold_s', 'warm_s', 'command_s', 'flask_s', 'asgi_s')
+
+
+def _peak_rss_kb() -> Optional[int]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS 以字节为单位，Linux 以 KB 为单位
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+def _load_web_app():
+    import importlib.util
+    spec = importlib.util.spec_from_file_location('blog_web_app', WEB_APP_FILE)
+    module = importlib.util.module_from_spec(spec)
+    # Flask 通过 sys.modules 确定模板目录
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+async def _asgi_get(app, path: str) -> int:
+    """在进程内直接调用 ASGI 应用，返回状态码"""
+    path, _, query = path.partition('?')
+    scope = {'type': 'http', 'method': 'GET', 'path': path, 'query_string': query.encode(), 'headers': []}
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        messages.append(message)
+
+    await app(scope, receive, send)
+    return messages[0]['status']
+
+
+def _run_concurrency(blog_path: str, name: str, repeat: int, concurrency: int) -> Dict:
+    """同一接口并发 concurrency 个请求，对比 Flask 与 ASGI"""
+    import asyncio
+    from concurrent.futures import ThreadPoolExecutor
+    from blog_writer import HexoBlogWriter
+    from blog_tools.asgi import BlogAPI
+
+    path = CONCURRENT_CASES[name]
+    web = _load_web_app()
+    web.blog_writer = HexoBlogWriter(blog_path)
+    api = BlogAPI(web.blog_writer)
+
+    def flask_get(_):
+        response = web.app.test_client().get(path)
+        if response.status_code != 200:
+            raise RuntimeError(f"{path} 返回 {response.status_code}")
+
+    async def asgi_round():
+        statuses = await asyncio.gather(*(_asgi_get(api, path) for _ in range(concurrency)))
+        if any(status != 200 for status in statuses):
+            raise RuntimeError(f"{path} 返回 {statuses}")
+
+    flask_runs, asgi_runs = [], []
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        # 第一轮预热（加载索引），不计时
+        list(pool.map(flask_get, range(concurrency)))
+        asyncio.run(asgi_round())
+        api.coalescer.computations = 0
+
+        for _ in range(max(repeat, 1)):
+            start = time.perf_counter()
+            list(pool.map(flask_get, range(concurrency)))
+            flask_runs.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            asyncio.run(asgi_round())
+            asgi_runs.append(time.perf_counter() - start)
+
+    flask_s = statistics.median(flask_runs)
+    asgi_s = statistics.median(asgi_runs)
+    return {
+        'concurrency': concurrency,
+        'flask_s': round(flask_s, 6),
+        'asgi_s': round(asgi_s, 6),
+        'flask_rps': round(concurrency / flask_s, 1),
+        'asgi_rps': round(concurrency / asgi_s, 1),
+        # 每轮 concurrency 个请求实际触发的计算次数
+        'asgi_computations': api.coalescer.computations / len(asgi_runs),
+        'peak_rss_kb': _peak_rss_kb()
+    }
+
+
+def _run_case(blog_path: str, name: str, repeat: int, result_queue, concurrency: int = 50):
+    """子进程入口：执行单个用例并把结果放入队列"""
+    try:
+        if str(ROOT_DIR) not in sys.path:
+            sys.path.insert(0, str(ROOT_DIR))
+
+        if name in CONCURRENT_CASES:
+            with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                result_queue.put(_run_concurrency(blog_path, name, repeat, concurrency))
+            return
+
+        # 导入时间不计入用例耗时，但 import 后的 RSS 作为基线
+        from blog_writer import HexoBlogWriter
+        web = _load_web_app() if name in WEB_CASES else None
+        baseline_rss = _peak_rss_kb()
+
+        shutil.rmtree(Path(blog_path) / ".blog_cache", ignore_errors=True)
+
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            if web is not None:
+                path = WEB_CASES[name]
+
+                def setup():
+                    web.blog_writer = HexoBlogWriter(blog_path)
+                    return web.app.test_client()
+
+                def run(client):
+                    response = client.get(path)
+                    if response.status_code != 200:
+                        raise RuntimeError(f"{path} 返回 {response.status_code}")
+            else:
+                operation = WRITER_CASES[name]
+
+                def setup():
+                    return HexoBlogWriter(blog_path)
+
+                def run(writer):
+                    operation(writer)
+
+            start = time.perf_counter()
+            target = setup()
+            run(target)
+            cold = time.perf_counter() - start
+
+            warm_runs = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                run(target)
+                warm_runs.append(time.perf_counter() - start)
+
+        result = {
+            'cold_s': round(cold, 6),
+            'warm_s': round(statistics.median(warm_runs), 6) if warm_runs else None,
+            'warm_min_s': round(min(warm_runs), 6) if warm_runs else None,
+            'warm_runs': len(warm_runs),
+            'baseline_rss_kb': baseline_rss,
+            'peak_rss_kb': _peak_rss_kb()
+        }
+        if name == 'create_batch' and result['warm_s']:
+            # 吞吐量包含删除本批文件，以及下一次创建前的索引刷新
+            result['posts_per_second'] = round(CREATE_BATCH_POSTS / result['warm_s'], 1)
+        result_queue.put(result)
+    except Exception as e:
+        result_queue.put({'error': f"{type(e).__name__}: {e}"})
+
+
+def parse_importtime(stderr: str) -> Dict[str, int]:
+    """解析 -X importtime 输出，返回 模块名 -> 累计导入耗时（微秒，仅顶层导入）"""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        # 缩进表示被其他模块间接导入
+        if not name.startswith('  '):
+            modules[name.strip()] = int(cumulative)
+    return modules
+
+
+def run_startup_case(blog_path: Path, name: str, repeat: int = 5) -> Dict:
+    """以新解释器运行命令行，测量冷/热启动耗时与导入耗时"""
+    command = [sys.executable, str(BLOG_WRITER_FILE), '--path', str(blog_path), *STARTUP_CASES[name]]
+    env = dict(os.environ, PYTHONIOENCODING='utf-8')
+
+    def _timed(cmd) -> float:
+        start = time.perf_counter()
+        subprocess.run(cmd, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        return time.perf_counter() - start
+
+    try:
+        interpreter = statistics.median(_timed([sys.executable, '-c', 'pass']) for _ in range(max(repeat, 3)))
+        # 不带命令时只打印帮助：脚本编译、模块导入与解析器构建，不加载索引
+        startup = statistics.median(_timed(command[:2]) for _ in range(max(repeat, 3)))
+
+        shutil.rmtree(Path(blog_path) / ".blog_cache", ignore_errors=True)
+        cold = _timed(command)
+        warm_runs = [_timed(command) for _ in range(repeat)]
+
+        output = subprocess.run([sys.executable, '-X', 'importtime', *command[1:]], env=env,
+                                stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    except subprocess.CalledProcessError as e:
+        return {'error': f"命令执行失败（退出码 {e.returncode}）: {' '.join(command)}"}
+
+    modules = parse_importtime(output.stderr)
+    warm = statistics.median(warm_runs)
+
+    return {
+        'cold_s': round(cold, 6),
+        'warm_s': round(warm, 6),
+        'warm_min_s': round(min(warm_runs), 6),
+        'warm_runs': len(warm_runs),
+        'interpreter_s': round(interpreter, 6),
+        'startup_overhead_s': round(max(startup - interpreter, 0), 6),
+        'command_s': round(max(warm - startup, 0), 6),
+        'import_s': round(sum(modules.values()) / 1e6, 6),
+        'top_imports': [{'module': module, 'ms': round(us / 1000, 2)}
+                        for module, us in sorted(modules.items(), key=lambda item: -item[1])[:8]]
+    }
+
+
+def check_startup_budget(results: Dict, budget_ms: float = STARTUP_BUDGET_MS) -> List[str]:
+    """检查启动用例：启动开销（不含命令本身的工作）超出预算时返回问题列表"""
+    problems = []
+    for name, result in results.items():
+        if name not in STARTUP_CASES or 'error' in result:
+            continue
+        overhead_ms = result['startup_overhead_s'] * 1000
+        if overhead_ms > budget_ms:
+            problems.append(f"{name}: 启动开销 {overhead_ms:.1f}ms 超出预算 {budget_ms:g}ms "
+                            f"(最重的导入: {', '.join(item['module'] for item in result['top_imports'][:3])})")
+    return problems
+
+
+def run_case(blog_path: Path, name: str, repeat: int = 5, timeout: float = 600, concurrency: int = 50) -> Dict:
+    """在独立子进程中运行用例"""
+    ctx = multiprocessing.get_context('spawn')
+    result_queue = ctx.Queue()
+    process = ctx.Process(target=_run_case, args=(str(blog_path), name, repeat, result_queue, concurrency))
+    process.start()
+    try:
+        result = result_queue.get(timeout=timeout)
+    except Exception:
+        result = {'error': f"超时（{timeout}s）或子进程异常退出"}
+    process.join(timeout=10)
+    if process.is_alive():
+        process.kill()
+    return result
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        output = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT_DIR,
+                                capture_output=True, text=True, timeout=10)
+        return output.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def run_benchmarks(posts: int = 1000, seed: int = 42, repeat: int = 5, cases: List[str] = None,
+                   corpus_dir: Optional[str] = None, mean_words: int = 600,
+                   cjk_ratio: float = 0.6, concurrency: int = 50) -> Dict:
+    """生成语料并运行所有用例，返回结果字典"""
+    cases = cases or ALL_CASES
+    unknown = [case for case in cases if case not in ALL_CASES]
+    if unknown:
+        raise ValueError(f"未知用例: {', '.join(unknown)}")
+
+    temp_dir = None
+    if corpus_dir:
+        blog_path = Path(corpus_dir)
+        if blog_path.exists() and any(blog_path.iterdir()):
+            raise ValueError(f"语料目录不为空: {blog_path}")
+    else:
+        temp_dir = tempfile.mkdtemp(prefix='blog-bench-')
+        blog_path = Path(temp_dir)
+
+    try:
+        corpus = generate_corpus(blog_path, posts=posts, seed=seed, mean_words=mean_words,
+                                 cjk_ratio=cjk_ratio)
+        results = {}
+        for name in cases:
+            print(f"⏱️  {name} ...", end=' ', flush=True)
+            if name in STARTUP_CASES:
+                result = run_startup_case(blog_path, name, repeat=repeat)
+            else:
+                result = run_case(blog_path, name, repeat=repeat, concurrency=concurrency)
+            results[name] = result
+            if 'error' in result:
+                print(f"❌ {result['error']}")
+            elif name in STARTUP_CASES:
+                print(f"cold {result['cold_s'] * 1000:.1f}ms  warm {result['warm_s'] * 1000:.1f}ms  "
+                      f"(解释器 {result['interpreter_s'] * 1000:.1f}ms, "
+                      f"启动 {result['startup_overhead_s'] * 1000:.1f}ms, 导入 {result['import_s'] * 1000:.1f}ms, "
+                      f"命令 {result['command_s'] * 1000:.1f}ms)")
+            elif name in CONCURRENT_CASES:
+                print(f"flask {result['flask_rps']} req/s  asgi {result['asgi_rps']} req/s  "
+                      f"(asgi 每轮计算 {result['asgi_computations']:g} 次)")
+            else:
+                throughput = f"  {result['posts_per_second']:g} 篇/秒" if result.get('posts_per_second') else ''
+                print(f"cold {result['cold_s'] * 1000:.1f}ms  warm {result['warm_s'] * 1000:.1f}ms  "
+                      f"rss {result['peak_rss_kb'] or 0} KB{throughput}")
+    finally:
+        if temp_dir:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    return {
+        'version': BENCHMARK_VERSION,
+        'meta': {
+            'commit': _git_commit(),
+            'time': datetime.datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'repeat': repeat,
+            'concurrency': concurrency,
+            'corpus': corpus
+        },
+        'results': results
+    }
+
+
+def compare_results(current: Dict, baseline: Dict, threshold: float = 0.2) -> List[str]:
+    """比较两次结果，返回回归列表（耗时增长超过 threshold 比例）"""
+    regressions = []
+    if current['meta']['corpus'] != baseline.get('meta', {}).get('corpus'):
+        print("⚠️  两次基准测试的语料参数不同，比较结果仅供参考")
+
+    print(f"\n{'用例':<22}{'指标':<11}{'基线':>12}{'当前':>12}{'变化':>10}")
+    print("-" * 67)
+    for name, result in current['results'].items():
+        old = baseline.get('results', {}).get(name)
+        if not old or 'error' in old or 'error' in result:
+            continue
+        for metric in TIME_METRICS:
+            before, after = old.get(metric), result.get(metric)
+            if not before or after is None:
+                continue
+            change = (after - before) / before
+            flag = ''
+            if change > threshold and after - before > NOISE_FLOOR:
+                flag = ' ❌'
+                regressions.append(f"{name}.{metric}: {before * 1000:.1f}ms -> {after * 1000:.1f}ms "
+                                   f"(+{change:.0%})")
+            print(f"{name:<22}{metric:<11}{before * 1000:>10.1f}ms{after * 1000:>10.1f}ms{change:>+10.0%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Hexo 博客写作工具 - 性能基准测试')
+    parser.add_argument('--posts', type=int, default=1000, help='合成文章数量')
+    parser.add_argument('--seed', type=int, default=42, help='随机种子')
+    parser.add_argument('--mean-words', type=int, default=600, help='文章平均词数（对数正态分布）')
+    parser.add_argument('--cjk-ratio', type=float, default=0.6, help='中文词比例 (0-1)')
+    parser.add_argument('--repeat', type=int, default=5, help='热运行次数')
+    parser.add_argument('--concurrency', type=int, default=50, help='并发用例的同时请求数')
+    parser.add_argument('--cases', nargs='*', help=f"只运行指定用例: {', '.join(ALL_CASES)}")
+    parser.add_argument('--corpus-dir', help='语料目录（默认使用临时目录并在结束后删除）')
+    parser.add_argument('--output', help='结果输出文件 (JSON)')
+    parser.add_argument('--compare', help='与之前的结果文件比较')
+    parser.add_argument('--threshold', type=float, default=0.2, help='回归阈值（耗时增长比例，默认 0.2）')
+    parser.add_argument('--startup-budget-ms', type=float, default=STARTUP_BUDGET_MS,
+                        help=f'启动用例的启动开销预算（毫秒，不含解释器启动与命令本身的工作，默认 {STARTUP_BUDGET_MS}）')
+    args = parser.parse_args()
+
+    try:
+        results = run_benchmarks(posts=args.posts, seed=args.seed, repeat=args.repeat, cases=args.cases,
+                                 corpus_dir=args.corpus_dir, mean_words=args.mean_words,
+                                 cjk_ratio=args.cjk_ratio, concurrency=args.concurrency)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(2)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+        print(f"\n✅ 结果已保存: {args.output}")
+
+    failed = [name for name, result in results['results'].items() if 'error' in result]
+
+    startup_problems = check_startup_budget(results['results'], args.startup_budget_ms)
+    if startup_problems:
+        print(f"\n❌ 启动性能检查未通过:")
+        for item in startup_problems:
+            print(f"  - {item}")
+        failed.extend(startup_problems)
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare_results(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n❌ 发现 {len(regressions)} 项性能回归 (阈值 {args.threshold:.0%}):")
+            for item in regressions:
+                print(f"  - {item}")
+            sys.exit(1)
+        print(f"\n✅ 未发现超过 {args.threshold:.0%} 的性能回归")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
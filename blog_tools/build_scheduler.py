@@ -0,0 +1,252 @@
+"""
+构建调度
+
+批量修改文章或多人连续保存时，如果每次保存、每次点击"生成"都执行一遍 hexo generate，
+同样的完整构建会重复很多次。BuildScheduler 收集修改事件，合并成尽量少的构建：
+
+- 防抖: 最后一次修改后安静 quiet 秒才开始构建；修改持续不断时，最早的一次修改最多等待 max_wait 秒
+- 显式请求（request）跳过安静窗口，但同样遵守"同一时刻只有一个构建"
+- 同一时刻只运行一个构建（进程内由调度线程保证；多个 worker 之间由构建函数自己加文件锁）
+- 构建过程中到达的修改并入下一次构建
+- status() 返回当前状态、队列深度（待构建的修改数）与最近几次构建的耗时，供 Web 界面显示
+
+调度线程在第一次有修改时才启动（gunicorn 预加载后 fork 的 worker 各自启动自己的线程）。
+
+HexoBuild 是 Web 界面各 worker 共用的构建函数: 多个进程之间用 .blog_cache/build.lock 互斥，
+并在 build.json 中记录最近一次构建的开始时间。等锁期间若其他进程已开始并完成了一次构建，
+那次构建已经包含本次请求之前写入的全部修改，本次直接跳过。
+"""
+
+import os
+import json
+import time
+import subprocess
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .coordination import InterProcessLock
+from .fileutil import atomic_write_text
+
+DEFAULT_QUIET = 2.0
+DEFAULT_MAX_WAIT = 10.0
+
+# 保留的构建记录数
+HISTORY_SIZE = 20
+
+# 每次构建记录中保留的输出长度与修改示例数
+OUTPUT_LIMIT = 4000
+SAMPLE_CHANGES = 10
+
+# build(本次包含的修改) -> (是否成功, 输出)
+Builder = Callable[[List[str]], Tuple[bool, str]]
+
+
+class BuildScheduler:
+    """合并修改事件的单线程构建调度器"""
+
+    def __init__(self, build: Builder, quiet: float = DEFAULT_QUIET, max_wait: float = DEFAULT_MAX_WAIT,
+                 history: int = HISTORY_SIZE):
+        if quiet < 0 or max_wait < quiet:
+            raise ValueError("安静窗口不能为负数，且不能超过最长等待时间")
+        self.build = build
+        self.quiet = quiet
+        self.max_wait = max_wait
+
+        self._cond = threading.Condition()
+        # 待构建的修改（dict 用作保持顺序的去重集合）与对应的事件数
+        self._pending: Dict[str, None] = {}
+        self._events = 0
+        self._first: Optional[float] = None
+        self._last: Optional[float] = None
+        self._immediate = False
+
+        self._running: Optional[Dict] = None
+        self._history: deque = deque(maxlen=history)
+        self._started = 0
+        self._finished = 0
+        self.total_events = 0
+
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+
+    # ------------------------------------------------------------------
+    # 提交
+    # ------------------------------------------------------------------
+
+    def _enqueue(self, changes: List[str], immediate: bool) -> int:
+        """加入待构建队列，返回将包含这些修改的构建序号"""
+        now = time.monotonic()
+        with self._cond:
+            for change in changes:
+                self._pending[change] = None
+            self._events += len(changes)
+            self.total_events += len(changes)
+            if self._first is None:
+                self._first = now
+            self._last = now
+            self._immediate = self._immediate or immediate
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='build-scheduler', daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+            return self._started + 1
+
+    def notify(self, change: str):
+        """记录一次修改（如文章ID），安静窗口结束后构建"""
+        self._enqueue([change], immediate=False)
+
+    def request(self, reason: str = '手动构建', wait: bool = False,
+                timeout: Optional[float] = None) -> Optional[Dict]:
+        """立即构建（正在构建时并入下一次）；wait=True 时等待包含本次请求的构建完成并返回其记录"""
+        target = self._enqueue([reason], immediate=True)
+        if not wait:
+            return None
+        return self.wait_for(target, timeout)
+
+    def wait_for(self, seq: int, timeout: Optional[float] = None) -> Optional[Dict]:
+        """等待第 seq 次构建完成并返回其记录（超时返回 None）"""
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._finished >= seq, timeout):
+                return None
+            for record in self._history:
+                if record['seq'] == seq:
+                    return dict(record)
+        return None
+
+    def stop(self):
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+
+    # ------------------------------------------------------------------
+    # 调度线程
+    # ------------------------------------------------------------------
+
+    def _next_batch(self) -> Optional[Tuple[List[str], Dict]]:
+        """等到下一次构建的时间，取出待构建的修改（停止时返回 None）"""
+        with self._cond:
+            while not self._stopping:
+                if not self._pending:
+                    self._cond.wait()
+                    continue
+                now = time.monotonic()
+                due = now if self._immediate else min(self._last + self.quiet, self._first + self.max_wait)
+                if now < due:
+                    self._cond.wait(due - now)
+                    continue
+
+                changes = list(self._pending)
+                self._started += 1
+                record = {
+                    'seq': self._started,
+                    'started': time.time(),
+                    'changes': len(changes),
+                    'events': self._events,
+                    'sample': changes[:SAMPLE_CHANGES],
+                    'waited': round(now - self._first, 3)
+                }
+                self._pending.clear()
+                self._events = 0
+                self._first = self._last = None
+                self._immediate = False
+                self._running = record
+                return changes, record
+            return None
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            changes, record = batch
+
+            start = time.perf_counter()
+            try:
+                success, output = self.build(changes)
+            except Exception as e:
+                success, output = False, str(e)
+            record['duration'] = round(time.perf_counter() - start, 3)
+            record['success'] = bool(success)
+            record['output'] = (output or '')[-OUTPUT_LIMIT:]
+
+            with self._cond:
+                self._running = None
+                self._finished = record['seq']
+                self._history.appendleft(record)
+                self._cond.notify_all()
+
+    # ------------------------------------------------------------------
+    # 状态
+    # ------------------------------------------------------------------
+
+    def status(self) -> Dict:
+        """当前状态（idle/waiting/building）、队列深度与最近的构建记录（不含输出）"""
+        with self._cond:
+            now = time.monotonic()
+            due_in = None
+            if self._pending and self._running is None:
+                due = now if self._immediate else min(self._last + self.quiet, self._first + self.max_wait)
+                due_in = round(max(0.0, due - now), 3)
+
+            running = None
+            if self._running is not None:
+                running = {key: value for key, value in self._running.items() if key != 'output'}
+                running['elapsed'] = round(time.time() - running['started'], 3)
+
+            builds = [{key: value for key, value in record.items() if key != 'output'}
+                      for record in self._history]
+            durations = [record['duration'] for record in self._history]
+            return {
+                'state': 'building' if running else ('waiting' if self._pending else 'idle'),
+                'queue_depth': len(self._pending),
+                'queued_events': self._events,
+                'due_in': due_in,
+                'running': running,
+                'builds': builds,
+                'total_builds': self._finished,
+                'total_events': self.total_events,
+                'average_duration': round(sum(durations) / len(durations), 3) if durations else None,
+                'quiet': self.quiet,
+                'max_wait': self.max_wait
+            }
+
+
+class HexoBuild:
+    """hexo generate（多进程互斥，合并其他进程已完成的构建）"""
+
+    def __init__(self, blog_path, cache_dir):
+        self.blog_path = Path(blog_path)
+        self.lock = InterProcessLock(Path(cache_dir) / "build.lock")
+        self.state_file = Path(cache_dir) / "build.json"
+        self.skipped = 0
+
+    def _last_build(self) -> Dict:
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def __call__(self, changes: Optional[List[str]] = None) -> Tuple[bool, str]:
+        requested = time.time()
+        with self.lock():
+            last = self._last_build()
+            if last.get('started', 0) >= requested:
+                self.skipped += 1
+                return bool(last.get('success')), f"进程 {last.get('pid')} 的构建已包含这些修改，跳过"
+
+            started = time.time()
+            result = subprocess.run(['npx', 'hexo', 'generate'], capture_output=True, text=True,
+                                    cwd=self.blog_path)
+            success = result.returncode == 0
+            atomic_write_text(self.state_file, json.dumps({
+                'started': started,
+                'finished': time.time(),
+                'success': success,
+                'pid': os.getpid()
+            }))
+        if success:
+            return True, result.stdout
+        return False, result.stderr or result.stdout
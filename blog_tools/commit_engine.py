@@ -0,0 +1,117 @@
+"""
+选择性提交
+
+代替 `git add --all`：只在博客源文件范围内（文章、页面、配置、脚手架）查找变更，
+按包含/排除规则筛选后一次性写入暂存区，再提交。
+
+- 变更查找使用带路径规则的 `git status`，git 不会遍历 public/、node_modules/ 等生成目录
+- 暂存通过一次 `git update-index --add --remove -z --stdin` 完成（只写一次 index 文件）
+- 规则为相对博客根目录的 glob（支持 **），例如 include=['source/_posts/**'], exclude=['source/_drafts/**']
+- 返回暂存的文件列表和各阶段耗时
+"""
+
+import time
+import subprocess
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from .timing import phase
+
+# 默认提交范围（相对博客根目录）
+DEFAULT_INCLUDE = (
+    'source/**',
+    'scaffolds/**',
+    '_config.yml',
+    '_config.*.yml',
+    'package.json',
+    'package-lock.json',
+)
+
+# 默认排除（即使落在包含范围内）
+DEFAULT_EXCLUDE = (
+    'public/**',
+    'node_modules/**',
+    '.playwright-mcp/**',
+    '.deploy_git/**',
+    '.blog_cache/**',
+    'db.json',
+    '**/.DS_Store',
+)
+
+
+class CommitEngine:
+    """按规则暂存并提交博客源文件"""
+
+    def __init__(self, repo, blog_path: Path,
+                 include: Optional[Sequence[str]] = None, exclude: Optional[Sequence[str]] = None):
+        """repo 为 GitPython 的 Repo（提交方式与之前的 repo.index.commit 保持一致）"""
+        self.repo = repo
+        self.repo_dir = Path(repo.working_tree_dir).resolve()
+        prefix = Path(blog_path).resolve().relative_to(self.repo_dir).as_posix()
+        self.prefix = '' if prefix == '.' else prefix + '/'
+        self.include = list(include) if include else list(DEFAULT_INCLUDE)
+        self.exclude = list(DEFAULT_EXCLUDE) + list(exclude or [])
+
+    def _git(self, *args, input: Optional[bytes] = None) -> subprocess.CompletedProcess:
+        with phase('git'):
+            result = subprocess.run(['git', *args], cwd=str(self.repo_dir), input=input, capture_output=True)
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.decode('utf-8', errors='replace').strip()
+                               or f"git {args[0]} 失败")
+        return result
+
+    def pathspecs(self) -> List[str]:
+        """包含/排除规则 -> git 路径规则（相对仓库根目录）"""
+        specs = [f':(top,glob){self.prefix}{pattern}' for pattern in self.include]
+        specs += [f':(top,exclude,glob){self.prefix}{pattern}' for pattern in self.exclude]
+        return specs
+
+    def changed_paths(self) -> List[str]:
+        """规则范围内有变化的文件（相对仓库根目录，含删除和重命名的原路径）"""
+        output = self._git('status', '--porcelain=v1', '-z', '--untracked-files=all',
+                           '--', *self.pathspecs()).stdout
+        entries = output.decode('utf-8', errors='surrogateescape').split('\0')
+        paths = []
+        i = 0
+        while i < len(entries):
+            entry = entries[i]
+            i += 1
+            if len(entry) < 4:
+                continue
+            paths.append(entry[3:])
+            if entry[0] in 'RC':
+                # 重命名记录后面跟着原路径
+                paths.append(entries[i])
+                i += 1
+        return paths
+
+    def commit(self, message: str) -> Dict:
+        """暂存规则范围内的变更并提交"""
+        timings = {}
+
+        start = time.perf_counter()
+        paths = self.changed_paths()
+        timings['status'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        if paths:
+            data = b''.join(path.encode('utf-8', errors='surrogateescape') + b'\0' for path in paths)
+            self._git('update-index', '--add', '--remove', '-z', '--stdin', input=data)
+        timings['stage'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        # 暂存区与 HEAD 是否有差异（也包括提交前已手动暂存的内容）
+        with phase('git'):
+            staged = subprocess.run(['git', 'diff', '--cached', '--quiet'], cwd=str(self.repo_dir)).returncode != 0
+        commit = None
+        if staged:
+            with phase('git'):
+                commit = self.repo.index.commit(message).hexsha
+        timings['commit'] = time.perf_counter() - start
+
+        return {
+            'committed': staged,
+            'commit': commit,
+            'staged_files': paths,
+            'timings': {name: round(seconds, 4) for name, seconds in timings.items()}
+        }
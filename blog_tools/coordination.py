@@ -0,0 +1,256 @@
+"""
+多进程协调
+
+Web 界面以多个 worker（gunicorn/waitress）运行时，进程之间通过 .blog_cache/ 下的文件协调：
+- InterProcessLock: 线程锁 + 文件锁（fcntl.flock），用于索引刷新、Git 操作等临界区
+- ServerRegistry: 本工具启动的 Hexo 预览服务器记录在 SQLite 中（端口 -> pid），
+  任意 worker 都能查询、停止其他 worker 启动的服务器，同一端口不会被重复启动
+- SingleFlight: 进程内合并并发的相同调用
+"""
+
+import os
+import time
+import signal
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+# psutil 为可选依赖，首次需要时才导入（False 表示尚未尝试）
+_psutil_module = False
+
+
+def _psutil():
+    global _psutil_module
+    if _psutil_module is False:
+        try:
+            import psutil
+            _psutil_module = psutil
+        except ImportError:  # pragma: no cover - 可选依赖
+            _psutil_module = None
+    return _psutil_module
+
+
+class InterProcessLock:
+    """同时在线程间与进程间互斥的锁（可重入）"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._thread_lock = threading.RLock()
+        self._local = threading.local()
+
+    @contextmanager
+    def __call__(self):
+        with self._thread_lock:
+            depth = getattr(self._local, 'depth', 0)
+            if depth or fcntl is None:
+                # 同一线程内重入，文件锁已持有
+                self._local.depth = depth + 1
+                try:
+                    yield
+                finally:
+                    self._local.depth = depth
+                return
+
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, 'a+') as f:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+                self._local.depth = 1
+                try:
+                    yield
+                finally:
+                    self._local.depth = 0
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def _process_start_time(pid: int) -> Optional[float]:
+    psutil = _psutil()
+    if psutil is None:
+        return None
+    try:
+        return psutil.Process(pid).create_time()
+    except psutil.Error:
+        return None
+
+
+def _reap(pid: int):
+    """如果是本进程的子进程且已退出，回收它（避免僵尸进程被当作仍在运行）"""
+    try:
+        os.waitpid(pid, os.WNOHANG)
+    except (AttributeError, OSError):
+        pass
+
+
+def process_alive(pid: int, started: Optional[float] = None) -> bool:
+    """进程是否仍在运行（started 用于排除 pid 被复用的情况）"""
+    _reap(pid)
+    psutil = _psutil()
+    if psutil is not None:
+        try:
+            process = psutil.Process(pid)
+            if process.status() == psutil.STATUS_ZOMBIE:
+                return False
+            return started is None or abs(process.create_time() - started) < 1.0
+        except psutil.Error:
+            return False
+
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _signal(pid: int, sig: int):
+    """向进程发送信号；进程是独立进程组的组长时（npx 会再派生 node 进程）发送给整组"""
+    try:
+        if hasattr(os, 'killpg') and os.getpgid(pid) == pid:
+            os.killpg(pid, sig)
+        else:
+            os.kill(pid, sig)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+class ServerRegistry:
+    """Hexo 预览服务器登记表（SQLite，多进程共享）"""
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS servers (
+                    port INTEGER PRIMARY KEY,
+                    pid INTEGER NOT NULL,
+                    started REAL,
+                    start_time TEXT NOT NULL
+                )
+            """)
+
+    @contextmanager
+    def _connect(self):
+        import sqlite3
+        conn = sqlite3.connect(str(self.db_path), timeout=30, isolation_level=None)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _row(row) -> Dict:
+        return {'port': row[0], 'pid': row[1], 'started': row[2], 'start_time': row[3]}
+
+    def _alive(self, conn, row) -> bool:
+        entry = self._row(row)
+        if process_alive(entry['pid'], entry['started']):
+            return True
+        conn.execute("DELETE FROM servers WHERE port = ?", (entry['port'],))
+        return False
+
+    def get(self, port: int) -> Optional[Dict]:
+        """返回仍在运行的服务器记录（已退出的记录会被清理）"""
+        with self._connect() as conn:
+            row = conn.execute("SELECT port, pid, started, start_time FROM servers WHERE port = ?",
+                               (port,)).fetchone()
+            if row and self._alive(conn, row):
+                return self._row(row)
+        return None
+
+    def list(self) -> List[Dict]:
+        with self._connect() as conn:
+            rows = conn.execute("SELECT port, pid, started, start_time FROM servers ORDER BY port").fetchall()
+            return [self._row(row) for row in rows if self._alive(conn, row)]
+
+    def start(self, port: int, launch) -> Optional[Dict]:
+        """在写锁内检查并启动服务器；端口已有运行中的服务器时返回 None
+
+        launch() 负责启动进程并返回 pid，整个过程持有数据库写锁，
+        多个 worker 同时请求同一端口时只会启动一个进程。
+        """
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute("SELECT port, pid, started, start_time FROM servers WHERE port = ?",
+                                   (port,)).fetchone()
+                if row and self._alive(conn, row):
+                    conn.execute("COMMIT")
+                    return None
+
+                pid = launch()
+                entry = {
+                    'port': port,
+                    'pid': pid,
+                    'started': _process_start_time(pid),
+                    'start_time': time.strftime('%Y-%m-%dT%H:%M:%S')
+                }
+                conn.execute("INSERT OR REPLACE INTO servers (port, pid, started, start_time) VALUES (?, ?, ?, ?)",
+                             (port, pid, entry['started'], entry['start_time']))
+                conn.execute("COMMIT")
+                return entry
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    def stop(self, port: int, timeout: float = 5.0) -> Optional[bool]:
+        """停止服务器；未登记返回 None，已退出返回 False，成功停止返回 True"""
+        with self._connect() as conn:
+            row = conn.execute("SELECT port, pid, started, start_time FROM servers WHERE port = ?",
+                               (port,)).fetchone()
+            if not row:
+                return None
+            conn.execute("DELETE FROM servers WHERE port = ?", (port,))
+
+        entry = self._row(row)
+        pid = entry['pid']
+        if not process_alive(pid, entry['started']):
+            return False
+
+        _signal(pid, signal.SIGTERM)
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if not process_alive(pid, entry['started']):
+                return True
+            time.sleep(0.1)
+
+        _signal(pid, getattr(signal, 'SIGKILL', signal.SIGTERM))
+        return True
+
+
+class SingleFlight:
+    """合并线程间对同一键的并发调用：进行中的调用结束后，所有等待者拿到同一个结果（或异常）"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict = {}
+
+    def do(self, key, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = {'event': threading.Event(), 'result': None, 'error': None}
+
+        if not leader:
+            call['event'].wait()
+        else:
+            try:
+                call['result'] = fn()
+            except BaseException as e:
+                call['error'] = e
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call['event'].set()
+
+        if call['error'] is not None:
+            raise call['error']
+        return call['result']
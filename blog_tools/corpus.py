@@ -0,0 +1,135 @@
+"""
+合成测试语料
+
+按固定随机种子生成一个最小的 Hexo 博客目录（source/_posts、_config.yml、public/images），
+用于基准测试。文章长度服从对数正态分布，正文混合中文与英文，
+包含站内链接、图片（部分缺失）以及多种 front matter 写法：
+行内列表、块列表、带引号的值、单个字符串标签、缺少日期、非法日期、重复标题。
+"""
+
+import random
+import datetime
+from pathlib import Path
+from typing import Dict, List
+
+CJK_WORDS = ['漏洞', '渗透', '测试', '网络', '安全', '配置', '教程', '服务器', '远程', '桌面',
+             '博客', '主题', '文件', '上传', '抓包', '工具', '分析', '靶场', '摄影', '迁移']
+LATIN_WORDS = ['cve', 'exploit', 'payload', 'request', 'server', 'config', 'network', 'upload',
+               'python', 'nextjs', 'hexo', 'docker', 'linux', 'shell', 'proxy', 'ipv6', 'token',
+               'router', 'kernel', 'vector']
+TAGS = ['CTF', '网络安全', '渗透', '抓包', '工具', '教程', 'IPv6', '博客', 'Next.js', '摄影',
+        'CVE', '文件上传漏洞', '春秋云镜', '远程桌面', 'RustDesk']
+CATEGORIES = ['CTF', '工具', '技术', '教程', '安全研究', '漏洞分析', '博客', '摄影']
+
+# 1x1 PNG
+_PNG = bytes.fromhex(
+    '89504e470d0a1a0a0000000d4948445200000001000000010806000000'
+    '1f15c4890000000d49444154789c6360000002000154a24f5d0000000049454e44ae426082'
+)
+
+
+def _sentence(rng: random.Random, cjk_ratio: float) -> str:
+    words = []
+    for _ in range(rng.randint(6, 16)):
+        if rng.random() < cjk_ratio:
+            words.append(rng.choice(CJK_WORDS))
+        else:
+            words.append(rng.choice(LATIN_WORDS))
+    if rng.random() < 0.05:
+        words.append(f"CVE-20{rng.randint(10, 25)}-{rng.randint(1000, 99999)}")
+    return ' '.join(words) + '。'
+
+
+def _front_matter(rng: random.Random, index: int, title: str, date: datetime.datetime) -> str:
+    tags = rng.sample(TAGS, rng.randint(0, 5))
+    categories = rng.sample(CATEGORIES, rng.randint(0, 3))
+    variant = index % 10
+    lines = ['---', f"title: {title}"]
+
+    if variant == 7:
+        pass  # 缺少日期
+    elif variant == 8:
+        lines.append("date: 2024-13-45 25:61:00")  # 非法日期
+    elif variant in (1, 4):
+        lines.append(f"date: {date.strftime('%Y-%m-%d')}")
+    else:
+        lines.append(f"date: {date.strftime('%Y-%m-%d %H:%M:%S')}")
+
+    if variant == 2 and tags:
+        lines.append("tags:")
+        lines.extend(f"  - {tag}" for tag in tags)
+    elif variant == 3 and tags:
+        lines.append(f"tags: {tags[0]}")
+    elif tags:
+        quoted = variant in (5, 6)
+        lines.append("tags: [" + ', '.join(f"'{t}'" if quoted else t for t in tags) + "]")
+
+    if categories:
+        lines.append("categories: [" + ', '.join(categories) + "]")
+    if variant == 6:
+        lines.append("cover: /images/cover.png")
+    lines.append("layout: post")
+    lines.append('---')
+    return '\n'.join(lines) + '\n'
+
+
+def generate_corpus(dest: Path, posts: int = 1000, seed: int = 42, mean_words: int = 600,
+                    cjk_ratio: float = 0.6, link_rate: float = 0.3, image_rate: float = 0.3,
+                    duplicate_rate: float = 0.02) -> Dict:
+    """生成语料，返回生成参数与统计"""
+    rng = random.Random(seed)
+    dest = Path(dest)
+    posts_dir = dest / "source" / "_posts"
+    images_dir = dest / "public" / "images"
+    posts_dir.mkdir(parents=True, exist_ok=True)
+    images_dir.mkdir(parents=True, exist_ok=True)
+
+    (dest / "_config.yml").write_text("title: Benchmark Blog\ntheme: glasses\n", encoding='utf-8')
+    (images_dir / "cover.png").write_bytes(_PNG)
+    for i in range(20):
+        (images_dir / f"img-{i}.png").write_bytes(_PNG)
+
+    about_dir = dest / "source" / "about"
+    about_dir.mkdir(parents=True, exist_ok=True)
+    (about_dir / "index.md").write_text("---\ntitle: About\ndate: 2025-01-01 00:00:00\nlayout: page\n---\n\nabout\n",
+                                        encoding='utf-8')
+
+    start = datetime.datetime(2018, 1, 1)
+    slugs: List[str] = []
+    total_bytes = 0
+    for index in range(posts):
+        slug = f"post-{index:06d}"
+        if slugs and rng.random() < duplicate_rate:
+            title = f"Post {rng.randrange(len(slugs))}"  # 重复标题
+        else:
+            title = f"Post {index}"
+        date = start + datetime.timedelta(minutes=rng.randrange(60 * 24 * 365 * 7))
+
+        words = max(20, int(rng.lognormvariate(0, 0.8) * mean_words))
+        paragraphs = []
+        written = 0
+        while written < words:
+            paragraph = ' '.join(_sentence(rng, cjk_ratio) for _ in range(rng.randint(2, 6)))
+            if slugs and rng.random() < link_rate:
+                paragraph += f" [相关文章](./{rng.choice(slugs)}.md)"
+            if rng.random() < image_rate:
+                # 约 1/10 的图片引用指向不存在的文件
+                name = f"img-{rng.randrange(22)}.png"
+                paragraph += f"\n\n![截图](/images/{name})"
+            if rng.random() < 0.1:
+                paragraph += "\n\n```bash\ncurl -X POST http://target/upload -F file=@shell.php\n```"
+            paragraphs.append(paragraph)
+            written += len(paragraph.split())
+
+        content = _front_matter(rng, index, title, date) + '\n' + '\n\n'.join(paragraphs) + '\n'
+        (posts_dir / f"{slug}.md").write_text(content, encoding='utf-8')
+        total_bytes += len(content.encode('utf-8'))
+        slugs.append(slug)
+
+    return {
+        'posts': posts,
+        'seed': seed,
+        'mean_words': mean_words,
+        'cjk_ratio': cjk_ratio,
+        'bytes': total_bytes
+    }
@@ -0,0 +1,215 @@
+"""
+文章创建
+
+create_post、Web 界面的 /create 与批量创建共用的创建逻辑（不会询问用户，可在脚本和 Web 进程中调用）：
+
+- 文件名: <日期>-<slug>.md，slug 由 text.slugify 生成（保留中文，去掉标点和路径分隔符），草稿加 draft- 前缀
+- front matter 与正文一次原子写入，索引直接用内存中的内容更新，不再读取文件
+- 重名检查使用索引维护的已占用文件名集合（文章 + 草稿，见 PostIndex.name_taken），每篇 O(1)，不遍历目录；
+  导入（importer.py）使用同一套 existing_names / unique_name
+- 批量清单: JSONL（每行一个对象）或 CSV（首行为列名），字段见 SPEC_FIELDS；
+  CSV 中的 tags/categories 用逗号分隔
+"""
+
+import os
+import csv
+import json
+import time
+import datetime
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from .fileutil import atomic_write_text
+from .text import slugify
+
+SPEC_FIELDS = ('title', 'tags', 'categories', 'layout', 'draft', 'date', 'slug', 'content')
+
+# 重名时的处理方式: 报错 / 加 -2、-3 后缀 / 跳过
+ON_CONFLICT = ('error', 'rename', 'skip')
+
+# 没有提供正文时使用的模板
+DEFAULT_BODY = "# {title}\n\n在这里开始写你的内容...\n\n<!-- more -->\n\n## 继续你的内容\n\n"
+
+# 批量创建时每批并行写入的文章数
+BATCH_SIZE = 500
+
+_DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+class TakenNames:
+    """已占用的文件名（不含 .md）：索引中的名字加上本次新分配的名字，不复制索引中的集合"""
+
+    def __init__(self, index):
+        self.index = index
+        self.added: Set[str] = set()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.added or self.index.name_taken(name)
+
+    def add(self, name: str):
+        self.added.add(name)
+
+
+def existing_names(writer) -> TakenNames:
+    """文章目录中已占用的文件名（先增量刷新索引，通常只检查目录 mtime）"""
+    writer.index.refresh()
+    return TakenNames(writer.index)
+
+
+def unique_name(base: str, taken: TakenNames) -> str:
+    """base 已被占用时依次尝试 base-2、base-3 ...，结果加入 taken"""
+    name, n = base, 1
+    while name in taken:
+        n += 1
+        name = f"{base}-{n}"
+    taken.add(name)
+    return name
+
+
+def _as_list(value) -> List[str]:
+    if value is None:
+        return []
+    if isinstance(value, str):
+        value = value.split(',')
+    return [str(item).strip() for item in value if str(item).strip()]
+
+
+def _as_bool(value) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() in ('true', 'yes', '1', 'y')
+    return bool(value)
+
+
+def normalize_spec(spec: Dict) -> Dict:
+    """清单中的一项 -> 创建参数（缺少标题时抛出 ValueError）"""
+    unknown = set(spec) - set(SPEC_FIELDS)
+    if unknown:
+        raise ValueError(f"未知字段: {', '.join(sorted(unknown))}")
+    title = ' '.join(str(spec.get('title') or '').split())
+    if not title:
+        raise ValueError("标题不能为空")
+    return {
+        'title': title,
+        'tags': _as_list(spec.get('tags')),
+        'categories': _as_list(spec.get('categories')),
+        'layout': str(spec.get('layout') or 'post').strip(),
+        'draft': _as_bool(spec.get('draft', False)),
+        'date': str(spec.get('date') or '').strip(),
+        'slug': str(spec.get('slug') or '').strip(),
+        'content': spec.get('content')
+    }
+
+
+def load_manifest(path: Path) -> Iterator[Dict]:
+    """逐项读取 JSONL 或 CSV 清单（按扩展名判断，.csv 以外都按 JSONL 解析）"""
+    path = Path(path)
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        if path.suffix.lower() == '.csv':
+            for row in csv.DictReader(f):
+                yield {key.strip(): value for key, value in row.items() if key and value not in (None, '')}
+            return
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                item = json.loads(line)
+            except ValueError as e:
+                raise ValueError(f"{path.name} 第 {line_number} 行不是有效的 JSON: {e}")
+            if not isinstance(item, dict):
+                raise ValueError(f"{path.name} 第 {line_number} 行应为 JSON 对象")
+            yield item
+
+
+class PostCreator:
+    """创建文章（单篇或批量）"""
+
+    def __init__(self, writer):
+        self.writer = writer
+
+    def _filename(self, spec: Dict, date: str, taken: TakenNames, on_conflict: str) -> Optional[str]:
+        """文件名（不含 .md）；on_conflict 为 skip 且重名时返回 None"""
+        slug = slugify(spec['slug']) or slugify(spec['title']) or 'post'
+        base = slug if spec['slug'] else f"{date[:10]}-{slug}"
+        if spec['draft']:
+            base = f"draft-{base}"
+        if base not in taken:
+            taken.add(base)
+            return base
+        if on_conflict == 'skip':
+            return None
+        if on_conflict == 'rename':
+            return unique_name(base, taken)
+        raise FileExistsError(f"文章已存在: {base}.md")
+
+    def render(self, spec: Dict, date: str) -> str:
+        """front matter + 正文"""
+        front_matter = self.writer._generate_front_matter(spec['title'], spec['tags'], spec['categories'],
+                                                          spec['layout'], date=date)
+        content = spec['content']
+        if content is None or not str(content).strip():
+            body = DEFAULT_BODY.format(title=spec['title'])
+        else:
+            body = str(content).replace('\r\n', '\n').strip('\n') + '\n'
+        return f"{front_matter}\n\n{body}"
+
+    def _prepare(self, spec: Dict, taken: TakenNames, on_conflict: str) -> Optional[Tuple[Path, str]]:
+        spec = normalize_spec(spec)
+        date = spec['date'] or datetime.datetime.now().strftime(_DATE_FORMAT)
+        name = self._filename(spec, date, taken, on_conflict)
+        if name is None:
+            return None
+        return self.writer.posts_dir / f"{name}.md", self.render(spec, date)
+
+    def create(self, spec: Dict, on_conflict: str = 'error') -> Path:
+        """创建一篇文章，返回文件路径"""
+        if on_conflict not in ON_CONFLICT:
+            raise ValueError(f"on_conflict 必须是 {', '.join(ON_CONFLICT)} 之一")
+        prepared = self._prepare(spec, existing_names(self.writer), on_conflict)
+        if prepared is None:
+            raise FileExistsError(f"文章已存在: {spec.get('title')}")
+        path, content = prepared
+        atomic_write_text(path, content)
+        self.writer.index.update_records([(path, self.writer._record_from_content(path, content))])
+        return path
+
+    def create_many(self, specs: Iterable[Dict], on_conflict: str = 'rename',
+                    workers: Optional[int] = None, batch_size: int = BATCH_SIZE) -> Dict:
+        """批量创建：按批并行写入，最后一次性更新索引
+
+        某一项无效（缺少标题、未知字段、on_conflict=error 时重名）会在写入任何文件前抛出 ValueError/FileExistsError，
+        并指出清单中的序号。
+        """
+        if on_conflict not in ON_CONFLICT:
+            raise ValueError(f"on_conflict 必须是 {', '.join(ON_CONFLICT)} 之一")
+        start = time.perf_counter()
+        taken = existing_names(self.writer)
+
+        prepared: List[Tuple[Path, str]] = []
+        skipped = 0
+        for number, spec in enumerate(specs, 1):
+            try:
+                item = self._prepare(spec, taken, on_conflict)
+            except (ValueError, FileExistsError) as e:
+                raise type(e)(f"第 {number} 项: {e}")
+            if item is None:
+                skipped += 1
+            else:
+                prepared.append(item)
+
+        workers = workers or min(8, (os.cpu_count() or 2) * 2)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for offset in range(0, len(prepared), batch_size):
+                list(pool.map(lambda item: atomic_write_text(*item), prepared[offset:offset + batch_size]))
+
+        record_for = self.writer._record_from_content
+        self.writer.index.update_records((path, record_for(path, content)) for path, content in prepared)
+
+        elapsed = time.perf_counter() - start
+        return {
+            'created': len(prepared),
+            'skipped': skipped,
+            'files': [str(path) for path, _ in prepared],
+            'elapsed': elapsed,
+            'posts_per_second': round(len(prepared) / elapsed, 1) if elapsed > 0 else None
+        }
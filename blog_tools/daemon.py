@@ -0,0 +1,230 @@
+"""
+常驻进程
+
+`blog_writer.py daemon start` 在后台启动一个常驻进程，持有已加载索引的 HexoBlogWriter，
+通过 Unix 域套接字（.blog_cache/daemon.sock）接收命令。命令行执行 list/search/debug validate
+时先尝试转发给常驻进程，没有常驻进程（或连接失败）时照常在本进程内执行。
+
+协议（每个连接一次请求）:
+
+    请求: {"protocol": 1, "argv": ["search", "关键词"]}\\n
+    响应: {"code": 0, "output": "..."}              # output 为命令的标准输出
+          {"retry": true}                          # 常驻进程的代码已过期，调用方应在本进程内执行
+
+- 空闲超过 idle_timeout 秒后常驻进程自动退出
+- 启动时若套接字文件已存在：能连上说明已有常驻进程在运行；连不上则是上次异常退出留下的，删除后重新绑定
+- 每次请求前检查 blog_writer.py 与 blog_tools/ 的修改时间，代码更新后常驻进程退出，避免执行旧代码
+"""
+
+import os
+import io
+import sys
+import json
+import time
+import socket
+import threading
+from contextlib import redirect_stdout
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+PROTOCOL_VERSION = 1
+
+# 空闲自动退出时间（秒）
+IDLE_TIMEOUT = 30 * 60
+
+# 客户端连接超时（秒）：常驻进程无响应时尽快回退到本进程执行
+CONNECT_TIMEOUT = 0.5
+
+# Unix 套接字路径长度上限（Linux 为 108 字节，含结尾的 \0）
+_MAX_SOCKET_PATH = 100
+
+# handler(argv) -> 退出码（标准输出由服务端收集）
+Handler = Callable[[List[str]], int]
+
+
+def socket_path(blog_path: Path) -> Path:
+    """博客对应的套接字路径（路径过长时放到临时目录）"""
+    path = Path(blog_path).resolve() / ".blog_cache" / "daemon.sock"
+    if len(str(path).encode('utf-8')) <= _MAX_SOCKET_PATH:
+        return path
+    import hashlib
+    import tempfile
+    digest = hashlib.sha1(str(path).encode('utf-8')).hexdigest()[:12]
+    return Path(tempfile.gettempdir()) / f"blog_writer-{digest}.sock"
+
+
+def _connect(path: Path, timeout: float = CONNECT_TIMEOUT) -> Optional[socket.socket]:
+    if not hasattr(socket, 'AF_UNIX') or not path.exists():
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(str(path))
+    except OSError:
+        sock.close()
+        return None
+    return sock
+
+
+def _recv_all(sock: socket.socket) -> bytes:
+    chunks = []
+    while True:
+        chunk = sock.recv(65536)
+        if not chunk:
+            return b''.join(chunks)
+        chunks.append(chunk)
+
+
+def request(path: Path, message: Dict, timeout: Optional[float] = None) -> Optional[Dict]:
+    """向常驻进程发送一次请求；没有常驻进程或通信失败时返回 None"""
+    sock = _connect(path)
+    if sock is None:
+        return None
+    try:
+        sock.settimeout(timeout)
+        sock.sendall(json.dumps(message, ensure_ascii=False).encode('utf-8') + b'\n')
+        sock.shutdown(socket.SHUT_WR)
+        return json.loads(_recv_all(sock).decode('utf-8'))
+    except (OSError, ValueError):
+        return None
+    finally:
+        sock.close()
+
+
+def forward(blog_path: Path, argv: List[str]) -> Optional[int]:
+    """把命令转发给常驻进程并输出结果，返回退出码；需要在本进程内执行时返回 None"""
+    response = request(socket_path(blog_path), {'protocol': PROTOCOL_VERSION, 'argv': argv})
+    if not response or 'code' not in response:
+        return None
+    sys.stdout.write(response.get('output', ''))
+    sys.stdout.flush()
+    return response['code']
+
+
+def is_running(blog_path: Path) -> bool:
+    response = request(socket_path(blog_path), {'protocol': PROTOCOL_VERSION, 'ping': True}, timeout=2)
+    return bool(response and response.get('pong'))
+
+
+def status(blog_path: Path) -> Optional[Dict]:
+    """常驻进程状态（pid、运行时间、请求数等），未运行时返回 None"""
+    response = request(socket_path(blog_path), {'protocol': PROTOCOL_VERSION, 'status': True}, timeout=2)
+    return response if response and 'pid' in response else None
+
+
+def stop(blog_path: Path) -> bool:
+    response = request(socket_path(blog_path), {'protocol': PROTOCOL_VERSION, 'stop': True}, timeout=5)
+    return bool(response and response.get('stopped'))
+
+
+def _code_signature(files: Iterable[Path]) -> Tuple:
+    signature = []
+    for path in files:
+        try:
+            stat = os.stat(path)
+            signature.append((str(path), stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            signature.append((str(path), None, None))
+    return tuple(signature)
+
+
+class DaemonServer:
+    """Unix 套接字上的命令服务（命令串行执行，标准输出被收集后返回给客户端）"""
+
+    def __init__(self, path: Path, handler: Handler, idle_timeout: float = IDLE_TIMEOUT,
+                 watch_files: Iterable[Path] = ()):
+        self.path = Path(path)
+        self.handler = handler
+        self.idle_timeout = idle_timeout
+        self.watch_files = list(watch_files)
+
+        self.started = time.time()
+        self.requests = 0
+        self._signature = _code_signature(self.watch_files)
+        self._last_active = time.monotonic()
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._sock: Optional[socket.socket] = None
+
+    def bind(self) -> bool:
+        """绑定套接字；已有常驻进程在运行时返回 False"""
+        if self.path.exists():
+            probe = _connect(self.path)
+            if probe is not None:
+                probe.close()
+                return False
+            # 上次异常退出留下的套接字文件
+            self.path.unlink()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.bind(str(self.path))
+        os.chmod(self.path, 0o600)
+        sock.listen(16)
+        sock.settimeout(1.0)
+        self._sock = sock
+        return True
+
+    def serve_forever(self):
+        try:
+            while not self._stopping.is_set():
+                try:
+                    conn, _ = self._sock.accept()
+                except socket.timeout:
+                    if time.monotonic() - self._last_active > self.idle_timeout:
+                        break
+                    continue
+                self._last_active = time.monotonic()
+                threading.Thread(target=self._serve_connection, args=(conn,), daemon=True).start()
+        finally:
+            self.close()
+
+    def close(self):
+        self._stopping.set()
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+            try:
+                self.path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def _serve_connection(self, conn: socket.socket):
+        with conn:
+            try:
+                conn.settimeout(10)
+                message = json.loads(_recv_all(conn).decode('utf-8'))
+                response = self._dispatch(message)
+                conn.sendall(json.dumps(response, ensure_ascii=False).encode('utf-8'))
+            except (OSError, ValueError):
+                pass
+            finally:
+                self._last_active = time.monotonic()
+
+    def _dispatch(self, message: Dict) -> Dict:
+        if message.get('protocol') != PROTOCOL_VERSION:
+            return {'retry': True}
+        if message.get('ping'):
+            return {'pong': True}
+        if message.get('status'):
+            return {'pid': os.getpid(), 'started': self.started, 'requests': self.requests,
+                    'idle_timeout': self.idle_timeout, 'socket': str(self.path)}
+        if message.get('stop'):
+            self._stopping.set()
+            return {'stopped': True}
+
+        if _code_signature(self.watch_files) != self._signature:
+            # 代码已更新：让客户端在本进程内执行，自己退出（下次启动时加载新代码）
+            self._stopping.set()
+            return {'retry': True}
+
+        argv = message.get('argv')
+        if not isinstance(argv, list) or not all(isinstance(arg, str) for arg in argv):
+            return {'retry': True}
+
+        with self._lock:
+            self.requests += 1
+            output = io.StringIO()
+            with redirect_stdout(output):
+                code = self.handler(argv)
+        return {'code': code, 'output': output.getvalue()}
@@ -0,0 +1,219 @@
+"""
+编辑器自动保存日志
+
+自动保存的内容不写入文章文件，而是追加到 .blog_cache/drafts/<文章ID>.journal（每行一条 JSON 记录），
+因此自动保存不会让 Git 工作区变脏，也不会触发文章索引刷新。显式保存文章后日志即被清除。
+
+记录格式（与 patching.py 的补丁格式相同）:
+
+    {"session": "...", "seq": 3, "base": "<文章文件哈希>", "ops": [...], "fields": {...}, "t": 1700000000.0}
+    {"session": "...", "seq": 5, "base": "...", "content": "<完整草稿>", "t": ...}     # 快照
+
+- 每个编辑会话内 seq 从 1 递增，每条记录是相对于上一条的修改；会话起点（seq 0）是文章文件本身，
+  或者恢复草稿时写入的快照；快照记录表示该 seq 时的完整草稿
+- 写入先缓存在内存中，由后台定时器批量追加到文件（多个 worker 各自追加，按 seq 排序还原）
+- 日志超过一定大小时压缩为一条快照加上尚未连续的记录
+- 恢复时只采用 base 与当前文章文件一致的最近一个会话，文章已被修改过的旧草稿会被忽略
+"""
+
+import os
+import json
+import time
+import atexit
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .coordination import InterProcessLock
+from .fileutil import atomic_write_text
+from .patching import PatchError, apply_patch, content_hash
+
+# 批量写入间隔（秒）
+FLUSH_INTERVAL = 2.0
+
+# 日志超过该大小（字节）时压缩
+COMPACT_BYTES = 64 * 1024
+
+
+def new_session_id() -> str:
+    return os.urandom(6).hex()
+
+
+class DraftJournal:
+    """自动保存日志（写入缓冲 + 定时批量追加 + 压缩 + 恢复）"""
+
+    def __init__(self, journal_dir: Path, source: Callable[[str], Optional[str]] = None,
+                 flush_interval: float = FLUSH_INTERVAL, compact_bytes: int = COMPACT_BYTES):
+        """source(post_id) 返回文章文件当前内容（压缩时作为会话起点）"""
+        self.journal_dir = Path(journal_dir)
+        self.source = source
+        self.flush_interval = flush_interval
+        self.compact_bytes = compact_bytes
+
+        self._pending: Dict[str, List[Dict]] = {}
+        self._lock = threading.Lock()
+        self._file_lock = InterProcessLock(self.journal_dir / "journal.lock")
+        self._timer: Optional[threading.Timer] = None
+        atexit.register(self.flush)
+
+    def _path(self, post_id: str) -> Path:
+        if Path(post_id).name != post_id or post_id.startswith('.'):
+            raise ValueError(f"无效的文章ID: {post_id}")
+        return self.journal_dir / f"{post_id}.journal"
+
+    # ------------------------------------------------------------------
+    # 写入
+    # ------------------------------------------------------------------
+
+    def append(self, post_id: str, session: str, seq: int, base: str,
+               ops: List[Dict] = None, fields: Dict = None):
+        """记录一次自动保存（只进入内存缓冲，由定时器批量写入）"""
+        self._path(post_id)
+        if not session or not isinstance(seq, int) or seq < 1:
+            raise ValueError("自动保存记录需要 session 与正整数 seq")
+        record = {'session': session, 'seq': seq, 'base': base,
+                  'ops': ops or [], 'fields': fields or {}, 't': time.time()}
+        with self._lock:
+            self._pending.setdefault(post_id, []).append(record)
+            self._schedule()
+
+    def _schedule(self):
+        if self._timer is None:
+            self._timer = threading.Timer(self.flush_interval, self._on_timer)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _on_timer(self):
+        with self._lock:
+            self._timer = None
+        try:
+            self.flush()
+        except Exception as e:
+            print(f"⚠️  写入自动保存日志失败: {e}")
+
+    def flush(self, post_id: Optional[str] = None):
+        """把缓冲的记录追加到日志文件（每篇文章一次写入）"""
+        with self._lock:
+            if post_id is None:
+                batches, self._pending = self._pending, {}
+            else:
+                batches = {post_id: self._pending.pop(post_id, [])}
+
+        for pid, records in batches.items():
+            if not records:
+                continue
+            path = self._path(pid)
+            data = ''.join(json.dumps(record, ensure_ascii=False) + '\n' for record in records)
+            with self._file_lock():
+                path.parent.mkdir(parents=True, exist_ok=True)
+                with open(path, 'a', encoding='utf-8') as f:
+                    f.write(data)
+                    f.flush()
+                    os.fsync(f.fileno())
+                if path.stat().st_size > self.compact_bytes:
+                    self._compact(pid)
+
+    def snapshot(self, post_id: str, base: str, content: str) -> str:
+        """以恢复出的草稿开始一个新会话，返回会话ID（旧记录一并压缩掉）"""
+        session = new_session_id()
+        record = {'session': session, 'seq': 0, 'base': base, 'content': content, 't': time.time()}
+        with self._file_lock():
+            atomic_write_text(self._path(post_id), json.dumps(record, ensure_ascii=False) + '\n')
+        return session
+
+    def discard(self, post_id: str):
+        """文章已显式保存：丢弃缓冲和日志"""
+        with self._lock:
+            self._pending.pop(post_id, None)
+        with self._file_lock():
+            try:
+                self._path(post_id).unlink()
+            except FileNotFoundError:
+                pass
+
+    # ------------------------------------------------------------------
+    # 读取 / 恢复 / 压缩
+    # ------------------------------------------------------------------
+
+    def _read(self, post_id: str) -> List[Dict]:
+        records = []
+        try:
+            with open(self._path(post_id), 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        records.append(json.loads(line))
+                    except ValueError:
+                        # 崩溃时最后一行可能只写了一半
+                        continue
+        except FileNotFoundError:
+            pass
+        return records
+
+    @staticmethod
+    def _latest_session(records: List[Dict], base: Optional[str] = None) -> List[Dict]:
+        """最近一个（base 匹配的）会话的记录，按 seq 排序"""
+        latest, latest_time = None, -1.0
+        for record in records:
+            if base is not None and record.get('base') != base:
+                continue
+            if record.get('t', 0) >= latest_time:
+                latest, latest_time = record.get('session'), record.get('t', 0)
+        if latest is None:
+            return []
+        # 同一 seq 的快照排在修改记录之前
+        return sorted((r for r in records if r.get('session') == latest),
+                      key=lambda r: (r['seq'], 'content' not in r))
+
+    @staticmethod
+    def _replay(records: List[Dict], content: Optional[str]) -> Tuple[Optional[str], int]:
+        """从会话起点依次应用连续的记录，返回 (草稿内容, 最后应用的 seq)"""
+        seq = 0
+        # 从最后一个快照开始（记录已按 seq 排序）
+        snapshots = [i for i, record in enumerate(records) if 'content' in record]
+        if snapshots:
+            content, seq = records[snapshots[-1]]['content'], records[snapshots[-1]]['seq']
+            records = records[snapshots[-1] + 1:]
+
+        for record in records:
+            if record['seq'] <= seq:
+                continue
+            if record['seq'] != seq + 1 or content is None:
+                break
+            try:
+                content, _ = apply_patch(content, record.get('ops'), record.get('fields'))
+            except PatchError:
+                break
+            seq = record['seq']
+        return content, seq
+
+    def recover(self, post_id: str, base: str, published: str) -> Optional[str]:
+        """恢复基于当前文章文件（哈希为 base）的草稿；没有或与文件内容相同时返回 None"""
+        self.flush(post_id)
+        records = self._latest_session(self._read(post_id), base)
+        if not records:
+            return None
+        content, _ = self._replay(records, published)
+        return content if content != published else None
+
+    def _compact(self, post_id: str):
+        """压缩为一条快照 + 尚不连续的记录（调用方持有文件锁）"""
+        records = self._read(post_id)
+        session = self._latest_session(records)
+        if not session:
+            return
+        base = session[0]['base']
+        published = self.source(post_id) if self.source else None
+        if published is not None and content_hash(published) != base:
+            # 文章文件已被修改，日志中的草稿都已失效
+            self._path(post_id).unlink()
+            return
+        if published is None and not any('content' in r for r in session):
+            # 会话起点是文章文件本身，读不到文件时无法压缩
+            return
+
+        content, seq = self._replay(session, published)
+        head = {'session': session[0]['session'], 'seq': seq, 'base': base,
+                'content': content, 't': max(r.get('t', 0) for r in session)}
+        rest = [r for r in session if r['seq'] > seq]
+        atomic_write_text(self._path(post_id),
+                          ''.join(json.dumps(r, ensure_ascii=False) + '\n' for r in [head] + rest))
@@ -0,0 +1,213 @@
+"""
+近似重复文章检测
+
+转载、改写的文章标题往往不同，validate_posts 的重复标题检查发现不了。这里用 MinHash + LSH：
+
+- 分片（shingle）: 正文纯文本去掉空白后每 SHINGLE_SIZE 个连续字符为一个分片（中英文通用），
+  用多项式哈希映射为 32 位整数
+- MinHash 签名: NUM_PERM 个随机掩码，签名第 i 位为 min(分片哈希 ^ 掩码 i)；两篇文章签名相同位置
+  相等的比例是其分片集合 Jaccard 相似度的估计。安装了 numpy 时整篇文章一次向量化计算
+- LSH: 签名切成 BANDS 段，任意一段完全相同的文章才成为候选对，避免两两比较；
+  候选对按签名估计相似度过滤，超过阈值的用并查集合并成簇
+- 签名按文章 mtime/size 缓存在 .blog_cache/duplicates.json，只为新增或修改的文章重新计算
+"""
+
+import re
+import json
+import random
+import time
+from itertools import combinations
+from operator import itemgetter
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .export import dump_json, write_if_changed
+from .text import plain_text
+
+try:
+    import numpy
+except ImportError:  # 可选依赖
+    numpy = None
+
+DUPLICATES_VERSION = 1
+
+SHINGLE_SIZE = 5
+
+# 签名长度 = BANDS × ROWS；候选对的相似度拐点约为 (1 / BANDS) ** (1 / ROWS) ≈ 0.5
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+
+DEFAULT_THRESHOLD = 0.8
+
+# 单个 LSH 桶超过该大小时不展开两两比较（通常是空文章或模板文章）
+MAX_BUCKET = 200
+
+# 固定种子：签名写入缓存，多次运行必须使用同一组掩码
+_MASKS = random.Random(0x5EED).sample(range(1, 1 << 32), NUM_PERM)
+_EMPTY = (1 << 32) - 1
+
+
+_SPACE_RE = re.compile(r'\s+')
+
+_MASK32 = (1 << 32) - 1
+_BASE = 1000003
+_MIX = 0x9E3779B1
+
+
+def shingles(text: str) -> Sequence[int]:
+    """文本 -> 分片哈希（安装了 numpy 时返回未去重的数组；两种实现得到的签名相同）"""
+    text = _SPACE_RE.sub('', text.lower())
+    count = len(text) - SHINGLE_SIZE + 1
+    if count < 1:
+        return []
+    if numpy is not None:
+        codes = numpy.frombuffer(text.encode('utf-32-le'), dtype=numpy.uint32)
+        hashes = numpy.zeros(count, dtype=numpy.uint32)
+        for j in range(SHINGLE_SIZE):
+            hashes = hashes * numpy.uint32(_BASE) + codes[j:j + count]
+        hashes = hashes * numpy.uint32(_MIX)
+        hashes ^= hashes >> numpy.uint32(16)
+        return hashes
+
+    codes = list(map(ord, text))
+    hashes = [0] * count
+    for j in range(SHINGLE_SIZE):
+        hashes = [(h * _BASE + c) & _MASK32 for h, c in zip(hashes, codes[j:j + count])]
+    hashes = [(h * _MIX) & _MASK32 for h in hashes]
+    return sorted({h ^ (h >> 16) for h in hashes})
+
+
+def minhash(hashes: Sequence[int]) -> List[int]:
+    """分片哈希 -> MinHash 签名（NUM_PERM 个整数）"""
+    if len(hashes) == 0:
+        return [_EMPTY] * NUM_PERM
+    if numpy is not None:
+        values = numpy.asarray(hashes, dtype=numpy.uint32)
+        masks = numpy.asarray(_MASKS, dtype=numpy.uint32)
+        return (values[:, None] ^ masks[None, :]).min(axis=0).tolist()
+    return [min(map(mask.__xor__, hashes)) for mask in _MASKS]
+
+
+def similarity(a: List[int], b: List[int]) -> float:
+    """两个签名估计的 Jaccard 相似度"""
+    return sum(1 for x, y in zip(a, b) if x == y) / NUM_PERM
+
+
+class DuplicateDetector:
+    """近似重复文章检测（签名缓存在 .blog_cache/duplicates.json）"""
+
+    def __init__(self, writer):
+        self.writer = writer
+        self.cache_file = writer.cache_dir / "duplicates.json"
+        self._cache: Optional[Dict] = None
+
+    def _load_cache(self) -> Dict:
+        if self._cache is None:
+            try:
+                with open(self.cache_file, 'r', encoding='utf-8') as f:
+                    cache = json.load(f)
+                if cache.get('version') != DUPLICATES_VERSION or cache.get('perm') != NUM_PERM:
+                    raise ValueError
+            except (OSError, ValueError):
+                cache = {'version': DUPLICATES_VERSION, 'perm': NUM_PERM, 'posts': {}}
+            self._cache = cache
+        return self._cache
+
+    def _signature(self, record: Dict) -> List[int]:
+        with open(record['path'], 'r', encoding='utf-8') as f:
+            content = f.read()
+        return minhash(shingles(plain_text(self.writer._split_front_matter(content)[1])))
+
+    def update(self) -> Tuple[Dict[str, List[int]], int]:
+        """更新签名缓存，返回 (文章ID -> 签名, 重新计算的文章数)"""
+        index = self.writer.index
+        index.refresh()
+        cache = self._load_cache()
+        cached_posts = cache['posts']
+
+        live = set(index.post_ids())
+        dirty = False
+        for post_id in [post_id for post_id in cached_posts if post_id not in live]:
+            del cached_posts[post_id]
+            dirty = True
+
+        computed = 0
+        for record in index.all_posts():
+            post_id = record['id']
+            signature = list(index.stat.get(post_id, ()))
+            entry = cached_posts.get(post_id)
+            if not entry or entry['stat'] != signature:
+                cached_posts[post_id] = {'stat': signature, 'minhash': self._signature(record)}
+                computed += 1
+
+        if computed or dirty:
+            write_if_changed(self.cache_file, dump_json(cache))
+        return {post_id: entry['minhash'] for post_id, entry in cached_posts.items()}, computed
+
+    @staticmethod
+    def candidate_pairs(signatures: Dict[str, List[int]]) -> set:
+        """LSH 分段：任意一段签名完全相同的文章对"""
+        pairs = set()
+        for band in range(BANDS):
+            start = band * ROWS
+            buckets: Dict[tuple, List[str]] = {}
+            for post_id, signature in signatures.items():
+                key = tuple(signature[start:start + ROWS])
+                if key[0] == _EMPTY:
+                    continue
+                buckets.setdefault(key, []).append(post_id)
+            for members in buckets.values():
+                if 1 < len(members) <= MAX_BUCKET:
+                    pairs.update(combinations(sorted(members), 2))
+        return pairs
+
+    def find(self, threshold: float = DEFAULT_THRESHOLD) -> Dict:
+        """相似度不低于 threshold 的文章簇"""
+        if not 0 < threshold <= 1:
+            raise ValueError("相似度阈值必须在 0 到 1 之间")
+        start = time.perf_counter()
+        signatures, computed = self.update()
+        candidates = self.candidate_pairs(signatures)
+
+        parent: Dict[str, str] = {}
+
+        def root(post_id: str) -> str:
+            while parent.get(post_id, post_id) != post_id:
+                post_id = parent[post_id]
+            return post_id
+
+        pairs = []
+        for a, b in candidates:
+            score = similarity(signatures[a], signatures[b])
+            if score >= threshold:
+                pairs.append((a, b, score))
+                ra, rb = root(a), root(b)
+                if ra != rb:
+                    parent[max(ra, rb)] = min(ra, rb)
+
+        groups: Dict[str, Dict] = {}
+        for a, b, score in pairs:
+            group = groups.setdefault(root(a), {'posts': set(), 'pairs': []})
+            group['posts'].update((a, b))
+            group['pairs'].append([a, b, score])
+
+        index = self.writer.index
+        clusters = []
+        for group in groups.values():
+            group['pairs'].sort(key=itemgetter(2), reverse=True)
+            clusters.append({
+                'posts': [{'id': post_id, 'title': (index.get(post_id) or {}).get('title', post_id)}
+                          for post_id in sorted(group['posts'])],
+                'max_similarity': group['pairs'][0][2],
+                'pairs': group['pairs']
+            })
+        clusters.sort(key=lambda cluster: (-cluster['max_similarity'], cluster['posts'][0]['id']))
+
+        return {
+            'clusters': clusters,
+            'posts': len(signatures),
+            'computed': computed,
+            'candidates': len(candidates),
+            'threshold': threshold,
+            'elapsed': time.perf_counter() - start
+        }
@@ -0,0 +1,351 @@
+"""
+前端数据导出
+
+从文章索引生成 Next.js 前端使用的 JSON 数据包（npm run build 通过 npm run export-data 调用）：
+
+    public/data/v1/
+    ├── manifest.json                 # 入口文件（固定文件名，记录其余文件名）
+    ├── pages/page-1.<hash>.json      # 分页文章列表（不含正文）
+    ├── posts/<slug>.<hash>.json      # 单篇文章完整数据（含 related 相关文章）
+    ├── taxonomy.<hash>.json          # 标签/分类聚合索引
+    └── search/search-0.<hash>.json   # 搜索数据分片
+
+除 manifest.json 外的文件名都带内容哈希，内容不变时文件名不变，前端可以长期缓存。
+文章未变化（mtime/size 与上次导出一致，相关文章也未变化）时不会重新读取和序列化。
+
+字段来自文章索引，front matter 由 HexoBlogWriter._parse_front_matter 解析（与其他命令相同）。
+它只支持单行的 "key: value"、[a, b] 与 "- item" 列表和加引号的字符串；YAML 的多行字符串（| 与 >）、
+嵌套对象等写法与 gray-matter 的结果不同，front matter 中需要这些写法的字段不会正确导出。
+date/updated 与原来的 gray-matter 输出一致，转换为 UTC 的 ISO 8601 时间（2024-05-01T10:00:00.000Z）。
+"""
+
+import re
+import json
+import hashlib
+import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .fileutil import atomic_write_bytes
+from .text import plain_text
+
+EXPORT_VERSION = 1
+
+# 站点信息（index.json 与 feeds.py 的 sitemap/订阅源共用）
+SITE_URL = 'https://jimmy.wiki'
+SITE_TITLE = "MyKi's Blog"
+SITE_DESCRIPTION = 'Tech notes, coding experiences, and life thoughts'
+SITE_AUTHOR = 'Jimmy Ki'
+
+# 搜索分片中每篇文章保留的正文长度
+SEARCH_TEXT_LIMIT = 2000
+
+# 搜索分片大小（文章数）
+SEARCH_SHARD_SIZE = 200
+
+
+_DATE_RE = re.compile(r'^(\d{4})-(\d{1,2})-(\d{1,2})(?:[ T](\d{1,2}):(\d{2})(?::(\d{2}))?)?')
+
+
+def parse_date(value: str) -> Optional[datetime.datetime]:
+    """解析 front matter 日期（2025-03-23 / 2025-03-23 12:00:00 / 2025-12-22T12:15）"""
+    match = _DATE_RE.match(str(value or '').strip())
+    if not match:
+        return None
+    parts = [int(p) if p else 0 for p in match.groups()]
+    try:
+        return datetime.datetime(*parts, tzinfo=datetime.timezone.utc)
+    except ValueError:
+        return None
+
+
+def iso_date(value) -> str:
+    """front matter 日期 -> ISO 8601（与 js-yaml 把不带时区的时间当作 UTC 一致），无法解析时原样返回"""
+    date = parse_date(value)
+    if date is None:
+        return str(value or '')
+    return date.strftime('%Y-%m-%dT%H:%M:%S.000Z')
+
+
+def content_hash(data: bytes, length: int = 10) -> str:
+    """内容哈希（用于文件名）"""
+    return hashlib.sha256(data).hexdigest()[:length]
+
+
+def dump_json(data, pretty: bool = False) -> bytes:
+    if pretty:
+        return json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'), sort_keys=True).encode('utf-8')
+
+
+def write_if_changed(path: Path, data: bytes) -> bool:
+    """内容不同才写入，保持未变化文件的 mtime"""
+    try:
+        if path.stat().st_size == len(data) and path.read_bytes() == data:
+            return False
+    except FileNotFoundError:
+        pass
+    atomic_write_bytes(path, data)
+    return True
+
+
+class DataExporter:
+    """导出前端 JSON 数据包"""
+
+    def __init__(self, writer, output_dir: Optional[Path] = None, page_size: int = 20,
+                 legacy: bool = True, related: bool = True):
+        self.writer = writer
+        self.data_dir = Path(output_dir) if output_dir else writer.blog_path / "public" / "data"
+        self.bundle_dir = self.data_dir / f"v{EXPORT_VERSION}"
+        self.manifest_file = self.bundle_dir / "manifest.json"
+        self.search_cache_file = writer.cache_dir / "export_search.json"
+        self.page_size = max(1, page_size)
+        self.legacy = legacy
+        self.related = related
+
+        self.written = 0
+        self.reused = 0
+
+    # ------------------------------------------------------------------
+    # 数据构建
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def summary(record: Dict) -> Dict:
+        """列表用的文章摘要（字段与 app/components/types.ts 中的 Post 一致）"""
+        post_id = record['id']
+        return {
+            'id': post_id,
+            'slug': post_id,
+            'title': record.get('title', post_id),
+            'date': iso_date(record.get('date', '')),
+            'updated': iso_date(record.get('updated') or record.get('date', '')),
+            'categories': record.get('categories', []),
+            'tags': record.get('tags', []),
+            'layout': record.get('layout', 'post'),
+            'excerpt': record.get('excerpt', ''),
+            'author': record.get('author') or SITE_AUTHOR,
+            'path': f"/{post_id}/",
+            'coverImage': record.get('cover') or None,
+            'sticky': bool(record.get('sticky'))
+        }
+
+    def _read_body(self, record: Dict) -> str:
+        with open(record['path'], 'r', encoding='utf-8') as f:
+            content = f.read()
+        return self.writer._split_front_matter(content)[1]
+
+    def _emit(self, relative: str, data: bytes) -> str:
+        """写入带哈希的文件，返回相对 bundle 目录的文件名"""
+        stem, suffix = relative.rsplit('.', 1)
+        name = f"{stem}.{content_hash(data)}.{suffix}"
+        path = self.bundle_dir / name
+        if path.exists():
+            self.reused += 1
+        else:
+            atomic_write_bytes(path, data)
+            self.written += 1
+        return name
+
+    def _load_manifest(self) -> Dict:
+        try:
+            with open(self.manifest_file, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            if manifest.get('version') == EXPORT_VERSION:
+                return manifest
+        except (OSError, ValueError):
+            pass
+        return {}
+
+    def _load_search_cache(self) -> Dict:
+        try:
+            with open(self.search_cache_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_search_cache(self, cache: Dict):
+        write_if_changed(self.search_cache_file, dump_json(cache))
+
+    @staticmethod
+    def _ordered(records: List[Dict]) -> List[Dict]:
+        """置顶文章优先，其余按日期倒序"""
+        records = sorted(records, key=lambda r: str(r.get('date', '')), reverse=True)
+        records.sort(key=lambda r: not r.get('sticky'))
+        return records
+
+    # ------------------------------------------------------------------
+    # 导出
+    # ------------------------------------------------------------------
+
+    def export(self) -> Dict:
+        index = self.writer.index
+        index.refresh(force=True)
+        records = self._ordered(index.all_posts())
+        previous = self._load_manifest().get('posts', {})
+
+        related = {}
+        if self.related:
+            from .related import RelatedPosts
+            engine = RelatedPosts(self.writer)
+            engine.build()
+            related = {record['id']: engine.get(record['id']) for record in records}
+
+        # 1. 单篇文章（未变化的直接沿用上次的文件）
+        post_files = {}
+        bodies = {}
+        for record in records:
+            post_id = record['id']
+            signature = list(index.stat.get(post_id, ()))
+            related_hash = content_hash(dump_json(related.get(post_id, [])))
+            prev = previous.get(post_id)
+            if (prev and prev.get('stat') == signature and prev.get('related') == related_hash
+                    and (self.bundle_dir / prev['file']).exists()):
+                post_files[post_id] = prev
+                self.reused += 1
+                continue
+
+            body = self._read_body(record)
+            bodies[post_id] = body
+            post = dict(self.summary(record), content=body, related=related.get(post_id, []))
+            post_files[post_id] = {
+                'file': self._emit(f"posts/{post_id}.json", dump_json(post)),
+                'stat': signature,
+                'related': related_hash
+            }
+
+        # 2. 分页文章列表
+        summaries = [self.summary(record) for record in records]
+        pages = []
+        for start in range(0, len(summaries), self.page_size):
+            page_number = start // self.page_size + 1
+            page = {
+                'page': page_number,
+                'posts': summaries[start:start + self.page_size]
+            }
+            pages.append(self._emit(f"pages/page-{page_number}.json", dump_json(page)))
+
+        # 3. 标签/分类
+        taxonomy_file = self._emit("taxonomy.json", dump_json(index.taxonomy()))
+
+        # 4. 搜索数据分片（标题/标签/正文纯文本，按文章缓存）
+        search_cache = self._load_search_cache()
+        search_files = []
+        for start in range(0, len(records), SEARCH_SHARD_SIZE):
+            entries = []
+            for record in records[start:start + SEARCH_SHARD_SIZE]:
+                post_id = record['id']
+                signature = list(index.stat.get(post_id, ()))
+                cached = search_cache.get(post_id)
+                if not cached or cached['stat'] != signature:
+                    body = bodies.get(post_id)
+                    if body is None:
+                        body = self._read_body(record)
+                    cached = {'stat': signature, 'text': plain_text(body)[:SEARCH_TEXT_LIMIT]}
+                    search_cache[post_id] = cached
+                entries.append([post_id, record.get('title', post_id), record.get('tags', []), cached['text']])
+            shard = start // SEARCH_SHARD_SIZE
+            search_files.append(self._emit(f"search/search-{shard}.json",
+                                           dump_json({'fields': ['id', 'title', 'tags', 'text'],
+                                                      'entries': entries})))
+
+        manifest = {
+            'version': EXPORT_VERSION,
+            'generated': datetime.datetime.now().isoformat(),
+            'postsCount': len(records),
+            'pageSize': self.page_size,
+            'pages': pages,
+            'posts': post_files,
+            'taxonomy': taxonomy_file,
+            'search': search_files
+        }
+        atomic_write_bytes(self.manifest_file, dump_json(manifest, pretty=True))
+        self._save_search_cache({post_id: search_cache[post_id] for post_id in post_files})
+
+        removed = self._collect_garbage(manifest)
+
+        if self.legacy:
+            self._export_legacy(records, summaries, bodies, post_files, related)
+
+        return {
+            'manifest': str(self.manifest_file),
+            'posts': len(records),
+            'written': self.written,
+            'reused': self.reused,
+            'removed': removed,
+            'related': sum(1 for items in related.values() if items) if self.related else None
+        }
+
+    def _collect_garbage(self, manifest: Dict) -> int:
+        """删除不再被 manifest 引用的旧文件"""
+        referenced = set(manifest['pages']) | set(manifest['search'])
+        referenced.add(manifest['taxonomy'])
+        referenced.update(entry['file'] for entry in manifest['posts'].values())
+
+        removed = 0
+        for sub in ('pages', 'posts', 'search'):
+            directory = self.bundle_dir / sub
+            if not directory.exists():
+                continue
+            for path in directory.glob('*.json'):
+                if f"{sub}/{path.name}" not in referenced:
+                    path.unlink()
+                    removed += 1
+        for path in self.bundle_dir.glob('taxonomy.*.json'):
+            if path.name not in referenced:
+                path.unlink()
+                removed += 1
+        return removed
+
+    def _cached_body(self, entry: Dict) -> Optional[str]:
+        """本次导出沿用的 v1 文章文件中的正文（manifest 按 mtime/size 确认过与文章文件一致）"""
+        try:
+            with open(self.bundle_dir / entry['file'], 'r', encoding='utf-8') as f:
+                return json.load(f).get('content')
+        except (OSError, ValueError):
+            return None
+
+    def _export_legacy(self, records: List[Dict], summaries: List[Dict], bodies: Dict[str, str],
+                       post_files: Dict[str, Dict], related: Dict[str, List[Dict]]):
+        """兼容现有页面：public/data/index.json 与 public/data/posts/<slug>.json"""
+        legacy_dir = self.data_dir / "posts"
+        legacy_posts = []
+        for record, summary in zip(records, summaries):
+            post_id = record['id']
+            body = bodies.get(post_id)
+            if body is None:
+                body = self._cached_body(post_files[post_id])
+            if body is None:
+                body = self._read_body(record)
+
+            post = dict(summary, content=body)
+            legacy_posts.append(post)
+            write_if_changed(legacy_dir / f"{post_id}.json",
+                             dump_json(dict(post, related=related.get(post_id, [])), pretty=True))
+
+        # 删除已删除文章的旧文件，避免仍可访问
+        exported = {f"{record['id']}.json" for record in records}
+        if legacy_dir.exists():
+            for path in legacy_dir.glob('*.json'):
+                if path.name not in exported:
+                    path.unlink()
+
+        tag_counts = self.writer.index.tag_counts()
+        category_counts = self.writer.index.category_counts()
+        blog_data = {
+            'posts': legacy_posts,
+            'categories': [{'name': name, 'count': count} for name, count in category_counts.items()],
+            'tags': [{'name': name, 'count': count} for name, count in tag_counts.items()],
+            'site': {
+                'title': SITE_TITLE,
+                'description': SITE_DESCRIPTION,
+                'author': SITE_AUTHOR,
+                'url': SITE_URL,
+                'postsCount': len(legacy_posts),
+                'categoriesCount': len(category_counts),
+                'tagsCount': len(tag_counts)
+            },
+            'lastUpdated': datetime.datetime.now().isoformat()
+        }
+        atomic_write_bytes(self.data_dir / "index.json", dump_json(blog_data, pretty=True))
+
@@ -0,0 +1,315 @@
+"""
+站点地图与订阅源
+
+从文章索引增量生成 public/ 下的 sitemap.xml、rss.xml 与 atom.xml：
+- 逐条流式写入临时文件后原子替换，不在内存中拼接整个文件
+- URL 超过 50000 条时拆分为 sitemap-N.xml，并由 sitemap.xml 作为索引文件
+- 记录每个分片/订阅源的指纹（文章ID + 日期），未变化时跳过重新生成
+- lastmod 取自索引中的 updated/date 字段
+"""
+
+import json
+import hashlib
+import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from xml.sax.saxutils import escape
+
+from .export import SITE_AUTHOR, SITE_DESCRIPTION, SITE_TITLE, SITE_URL, dump_json, parse_date, write_if_changed
+from .text import plain_text
+
+# 单个 sitemap 文件的 URL 上限（sitemaps.org 协议规定）
+SITEMAP_MAX_URLS = 50000
+
+# 订阅源中的文章数
+FEED_LIMIT = 20
+
+STATIC_PAGES = ['/about', '/contact', '/categories', '/tags', '/tools']
+
+# (loc, lastmod, changefreq, priority)
+SitemapEntry = Tuple[str, Optional[str], str, str]
+
+
+def is_published(record: Dict) -> bool:
+    return str(record.get('published', True)).lower() not in ('false', 'no', '0')
+
+
+class _StreamWriter:
+    """流式写入临时文件，完成后原子替换"""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.tmp_path = path.with_name(f".{path.name}.tmp")
+
+    def __enter__(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.file = open(self.tmp_path, 'w', encoding='utf-8')
+        return self.file
+
+    def __exit__(self, exc_type, exc, tb):
+        self.file.close()
+        if exc_type is None:
+            self.tmp_path.replace(self.path)
+        else:
+            self.tmp_path.unlink(missing_ok=True)
+        return False
+
+
+class FeedBuilder:
+    """增量生成 sitemap 与 RSS/Atom"""
+
+    def __init__(self, writer, output_dir: Optional[Path] = None, site_url: str = SITE_URL,
+                 max_urls: int = SITEMAP_MAX_URLS, feed_limit: int = FEED_LIMIT):
+        self.writer = writer
+        self.output_dir = Path(output_dir) if output_dir else writer.blog_path / "public"
+        self.site_url = site_url.rstrip('/')
+        self.max_urls = max(1, min(max_urls, SITEMAP_MAX_URLS))
+        self.feed_limit = feed_limit
+        self.state_file = writer.cache_dir / "feeds.json"
+
+    # ------------------------------------------------------------------
+    # 状态
+    # ------------------------------------------------------------------
+
+    def _load_state(self) -> Dict:
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            if state.get('output_dir') == str(self.output_dir) and state.get('site_url') == self.site_url:
+                return state
+        except (OSError, ValueError):
+            pass
+        return {'output_dir': str(self.output_dir), 'site_url': self.site_url, 'fingerprints': {}}
+
+    def _unchanged(self, state: Dict, name: str, fingerprint: str) -> bool:
+        return state['fingerprints'].get(name) == fingerprint and (self.output_dir / name).exists()
+
+    @staticmethod
+    def _fingerprint(items: Iterable) -> str:
+        digest = hashlib.sha256()
+        for item in items:
+            digest.update(json.dumps(item, ensure_ascii=False, sort_keys=True).encode('utf-8'))
+            digest.update(b'\n')
+        return digest.hexdigest()
+
+    # ------------------------------------------------------------------
+    # Sitemap
+    # ------------------------------------------------------------------
+
+    def _tool_pages(self) -> List[str]:
+        tools_dir = self.writer.blog_path / "app" / "tools"
+        if not tools_dir.exists():
+            return []
+        return sorted(f"/tools/{item.name}" for item in tools_dir.iterdir()
+                      if (item / "page.tsx").exists())
+
+    @staticmethod
+    def _lastmod(record: Dict) -> Optional[str]:
+        date = parse_date(record.get('updated') or record.get('date', ''))
+        if not date or date.year <= 1970:
+            return None
+        return date.strftime('%Y-%m-%d')
+
+    def _entries(self, records: List[Dict]) -> Iterator[SitemapEntry]:
+        latest = max((self._lastmod(r) or '' for r in records), default='') or None
+
+        yield (self.site_url + '/', latest, 'daily', '1.0')
+        for path in STATIC_PAGES:
+            yield (self.site_url + path + '/', latest, 'weekly', '0.6')
+        for path in self._tool_pages():
+            yield (self.site_url + path + '/', None, 'weekly', '0.5')
+
+        for record in records:
+            priority = '0.9' if record.get('sticky') else '0.8'
+            yield (f"{self.site_url}/{record['id']}/", self._lastmod(record), 'monthly', priority)
+
+    def _chunks(self, entries: Iterator[SitemapEntry]) -> Iterator[List[SitemapEntry]]:
+        chunk: List[SitemapEntry] = []
+        for entry in entries:
+            chunk.append(entry)
+            if len(chunk) >= self.max_urls:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    @staticmethod
+    def _write_urlset(path: Path, entries: List[SitemapEntry]):
+        with _StreamWriter(path) as f:
+            f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+            f.write('<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n')
+            for loc, lastmod, changefreq, priority in entries:
+                f.write(f"  <url>\n    <loc>{escape(loc)}</loc>\n")
+                if lastmod:
+                    f.write(f"    <lastmod>{lastmod}</lastmod>\n")
+                f.write(f"    <changefreq>{changefreq}</changefreq>\n"
+                        f"    <priority>{priority}</priority>\n  </url>\n")
+            f.write('</urlset>\n')
+
+    def _write_chunk(self, state: Dict, name: str, chunk: List[SitemapEntry], written: List[str]) -> str:
+        fingerprint = self._fingerprint(chunk)
+        if not self._unchanged(state, name, fingerprint):
+            self._write_urlset(self.output_dir / name, chunk)
+            state['fingerprints'][name] = fingerprint
+            written.append(name)
+        return fingerprint
+
+    def build_sitemap(self, records: List[Dict], state: Dict) -> List[str]:
+        """生成 sitemap，返回实际重写的文件名
+
+        同时在内存中最多保留两个分片（每个不超过 max_urls 条）。
+        """
+        written: List[str] = []
+        chunks = self._chunks(self._entries(records))
+        first = next(chunks, [])
+        second = next(chunks, None)
+
+        if second is None:
+            # 只有一个分片时直接作为 sitemap.xml
+            self._write_chunk(state, 'sitemap.xml', first, written)
+            index_entries = []
+        else:
+            index_entries = []
+            for number, chunk in enumerate([first, second], 1):
+                name = f"sitemap-{number}.xml"
+                index_entries.append((name, self._write_chunk(state, name, chunk, written),
+                                      max((e[1] for e in chunk if e[1]), default=None)))
+            del first, second
+            for number, chunk in enumerate(chunks, 3):
+                name = f"sitemap-{number}.xml"
+                index_entries.append((name, self._write_chunk(state, name, chunk, written),
+                                      max((e[1] for e in chunk if e[1]), default=None)))
+
+            fingerprint = self._fingerprint(index_entries)
+            if not self._unchanged(state, 'sitemap.xml', fingerprint):
+                with _StreamWriter(self.output_dir / 'sitemap.xml') as f:
+                    f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+                    f.write('<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n')
+                    for name, _, lastmod in index_entries:
+                        f.write(f"  <sitemap>\n    <loc>{escape(self.site_url)}/{name}</loc>\n")
+                        if lastmod:
+                            f.write(f"    <lastmod>{lastmod}</lastmod>\n")
+                        f.write("  </sitemap>\n")
+                    f.write('</sitemapindex>\n')
+                state['fingerprints']['sitemap.xml'] = fingerprint
+                written.append('sitemap.xml')
+
+        # 清理多余的旧分片
+        keep = {name for name, _, _ in index_entries}
+        for path in self.output_dir.glob('sitemap-*.xml'):
+            if path.name not in keep:
+                path.unlink()
+                state['fingerprints'].pop(path.name, None)
+
+        return written
+
+    # ------------------------------------------------------------------
+    # RSS / Atom
+    # ------------------------------------------------------------------
+
+    def _feed_items(self, records: List[Dict]) -> List[Dict]:
+        dated = []
+        for record in records:
+            date = parse_date(record.get('date', ''))
+            if date and date.year > 1970:
+                dated.append((date, record))
+        dated.sort(key=lambda item: item[0], reverse=True)
+        return [dict(record, _date=date) for date, record in dated[:self.feed_limit]]
+
+    def _description(self, record: Dict) -> str:
+        if record.get('excerpt'):
+            return plain_text(record['excerpt'])
+        try:
+            with open(record['path'], 'r', encoding='utf-8') as f:
+                body = self.writer._split_front_matter(f.read())[1]
+        except OSError:
+            return ''
+        text = plain_text(body)
+        return text[:200] + ('...' if len(text) > 200 else '')
+
+    @staticmethod
+    def _cdata(text: str) -> str:
+        return '<![CDATA[' + str(text).replace(']]>', ']]]]><![CDATA[>') + ']]>'
+
+    def build_feeds(self, records: List[Dict], state: Dict) -> List[str]:
+        items = self._feed_items(records)
+        fingerprint = self._fingerprint(
+            [item['id'], item.get('title'), item.get('date'), item.get('updated'),
+             list(self.writer.index.stat.get(item['id'], ()))] for item in items
+        )
+        if self._unchanged(state, 'rss.xml', fingerprint) and self._unchanged(state, 'atom.xml', fingerprint):
+            return []
+
+        now = datetime.datetime.now(datetime.timezone.utc)
+        updated = items[0]['_date'] if items else now
+
+        with _StreamWriter(self.output_dir / 'rss.xml') as rss, \
+                _StreamWriter(self.output_dir / 'atom.xml') as atom:
+            rss.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+                      '<rss version="2.0" xmlns:atom="http://www.w3.org/2005/Atom">\n  <channel>\n'
+                      f"    <title>{self._cdata(SITE_TITLE)}</title>\n"
+                      f"    <description>{self._cdata(SITE_DESCRIPTION)}</description>\n"
+                      f"    <link>{self.site_url}</link>\n"
+                      f'    <atom:link href="{self.site_url}/rss.xml" rel="self" type="application/rss+xml"/>\n'
+                      "    <language>zh-CN</language>\n"
+                      f"    <lastBuildDate>{updated.strftime('%a, %d %b %Y %H:%M:%S GMT')}</lastBuildDate>\n"
+                      "    <generator>blog_writer.py</generator>\n")
+            atom.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+                       '<feed xmlns="http://www.w3.org/2005/Atom">\n'
+                       f"  <title>{escape(SITE_TITLE)}</title>\n"
+                       f"  <subtitle>{escape(SITE_DESCRIPTION)}</subtitle>\n"
+                       f'  <link href="{self.site_url}/"/>\n'
+                       f'  <link href="{self.site_url}/atom.xml" rel="self"/>\n'
+                       f"  <id>{self.site_url}/</id>\n"
+                       f"  <updated>{updated.isoformat()}</updated>\n"
+                       f"  <author><name>{escape(SITE_AUTHOR)}</name></author>\n")
+
+            for item in items:
+                url = f"{self.site_url}/{item['id']}/"
+                description = self._description(item)
+                category = item['categories'][0] if item.get('categories') else '未分类'
+                item_updated = parse_date(item.get('updated', '')) or item['_date']
+
+                rss.write("    <item>\n"
+                          f"      <title>{self._cdata(item.get('title', item['id']))}</title>\n"
+                          f"      <link>{url}</link>\n"
+                          f"      <description>{self._cdata(description)}</description>\n"
+                          f"      <author>{escape(item.get('author') or SITE_AUTHOR)}</author>\n"
+                          f'      <guid isPermaLink="true">{url}</guid>\n'
+                          f"      <pubDate>{item['_date'].strftime('%a, %d %b %Y %H:%M:%S GMT')}</pubDate>\n"
+                          f"      <category>{self._cdata(category)}</category>\n"
+                          "    </item>\n")
+                atom.write("  <entry>\n"
+                           f"    <title>{escape(item.get('title', item['id']))}</title>\n"
+                           f'    <link href="{url}"/>\n'
+                           f"    <id>{url}</id>\n"
+                           f"    <published>{item['_date'].isoformat()}</published>\n"
+                           f"    <updated>{item_updated.isoformat()}</updated>\n"
+                           f"    <summary>{escape(description)}</summary>\n"
+                           + ''.join(f'    <category term="{escape(tag, {chr(34): "&quot;"})}"/>\n'
+                                     for tag in item.get('tags', []))
+                           + "  </entry>\n")
+
+            rss.write('  </channel>\n</rss>\n')
+            atom.write('</feed>\n')
+
+        state['fingerprints']['rss.xml'] = fingerprint
+        state['fingerprints']['atom.xml'] = fingerprint
+        return ['rss.xml', 'atom.xml']
+
+    # ------------------------------------------------------------------
+
+    def build(self, force: bool = False) -> Dict:
+        index = self.writer.index
+        index.refresh(force=True)
+        records = [record for record in index.all_posts() if is_published(record)]
+
+        state = self._load_state()
+        if force:
+            state['fingerprints'] = {}
+
+        written = self.build_sitemap(records, state)
+        written += self.build_feeds(records, state)
+        write_if_changed(self.state_file, dump_json(state))
+
+        return {'posts': len(records), 'written': written}
@@ -0,0 +1,48 @@
+"""
+文件读写工具
+"""
+
+import os
+from pathlib import Path
+from typing import Union
+
+
+def _current_umask() -> int:
+    """读取当前进程的 umask"""
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+def atomic_write_bytes(path: Union[str, Path], data: bytes) -> None:
+    """原子写入文件（先写临时文件再 rename，避免读到写了一半的内容）"""
+    import tempfile
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    # mkstemp 创建的文件权限为 0600，这里沿用原文件权限或默认权限
+    try:
+        mode = path.stat().st_mode & 0o777
+    except FileNotFoundError:
+        mode = 0o666 & ~_current_umask()
+
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=str(path.parent))
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def atomic_write_text(path: Union[str, Path], text: str, encoding: str = 'utf-8') -> None:
+    """原子写入文本文件"""
+    atomic_write_bytes(path, text.encode(encoding))
@@ -0,0 +1,65 @@
+"""
+Front matter 写入
+
+新建文章、批量导入与编辑器保存共用同一种 YAML 写法，Hexo（js-yaml）、gray-matter 与
+HexoBlogWriter._parse_front_matter 都能还原:
+
+- 字符串值写成 JSON 字符串（同时是合法的 YAML 双引号字符串），冒号、#、引号、[、@ 等不会被误解析；
+  只含字母、数字、_、- 的普通单词（如 layout: post）不加引号
+- 列表用 "- item" 块写法，元素中的逗号不会被拆开；空列表写 []
+- date/updated 为 YYYY-MM-DD[ HH:MM[:SS]] 时不加引号，Hexo 按日期解析
+"""
+
+import re
+import json
+from typing import Iterable, List, Tuple
+
+# 自定义键只保留普通标识符，其它写法无法安全地作为 YAML 键
+KEY_RE = re.compile(r'^[A-Za-z_][\w-]*$')
+
+DATE_FIELDS = ('date', 'updated')
+_DATE_RE = re.compile(r'^\d{4}-\d{2}-\d{2}([ T]\d{1,2}:\d{2}(:\d{2})?)?$')
+_PLAIN_RE = re.compile(r'^[A-Za-z][\w-]*$')
+# YAML 1.1 中会被解析为布尔值或 null 的单词
+_RESERVED = {'true', 'false', 'yes', 'no', 'on', 'off', 'y', 'n', 'null'}
+
+
+def quote(value) -> str:
+    """YAML 标量（普通单词原样，其余写成双引号字符串）"""
+    value = str(value)
+    if _PLAIN_RE.match(value) and value.lower() not in _RESERVED:
+        return value
+    return json.dumps(value, ensure_ascii=False)
+
+
+def unquote(value: str) -> str:
+    """还原 quote() 或手写的 '单引号' 标量，其他值原样返回"""
+    if len(value) >= 2 and value[0] == value[-1] == '"':
+        try:
+            return json.loads(value)
+        except ValueError:
+            return value[1:-1]
+    if len(value) >= 2 and value[0] == value[-1] == "'":
+        return value[1:-1].replace("''", "'")
+    return value
+
+
+def format_field(key: str, value) -> List[str]:
+    """一个字段的 front matter 行"""
+    if isinstance(value, (list, tuple)):
+        items = [str(item).strip() for item in value if str(item).strip()]
+        if not items:
+            return [f"{key}: []"]
+        return [f"{key}:"] + [f"  - {quote(item)}" for item in items]
+    if key in DATE_FIELDS and _DATE_RE.match(str(value)):
+        return [f"{key}: {value}"]
+    return [f"{key}: {quote(value)}"]
+
+
+def render_front_matter(fields: Iterable[Tuple[str, object]]) -> str:
+    """按顺序渲染 (键, 值) 为完整的 front matter 块（含首尾 --- 行与结尾换行）"""
+    lines = ['---']
+    for key, value in fields:
+        lines.extend(format_field(key, value))
+    lines.append('---')
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,277 @@
+"""
+文章修改时间线
+
+一次遍历 `git log --name-status -z` 的输出（流式解析，不逐个文件调用 git log），得到每篇文章的:
+- created: 首次提交时间
+- modified: 最后一次提交时间
+- revisions: 涉及该文章的提交数
+
+重命名（R 状态）会把旧路径的历史合并到新路径上。结果缓存在 .blog_cache/git_timeline.json，
+之后只处理上次索引的提交之后的新提交；历史被改写（上次的提交不再是 HEAD 的祖先）时重新构建。
+"""
+
+import json
+import time
+import datetime
+import subprocess
+import threading
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .coordination import InterProcessLock
+from .fileutil import atomic_write_text
+from .timing import phase
+
+TIMELINE_VERSION = 1
+
+# git log 中每个提交的头部标记（与文件状态、路径区分）
+_HEADER = '\x01'
+
+# 每条路径的统计: [首次提交时间, 最后提交时间, 提交数]
+Entry = List[int]
+
+
+def format_timestamp(ts: Optional[int]) -> str:
+    """Unix 时间戳 -> 与 front matter 日期相同的格式"""
+    if not ts:
+        return ''
+    return datetime.datetime.fromtimestamp(ts).strftime('%Y-%m-%d %H:%M:%S')
+
+
+def _is_sha(value: str) -> bool:
+    return len(value) in (40, 64) and all(c in '0123456789abcdef' for c in value)
+
+
+def parse_log(chunks: Iterator[bytes]) -> Iterator[Tuple[int, str, List[str]]]:
+    """流式解析 git log -z --name-status 输出，逐个产出 (提交时间, 状态, 路径列表)"""
+    buffer = b''
+    timestamp = 0
+    pending: List[str] = []
+    need = 0
+    status = ''
+
+    def _tokens():
+        nonlocal buffer
+        for chunk in chunks:
+            buffer += chunk
+            parts = buffer.split(b'\0')
+            buffer = parts.pop()
+            for part in parts:
+                yield part.decode('utf-8', errors='surrogateescape')
+        if buffer:
+            yield buffer.decode('utf-8', errors='surrogateescape')
+
+    for token in _tokens():
+        token = token.lstrip('\n')
+        if need:
+            pending.append(token)
+            need -= 1
+            if not need:
+                yield timestamp, status, pending
+                pending = []
+            continue
+        if not token:
+            continue
+        if token.startswith(_HEADER):
+            timestamp = int(token[1:].split(' ', 1)[1])
+            continue
+        status = token
+        need = 2 if token[0] in 'RC' else 1
+
+
+class GitTimeline:
+    """文章路径 -> 首次/最后提交时间与提交数"""
+
+    def __init__(self, repo_dir: Path, posts_dir: Path, cache_file: Optional[Path] = None,
+                 refresh_interval: float = 5.0):
+        self.repo_dir = Path(repo_dir).resolve()
+        self.posts_dir = Path(posts_dir).resolve()
+        self.pathspec = self.posts_dir.relative_to(self.repo_dir).as_posix() or '.'
+        self.cache_file = Path(cache_file) if cache_file else None
+        self.refresh_interval = refresh_interval
+
+        # 相对仓库根目录的路径 -> [首次提交时间, 最后提交时间, 提交数]
+        self.paths: Dict[str, Entry] = {}
+        self.head: Optional[str] = None
+
+        self._lock = threading.RLock()
+        self._file_lock = InterProcessLock(self.cache_file.with_suffix('.lock')) if self.cache_file else None
+        self._loaded = False
+        self._last_refresh = 0.0
+
+    # ------------------------------------------------------------------
+    # git
+    # ------------------------------------------------------------------
+
+    def _git(self, *args) -> subprocess.CompletedProcess:
+        with phase('git'):
+            return subprocess.run(['git', *args], cwd=str(self.repo_dir),
+                                  capture_output=True, text=True)
+
+    def _read_head(self) -> Optional[str]:
+        """直接读取 .git/HEAD 与引用文件（含 packed-refs），无法解析时返回 None"""
+        git_dir = self.repo_dir / '.git'
+        try:
+            head = (git_dir / 'HEAD').read_text(encoding='utf-8').strip()
+            if not head.startswith('ref: '):
+                return head if _is_sha(head) else None
+            ref = head[len('ref: '):]
+            try:
+                commit = (git_dir / ref).read_text(encoding='utf-8').strip()
+                return commit if _is_sha(commit) else None
+            except FileNotFoundError:
+                pass
+            with open(git_dir / 'packed-refs', 'r', encoding='utf-8') as f:
+                for line in f:
+                    commit, _, name = line.strip().partition(' ')
+                    if name == ref and _is_sha(commit):
+                        return commit
+        except OSError:
+            # .git 是文件（worktree/子模块）、新仓库没有提交等情况
+            pass
+        return None
+
+    def _current_head(self) -> Optional[str]:
+        # 每条命令都会检查 HEAD，直接读文件避免每次启动 git 进程
+        head = self._read_head()
+        if head:
+            return head
+        result = self._git('rev-parse', '--verify', '-q', 'HEAD')
+        return result.stdout.strip() or None
+
+    def _is_ancestor(self, commit: str, head: str) -> bool:
+        return self._git('merge-base', '--is-ancestor', commit, head).returncode == 0
+
+    def _scan(self, revision_range: str) -> Tuple[Dict[str, Entry], Dict[str, str]]:
+        """遍历提交范围，返回 (路径统计, 旧路径 -> 最终路径)"""
+        paths: Dict[str, Entry] = {}
+        renamed: Dict[str, str] = {}
+
+        def _resolve(path: str) -> str:
+            while path in renamed:
+                path = renamed[path]
+            return path
+
+        command = ['git', 'log', '-z', '--name-status', '-M', f'--format={_HEADER}%H %ct',
+                   revision_range, '--', self.pathspec]
+        with phase('git'):
+            process = subprocess.Popen(command, cwd=str(self.repo_dir),
+                                       stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+            try:
+                chunks = iter(lambda: process.stdout.read(65536), b'')
+                # 从新到旧：旧路径上更早的提交记到重命名后的路径上
+                for timestamp, status, files in parse_log(chunks):
+                    path = _resolve(files[-1])
+                    if status[0] == 'R' and files[0] != files[-1]:
+                        renamed[files[0]] = path
+                    entry = paths.get(path)
+                    if entry is None:
+                        paths[path] = [timestamp, timestamp, 1]
+                    else:
+                        entry[0] = min(entry[0], timestamp)
+                        entry[1] = max(entry[1], timestamp)
+                        entry[2] += 1
+            finally:
+                process.stdout.close()
+                process.wait()
+
+        return paths, {old: _resolve(old) for old in renamed}
+
+    # ------------------------------------------------------------------
+    # 构建 / 刷新 / 持久化
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _merge(target: Dict[str, Entry], path: str, entry: Entry):
+        current = target.get(path)
+        if current is None:
+            target[path] = list(entry)
+        else:
+            current[0] = min(current[0], entry[0])
+            current[1] = max(current[1], entry[1])
+            current[2] += entry[2]
+
+    def _load(self):
+        if not self.cache_file or not self.cache_file.exists():
+            return
+        try:
+            data = json.loads(self.cache_file.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return
+        if data.get('version') != TIMELINE_VERSION or data.get('pathspec') != self.pathspec:
+            return
+        self.head = data.get('head')
+        self.paths = data.get('paths', {})
+
+    def _save(self):
+        if not self.cache_file:
+            return
+        data = {'version': TIMELINE_VERSION, 'pathspec': self.pathspec, 'head': self.head, 'paths': self.paths}
+        try:
+            atomic_write_text(self.cache_file, json.dumps(data, ensure_ascii=False))
+        except OSError as e:
+            print(f"⚠️  保存提交时间线缓存失败: {e}")
+
+    def refresh(self, force: bool = False) -> bool:
+        """处理上次索引之后的新提交，HEAD 有变化时返回 True"""
+        with self._lock:
+            now = time.monotonic()
+            if self._loaded and not force and now - self._last_refresh < self.refresh_interval:
+                return False
+            self._last_refresh = now
+
+            head = self._current_head()
+            if self._loaded and head == self.head:
+                return False
+
+            with (self._file_lock() if self._file_lock else self._lock):
+                # 其他进程可能已经更新过缓存
+                self._load()
+                self._loaded = True
+                if head == self.head:
+                    return False
+
+                if head is None:
+                    self.paths, self.head = {}, None
+                elif self.head and self._is_ancestor(self.head, head):
+                    paths, renamed = self._scan(f'{self.head}..{head}')
+                    for old, new in renamed.items():
+                        if old in self.paths:
+                            self._merge(paths, new, self.paths.pop(old))
+                    for path, entry in paths.items():
+                        self._merge(self.paths, path, entry)
+                    self.head = head
+                else:
+                    self.paths, _ = self._scan(head)
+                    self.head = head
+
+                self._save()
+                return True
+
+    # ------------------------------------------------------------------
+    # 查询
+    # ------------------------------------------------------------------
+
+    def _key(self, file_path: Path) -> str:
+        return Path(file_path).resolve().relative_to(self.repo_dir).as_posix()
+
+    def get(self, file_path: Path) -> Optional[Dict]:
+        """文章的提交历史摘要；未提交过的文章返回 None"""
+        self.refresh()
+        try:
+            entry = self.paths.get(self._key(file_path))
+        except ValueError:
+            return None
+        if entry is None:
+            return None
+        return {
+            'created': format_timestamp(entry[0]),
+            'modified': format_timestamp(entry[1]),
+            'revisions': entry[2]
+        }
+
+    def last_modified(self) -> Optional[str]:
+        """文章目录下最近一次提交的时间"""
+        self.refresh()
+        latest = max((entry[1] for entry in self.paths.values()), default=None)
+        return format_timestamp(latest) if latest else None
@@ -0,0 +1,396 @@
+"""
+批量导入
+
+把其他博客的导出文件转换为 Hexo 文章：
+
+- wordpress: WordPress 导出的 WXR 文件（xml.etree.iterparse 逐个 <item> 解析，处理完即释放）
+- ghost:     Ghost 导出的 JSON（逐个解码 posts 数组中的元素，不把整个文件读入内存；
+             标签关系在第一遍扫描中读取）
+- markdown:  Markdown 文件目录（递归查找 *.md / *.markdown，保留 front matter 中的其他字段）
+
+正文原样保留（WordPress/Ghost 的 HTML 由 Hexo 的 Markdown 渲染器直接输出）。
+文件名使用来源中的 slug（保持原有链接），与已有文章重名时加 -2、-3 后缀；草稿写为 draft-<slug>.md。
+文章按批渲染，由线程池并行原子写入；全部写完后刷新一次索引，并（可选）提交一次 Git。
+"""
+
+import os
+import re
+import json
+import time
+import datetime
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from urllib.parse import unquote
+
+from .creation import existing_names, unique_name
+from .fileutil import atomic_write_text
+from .front_matter import KEY_RE, format_field
+from .text import slugify
+
+FORMATS = ('wordpress', 'ghost', 'markdown')
+
+# 每批渲染/写入的文章数
+BATCH_SIZE = 500
+
+# 流式读取 JSON 的块大小（字符）
+CHUNK_SIZE = 1 << 20
+
+_DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+_WP_NS = {
+    'content': 'http://purl.org/rss/1.0/modules/content/',
+    'excerpt': 'http://wordpress.org/export/1.2/excerpt/',
+    'dc': 'http://purl.org/dc/elements/1.1/',
+}
+_WP_EXPORT_RE = re.compile(r'^\{http://wordpress\.org/export/[\d.]+/\}')
+
+# front matter 中由导入器生成的字段（markdown 来源的其他字段原样保留）
+_GENERATED_KEYS = ('title', 'date', 'updated', 'tags', 'categories', 'layout', 'author')
+
+
+def _format_date(value: str) -> str:
+    """各种来源的时间 -> Hexo 的 YYYY-MM-DD HH:MM:SS（解析失败时原样返回）"""
+    value = (value or '').strip()
+    if not value or value.startswith('0000'):
+        return ''
+    try:
+        parsed = datetime.datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return value
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    return parsed.strftime(_DATE_FORMAT)
+
+
+# ----------------------------------------------------------------------
+# 来源解析（每个函数产出统一格式的文章字典）
+# ----------------------------------------------------------------------
+
+def iter_wordpress(path: Path) -> Iterator[Dict]:
+    """逐篇读取 WordPress WXR 导出文件中的文章（只取 post 类型）"""
+    stack: List[ET.Element] = []
+    for event, elem in ET.iterparse(str(path), events=('start', 'end')):
+        if event == 'start':
+            stack.append(elem)
+            continue
+        stack.pop()
+        if elem.tag != 'item':
+            continue
+
+        fields = {}
+        categories, tags = [], []
+        for child in elem:
+            tag = _WP_EXPORT_RE.sub('wp:', child.tag)
+            if child.tag == 'category':
+                name = (child.text or '').strip()
+                if name:
+                    (tags if child.get('domain') == 'post_tag' else categories).append(name)
+            else:
+                fields[tag] = child.text or ''
+
+        if fields.get('wp:post_type', 'post') == 'post' and fields.get('wp:status') != 'trash':
+            yield {
+                'title': fields.get('title', ''),
+                'slug': unquote(fields.get('wp:post_name', '')),
+                'date': _format_date(fields.get('wp:post_date', '')),
+                'updated': _format_date(fields.get('wp:post_modified', '')),
+                'author': fields.get('{%s}creator' % _WP_NS['dc'], ''),
+                'tags': tags,
+                'categories': categories,
+                'content': fields.get('{%s}encoded' % _WP_NS['content'], ''),
+                'draft': fields.get('wp:status', 'publish') != 'publish'
+            }
+
+        # 处理完的 <item> 从父节点移除，内存占用与文件大小无关
+        elem.clear()
+        if stack:
+            stack[-1].remove(elem)
+
+
+_JSON_TOKEN_RE = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*(?:"|\\?\Z)|[{}\[\]:,]')
+_JSON_SKIP_RE = re.compile(r'[\s,]*')
+
+
+def stream_json_arrays(path: Path, keys: Set[str]) -> Iterator[Tuple[str, object]]:
+    """逐个产出 JSON 文件中指定数组的元素 (数组键名, 元素)
+
+    只匹配根对象或 "data" 对象下的数组（Ghost 导出格式为 {"db": [{"data": {"posts": [...]}}]}）。
+    """
+    decoder = json.JSONDecoder()
+    with open(path, 'r', encoding='utf-8') as f:
+        buf, pos, eof = '', 0, False
+
+        def fill() -> bool:
+            nonlocal buf, pos, eof
+            if eof:
+                return False
+            chunk = f.read(CHUNK_SIZE)
+            if not chunk:
+                eof = True
+                return False
+            buf = buf[pos:] + chunk
+            pos = 0
+            return True
+
+        # 容器栈: 每项为 (括号, 打开它的键名)
+        stack: List[Tuple[str, Optional[str]]] = []
+        last_string, pending_key = None, None
+        while True:
+            match = _JSON_TOKEN_RE.search(buf, pos)
+            if match is None or (match.group().startswith('"') and
+                                 (len(match.group()) < 2 or not match.group().endswith('"')
+                                  or match.end() == len(buf))):
+                # 字符串可能被块边界截断，读入更多内容后从同一位置重新匹配
+                pos = match.start() if match is not None else len(buf)
+                if not fill():
+                    if match is None:
+                        return
+                    raise ValueError(f"JSON 文件不完整: {path}")
+                continue
+
+            token = match.group()
+            pos = match.end()
+            if token.startswith('"'):
+                last_string = token[1:-1]
+            elif token == ':':
+                pending_key = last_string
+            elif token in '{[':
+                parent_key = stack[-1][1] if stack else None
+                in_target = (token == '[' and pending_key in keys and len(stack) >= 1
+                             and stack[-1][0] == '{' and (len(stack) == 1 or parent_key == 'data'))
+                if not in_target:
+                    stack.append((token, pending_key))
+                    pending_key = None
+                    continue
+
+                key, pending_key = pending_key, None
+                while True:
+                    pos = _JSON_SKIP_RE.match(buf, pos).end()
+                    if pos >= len(buf):
+                        if not fill():
+                            raise ValueError(f"JSON 文件不完整: {path}")
+                        continue
+                    if buf[pos] == ']':
+                        pos += 1
+                        break
+                    try:
+                        element, end = decoder.raw_decode(buf, pos)
+                    except json.JSONDecodeError:
+                        if not fill():
+                            raise
+                        continue
+                    if end == len(buf) and not eof:
+                        # 数字可能被截断
+                        if fill():
+                            continue
+                    pos = end
+                    yield key, element
+            elif token in '}]':
+                if stack:
+                    stack.pop()
+                pending_key = None
+            else:
+                pending_key = None
+
+
+def iter_ghost(path: Path) -> Iterator[Dict]:
+    """逐篇读取 Ghost JSON 导出文件中的文章（只取 post 类型）"""
+    tag_names: Dict[str, str] = {}
+    post_tags: Dict[str, List[Tuple[int, str]]] = {}
+    for key, element in stream_json_arrays(path, {'tags', 'posts_tags'}):
+        if key == 'tags':
+            tag_names[element.get('id')] = element.get('name', '')
+        else:
+            post_tags.setdefault(element.get('post_id'), []).append(
+                (element.get('sort_order') or 0, element.get('tag_id')))
+
+    for _, post in stream_json_arrays(path, {'posts'}):
+        if post.get('type', 'post') != 'post' or post.get('page') in (True, 1):
+            continue
+        tags = [tag_names[tag_id] for _, tag_id in sorted(post_tags.pop(post.get('id'), []))
+                if tag_names.get(tag_id)]
+        # 旧版本导出有 markdown 字段，新版本只有 html
+        content = post.get('markdown') or post.get('html') or post.get('plaintext') or ''
+        yield {
+            'title': post.get('title', ''),
+            'slug': post.get('slug', ''),
+            'date': _format_date(post.get('published_at') or post.get('created_at') or ''),
+            'updated': _format_date(post.get('updated_at') or ''),
+            'author': '',
+            'tags': tags,
+            'categories': [],
+            'content': content,
+            'draft': post.get('status', 'published') != 'published'
+        }
+
+
+def iter_markdown(root: Path, parse_front_matter: Callable[[str], Dict],
+                  split_front_matter: Callable[[str], tuple]) -> Iterator[Dict]:
+    """递归读取目录中的 Markdown 文件"""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(name for name in dirnames if not name.startswith('.'))
+        for name in sorted(filenames):
+            if name.startswith('.') or not name.endswith(('.md', '.markdown')):
+                continue
+            path = os.path.join(dirpath, name)
+            with open(path, 'r', encoding='utf-8') as f:
+                content = f.read()
+            front_matter = parse_front_matter(content)
+            body = split_front_matter(content)[1] if front_matter else content
+            stem = name.rsplit('.', 1)[0]
+            published = str(front_matter.get('published', 'true')).lower() not in ('false', 'no', '0')
+            yield {
+                'title': front_matter.get('title') or stem,
+                'slug': front_matter.get('slug') or stem,
+                'date': _format_date(str(front_matter.get('date', ''))) or datetime.datetime.fromtimestamp(
+                    os.stat(path).st_mtime).strftime(_DATE_FORMAT),
+                'updated': _format_date(str(front_matter.get('updated', ''))),
+                'author': front_matter.get('author', ''),
+                'tags': front_matter.get('tags') or [],
+                'categories': front_matter.get('categories') or [],
+                'content': body,
+                'draft': stem.startswith('draft-') or not published,
+                'extra': {key: value for key, value in front_matter.items()
+                          if key not in _GENERATED_KEYS and key not in ('slug', 'published')}
+            }
+
+
+# ----------------------------------------------------------------------
+# 渲染与写入
+# ----------------------------------------------------------------------
+
+def _clean(value) -> str:
+    return ' '.join(str(value).split())
+
+
+def _list(values) -> List[str]:
+    if isinstance(values, str):
+        values = [values]
+    return [_clean(value) for value in values if _clean(value)]
+
+
+def _field(lines: List[str], key: str, value):
+    """追加一个 front matter 字段（空值、空列表不写）"""
+    if isinstance(value, (list, tuple)):
+        value = _list(value)
+        if not value:
+            return
+    elif not _clean(value):
+        return
+    else:
+        value = _clean(value)
+    lines.extend(format_field(key, value))
+
+
+def render_post(post: Dict) -> str:
+    """文章字典 -> Markdown 文件内容（字符串值一律加引号，YAML 解析器与 _parse_front_matter 都能还原）"""
+    lines = ['---', *format_field('title', _clean(post['title'])), *format_field('date', post['date'])]
+    if post.get('updated') and post['updated'] != post['date']:
+        _field(lines, 'updated', post['updated'])
+    _field(lines, 'tags', _list(post.get('tags', [])))
+    _field(lines, 'categories', _list(post.get('categories', [])))
+    if post.get('author'):
+        _field(lines, 'author', post['author'])
+    for key, value in (post.get('extra') or {}).items():
+        if KEY_RE.match(str(key)):
+            _field(lines, key, value)
+    lines.append("layout: post")
+    lines.append('---')
+    body = post.get('content', '').replace('\r\n', '\n').strip('\n')
+    return '\n'.join(lines) + '\n\n' + body + '\n'
+
+
+class PostImporter:
+    """把导出文件中的文章流式转换并写入文章目录"""
+
+    def __init__(self, writer, include_drafts: bool = False, workers: Optional[int] = None,
+                 batch_size: int = BATCH_SIZE):
+        self.writer = writer
+        self.include_drafts = include_drafts
+        self.workers = workers or min(8, (os.cpu_count() or 2) * 2)
+        self.batch_size = max(1, batch_size)
+
+    def source(self, fmt: str, path: Path) -> Iterable[Dict]:
+        path = Path(path)
+        if not path.exists():
+            raise FileNotFoundError(f"导入源不存在: {path}")
+        if fmt in ('wordpress', 'ghost') and not path.is_file():
+            raise ValueError(f"{fmt} 导入源必须是导出文件: {path}")
+        if fmt == 'wordpress':
+            return iter_wordpress(path)
+        if fmt == 'ghost':
+            return iter_ghost(path)
+        if fmt == 'markdown':
+            if not path.is_dir():
+                raise ValueError(f"markdown 导入源必须是目录: {path}")
+            return iter_markdown(path, self.writer._parse_front_matter, self.writer._split_front_matter)
+        raise ValueError(f"不支持的导入格式: {fmt}（可选: {', '.join(FORMATS)}）")
+
+    def run(self, fmt: str, path: Path, commit: bool = True,
+            progress: Optional[Callable[[int], None]] = None) -> Dict:
+        start = time.perf_counter()
+        posts = self.source(fmt, path)
+        taken = existing_names(self.writer)
+        posts_dir = self.writer.posts_dir
+
+        imported, drafts, renamed, skipped = 0, 0, 0, 0
+        batch: List[Tuple[Path, str]] = []
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            pending = None
+
+            def flush():
+                nonlocal batch, pending
+                if pending is not None:
+                    list(pending)  # 上一批写完（并抛出其中的异常）再提交下一批，内存中最多两批
+                pending = pool.map(lambda item: atomic_write_text(*item), batch) if batch else None
+                batch = []
+
+            for post in posts:
+                if post['draft'] and not self.include_drafts:
+                    skipped += 1
+                    continue
+                if not post['title'] and not post['content']:
+                    skipped += 1
+                    continue
+                if not post['date']:
+                    post['date'] = datetime.datetime.now().strftime(_DATE_FORMAT)
+
+                base = slugify(post['slug']) or slugify(post['title']) or 'post'
+                if post['draft']:
+                    base = base if base.startswith('draft-') else f"draft-{base}"
+                name = unique_name(base, taken)
+                if name != base:
+                    renamed += 1
+                drafts += post['draft']
+                imported += 1
+
+                batch.append((posts_dir / f"{name}.md", render_post(post)))
+                if len(batch) >= self.batch_size:
+                    flush()
+                    if progress:
+                        progress(imported)
+            flush()
+            flush()
+
+        written = time.perf_counter() - start
+        if imported:
+            self.writer.index.refresh(force=True)
+
+        commit_sha = None
+        if commit and imported and self.writer.repo_dir is not None and self.writer.repo is not None:
+            posts_rule = posts_dir.relative_to(self.writer.blog_path).as_posix() + '/**'
+            result = self.writer.commit_changes(f"导入 {imported} 篇文章 ({fmt})", include=[posts_rule])
+            commit_sha = result['commit']
+
+        return {
+            'format': fmt,
+            'imported': imported,
+            'drafts': drafts,
+            'renamed': renamed,
+            'skipped': skipped,
+            'commit': commit_sha,
+            'write_seconds': written,
+            'elapsed': time.perf_counter() - start
+        }
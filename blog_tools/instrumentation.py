@@ -0,0 +1,352 @@
+"""
+Web 界面请求监控
+
+为 Flask 应用提供:
+- 分阶段计时（见 timing.py），通过 Server-Timing 响应头返回，浏览器开发者工具可直接查看
+- /metrics: Prometheus 文本格式的请求数、请求耗时与各阶段耗时直方图。
+  指定 metrics_dir 时，每个 worker 进程把自己的计数定期（至多每 METRICS_FLUSH_INTERVAL 秒）写入
+  metrics_dir/<pid>-<启动时间>.json，/metrics 汇总目录下所有文件，多 worker 部署时结果不取决于
+  由哪个 worker 响应抓取；其他 worker 的数据最多滞后 METRICS_FLUSH_INTERVAL 秒。
+  未指定时只输出当前进程的计数
+- 按需采样分析: 设置环境变量 BLOG_PROFILER=1 后，请求带上 ?_profile=1（或请求头 X-Profile: 1）
+  即对该请求采样调用栈，结果以折叠栈格式（flamegraph.pl / speedscope 可直接读取）保存，
+  文件名通过 X-Profile 响应头返回，可在 /debug/profiles/<文件名> 下载；只保留最近 PROFILE_KEEP 份
+"""
+
+import os
+import sys
+import json
+import time
+import threading
+import datetime
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Tuple
+
+from flask import Flask, Response, abort, g, request, send_from_directory
+
+from .fileutil import atomic_write_text
+from .timing import start_recording, stop_recording
+
+# 请求耗时直方图的桶（秒）
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# 采样间隔（秒）
+PROFILE_INTERVAL = 0.002
+
+# 保留的采样分析文件数，超出后删除最旧的
+PROFILE_KEEP = 50
+
+# 各 worker 把计数写入共享目录的最短间隔（秒）
+METRICS_FLUSH_INTERVAL = 1.0
+
+
+def _escape_label(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = '') -> str:
+    parts = [f'{name}="{_escape_label(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return '{' + ','.join(parts) + '}' if parts else ''
+
+
+class CounterMetric:
+    """带标签的计数器"""
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str]):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount: float = 1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def snapshot(self) -> list:
+        """可写入 JSON 的当前计数: [[标签值...], 计数]"""
+        with self._lock:
+            return [[list(values), total] for values, total in self._values.items()]
+
+    def merge(self, snapshots) -> Dict[Tuple[str, ...], float]:
+        """累加多个进程的 snapshot()"""
+        merged: Dict[Tuple[str, ...], float] = {}
+        for snapshot in snapshots:
+            for values, total in snapshot:
+                values = tuple(values)
+                merged[values] = merged.get(values, 0) + total
+        return merged
+
+    def render(self, values: Optional[Dict[Tuple[str, ...], float]] = None) -> str:
+        if values is None:
+            values = self.merge([self.snapshot()])
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for label_values, total in sorted(values.items()):
+            lines.append(f"{self.name}{_format_labels(self.labels, label_values)} {total}")
+        return '\n'.join(lines)
+
+
+class Histogram:
+    """带标签的直方图（累计桶）"""
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str],
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        # 标签值 -> [各桶计数..., 总和, 总数]
+        self._values: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values):
+        with self._lock:
+            entry = self._values.get(label_values)
+            if entry is None:
+                entry = self._values[label_values] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry[i] += 1
+            entry[-2] += value
+            entry[-1] += 1
+
+    def snapshot(self) -> list:
+        """可写入 JSON 的当前数据: [[标签值...], [各桶计数..., 总和, 总数]]"""
+        with self._lock:
+            return [[list(values), list(entry)] for values, entry in self._values.items()]
+
+    def merge(self, snapshots) -> Dict[Tuple[str, ...], list]:
+        """累加多个进程的 snapshot()，桶数不一致的数据（旧版本写入）跳过"""
+        merged: Dict[Tuple[str, ...], list] = {}
+        for snapshot in snapshots:
+            for values, entry in snapshot:
+                if len(entry) != len(self.buckets) + 2:
+                    continue
+                target = merged.setdefault(tuple(values), [0] * len(self.buckets) + [0.0, 0])
+                for i, count in enumerate(entry):
+                    target[i] += count
+        return merged
+
+    def render(self, values: Optional[Dict[Tuple[str, ...], list]] = None) -> str:
+        if values is None:
+            values = self.merge([self.snapshot()])
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for label_values, entry in sorted(values.items()):
+            for i, bound in enumerate(self.buckets):
+                labels = _format_labels(self.labels, label_values, f'le="{bound}"')
+                lines.append(f"{self.name}_bucket{labels} {entry[i]}")
+            labels = _format_labels(self.labels, label_values, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{labels} {entry[-1]}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labels, label_values)} {entry[-2]:.6f}")
+            lines.append(f"{self.name}_count{_format_labels(self.labels, label_values)} {entry[-1]}")
+        return '\n'.join(lines)
+
+
+class Metrics:
+    """Web 界面的监控指标（指定 shared_dir 时汇总所有 worker 进程）"""
+
+    def __init__(self, shared_dir: Optional[Path] = None):
+        self.start_time = time.time()
+        self.shared_dir = Path(shared_dir) if shared_dir else None
+        self._pid = os.getpid()
+        self._flush_lock = threading.Lock()
+        self._flush_timer: Optional[threading.Timer] = None
+        self.requests = CounterMetric('blog_http_requests_total', '请求总数',
+                                      ('method', 'endpoint', 'status'))
+        self.latency = Histogram('blog_http_request_duration_seconds', '请求耗时（秒）',
+                                 ('method', 'endpoint'))
+        self.phases = Histogram('blog_http_request_phase_seconds', '请求各阶段耗时（秒）',
+                                ('endpoint', 'phase'))
+
+    def _worker_file(self) -> Path:
+        # 预加载应用后再 fork 的 worker 继承了父进程的对象（父进程不处理请求，计数为空），按当前 pid 重新命名
+        if os.getpid() != self._pid:
+            self._pid = os.getpid()
+            self.start_time = time.time()
+            self._flush_timer = None
+        # 带上启动时间，pid 被新进程复用时不会覆盖旧进程已累计的计数
+        return self.shared_dir / f"{self._pid}-{int(self.start_time * 1000)}.json"
+
+    def _snapshot(self) -> dict:
+        return {
+            'start_time': self.start_time,
+            'requests': self.requests.snapshot(),
+            'latency': self.latency.snapshot(),
+            'phases': self.phases.snapshot()
+        }
+
+    def flush(self):
+        """把本进程的计数写入共享目录"""
+        if self.shared_dir is None:
+            return
+        path = self._worker_file()
+        with self._flush_lock:
+            self._flush_timer = None
+            atomic_write_text(path, json.dumps(self._snapshot()))
+
+    def schedule_flush(self):
+        """请求结束后调用：METRICS_FLUSH_INTERVAL 秒内的多次请求合并为一次写入"""
+        if self.shared_dir is None:
+            return
+        with self._flush_lock:
+            if self._flush_timer is not None:
+                return
+            self._flush_timer = threading.Timer(METRICS_FLUSH_INTERVAL, self.flush)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+
+    def _collect(self) -> list:
+        """所有 worker 的 snapshot（本进程使用内存中的最新值）"""
+        if self.shared_dir is None:
+            return [self._snapshot()]
+        self.flush()
+        own = self._worker_file()
+        snapshots = [self._snapshot()]
+        for path in sorted(self.shared_dir.glob('*.json')):
+            if path == own:
+                continue
+            try:
+                snapshots.append(json.loads(path.read_text(encoding='utf-8')))
+            except (OSError, ValueError):
+                continue
+        return snapshots
+
+    def render(self) -> str:
+        snapshots = self._collect()
+        start_time = min(snapshot.get('start_time', self.start_time) for snapshot in snapshots)
+        parts = [
+            self.requests.render(self.requests.merge(s.get('requests', []) for s in snapshots)),
+            self.latency.render(self.latency.merge(s.get('latency', []) for s in snapshots)),
+            self.phases.render(self.phases.merge(s.get('phases', []) for s in snapshots)),
+            "# HELP blog_process_start_time_seconds 最早的 worker 进程启动时间（Unix 时间戳）\n"
+            "# TYPE blog_process_start_time_seconds gauge\n"
+            f"blog_process_start_time_seconds {start_time:.3f}",
+            "# HELP blog_metrics_workers 参与汇总的 worker 进程数（含已退出的进程）\n"
+            "# TYPE blog_metrics_workers gauge\n"
+            f"blog_metrics_workers {len(snapshots)}"
+        ]
+        return '\n'.join(parts) + '\n'
+
+
+class SamplingProfiler:
+    """在后台线程中定时采样目标线程的调用栈，输出折叠栈"""
+
+    def __init__(self, thread_id: int, interval: float = PROFILE_INTERVAL):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    @staticmethod
+    def _frame_name(frame) -> str:
+        code = frame.f_code
+        return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(self._frame_name(frame))
+                frame = frame.f_back
+            if stack:
+                self.stacks[';'.join(reversed(stack))] += 1
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self) -> str:
+        self._stop.set()
+        self._thread.join()
+        return ''.join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+def _endpoint_label() -> str:
+    rule = request.url_rule
+    return rule.rule if rule is not None else 'unmatched'
+
+
+def _prune_profiles(profile_dir: Path, keep: int = PROFILE_KEEP):
+    """只保留最近 keep 份采样分析文件（文件名以时间戳开头，按名称排序即按时间排序）"""
+    for path in sorted(profile_dir.glob('*.folded'))[:-keep]:
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+
+def init_instrumentation(app: Flask, profile_dir: Optional[Path] = None,
+                         metrics_dir: Optional[Path] = None) -> Metrics:
+    """为应用注册计时钩子、/metrics 与采样分析"""
+    metrics = Metrics(metrics_dir)
+    profiler_enabled = os.environ.get('BLOG_PROFILER', '').lower() in ('1', 'true', 'yes')
+    profile_dir = Path(profile_dir) if profile_dir else Path('.blog_cache') / 'profiles'
+
+    @app.before_request
+    def _start_timing():
+        g.request_start = time.perf_counter()
+        g.phase_recorder = start_recording()
+        g.profiler = None
+        if profiler_enabled and (request.args.get('_profile') == '1' or request.headers.get('X-Profile') == '1'):
+            g.profiler = SamplingProfiler(threading.get_ident())
+            g.profiler.start()
+
+    @app.after_request
+    def _finish_timing(response):
+        start = g.pop('request_start', None)
+        recorder = g.pop('phase_recorder', None)
+        if start is None or recorder is None:
+            return response
+
+        total = time.perf_counter() - start
+        endpoint = _endpoint_label()
+
+        profiler = g.pop('profiler', None)
+        if profiler is not None:
+            collapsed = profiler.stop()
+            profile_dir.mkdir(parents=True, exist_ok=True)
+            name = f"{datetime.datetime.now().strftime('%Y%m%d-%H%M%S-%f')}-{request.endpoint or 'request'}.folded"
+            (profile_dir / name).write_text(collapsed, encoding='utf-8')
+            _prune_profiles(profile_dir)
+            response.headers['X-Profile'] = name
+
+        timings = []
+        accounted = 0.0
+        for phase_name, seconds in recorder.totals.items():
+            accounted += seconds
+            metrics.phases.observe(seconds, endpoint, phase_name)
+            timings.append(f'{phase_name};dur={seconds * 1000:.2f}')
+        timings.append(f'app;dur={max(total - accounted, 0) * 1000:.2f}')
+        timings.append(f'total;dur={total * 1000:.2f}')
+        response.headers['Server-Timing'] = ', '.join(timings)
+
+        metrics.latency.observe(total, request.method, endpoint)
+        metrics.requests.inc(request.method, endpoint, str(response.status_code))
+        metrics.schedule_flush()
+        return response
+
+    @app.teardown_request
+    def _stop_timing(exc):
+        stop_recording()
+        profiler = g.pop('profiler', None)
+        if profiler is not None:
+            profiler.stop()
+
+    @app.route('/metrics')
+    def metrics_endpoint():
+        """Prometheus 指标"""
+        return Response(metrics.render(), mimetype='text/plain; version=0.0.4; charset=utf-8')
+
+    @app.route('/debug/profiles/<name>')
+    def download_profile(name):
+        """下载采样分析结果（折叠栈）"""
+        if not profiler_enabled:
+            abort(404)
+        return send_from_directory(profile_dir.resolve(), name, mimetype='text/plain')
+
+    app.extensions['blog_metrics'] = metrics
+    return metrics
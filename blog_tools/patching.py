@@ -0,0 +1,169 @@
+"""
+文章增量保存
+
+编辑器不再提交整篇文章，而是提交相对于某个已知版本（内容哈希）的修改:
+
+    {
+        "base_hash": "<编辑器打开时文件内容的哈希>",
+        "ops": [{"start": 10, "end": 12, "text": "新内容"}, ...],   # 正文修改
+        "fields": {"title": "新标题", "tags": ["a", "b"]}            # 修改过的 front matter 字段
+    }
+
+- ops 的位置以编辑器中的正文（front matter 之后、去掉首尾空白的部分）为基准，
+  单位与 JavaScript 字符串下标一致（UTF-16 码元），按位置排列且互不重叠
+- fields 只改写对应的 front matter 行（写法见 front_matter.py），其他行原样保留
+- base_hash 与当前文件不一致时说明文件已被其他地方修改，拒绝应用（PatchConflict）
+"""
+
+import hashlib
+import re
+from typing import Dict, List, Optional, Tuple
+
+from .front_matter import format_field
+
+# 可通过 fields 修改的 front matter 字段
+PATCH_FIELDS = ('title', 'date', 'updated', 'tags', 'categories', 'layout')
+LIST_FIELDS = ('tags', 'categories')
+
+_FIELD_LINE = re.compile(r'^([A-Za-z_][\w-]*)\s*:')
+
+
+class PatchError(ValueError):
+    """补丁格式错误或无法应用"""
+
+
+class PatchConflict(Exception):
+    """补丁的基准版本与当前文件不一致"""
+
+    def __init__(self, current_hash: str):
+        super().__init__("文章已被其他地方修改，请重新加载后再保存")
+        self.current_hash = current_hash
+
+
+def content_hash(text: str) -> str:
+    """文章内容哈希（编辑器用来标识自己基于哪个版本修改）"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()[:16]
+
+
+def utf16_length(text: str) -> int:
+    """文本长度（UTF-16 码元，与 ops 的位置单位一致）"""
+    return len(text.encode('utf-16-le', errors='surrogatepass')) // 2
+
+
+def split_document(content: str) -> Tuple[str, str, str, str]:
+    """拆分文章为 (front matter 块, 正文前空白, 正文, 正文后空白)
+
+    front matter 块包含首尾的 --- 行；四部分拼接后与原文完全一致。
+    """
+    head = ''
+    body = content
+    if content.startswith('---'):
+        end_idx = content.find('\n---', 3)
+        if end_idx != -1:
+            line_end = content.find('\n', end_idx + 4)
+            split_at = len(content) if line_end == -1 else line_end + 1
+            head, body = content[:split_at], content[split_at:]
+
+    stripped = body.strip()
+    if not stripped:
+        return head, body, '', ''
+    lead = body.index(stripped[0])
+    trail = lead + len(stripped)
+    return head, body[:lead], stripped, body[trail:]
+
+
+def _normalize_ops(ops, length: int) -> List[Tuple[int, int, str]]:
+    if not isinstance(ops, list):
+        raise PatchError("ops 必须是列表")
+
+    normalized = []
+    last_end = 0
+    for op in ops:
+        if not isinstance(op, dict):
+            raise PatchError("每个修改必须是对象")
+        start, end, text = op.get('start'), op.get('end', op.get('start')), op.get('text', '')
+        if not isinstance(start, int) or not isinstance(end, int) or not isinstance(text, str):
+            raise PatchError("修改的 start/end 必须是整数，text 必须是字符串")
+        if start < last_end or end < start or end > length:
+            raise PatchError(f"修改位置无效: {start}-{end}")
+        normalized.append((start, end, text))
+        last_end = end
+    return normalized
+
+
+def apply_ops(text: str, ops) -> str:
+    """在文本上应用修改（位置为 UTF-16 码元下标）"""
+    data = text.encode('utf-16-le')
+    normalized = _normalize_ops(ops, len(data) // 2)
+    if not normalized:
+        return text
+
+    parts = []
+    pos = 0
+    for start, end, insert in normalized:
+        parts.append(data[pos * 2:start * 2])
+        parts.append(insert.encode('utf-16-le', errors='surrogatepass'))
+        pos = end
+    parts.append(data[pos * 2:])
+
+    try:
+        return b''.join(parts).decode('utf-16-le')
+    except UnicodeDecodeError:
+        raise PatchError("修改位置落在代理对中间")
+
+
+def _format_field(key: str, value) -> List[str]:
+    if key in LIST_FIELDS and isinstance(value, str):
+        # 编辑器表单中的列表字段是逗号分隔的字符串
+        value = [item.strip() for item in value.split(',')]
+    return format_field(key, value)
+
+
+def set_front_matter_fields(head: str, fields: Dict) -> str:
+    """改写 front matter 中指定字段（包括其后的 "- item" 续行），其他行保持不变"""
+    unknown = set(fields) - set(PATCH_FIELDS)
+    if unknown:
+        raise PatchError(f"不支持修改的字段: {', '.join(sorted(unknown))}")
+    if not fields:
+        return head
+
+    if head:
+        lines = head.split('\n')
+        # lines[0] 为开头的 ---，结尾的 --- 行及之后的内容保持不变
+        close = next(i for i in range(len(lines) - 1, 0, -1) if lines[i].startswith('---'))
+        inner, tail = lines[1:close], lines[close:]
+    else:
+        inner, tail = [], ['---', '', '']
+
+    result = []
+    pending = dict(fields)
+    skipping = False
+    for line in inner:
+        match = _FIELD_LINE.match(line)
+        if match:
+            key = match.group(1)
+            skipping = key in pending
+            if skipping:
+                result.extend(_format_field(key, pending.pop(key)))
+                continue
+        elif skipping and (line.startswith((' ', '\t', '-')) or not line.strip()):
+            continue
+        else:
+            skipping = False
+        result.append(line)
+
+    for key, value in pending.items():
+        result.extend(_format_field(key, value))
+
+    return '\n'.join(['---'] + result + tail)
+
+
+def apply_patch(content: str, ops=None, fields: Optional[Dict] = None) -> Tuple[str, bool]:
+    """对整篇文章应用补丁，返回 (新内容, front matter 是否变化)"""
+    head, lead, body, trail = split_document(content)
+    new_body = apply_ops(body, ops or [])
+    new_head = set_front_matter_fields(head, fields or {})
+    if not body and new_body and not lead:
+        # 原正文为空：与 Web 界面保存格式一致，front matter 后空一行
+        lead, trail = '\n', '\n'
+    return new_head + lead + new_body + trail, new_head != head
@@ -0,0 +1,163 @@
+"""
+文章文件枚举
+
+source/_posts 可以按目录分层存放（如 _posts/2024/05/slug.md），文章ID 仍是文件名去掉 .md。
+递归枚举基于 os.scandir，文件状态直接取目录项（Windows 上不需要额外的 stat 调用，
+Linux 上用 d_type 判断类型，只为 .md 文件 stat）。跳过的内容:
+
+- 以 . 开头的文件和目录
+- draft-* 文件（drafts=True 时保留）
+- Hexo 的文章资源目录（与同目录下某篇文章同名的目录，如 slug/ 与 slug.md）
+
+PostTree 额外记住每个目录的 mtime 与其中的文件列表。目录的 mtime 只在其中有文件新增、删除、
+重命名时变化（本工具的原子写入也是重命名），prune=True 时 mtime 未变的目录不再列出，
+文件状态沿用上次结果，只检查子目录的 mtime。原地修改文件内容不会改变目录 mtime，
+因此调用方需要定期做一次完整扫描（见 PostIndex.full_scan_interval）。
+
+PageTree 枚举 source/ 下的页面（<slug>/index.md），跳过 _posts 等以 _ 或 . 开头的目录。
+"""
+
+import os
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# (路径字符串, 文件名, stat)
+PostFile = Tuple[str, str, os.stat_result]
+
+# 目录 mtime 距扫描时间小于该值（纳秒）时不信任：同一时间粒度内的后续修改不会再改变 mtime
+RACY_NS = 2 * 10 ** 9
+
+
+def _wanted(name: str, drafts: bool) -> bool:
+    return name.endswith('.md') and not name.startswith('.') and (drafts or not name.startswith('draft-'))
+
+
+def _list_dir(path: str, drafts: bool) -> Tuple[List[PostFile], List[Tuple[str, os.stat_result]]]:
+    """列出一个目录: (文章文件, [(子目录路径, stat)])"""
+    files, dirs = [], []
+    names = set()
+    with os.scandir(path) as it:
+        for entry in it:
+            name = entry.name
+            if name.startswith('.'):
+                continue
+            try:
+                if entry.is_dir():
+                    dirs.append(entry)
+                elif name.endswith('.md') and entry.is_file():
+                    names.add(name[:-3])
+                    if _wanted(name, drafts):
+                        files.append((entry.path, name, entry.stat()))
+            except OSError:
+                # 枚举过程中被删除
+                continue
+
+    subdirs = []
+    for entry in dirs:
+        if entry.name in names:
+            continue  # 文章资源目录
+        try:
+            subdirs.append((entry.path, entry.stat()))
+        except OSError:
+            continue
+    return files, subdirs
+
+
+def iter_post_files(root, drafts: bool = False) -> Iterator[PostFile]:
+    """递归枚举文章文件（每个目录先输出文件，再进入子目录）"""
+    stack = [os.fspath(root)]
+    while stack:
+        path = stack.pop()
+        try:
+            files, subdirs = _list_dir(path, drafts)
+        except OSError:
+            continue
+        yield from files
+        stack.extend(subdir for subdir, _ in reversed(subdirs))
+
+
+class PostTree:
+    """带目录 mtime 缓存的递归枚举"""
+
+    def __init__(self, root, drafts: bool = False):
+        self.root = os.fspath(root)
+        self.drafts = drafts
+        # 目录路径 -> (可信的 mtime_ns 或 None, 文章文件, 子目录路径)
+        self._dirs: Dict[str, Tuple[Optional[int], List[PostFile], List[str]]] = {}
+        self.listed = 0
+        self.pruned = 0
+
+    def scan(self, prune: bool = False) -> List[PostFile]:
+        """枚举全部文章文件；prune=True 时跳过 mtime 未变的目录（沿用上次的文件状态）"""
+        now = time.time_ns()
+        seen: Dict[str, Tuple[Optional[int], List[PostFile], List[str]]] = {}
+        result: List[PostFile] = []
+        self.listed = self.pruned = 0
+
+        try:
+            root_stat = os.stat(self.root)
+        except OSError:
+            self._dirs = {}
+            return result
+
+        stack: List[Tuple[str, os.stat_result]] = [(self.root, root_stat)]
+        while stack:
+            path, st = stack.pop()
+            mtime = st.st_mtime_ns
+            cached = self._dirs.get(path)
+            if prune and cached is not None and cached[0] == mtime:
+                _, files, subdir_paths = cached
+                subdirs = []
+                for subdir in subdir_paths:
+                    try:
+                        subdirs.append((subdir, os.stat(subdir)))
+                    except OSError:
+                        continue
+                self.pruned += 1
+            else:
+                try:
+                    files, subdirs = _list_dir(path, self.drafts)
+                except OSError:
+                    continue
+                self.listed += 1
+
+            trusted = mtime if now - mtime > RACY_NS else None
+            seen[path] = (trusted, files, [subdir for subdir, _ in subdirs])
+            result.extend(files)
+            stack.extend(reversed(subdirs))
+
+        self._dirs = seen
+        return result
+
+
+def page_id_for(file_path) -> str:
+    """页面ID: source/<slug>/index.md 的目录名"""
+    return os.path.basename(os.path.dirname(os.fspath(file_path)))
+
+
+class PageTree:
+    """页面枚举（页面数量少，每次都列出 source/；接口与 PostTree 相同）"""
+
+    INDEX_FILE = 'index.md'
+
+    def __init__(self, root):
+        self.root = os.fspath(root)
+        self.listed = 0
+        self.pruned = 0
+
+    def scan(self, prune: bool = False) -> List[PostFile]:
+        pages: List[PostFile] = []
+        try:
+            with os.scandir(self.root) as it:
+                dirs = [entry.path for entry in it
+                        if not entry.name.startswith(('_', '.')) and entry.is_dir()]
+        except OSError:
+            dirs = []
+        for path in dirs:
+            page_file = os.path.join(path, self.INDEX_FILE)
+            try:
+                pages.append((page_file, self.INDEX_FILE, os.stat(page_file)))
+            except OSError:
+                continue
+        self.listed = 1
+        return pages
@@ -0,0 +1,591 @@
+"""
+文章索引
+
+缓存 source/_posts 下每篇文章的元数据（按 mtime/size 增量刷新，只重新解析变化的文件），
+并维护标签、分类的聚合索引：
+- 标签 -> 按日期排序的文章ID
+- 分类（含层级路径，如 "CTF/工具"）-> 按日期排序的文章ID
+- 各标签/分类的文章数
+
+按标签或分类过滤时直接取对应的倒排列表，开销只与结果数量有关。
+
+source/ 下的页面（<slug>/index.md）使用同一个类建立页面索引（tree=PageTree, id_for=page_id_for）。
+
+文章目录可以分层存放（见 post_files.py）。扫描时也列出草稿，草稿不建索引，只和其他文件一起记入
+已占用的文件名集合（names），新建/导入文章时 O(1) 判断重名，不需要再遍历目录。定期刷新时跳过 mtime 未变的目录，
+每隔 full_scan_interval 秒（以及 refresh(force=True) 时）做一次完整扫描，发现原地修改的文件。
+
+多个进程（如多 worker 的 Web 服务）共享同一缓存文件：解析在文件锁内进行，
+并先采用其他进程已写入缓存的结果，同一篇文章的修改只会被解析一次。
+"""
+
+import os
+import json
+import time
+import bisect
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from .coordination import InterProcessLock
+from .fileutil import atomic_write_text
+from .post_files import PostTree
+from .timing import phase
+
+INDEX_VERSION = 2
+
+# 分类层级路径分隔符（Hexo 中 categories: [A, B] 表示 A 下的子分类 B）
+CATEGORY_SEP = '/'
+
+# 排序键: (日期, 文章ID)，列表按升序存放，倒序遍历即为最新在前
+SortKey = Tuple[str, str]
+
+
+def post_id_for(file_path) -> str:
+    """文章ID（与前端 slug 保持一致：文件名去掉 .md）"""
+    return os.path.splitext(os.path.basename(os.fspath(file_path)))[0]
+
+
+def is_post_file(name: str) -> bool:
+    """是否为需要索引的文章文件（跳过草稿）"""
+    return name.endswith('.md') and not name.startswith('draft-')
+
+
+def as_list(value) -> List[str]:
+    """front matter 中的 tags/categories 统一为字符串列表"""
+    if not value:
+        return []
+    if isinstance(value, str):
+        return [value]
+    return [str(v) for v in value if str(v)]
+
+
+class PostIndex:
+    """文章元数据索引"""
+
+    def __init__(self, posts_dir: Path, parser: Callable[[Path], Dict],
+                 cache_file: Optional[Path] = None, refresh_interval: float = 1.0,
+                 full_scan_interval: float = 30.0, tree=None,
+                 id_for: Callable[[Path], str] = post_id_for):
+        self.posts_dir = Path(posts_dir)
+        self.parser = parser
+        self.id_for = id_for
+        self.cache_file = Path(cache_file) if cache_file else None
+        self.refresh_interval = refresh_interval
+        self.full_scan_interval = full_scan_interval
+        self.tree = tree or PostTree(self.posts_dir, drafts=True)
+
+        self.posts: Dict[str, Dict] = {}
+        self.stat: Dict[str, Tuple[int, int]] = {}
+
+        self.tags: Dict[str, List[SortKey]] = {}
+        self.categories: Dict[str, List[SortKey]] = {}
+        self.category_paths: Dict[str, List[SortKey]] = {}
+        self._order: List[SortKey] = []
+
+        self._lock = threading.RLock()
+        self._file_lock = InterProcessLock(self.cache_file.with_suffix('.lock')) if self.cache_file else None
+        # 最近一次读写缓存文件时的 (mtime_ns, size)
+        self._cache_signature: Optional[Tuple[int, int]] = None
+        self._loaded = False
+        self._dirty = False
+        # 文章ID -> 同名文件路径（排序后第一个被索引）
+        self.duplicates: Dict[str, List[str]] = {}
+        # 已占用的文件名（文章ID、草稿与重名文件），随刷新与写入更新
+        self._names: Set[str] = set()
+        self._last_refresh = 0.0
+        self._last_full_scan = 0.0
+        self._listeners: List[Callable[[str, Optional[Dict], Optional[Dict]], None]] = []
+
+    # ------------------------------------------------------------------
+    # 聚合索引维护
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _sort_key(post_id: str, record: Dict) -> SortKey:
+        return (str(record.get('date', '') or ''), post_id)
+
+    @staticmethod
+    def _posting_add(mapping: Dict[str, List[SortKey]], key: str, sort_key: SortKey):
+        postings = mapping.setdefault(key, [])
+        pos = bisect.bisect_left(postings, sort_key)
+        if pos == len(postings) or postings[pos] != sort_key:
+            postings.insert(pos, sort_key)
+
+    @staticmethod
+    def _posting_remove(mapping: Dict[str, List[SortKey]], key: str, sort_key: SortKey):
+        postings = mapping.get(key)
+        if not postings:
+            return
+        pos = bisect.bisect_left(postings, sort_key)
+        if pos < len(postings) and postings[pos] == sort_key:
+            del postings[pos]
+        if not postings:
+            del mapping[key]
+
+    @staticmethod
+    def category_paths_for(categories: List[str]) -> List[str]:
+        """分类层级路径: [A, B, C] -> ['A', 'A/B', 'A/B/C']"""
+        paths = []
+        for i in range(len(categories)):
+            paths.append(CATEGORY_SEP.join(categories[:i + 1]))
+        return paths
+
+    def _index_record(self, post_id: str, record: Dict):
+        sort_key = self._sort_key(post_id, record)
+        bisect.insort(self._order, sort_key)
+        for tag in set(record['tags']):
+            self._posting_add(self.tags, tag, sort_key)
+        for category in set(record['categories']):
+            self._posting_add(self.categories, category, sort_key)
+        for path in self.category_paths_for(record['categories']):
+            self._posting_add(self.category_paths, path, sort_key)
+
+    def _unindex_record(self, post_id: str, record: Dict):
+        sort_key = self._sort_key(post_id, record)
+        pos = bisect.bisect_left(self._order, sort_key)
+        if pos < len(self._order) and self._order[pos] == sort_key:
+            del self._order[pos]
+        for tag in set(record['tags']):
+            self._posting_remove(self.tags, tag, sort_key)
+        for category in set(record['categories']):
+            self._posting_remove(self.categories, category, sort_key)
+        for path in self.category_paths_for(record['categories']):
+            self._posting_remove(self.category_paths, path, sort_key)
+
+    def _rebuild_aggregates(self):
+        self.tags, self.categories, self.category_paths = {}, {}, {}
+        self._order = []
+        for post_id, record in self.posts.items():
+            self._index_record(post_id, record)
+
+    # ------------------------------------------------------------------
+    # 文章记录
+    # ------------------------------------------------------------------
+
+    def _build_record(self, file_path: Path) -> Dict:
+        with phase('parse'):
+            record = self.parser(file_path)
+        return self._normalize_record(file_path, record)
+
+    def _normalize_record(self, file_path: Path, record: Dict) -> Dict:
+        record = dict(record)
+        record['id'] = self.id_for(file_path)
+        record['tags'] = as_list(record.get('tags'))
+        record['categories'] = as_list(record.get('categories'))
+        return record
+
+    def _put(self, post_id: str, record: Optional[Dict], stat: Optional[Tuple[int, int]], notify: bool = True):
+        """替换（或删除）一篇文章的记录，并增量更新聚合索引；notify=False 时不通知监听器"""
+        old = self.posts.get(post_id)
+        if old is not None:
+            self._unindex_record(post_id, old)
+            del self.posts[post_id]
+            self.stat.pop(post_id, None)
+
+        if record is not None:
+            self.posts[post_id] = record
+            self.stat[post_id] = stat
+            self._index_record(post_id, record)
+
+        self._dirty = True
+        if notify:
+            self._notify(post_id, old, record)
+
+    def _notify(self, post_id: str, old: Optional[Dict], record: Optional[Dict]):
+        for listener in self._listeners:
+            try:
+                listener(post_id, old, record)
+            except Exception as e:
+                print(f"⚠️  索引监听器出错 {post_id}: {e}")
+
+    def add_listener(self, listener: Callable[[str, Optional[Dict], Optional[Dict]], None]):
+        """注册变更回调 listener(post_id, old_record, new_record)，删除时 new_record 为 None
+
+        只通知本进程发现或写入的变更；从缓存文件采用的其他进程的结果不通知，
+        多个 worker 各自注册的监听器（如构建调度）对同一次修改只会有一个被触发。
+        """
+        self._listeners.append(listener)
+
+    def name_taken(self, name: str) -> bool:
+        """文件名（不含 .md）是否已被文章或草稿占用（不触发刷新，调用方先 refresh）"""
+        return name in self._names
+
+    def update_file(self, file_path: Path) -> Optional[Dict]:
+        """文章写入后立即更新索引（不等待下一次刷新）"""
+        file_path = Path(file_path)
+        post_id = self.id_for(file_path)
+        with self._lock:
+            self.ensure_loaded()
+            if not is_post_file(file_path.name) or not file_path.exists():
+                if file_path.exists():
+                    self._names.add(post_id)
+                self._put(post_id, None, None)
+                return None
+
+            with self._interprocess():
+                st = file_path.stat()
+                record = self._build_record(file_path)
+                self._put(post_id, record, (st.st_mtime_ns, st.st_size))
+                self.save()
+            return dict(record)
+
+    def update_record(self, file_path: Path, record: Dict) -> List[str]:
+        """用调用方已解析好的记录更新索引（增量保存时不再重新读取文件），返回变化的字段
+
+        字段没有变化时只更新文件状态，不通知监听器；日期、标签、分类不变时不改动倒排列表。
+        """
+        file_path = Path(file_path)
+        post_id = self.id_for(file_path)
+        record = self._normalize_record(file_path, record)
+        with self._lock:
+            self.ensure_loaded()
+            with self._interprocess():
+                st = file_path.stat()
+                signature = (st.st_mtime_ns, st.st_size)
+                old = self.posts.get(post_id)
+                if old is None:
+                    self._put(post_id, record, signature)
+                    self.save()
+                    return sorted(record)
+
+                changed = sorted(key for key in set(old) | set(record) if old.get(key) != record.get(key))
+                if not changed:
+                    if self.stat.get(post_id) != signature:
+                        self.stat[post_id] = signature
+                        self._dirty = True
+                        self.save()
+                    return []
+
+                if self._sort_key(post_id, old) != self._sort_key(post_id, record) or \
+                        old['tags'] != record['tags'] or old['categories'] != record['categories']:
+                    self._put(post_id, record, signature)
+                else:
+                    self.posts[post_id] = record
+                    self.stat[post_id] = signature
+                    self._dirty = True
+                    self._notify(post_id, old, record)
+                self.save()
+                return changed
+
+    def update_records(self, items: Iterable[Tuple[Path, Dict]]) -> int:
+        """批量写入文章后用调用方已解析好的记录一次性更新索引（只保存一次），返回更新的文章数"""
+        count = 0
+        with self._lock:
+            self.ensure_loaded()
+            with self._interprocess():
+                for file_path, record in items:
+                    file_path = Path(file_path)
+                    self._names.add(self.id_for(file_path))
+                    if not is_post_file(file_path.name):
+                        continue
+                    st = file_path.stat()
+                    self._put(self.id_for(file_path), self._normalize_record(file_path, record),
+                              (st.st_mtime_ns, st.st_size))
+                    count += 1
+                self.save()
+        return count
+
+    def remove_file(self, file_path: Path):
+        """文章删除后从索引中移除"""
+        with self._lock:
+            self.ensure_loaded()
+            post_id = self.id_for(Path(file_path))
+            self._names.discard(post_id)
+            if post_id in self.posts:
+                with self._interprocess():
+                    self._put(post_id, None, None)
+                    self.save()
+
+    # ------------------------------------------------------------------
+    # 加载 / 刷新 / 持久化
+    # ------------------------------------------------------------------
+
+    def load(self) -> bool:
+        """从缓存文件加载索引"""
+        if not self.cache_file or not self.cache_file.exists():
+            return False
+
+        data = self._read_cache()
+        if data is None:
+            return False
+
+        self.posts = {}
+        self.stat = {}
+        for post_id, entry in data.get('posts', {}).items():
+            self.posts[post_id] = entry['info']
+            self.stat[post_id] = tuple(entry['stat'])
+        self._rebuild_aggregates()
+        return True
+
+    def _cache_file_signature(self) -> Optional[Tuple[int, int]]:
+        try:
+            st = self.cache_file.stat()
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _read_cache(self) -> Optional[Dict]:
+        """读取缓存文件（版本或目录不匹配时返回 None）"""
+        signature = self._cache_file_signature()
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️  索引缓存损坏，将重新构建: {e}")
+            return None
+
+        if data.get('version') != INDEX_VERSION or data.get('posts_dir') != str(self.posts_dir):
+            return None
+        self._cache_signature = signature
+        return data
+
+    def _interprocess(self):
+        """进程间互斥（没有缓存文件时只使用线程锁）"""
+        return self._file_lock() if self._file_lock else self._lock
+
+    def _adopt_cached(self, entries: Dict[str, os.stat_result]):
+        """采用其他进程已解析并写入缓存的记录（仅限与当前文件状态一致的条目）"""
+        if not self.cache_file or self._cache_file_signature() in (None, self._cache_signature):
+            return
+        data = self._read_cache()
+        if data is None:
+            return
+        cached = data.get('posts', {})
+        for post_id, entry in cached.items():
+            st = entries.get(post_id)
+            signature = tuple(entry['stat'])
+            if st is not None and signature == (st.st_mtime_ns, st.st_size) and self.stat.get(post_id) != signature:
+                self._put(post_id, entry['info'], signature, notify=False)
+        # 其他进程已记录的删除
+        for post_id in list(self.posts):
+            if post_id not in entries and post_id not in cached:
+                self._put(post_id, None, None, notify=False)
+
+    def save(self):
+        """保存索引到缓存文件（仅在有变化时写入）"""
+        if not self.cache_file or not self._dirty:
+            return
+
+        data = {
+            'version': INDEX_VERSION,
+            'posts_dir': str(self.posts_dir),
+            'posts': {
+                post_id: {'stat': list(self.stat[post_id]), 'info': record}
+                for post_id, record in self.posts.items()
+            }
+        }
+        try:
+            atomic_write_text(self.cache_file, json.dumps(data, ensure_ascii=False))
+            self._cache_signature = self._cache_file_signature()
+            self._dirty = False
+        except OSError as e:
+            print(f"⚠️  保存索引缓存失败: {e}")
+
+    def ensure_loaded(self):
+        with self._lock:
+            if not self._loaded:
+                self.load()
+                self._loaded = True
+                self.refresh(force=True)
+
+    def _report_duplicates(self, duplicates: Dict[str, List[str]]):
+        """新出现的重名文章输出警告（完整列表见 duplicates 属性与 debug validate）"""
+        for post_id, paths in duplicates.items():
+            if self.duplicates.get(post_id) != paths:
+                print(f"⚠️  文章ID重复: {post_id} 只索引 {paths[0]}，忽略 {', '.join(paths[1:])}")
+        self.duplicates = duplicates
+
+    def refresh(self, force: bool = False) -> List[str]:
+        """按 mtime/size 增量刷新索引，返回发生变化的文章ID"""
+        with self._lock:
+            if not self._loaded:
+                self.ensure_loaded()
+                return []
+
+            now = time.monotonic()
+            if not force and now - self._last_refresh < self.refresh_interval:
+                return []
+
+            full = force or now - self._last_full_scan >= self.full_scan_interval
+            with phase('scan'):
+                files = self.tree.scan(prune=not full)
+            if full:
+                self._last_full_scan = now
+            elif not self.tree.listed:
+                # 所有目录的 mtime 都未变化
+                self._last_refresh = time.monotonic()
+                return []
+
+            # 不同目录中的同名文章ID相同，只索引路径排序最前的一篇，其余记入 duplicates
+            entries: Dict[str, Tuple[str, os.stat_result]] = {}
+            duplicates: Dict[str, List[str]] = {}
+            names: Set[str] = set()
+            for path, name, st in files:
+                post_id = self.id_for(path)
+                names.add(post_id)
+                if not is_post_file(name):
+                    continue
+                kept = entries.get(post_id)
+                if kept is None:
+                    entries[post_id] = (path, st)
+                    continue
+                paths = duplicates.setdefault(post_id, [kept[0]])
+                paths.append(path)
+                paths.sort()
+                if paths[0] == path:
+                    entries[post_id] = (path, st)
+            self._report_duplicates(duplicates)
+            self._names = names
+
+            def _stale(post_id, st, path=None):
+                if self.stat.get(post_id) != (st.st_mtime_ns, st.st_size):
+                    return True
+                # 移动到其他目录的文章（重命名不改变 mtime/size）
+                return path is not None and self.posts[post_id].get('path') != path
+
+            changed = []
+            if any(_stale(post_id, st, path) for post_id, (path, st) in entries.items()) or \
+                    any(post_id not in entries for post_id in self.posts):
+                with self._interprocess():
+                    before = dict(self.stat)
+                    self._adopt_cached({post_id: st for post_id, (_, st) in entries.items()})
+
+                    moved = set()
+                    for post_id, (path, st) in entries.items():
+                        if _stale(post_id, st, path):
+                            if self.stat.get(post_id) == (st.st_mtime_ns, st.st_size):
+                                moved.add(post_id)
+                            self._put(post_id, self._build_record(Path(path)), (st.st_mtime_ns, st.st_size))
+
+                    for post_id in list(self.posts):
+                        if post_id not in entries:
+                            self._put(post_id, None, None)
+
+                    self.save()
+                    changed = sorted(moved | {post_id for post_id in set(before) | set(self.stat)
+                                              if before.get(post_id) != self.stat.get(post_id)})
+
+            self._last_refresh = time.monotonic()
+            return changed
+
+    # ------------------------------------------------------------------
+    # 查询
+    # ------------------------------------------------------------------
+
+    def _records(self, postings: List[SortKey]) -> List[Dict]:
+        return [dict(self.posts[post_id]) for _, post_id in reversed(postings)]
+
+    def get(self, post_id: str) -> Optional[Dict]:
+        with self._lock:
+            self.refresh()
+            record = self.posts.get(post_id)
+            return dict(record) if record else None
+
+    def all_posts(self) -> List[Dict]:
+        """所有文章（按日期倒序）"""
+        with self._lock:
+            self.refresh()
+            return self._records(self._order)
+
+    def post_ids(self) -> List[str]:
+        """所有文章ID（按日期倒序）"""
+        with self._lock:
+            self.refresh()
+            return [post_id for _, post_id in reversed(self._order)]
+
+    def posts_by_tag(self, tag: str) -> List[Dict]:
+        with self._lock:
+            self.refresh()
+            return self._records(self.tags.get(tag, []))
+
+    def posts_by_category(self, category: str) -> List[Dict]:
+        """按分类过滤；包含分隔符时按层级路径匹配（含子分类）"""
+        with self._lock:
+            self.refresh()
+            if CATEGORY_SEP in category:
+                return self._records(self.category_paths.get(category, []))
+            return self._records(self.categories.get(category, []))
+
+    def filter_posts(self, category: str = None, tag: str = None) -> List[Dict]:
+        """按分类和/或标签过滤，同时指定时遍历较短的倒排列表"""
+        with self._lock:
+            self.refresh()
+            if not category and not tag:
+                return self._records(self._order)
+            if category and not tag:
+                return self.posts_by_category(category)
+            if tag and not category:
+                return self.posts_by_tag(tag)
+
+            tag_postings = self.tags.get(tag, [])
+            if CATEGORY_SEP in category:
+                cat_postings = self.category_paths.get(category, [])
+            else:
+                cat_postings = self.categories.get(category, [])
+
+            shorter, longer = sorted((tag_postings, cat_postings), key=len)
+            longer_set = set(longer)
+            return self._records([key for key in shorter if key in longer_set])
+
+    def tag_counts(self) -> Dict[str, int]:
+        with self._lock:
+            self.refresh()
+            return {tag: len(postings) for tag, postings in self.tags.items()}
+
+    def category_counts(self) -> Dict[str, int]:
+        with self._lock:
+            self.refresh()
+            return {category: len(postings) for category, postings in self.categories.items()}
+
+    def category_tree(self) -> List[Dict]:
+        """分类层级树（按文章数降序）"""
+        with self._lock:
+            self.refresh()
+            nodes: Dict[str, Dict] = {}
+            roots: List[Dict] = []
+            for path in sorted(self.category_paths, key=lambda p: p.count(CATEGORY_SEP)):
+                postings = self.category_paths[path]
+                node = {
+                    'name': path.rsplit(CATEGORY_SEP, 1)[-1],
+                    'path': path,
+                    'count': len(postings),
+                    'posts': [post_id for _, post_id in reversed(postings)],
+                    'children': []
+                }
+                nodes[path] = node
+                parent = path.rsplit(CATEGORY_SEP, 1)[0] if CATEGORY_SEP in path else None
+                if parent in nodes:
+                    nodes[parent]['children'].append(node)
+                else:
+                    roots.append(node)
+
+            def _sort(children: List[Dict]):
+                children.sort(key=lambda n: (-n['count'], n['name']))
+                for child in children:
+                    _sort(child['children'])
+
+            _sort(roots)
+            return roots
+
+    def taxonomy(self) -> Dict:
+        """标签/分类聚合数据（供 Web API 与 Next.js 前端使用）"""
+        with self._lock:
+            self.refresh()
+
+            def _entries(mapping: Dict[str, List[SortKey]]) -> List[Dict]:
+                entries = [{
+                    'name': name,
+                    'count': len(postings),
+                    'posts': [post_id for _, post_id in reversed(postings)]
+                } for name, postings in mapping.items()]
+                entries.sort(key=lambda e: (-e['count'], e['name']))
+                return entries
+
+            return {
+                'version': INDEX_VERSION,
+                'postsCount': len(self.posts),
+                'tags': _entries(self.tags),
+                'categories': _entries(self.categories),
+                'categoryTree': self.category_tree()
+            }
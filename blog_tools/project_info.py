@@ -0,0 +1,83 @@
+"""
+项目信息缓存
+
+/api/project_info 需要的信息来源不同、变化频率也不同:
+- Hexo / Node.js 版本: 每个进程只检测一次（需要运行 npx / node 子进程）
+- 主题: 读取 _config.yml，按文件 mtime 缓存，配置修改后自动失效
+- 文章数: 直接取自文章索引
+
+并发请求会合并到同一次计算上，不会同时启动多组子进程。
+"""
+
+import subprocess
+from typing import Dict, Optional, Tuple
+
+from .coordination import SingleFlight
+from .timing import phase
+
+
+class ProjectInfo:
+    """项目信息（工具链版本、主题、文章数）"""
+
+    def __init__(self, writer):
+        self.writer = writer
+        self._flight = SingleFlight()
+        self._toolchain: Optional[Dict[str, str]] = None
+        self._theme: Optional[Tuple[Optional[int], str]] = None  # (_config.yml mtime_ns, 主题)
+
+    def _detect_toolchain(self) -> Dict[str, str]:
+        with phase('subprocess'):
+            try:
+                # 获取 Hexo 版本信息
+                result = subprocess.run(['npx', 'hexo', 'version'],
+                                        capture_output=True, text=True,
+                                        cwd=self.writer.blog_path)
+                hexo_version = result.stdout.split('\n')[0] if result.returncode == 0 else 'Unknown'
+            except OSError:
+                hexo_version = 'Unknown'
+
+            try:
+                # 获取 Node.js 版本
+                result = subprocess.run(['node', '--version'], capture_output=True, text=True)
+                node_version = result.stdout.strip() if result.returncode == 0 else 'Unknown'
+            except OSError:
+                node_version = 'Unknown'
+
+        return {
+            'hexo_version': hexo_version.replace('hexo-cli: ', ''),
+            'node_version': node_version
+        }
+
+    def toolchain(self) -> Dict[str, str]:
+        """Hexo / Node.js 版本（每个进程只检测一次）"""
+        if self._toolchain is None:
+            self._toolchain = self._flight.do('toolchain', self._detect_toolchain)
+        return self._toolchain
+
+    def _read_theme(self, mtime: Optional[int]) -> Tuple[Optional[int], str]:
+        theme = 'Unknown'
+        if mtime is not None:
+            with open(self.writer.config_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if line.strip().startswith('theme:'):
+                        theme = line.split(':')[1].strip()
+                        break
+        return (mtime, theme)
+
+    def theme(self) -> str:
+        """当前主题（_config.yml 修改后重新读取）"""
+        try:
+            mtime = self.writer.config_file.stat().st_mtime_ns
+        except OSError:
+            mtime = None
+
+        cached = self._theme
+        if cached is None or cached[0] != mtime:
+            cached = self._theme = self._flight.do(('theme', mtime), lambda: self._read_theme(mtime))
+        return cached[1]
+
+    def get(self) -> Dict:
+        info = dict(self.toolchain())
+        info['post_count'] = len(self.writer.index.post_ids())
+        info['theme'] = self.theme()
+        return info
@@ -0,0 +1,425 @@
+"""
+正则搜索
+
+`search --regex` 与 `/api/search?mode=regex` 的实现:
+
+1. 从正则表达式的语法树中提取匹配必然包含的三字母组（trigram）条件，例如
+   `CVE-20\\d\\d-\\d+` -> "cve" AND "ve-" AND "e-2" AND "-20"（字面量统一转为小写）
+2. 常驻进程（daemon / Web）在内存中维护 三字母组 -> 文章 的倒排列表，求交/并集得到候选文章；
+   一次性的命令行进程不建索引，直接扫描全部文章
+3. 只对候选文章执行完整的正则匹配
+
+每次查询有总的超时时间，防止灾难性回溯的表达式卡住进程:
+- 安装了 regex 模块时使用它的 timeout 参数（任意线程可用）
+- 否则在主线程中用 SIGALRM 定时器中断匹配
+- 两者都不可用时（例如 Web 的工作线程）拒绝含嵌套无界重复的表达式（如 `(a+)+`），并在文章之间检查超时
+"""
+
+import re
+import time
+import signal
+import bisect
+import threading
+from array import array
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+
+try:
+    from re import _parser as sre_parse, _constants as sre_constants
+except ImportError:  # pragma: no cover - Python < 3.11
+    import sre_parse
+    import sre_constants
+
+# 可选依赖: regex 模块支持匹配超时
+try:
+    import regex as regex_module
+except ImportError:  # pragma: no cover - 可选依赖
+    regex_module = None
+
+# 每次查询的默认超时（秒）
+REGEX_TIMEOUT = 2.0
+
+# 每篇文章最多返回的匹配行数与每行最大长度
+MAX_MATCH_LINES = 3
+MAX_LINE_LENGTH = 200
+
+# 变化的文章超过该数量时在后台线程中更新索引（期间的查询扫描全部文章）
+INDEX_SYNC_LIMIT = 200
+
+# 展开为确定字符串集合的上限（超过后转为三字母组条件）
+_MAX_EXACT = 64
+_MAX_CLASS = 10
+
+# 三字母组条件: None 表示不限制；字符串为单个三字母组；('and'|'or', [子条件])
+Query = Union[None, str, Tuple[str, List]]
+
+
+class RegexSearchError(ValueError):
+    """正则表达式无效或不安全"""
+
+
+class RegexTimeout(RegexSearchError):
+    """正则搜索超时"""
+
+
+# ----------------------------------------------------------------------
+# 三字母组条件提取
+# ----------------------------------------------------------------------
+
+def trigrams(text: str) -> Set[str]:
+    return set(map(''.join, zip(text, text[1:], text[2:])))
+
+
+def _and(*queries: Query) -> Query:
+    items = []
+    for query in queries:
+        if query is None:
+            continue
+        if isinstance(query, tuple) and query[0] == 'and':
+            items.extend(query[1])
+        elif query not in items:
+            items.append(query)
+    if not items:
+        return None
+    return items[0] if len(items) == 1 else ('and', items)
+
+
+def _or(queries: List[Query]) -> Query:
+    items = []
+    for query in queries:
+        if query is None:
+            return None
+        if isinstance(query, tuple) and query[0] == 'or':
+            items.extend(query[1])
+        elif query not in items:
+            items.append(query)
+    return items[0] if len(items) == 1 else ('or', items)
+
+
+def _exact_query(strings: Optional[Set[str]]) -> Query:
+    """确定字符串集合 -> 条件（任一字符串的全部三字母组）"""
+    if not strings:
+        return None
+    return _or([_and(*sorted(trigrams(s))) if len(s) >= 3 else None for s in strings])
+
+
+class _Info:
+    """子表达式的分析结果: exact 为其能匹配的全部字符串（未知时为 None），match 为额外条件"""
+
+    __slots__ = ('exact', 'match')
+
+    def __init__(self, exact: Optional[Set[str]] = None, match: Query = None):
+        self.exact = exact
+        self.match = match
+
+    def query(self) -> Query:
+        return _and(self.match, _exact_query(self.exact))
+
+
+_ANY = _Info()
+
+
+def _analyze_class(items) -> _Info:
+    chars = set()
+    for op, av in items:
+        if op is sre_constants.LITERAL:
+            chars.add(chr(av).lower())
+        elif op is sre_constants.RANGE and av[1] - av[0] < _MAX_CLASS:
+            chars.update(chr(c).lower() for c in range(av[0], av[1] + 1))
+        else:
+            # NEGATE、CATEGORY（\d \w 等包含 Unicode 字符）或大范围
+            return _ANY
+        if len(chars) > _MAX_CLASS:
+            return _ANY
+    return _Info(exact=chars)
+
+
+def _analyze_sequence(items) -> _Info:
+    """连接: 相邻的确定字符串做笛卡尔积，其余部分的条件取与"""
+    match: Query = None
+    run: Set[str] = {''}
+    exact = True
+    for item in items:
+        info = _analyze(item)
+        match = _and(match, info.match)
+        if info.exact is None:
+            match = _and(match, _exact_query(run))
+            run, exact = {''}, False
+        elif len(run) * len(info.exact) > _MAX_EXACT:
+            match = _and(match, _exact_query(run))
+            run, exact = set(info.exact), False
+        else:
+            run = {a + b for a in run for b in info.exact}
+    if exact:
+        return _Info(exact=run, match=match)
+    return _Info(match=_and(match, _exact_query(run)))
+
+
+def _analyze(item) -> _Info:
+    op, av = item
+    if op is sre_constants.LITERAL:
+        return _Info(exact={chr(av).lower()})
+    if op is sre_constants.IN:
+        return _analyze_class(av)
+    if op is sre_constants.SUBPATTERN:
+        return _analyze_sequence(av[-1])
+    if op is getattr(sre_constants, 'ATOMIC_GROUP', None):
+        return _analyze_sequence(av)
+    if op is sre_constants.BRANCH:
+        infos = [_analyze_sequence(alternative) for alternative in av[1]]
+        if all(info.exact is not None and info.match is None for info in infos):
+            exact = set().union(*(info.exact for info in infos))
+            if len(exact) <= _MAX_EXACT:
+                return _Info(exact=exact)
+        return _Info(match=_or([info.query() for info in infos]))
+    if op in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT,
+              getattr(sre_constants, 'POSSESSIVE_REPEAT', None)):
+        low, high, sub = av
+        if low == 0:
+            return _ANY
+        info = _analyze_sequence(sub)
+        if low == high and info.exact is not None and len(info.exact) ** low <= _MAX_EXACT:
+            exact = {''}
+            for _ in range(low):
+                exact = {a + b for a in exact for b in info.exact}
+            return _Info(exact=exact, match=info.match)
+        return _Info(match=info.query())
+    if op in (sre_constants.AT, sre_constants.ASSERT, sre_constants.ASSERT_NOT):
+        # 不消耗字符（前瞻/后顾的内容不作为条件）
+        return _Info(exact={''})
+    # ANY、NOT_LITERAL、GROUPREF 等
+    return _ANY
+
+
+def trigram_query(pattern: str) -> Query:
+    """正则表达式 -> 匹配文本（转小写后）必然满足的三字母组条件"""
+    try:
+        parsed = sre_parse.parse(pattern)
+    except re.error as e:
+        raise RegexSearchError(f"无效的正则表达式: {e}")
+    return _analyze_sequence(list(parsed)).query()
+
+
+def _has_nested_repeat(items, inside_repeat: bool = False) -> bool:
+    """是否有无界重复嵌套在另一个无界重复中（灾难性回溯的典型形式）"""
+    for op, av in items:
+        if op in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT):
+            unbounded = av[1] == sre_constants.MAXREPEAT
+            if unbounded and inside_repeat:
+                return True
+            if _has_nested_repeat(av[2], inside_repeat or unbounded):
+                return True
+        elif op is sre_constants.SUBPATTERN:
+            if _has_nested_repeat(av[-1], inside_repeat):
+                return True
+        elif op is sre_constants.BRANCH:
+            if any(_has_nested_repeat(alternative, inside_repeat) for alternative in av[1]):
+                return True
+    return False
+
+
+# ----------------------------------------------------------------------
+# 倒排索引
+# ----------------------------------------------------------------------
+
+class TrigramIndex:
+    """三字母组 -> 文章编号（递增数组）；文章修改后分配新编号，旧编号在压缩前被过滤掉"""
+
+    def __init__(self):
+        self.postings: Dict[str, array] = {}
+        # 文章键 -> (编号, 文件签名)
+        self.docs: Dict[str, Tuple[int, Tuple]] = {}
+        # 有效编号 -> 文章键
+        self.keys: Dict[int, str] = {}
+        self._next_id = 0
+        self._dead = 0
+        self._lock = threading.Lock()
+
+    def signature(self, key: str) -> Optional[Tuple]:
+        entry = self.docs.get(key)
+        return entry[1] if entry else None
+
+    def update(self, key: str, signature: Tuple, text: str):
+        """索引（已转小写的）文章内容"""
+        grams = trigrams(text)
+        with self._lock:
+            self._drop(key)
+            doc_id = self._next_id
+            self._next_id += 1
+            self.docs[key] = (doc_id, signature)
+            self.keys[doc_id] = key
+            for gram in grams:
+                posting = self.postings.get(gram)
+                if posting is None:
+                    posting = self.postings[gram] = array('I')
+                posting.append(doc_id)
+
+    def _drop(self, key: str):
+        entry = self.docs.pop(key, None)
+        if entry is not None:
+            del self.keys[entry[0]]
+            self._dead += 1
+
+    def retain(self, keys: Iterable[str]):
+        """删除不在 keys 中的文章，过期编号过多时压缩倒排列表"""
+        keep = set(keys)
+        with self._lock:
+            for key in [key for key in self.docs if key not in keep]:
+                self._drop(key)
+            if self._dead > max(len(self.keys), 1000):
+                self._compact()
+
+    def _compact(self):
+        live = self.keys
+        for gram in list(self.postings):
+            posting = array('I', (doc_id for doc_id in self.postings[gram] if doc_id in live))
+            if posting:
+                self.postings[gram] = posting
+            else:
+                del self.postings[gram]
+        self._dead = 0
+
+    def _estimate(self, query: Query) -> int:
+        if isinstance(query, str):
+            return len(self.postings.get(query, ()))
+        return len(self.keys)
+
+    def _evaluate(self, query: Query) -> Optional[Set[int]]:
+        if query is None:
+            return None
+        if isinstance(query, str):
+            return set(self.postings.get(query, ()))
+
+        op, children = query
+        if op == 'or':
+            result = set()
+            for child in children:
+                ids = self._evaluate(child)
+                if ids is None:
+                    return None
+                result |= ids
+            return result
+
+        # and: 从最短的倒排列表开始求交集
+        result = None
+        for child in sorted(children, key=self._estimate):
+            if result is not None and isinstance(child, str):
+                posting = self.postings.get(child, ())
+                if len(result) * 16 < len(posting):
+                    # 候选很少时在有序数组中二分查找
+                    result = {doc_id for doc_id in result if _contains(posting, doc_id)}
+                else:
+                    result.intersection_update(posting)
+            else:
+                ids = self._evaluate(child)
+                if ids is not None:
+                    result = ids if result is None else result & ids
+            if result is not None and not result:
+                break
+        return result
+
+    def candidates(self, query: Query) -> Optional[Set[str]]:
+        """满足条件的文章键；条件不限制时返回 None（需要检查全部文章）"""
+        with self._lock:
+            ids = self._evaluate(query)
+            if ids is None:
+                return None
+            return {self.keys[doc_id] for doc_id in ids if doc_id in self.keys}
+
+
+def _contains(posting: array, doc_id: int) -> bool:
+    i = bisect.bisect_left(posting, doc_id)
+    return i < len(posting) and posting[i] == doc_id
+
+
+# ----------------------------------------------------------------------
+# 查询
+# ----------------------------------------------------------------------
+
+class RegexQuery:
+    """一次正则搜索：编译表达式、提取条件、带超时地在文章内容中查找匹配行"""
+
+    def __init__(self, pattern: str, timeout: float = REGEX_TIMEOUT):
+        if not pattern:
+            raise RegexSearchError("正则表达式不能为空")
+        self.pattern = pattern
+        self.timeout = timeout
+
+        flags = re.MULTILINE
+        try:
+            if regex_module is not None:
+                self.compiled = regex_module.compile(pattern, flags | regex_module.VERSION0)
+            else:
+                self.compiled = re.compile(pattern, flags)
+        except (re.error, getattr(regex_module, 'error', re.error)) as e:
+            raise RegexSearchError(f"无效的正则表达式: {e}")
+        self._hard_timeout = regex_module is not None
+
+        try:
+            self.query = trigram_query(pattern)
+        except RegexSearchError:
+            # regex 模块特有的语法（如 \p{L}）：不做预筛选
+            self.query = None
+        self.deadline = None
+
+    def _can_alarm(self) -> bool:
+        return hasattr(signal, 'setitimer') and threading.current_thread() is threading.main_thread()
+
+    @contextmanager
+    def running(self):
+        """查询期间的超时控制"""
+        self.deadline = time.monotonic() + self.timeout
+        if self._hard_timeout:
+            yield
+            return
+
+        if not self._can_alarm():
+            if _has_nested_repeat(sre_parse.parse(self.pattern)):
+                raise RegexSearchError("正则表达式包含嵌套的重复（如 (a+)+），可能导致灾难性回溯，请改写后重试")
+            yield
+            return
+
+        def _on_alarm(signum, frame):
+            raise RegexTimeout(f"正则搜索超时（{self.timeout:g} 秒）")
+
+        previous = signal.signal(signal.SIGALRM, _on_alarm)
+        signal.setitimer(signal.ITIMER_REAL, self.timeout)
+        try:
+            yield
+        finally:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous)
+
+    def _remaining(self) -> float:
+        remaining = self.deadline - time.monotonic()
+        if remaining <= 0:
+            raise RegexTimeout(f"正则搜索超时（{self.timeout:g} 秒）")
+        return remaining
+
+    def matching_lines(self, text: str, limit: int = MAX_MATCH_LINES) -> List[str]:
+        """文本中包含匹配的行（最多 limit 行，去掉首尾空白）"""
+        remaining = self._remaining()
+        if self._hard_timeout:
+            try:
+                matches = self.compiled.finditer(text, timeout=remaining)
+                return self._collect(text, matches, limit)
+            except TimeoutError:
+                raise RegexTimeout(f"正则搜索超时（{self.timeout:g} 秒）")
+        return self._collect(text, self.compiled.finditer(text), limit)
+
+    @staticmethod
+    def _collect(text: str, matches, limit: int) -> List[str]:
+        lines = []
+        line_end = -1
+        for match in matches:
+            start = match.start()
+            if start <= line_end:
+                continue
+            line_start = text.rfind('\n', 0, start) + 1
+            line_end = text.find('\n', start)
+            if line_end == -1:
+                line_end = len(text)
+            lines.append(text[line_start:line_end].strip()[:MAX_LINE_LENGTH])
+            if len(lines) >= limit:
+                break
+        return lines
@@ -0,0 +1,297 @@
+"""
+相关文章
+
+用 TF-IDF 向量的余弦相似度为每篇文章找出最相似的 k 篇，结果写入导出的单篇文章数据（related 字段）：
+
+- 词项: 正文纯文本按 text.term_counts 分词（中文二元组），标题与标签的词额外加权（与 search_index 一致）
+- 权重: (1 + log 词频) × 平滑 idf，每篇只保留权重最高的 VECTOR_TERMS 个词，按 L2 归一化；
+  出现在一半以上文章中的词不参与计算
+- 计算: 安装了 numpy/scipy 时构建稀疏矩阵，按行分块计算 X[块] · Xᵀ；
+  否则用倒排表累加。两种方式都只访问有共同词项的文章对
+- 增量: 分词结果按文章 mtime/size 缓存在 .blog_cache/related.json；只重新计算变化的文章
+  以及邻居列表引用了变化文章的文章，变化文章再按相似度插入其他文章的邻居列表。
+  其余文章的分数沿用上次结果（idf 的细微漂移在变化较多触发全量计算时修正）
+"""
+
+import heapq
+import json
+import math
+import time
+from operator import itemgetter
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .export import dump_json, write_if_changed
+from .text import plain_text, term_counts, tokenize
+
+try:
+    import numpy
+    from scipy import sparse
+except ImportError:  # 可选依赖
+    numpy = None
+    sparse = None
+
+RELATED_VERSION = 1
+
+DEFAULT_K = 5
+
+# 缓存中每篇文章保留的词项数（按词频）
+MAX_TERMS = 200
+
+# 参与相似度计算的词项数（按 tf-idf 权重）
+VECTOR_TERMS = 64
+
+# 文档频率超过该比例的词不参与计算（文章数不少于 MIN_DF_PRUNE_POSTS 时）
+MAX_DF_RATIO = 0.5
+MIN_DF_PRUNE_POSTS = 20
+
+# 低于该分数的文章不算相关
+MIN_SCORE = 0.05
+
+# 变化文章超过 max(FULL_REBUILD_MIN, 文章数 × FULL_REBUILD_RATIO) 时全量计算
+FULL_REBUILD_MIN = 50
+FULL_REBUILD_RATIO = 0.2
+
+# 稀疏矩阵乘法每块的行数
+BLOCK_ROWS = 256
+
+# 计算结果: 行号 -> [(列号, 分数), ...]
+Neighbors = Dict[int, List[Tuple[int, float]]]
+
+
+def _top(scores: Dict[int, float], k: int) -> List[Tuple[int, float]]:
+    return heapq.nlargest(k, ((j, s) for j, s in scores.items() if s >= MIN_SCORE), key=itemgetter(1))
+
+
+def python_neighbors(vectors: List[Dict[int, float]], rows: Sequence[int], k: int,
+                     thresholds: Optional[List[float]] = None) -> Tuple[Neighbors, Neighbors]:
+    """倒排表累加的相似度计算，返回 (各行的前 k 个邻居, 各行中分数超过对应列阈值的项)"""
+    postings: Dict[int, List[Tuple[int, float]]] = {}
+    for doc, vector in enumerate(vectors):
+        for term, weight in vector.items():
+            postings.setdefault(term, []).append((doc, weight))
+
+    topk, above = {}, {}
+    for row in rows:
+        scores: Dict[int, float] = {}
+        get = scores.get
+        for term, weight in vectors[row].items():
+            for doc, other in postings[term]:
+                scores[doc] = get(doc, 0.0) + weight * other
+        scores.pop(row, None)
+        topk[row] = _top(scores, k)
+        if thresholds is not None:
+            above[row] = [(j, s) for j, s in scores.items() if s > thresholds[j]]
+    return topk, above
+
+
+def sparse_neighbors(vectors: List[Dict[int, float]], rows: Sequence[int], k: int,
+                     thresholds: Optional[List[float]] = None) -> Tuple[Neighbors, Neighbors]:
+    """稀疏矩阵分块乘法的相似度计算（需要 numpy/scipy），返回值同 python_neighbors"""
+    indptr, indices, data = [0], [], []
+    for vector in vectors:
+        indices.extend(vector.keys())
+        data.extend(vector.values())
+        indptr.append(len(indices))
+    n_terms = max(indices) + 1 if indices else 0
+    matrix = sparse.csr_matrix((numpy.asarray(data, dtype=numpy.float32),
+                                numpy.asarray(indices, dtype=numpy.int32),
+                                numpy.asarray(indptr, dtype=numpy.int64)),
+                               shape=(len(vectors), n_terms))
+    transposed = matrix.T.tocsr()
+    limits = numpy.asarray(thresholds, dtype=numpy.float32) if thresholds is not None else None
+
+    topk, above = {}, {}
+    count = min(k, len(vectors) - 1)
+    for start in range(0, len(rows), BLOCK_ROWS):
+        block = numpy.asarray(rows[start:start + BLOCK_ROWS], dtype=numpy.int64)
+        scores = (matrix[block] @ transposed).toarray()
+        scores[numpy.arange(len(block)), block] = 0.0
+
+        if count > 0:
+            best = numpy.argpartition(-scores, count - 1, axis=1)[:, :count]
+        else:
+            best = numpy.zeros((len(block), 0), dtype=numpy.int64)
+        for i, row in enumerate(block.tolist()):
+            pairs = [(j, float(scores[i, j])) for j in best[i].tolist() if scores[i, j] >= MIN_SCORE]
+            pairs.sort(key=itemgetter(1), reverse=True)
+            topk[row] = pairs
+
+        if limits is not None:
+            hit_rows, hit_cols = numpy.nonzero(scores > limits[None, :])
+            for i, j in zip(hit_rows.tolist(), hit_cols.tolist()):
+                above.setdefault(int(block[i]), []).append((j, float(scores[i, j])))
+    return topk, above
+
+
+def default_backend() -> str:
+    return 'scipy' if sparse is not None else 'python'
+
+
+class RelatedPosts:
+    """相关文章计算（结果与分词缓存保存在 .blog_cache/related.json）"""
+
+    def __init__(self, writer, k: int = DEFAULT_K, backend: Optional[str] = None):
+        self.writer = writer
+        self.k = max(1, k)
+        self.backend = backend or default_backend()
+        if self.backend == 'scipy' and sparse is None:
+            raise RuntimeError("scipy 模式需要安装 numpy 与 scipy: pip install numpy scipy")
+        self.cache_file = writer.cache_dir / "related.json"
+        self._cache: Optional[Dict] = None
+
+    # ------------------------------------------------------------------
+    # 缓存
+    # ------------------------------------------------------------------
+
+    def _load_cache(self) -> Dict:
+        if self._cache is None:
+            try:
+                with open(self.cache_file, 'r', encoding='utf-8') as f:
+                    cache = json.load(f)
+                if cache.get('version') != RELATED_VERSION:
+                    raise ValueError
+            except (OSError, ValueError):
+                cache = {'version': RELATED_VERSION, 'k': self.k, 'posts': {}, 'neighbors': {}}
+            self._cache = cache
+        return self._cache
+
+    def _analyze(self, record: Dict) -> Dict[str, int]:
+        """读取文章并统计词频（只保留词频最高的 MAX_TERMS 个词）"""
+        with open(record['path'], 'r', encoding='utf-8') as f:
+            content = f.read()
+        terms = term_counts(plain_text(self.writer._split_front_matter(content)[1]))
+        for token in tokenize(' '.join([record.get('title', '')] + record.get('tags', []))):
+            terms[token] += 3
+        return dict(terms.most_common(MAX_TERMS))
+
+    # ------------------------------------------------------------------
+    # 向量
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _vectors(term_lists: List[Dict[str, int]]) -> List[Dict[int, float]]:
+        """词频 -> 归一化的 tf-idf 稀疏向量（词项用整数编号）"""
+        n = len(term_lists)
+        df: Dict[str, int] = {}
+        for terms in term_lists:
+            for term in terms:
+                df[term] = df.get(term, 0) + 1
+
+        max_df = MAX_DF_RATIO * n if n >= MIN_DF_PRUNE_POSTS else n
+        idf = {term: math.log((1 + n) / (1 + count)) + 1.0 for term, count in df.items() if count <= max_df}
+        # 只出现在一篇文章中的词不会产生相似度，只计入向量长度
+        term_ids = {term: i for i, term in enumerate(term for term in idf if df[term] > 1)}
+
+        vectors = []
+        for terms in term_lists:
+            norm = 0.0
+            weights = []
+            for term, count in terms.items():
+                weight = idf.get(term)
+                if weight is None:
+                    continue
+                weight *= 1.0 + math.log(count)
+                norm += weight * weight
+                term_id = term_ids.get(term)
+                if term_id is not None:
+                    weights.append((term_id, weight))
+            if len(weights) > VECTOR_TERMS:
+                weights = heapq.nlargest(VECTOR_TERMS, weights, key=itemgetter(1))
+            norm = math.sqrt(norm) or 1.0
+            vectors.append({term: weight / norm for term, weight in weights})
+        return vectors
+
+    # ------------------------------------------------------------------
+    # 计算
+    # ------------------------------------------------------------------
+
+    def build(self, force: bool = False) -> Dict:
+        """更新分词缓存并（增量）计算所有文章的相关文章"""
+        start = time.perf_counter()
+        index = self.writer.index
+        index.refresh(force=True)
+        records = sorted(index.all_posts(), key=itemgetter('id'))
+        post_ids = [record['id'] for record in records]
+
+        cache = self._load_cache()
+        cached_posts = cache['posts']
+        live = set(post_ids)
+        removed = [post_id for post_id in cached_posts if post_id not in live]
+        for post_id in removed:
+            del cached_posts[post_id]
+
+        changed = []
+        for record in records:
+            post_id = record['id']
+            signature = list(index.stat.get(post_id, ()))
+            entry = cached_posts.get(post_id)
+            if not entry or entry['stat'] != signature:
+                cached_posts[post_id] = {'stat': signature, 'terms': self._analyze(record)}
+                changed.append(post_id)
+
+        old_neighbors = cache['neighbors']
+        full = (force or cache.get('k') != self.k or not old_neighbors
+                or len(changed) + len(removed) > max(FULL_REBUILD_MIN, FULL_REBUILD_RATIO * len(post_ids)))
+
+        rows = {post_id: i for i, post_id in enumerate(post_ids)}
+        vectors = self._vectors([cached_posts[post_id]['terms'] for post_id in post_ids])
+        compute = sparse_neighbors if self.backend == 'scipy' else python_neighbors
+
+        if full:
+            targets = list(range(len(post_ids)))
+            topk, _ = compute(vectors, targets, self.k)
+            neighbors = {post_ids[row]: [[post_ids[j], round(s, 4)] for j, s in pairs]
+                         for row, pairs in topk.items()}
+        else:
+            touched = set(changed) | set(removed)
+            neighbors = {post_id: old_neighbors.get(post_id, []) for post_id in post_ids}
+            # 变化的文章，以及邻居列表引用了变化/删除文章的文章：重新计算
+            targets = sorted(rows[post_id] for post_id in post_ids
+                             if post_id in touched or post_id not in old_neighbors
+                             or any(other in touched for other, _ in neighbors[post_id]))
+            target_set = set(targets)
+            thresholds = [neighbors[post_id][-1][1] if len(neighbors[post_id]) >= self.k else MIN_SCORE
+                          for post_id in post_ids]
+            topk, above = compute(vectors, targets, self.k, thresholds)
+            for row, pairs in topk.items():
+                neighbors[post_ids[row]] = [[post_ids[j], round(s, 4)] for j, s in pairs]
+
+            # 变化的文章可能进入其他文章的前 k 名（相似度对称）
+            for row, pairs in above.items():
+                if post_ids[row] not in touched:
+                    continue
+                for j, score in pairs:
+                    if j in target_set:
+                        continue
+                    entries = neighbors[post_ids[j]]
+                    entries.append([post_ids[row], round(score, 4)])
+                    entries.sort(key=itemgetter(1), reverse=True)
+                    del entries[self.k:]
+
+        cache['k'] = self.k
+        cache['neighbors'] = neighbors
+        write_if_changed(self.cache_file, dump_json(cache))
+
+        return {
+            'posts': len(post_ids),
+            'changed': len(changed),
+            'removed': len(removed),
+            'recomputed': len(targets),
+            'full': full,
+            'backend': self.backend,
+            'elapsed': time.perf_counter() - start
+        }
+
+    # ------------------------------------------------------------------
+    # 查询
+    # ------------------------------------------------------------------
+
+    def get(self, post_id: str) -> List[Dict]:
+        """文章的相关文章 [{slug, title, score}]（使用上次 build 的结果）"""
+        index = self.writer.index
+        related = []
+        for other, score in self._load_cache()['neighbors'].get(post_id, []):
+            record = index.get(other)
+            if record is not None:
+                related.append({'slug': other, 'title': record.get('title', other), 'score': score})
+        return related
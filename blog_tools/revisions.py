@@ -0,0 +1,221 @@
+"""
+文章历史版本
+
+- 版本列表: 一次 `git log --follow --raw` 得到文章每个版本的提交、时间、作者、说明、路径和 blob
+- 读取内容: 常驻的 `git cat-file --batch` 进程按 blob 读取，不为每个版本启动 git
+- 差异: 按 (旧 blob, 新 blob) 缓存统一差异格式的结果（blob 内容不可变，缓存无需失效）；
+  未缓存的大差异逐行生成，可直接流式返回
+"""
+
+import difflib
+import hashlib
+import threading
+import subprocess
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .timing import phase
+
+# 工作区（未提交的当前文件）对应的版本名
+WORKING = 'working'
+
+# 差异缓存的最大条目数与单条最大字节数
+DIFF_CACHE_ENTRIES = 256
+DIFF_CACHE_MAX_BYTES = 1024 * 1024
+
+# 版本列表缓存的最大文章数
+HISTORY_CACHE_ENTRIES = 128
+
+_HEADER = '\x01'
+_NULL_BLOB = '0' * 40
+
+
+class CatFileReader:
+    """常驻的 git cat-file --batch 进程（线程安全，进程退出后自动重启）"""
+
+    def __init__(self, repo_dir: Path):
+        self.repo_dir = Path(repo_dir)
+        self._process: Optional[subprocess.Popen] = None
+        self._lock = threading.Lock()
+
+    def _ensure_process(self) -> subprocess.Popen:
+        if self._process is None or self._process.poll() is not None:
+            self._process = subprocess.Popen(['git', 'cat-file', '--batch'], cwd=str(self.repo_dir),
+                                             stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                             stderr=subprocess.DEVNULL)
+        return self._process
+
+    def read(self, name: str) -> Optional[bytes]:
+        """读取对象内容（blob 哈希或 <提交>:<路径>），不存在时返回 None"""
+        with self._lock, phase('git'):
+            process = self._ensure_process()
+            try:
+                process.stdin.write(name.encode('utf-8') + b'\n')
+                process.stdin.flush()
+                header = process.stdout.readline().decode('utf-8').split()
+                if len(header) != 3:
+                    # "<name> missing" / "<name> ambiguous"
+                    return None
+                size = int(header[2])
+                data = process.stdout.read(size)
+                process.stdout.read(1)  # 结尾的换行
+                return data
+            except (OSError, ValueError):
+                self._close_process()
+                raise
+
+    def _close_process(self):
+        process, self._process = self._process, None
+        if process is not None:
+            try:
+                process.stdin.close()
+            except OSError:
+                pass
+            process.kill()
+            process.wait()
+
+    def close(self):
+        with self._lock:
+            self._close_process()
+
+
+def parse_history(output: bytes) -> List[Dict]:
+    """解析 git log --follow --raw -z 的输出（从新到旧）"""
+    tokens = output.decode('utf-8', errors='replace').split('\0')
+    revisions = []
+    i = 0
+    while i < len(tokens):
+        token = tokens[i].lstrip('\n')
+        i += 1
+        if not token.startswith(_HEADER):
+            continue
+
+        commit, timestamp, author, subject = token[1:], tokens[i], tokens[i + 1], tokens[i + 2]
+        i += 3
+        raw = tokens[i].lstrip('\n') if i < len(tokens) else ''
+        if not raw.startswith(':'):
+            continue
+        fields = raw[1:].split()
+        status = fields[4]
+        paths = tokens[i + 1:i + (3 if status[0] in 'RC' else 2)]
+        i += 1 + len(paths)
+
+        revisions.append({
+            'commit': commit,
+            'timestamp': int(timestamp),
+            'author': author,
+            'subject': subject,
+            'status': status[0],
+            'path': paths[-1],
+            'blob': None if fields[3] == _NULL_BLOB else fields[3]
+        })
+    return revisions
+
+
+class PostHistory:
+    """文章版本列表与版本间差异"""
+
+    def __init__(self, repo_dir: Path):
+        self.repo_dir = Path(repo_dir).resolve()
+        self.reader = CatFileReader(self.repo_dir)
+        self._lock = threading.Lock()
+        # (路径, HEAD) -> 版本列表
+        self._histories: 'OrderedDict[Tuple[str, str], List[Dict]]' = OrderedDict()
+        # (旧 blob, 新 blob) -> 差异文本
+        self._diffs: 'OrderedDict[Tuple[str, str], str]' = OrderedDict()
+
+    def _relative(self, file_path: Path) -> str:
+        return Path(file_path).resolve().relative_to(self.repo_dir).as_posix()
+
+    def _head(self) -> str:
+        with phase('git'):
+            result = subprocess.run(['git', 'rev-parse', '--verify', '-q', 'HEAD'], cwd=str(self.repo_dir),
+                                    capture_output=True, text=True)
+        return result.stdout.strip()
+
+    @staticmethod
+    def _remember(cache: OrderedDict, key, value, limit: int):
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > limit:
+            cache.popitem(last=False)
+
+    def revisions(self, file_path: Path) -> List[Dict]:
+        """文章的历史版本（从新到旧，跟随重命名）"""
+        path = self._relative(file_path)
+        head = self._head()
+        key = (path, head)
+        with self._lock:
+            cached = self._histories.get(key)
+        if cached is not None:
+            return cached
+        if not head:
+            return []
+
+        with phase('git'):
+            result = subprocess.run(['git', 'log', '--follow', '-z', '--raw', '--no-abbrev',
+                                     f'--format={_HEADER}%H%x00%ct%x00%an%x00%s', head, '--', path],
+                                    cwd=str(self.repo_dir), capture_output=True)
+        revisions = parse_history(result.stdout) if result.returncode == 0 else []
+        with self._lock:
+            self._remember(self._histories, key, revisions, HISTORY_CACHE_ENTRIES)
+        return revisions
+
+    def _resolve(self, file_path: Path, revision: str) -> Tuple[str, str, bytes]:
+        """版本 -> (缓存用的内容标识, 显示用的标签, 内容)"""
+        if revision == WORKING:
+            data = Path(file_path).read_bytes() if Path(file_path).exists() else b''
+            return 'working:' + hashlib.sha1(data).hexdigest(), WORKING, data
+
+        for entry in self.revisions(file_path):
+            if entry['commit'].startswith(revision) and len(revision) >= 7:
+                blob = entry['blob']
+                if blob is None:
+                    return _NULL_BLOB, entry['commit'][:7], b''
+                data = self.reader.read(blob)
+                if data is None:
+                    raise KeyError(f"无法读取版本内容: {revision}")
+                return blob, f"{entry['commit'][:7]}:{entry['path']}", data
+        raise KeyError(f"文章没有该版本: {revision}")
+
+    def content(self, file_path: Path, revision: str) -> str:
+        """某个版本的文章内容"""
+        return self._resolve(file_path, revision)[2].decode('utf-8', errors='replace')
+
+    def diff(self, file_path: Path, old: str, new: str = WORKING, context: int = 3) -> Iterator[str]:
+        """两个版本之间的统一差异（逐行产出；结果按 blob 对缓存）"""
+        old_key, old_label, old_data = self._resolve(file_path, old)
+        new_key, new_label, new_data = self._resolve(file_path, new)
+        key = (old_key, new_key, context)
+
+        with self._lock:
+            cached = self._diffs.get(key)
+            if cached is not None:
+                self._diffs.move_to_end(key)
+        if cached is not None:
+            yield cached
+            return
+
+        lines = difflib.unified_diff(
+            old_data.decode('utf-8', errors='replace').splitlines(keepends=True),
+            new_data.decode('utf-8', errors='replace').splitlines(keepends=True),
+            fromfile=old_label, tofile=new_label, n=context)
+
+        collected, size = [], 0
+        for line in lines:
+            if not line.endswith('\n'):
+                line += '\n\\ No newline at end of file\n'
+            if collected is not None:
+                collected.append(line)
+                size += len(line)
+                if size > DIFF_CACHE_MAX_BYTES:
+                    collected = None
+            yield line
+
+        if collected is not None:
+            with self._lock:
+                self._remember(self._diffs, key, ''.join(collected), DIFF_CACHE_ENTRIES)
+
+    def close(self):
+        self.reader.close()
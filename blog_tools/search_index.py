@@ -0,0 +1,245 @@
+"""
+静态搜索索引
+
+把文章编译成按词前缀区间分片的搜索文件，浏览器查询时只需下载相关的几个分片：
+
+    public/search/
+    ├── manifest.json            # 各分片的起始词 / 起始文档号 -> 分片文件名（固定文件名）
+    ├── shard-<hash>.json        # 词分片
+    └── docs-<hash>.json         # 文档分片
+
+词分片包含有序词表中连续的一段（即同一前缀范围内的词）:
+- terms: 词 -> [文档号增量列表, 词频列表]（文档号按升序做差分编码）
+
+文档分片包含连续文档号区间的文档信息，查询排好序后只下载前几个结果所在的文档分片:
+- docs: 文档号 -> [slug, 标题, 摘要]
+
+摘要不放在词分片中，高频词（出现在几乎所有文章中）的分片不会因为带上所有文章的摘要而变大。
+两种分片都不超过 max_shard_bytes，只有一个例外：单个词的倒排列表本身超过上限时
+（每篇文章约 4-8 字节，即该词出现在数千篇文章中），这个词单独成为一个分片。
+文档号在多次构建间保持稳定，分词结果按文章 mtime/size 缓存，
+因此新增或修改一篇文章只会改变包含其词项的分片与它所在的文档分片。
+"""
+
+import json
+import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .export import content_hash, dump_json, write_if_changed
+from .fileutil import atomic_write_bytes
+from .text import plain_text, term_counts, tokenize
+
+SEARCH_INDEX_VERSION = 2
+
+# 摘要长度（字符）
+SNIPPET_LENGTH = 120
+
+
+class SearchIndexBuilder:
+    """构建前缀分片的静态搜索索引"""
+
+    def __init__(self, writer, output_dir: Optional[Path] = None, max_shard_bytes: int = 32 * 1024):
+        self.writer = writer
+        self.output_dir = Path(output_dir) if output_dir else writer.blog_path / "public" / "search"
+        self.manifest_file = self.output_dir / "manifest.json"
+        self.cache_file = writer.cache_dir / "search_terms.json"
+        self.max_shard_bytes = max(1024, max_shard_bytes)
+
+        self.tokenized = 0
+        self.written = 0
+        self.reused = 0
+
+    # ------------------------------------------------------------------
+    # 分词缓存
+    # ------------------------------------------------------------------
+
+    def _load_cache(self) -> Dict:
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+            if cache.get('version') == SEARCH_INDEX_VERSION:
+                return cache
+        except (OSError, ValueError):
+            pass
+        return {'version': SEARCH_INDEX_VERSION, 'doc_numbers': {}, 'next_doc': 0, 'posts': {}}
+
+    def _analyze(self, record: Dict) -> Dict:
+        """读取文章并统计词频，生成摘要"""
+        with open(record['path'], 'r', encoding='utf-8') as f:
+            content = f.read()
+        body = plain_text(self.writer._split_front_matter(content)[1])
+
+        terms = term_counts(body)
+        # 标题与标签的词额外加权
+        for token in tokenize(' '.join([record.get('title', '')] + record.get('tags', []))):
+            terms[token] += 3
+
+        self.tokenized += 1
+        return {'terms': dict(terms), 'snippet': body[:SNIPPET_LENGTH]}
+
+    @staticmethod
+    def _assign_doc_numbers(cache: Dict, post_ids: List[str]):
+        """分配稳定的文档号；空洞超过一半时重新编号"""
+        numbers = cache['doc_numbers']
+        live = set(post_ids)
+        for post_id in list(numbers):
+            if post_id not in live:
+                del numbers[post_id]
+
+        if numbers and cache['next_doc'] > 2 * len(post_ids):
+            numbers.clear()
+            cache['next_doc'] = 0
+
+        for post_id in sorted(live - set(numbers)):
+            numbers[post_id] = cache['next_doc']
+            cache['next_doc'] += 1
+
+    # ------------------------------------------------------------------
+    # 分片
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _encode_postings(postings: List[Tuple[int, int]]) -> List[List[int]]:
+        postings.sort()
+        deltas, freqs = [], []
+        previous = 0
+        for doc, freq in postings:
+            deltas.append(doc - previous)
+            freqs.append(freq)
+            previous = doc
+        return [deltas, freqs]
+
+    def _terms_payload(self, terms: List[str], encoded: Dict[str, List[List[int]]]) -> bytes:
+        return dump_json({'v': SEARCH_INDEX_VERSION, 'terms': {term: encoded[term] for term in terms}})
+
+    @staticmethod
+    def _docs_payload(numbers: List[int], docs: Dict[int, List]) -> bytes:
+        return dump_json({'v': SEARCH_INDEX_VERSION, 'docs': {str(doc): docs[doc] for doc in numbers}})
+
+    def _partition(self, keys: List, sizes: Dict) -> List[List]:
+        """把有序的键（词或文档号）切成连续区间，每个区间为一个分片
+
+        sizes 为每个键序列化后的字节数（JSON 中的键名、分隔符另计 8 字节）。
+        切分点由键本身的哈希决定（内容定义分块）：分片达到上限的 1/4 后，
+        遇到哈希满足条件的键就切分，超过上限时强制切分。
+        这样增删一个词或一篇文档只影响相邻的分片，其余分片文件名保持不变。
+        """
+        min_bytes = self.max_shard_bytes // 4
+        # 分片外层结构 {"terms":{...},"v":2} 的长度
+        overhead = 24
+
+        groups: List[List] = []
+        current: List = []
+        size = overhead
+        for key in keys:
+            added = sizes[key] + 8
+            if current and size + added > self.max_shard_bytes:
+                groups.append(current)
+                current, size = [], overhead
+
+            current.append(key)
+            size += added
+
+            if size >= min_bytes and int(content_hash(str(key).encode('utf-8'), 4), 16) % 8 == 0:
+                groups.append(current)
+                current, size = [], overhead
+
+        if current:
+            groups.append(current)
+        return groups
+
+    def _emit(self, prefix: str, payload: bytes) -> str:
+        name = f"{prefix}-{content_hash(payload, 12)}.json"
+        path = self.output_dir / name
+        if path.exists():
+            self.reused += 1
+        else:
+            atomic_write_bytes(path, payload)
+            self.written += 1
+        return name
+
+    # ------------------------------------------------------------------
+    # 构建
+    # ------------------------------------------------------------------
+
+    def build(self) -> Dict:
+        index = self.writer.index
+        index.refresh(force=True)
+        records = index.all_posts()
+        post_ids = [record['id'] for record in records]
+
+        cache = self._load_cache()
+        self._assign_doc_numbers(cache, post_ids)
+
+        cached_posts = cache['posts']
+        for post_id in list(cached_posts):
+            if post_id not in cache['doc_numbers']:
+                del cached_posts[post_id]
+
+        inverted: Dict[str, List[Tuple[int, int]]] = {}
+        docs: Dict[int, List] = {}
+        for record in records:
+            post_id = record['id']
+            signature = list(index.stat.get(post_id, ()))
+            entry = cached_posts.get(post_id)
+            if not entry or entry['stat'] != signature:
+                entry = dict(self._analyze(record), stat=signature)
+                cached_posts[post_id] = entry
+
+            doc = cache['doc_numbers'][post_id]
+            docs[doc] = [post_id, record.get('title', post_id), entry['snippet']]
+            for term, freq in entry['terms'].items():
+                inverted.setdefault(term, []).append((doc, freq))
+
+        # 有序词表与文档号分别按区间切分，manifest 记录每个分片的第一个词 / 第一个文档号
+        encoded = {term: self._encode_postings(postings) for term, postings in inverted.items()}
+        term_sizes = {term: len(term.encode('utf-8')) + len(dump_json(value)) for term, value in encoded.items()}
+        doc_sizes = {doc: len(str(doc)) + len(dump_json(entry)) for doc, entry in docs.items()}
+
+        sizes = []
+        files = []
+        for terms in self._partition(sorted(inverted), term_sizes):
+            payload = self._terms_payload(terms, encoded)
+            sizes.append(len(payload))
+            files.append([terms[0], self._emit('shard', payload)])
+
+        doc_files = []
+        for numbers in self._partition(sorted(docs), doc_sizes):
+            payload = self._docs_payload(numbers, docs)
+            sizes.append(len(payload))
+            doc_files.append([numbers[0], self._emit('docs', payload)])
+
+        manifest = {
+            'version': SEARCH_INDEX_VERSION,
+            'generated': datetime.datetime.now().isoformat(),
+            'docs': len(docs),
+            'terms': len(inverted),
+            'tokenizer': 'latin-word+cjk-bigram',
+            # [[分片第一个词, 文件名], ...]，按词排序；查询词落在最后一个不大于它的分片中
+            'shards': files,
+            # [[分片第一个文档号, 文件名], ...]，按文档号排序
+            'docs_shards': doc_files
+        }
+        atomic_write_bytes(self.manifest_file, dump_json(manifest, pretty=True))
+        write_if_changed(self.cache_file, dump_json(cache))
+
+        removed = 0
+        referenced = {name for _, name in files + doc_files}
+        for pattern in ('shard-*.json', 'docs-*.json'):
+            for path in self.output_dir.glob(pattern):
+                if path.name not in referenced:
+                    path.unlink()
+                    removed += 1
+
+        return {
+            'manifest': str(self.manifest_file),
+            'docs': len(docs),
+            'terms': len(inverted),
+            'shards': len(files) + len(doc_files),
+            'max_shard_bytes': max(sizes) if sizes else 0,
+            'tokenized': self.tokenized,
+            'written': self.written,
+            'reused': self.reused,
+            'removed': removed
+        }
@@ -0,0 +1,71 @@
+"""
+文本处理工具
+
+Markdown 转纯文本、分词（中文按二元组切分，英文/数字按单词切分）。
+搜索索引等模块共用同一套分词规则，前端 app/components/searchIndex.ts 中有对应实现。
+"""
+
+import re
+from collections import Counter
+from typing import List
+
+_CODE_BLOCK_RE = re.compile(r'```.*?```', re.DOTALL)
+_IMAGE_RE = re.compile(r'!\[[^\]]*\]\([^)]*\)')
+_LINK_RE = re.compile(r'\[([^\]]*)\]\([^)]*\)')
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+_MARKUP_RE = re.compile(r'[#*`>_~|-]+')
+_SPACE_RE = re.compile(r'\s+')
+
+# 英文/数字单词 或 连续的中日韩字符
+_CJK_RANGES = '\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\u3040-\u30ff\uac00-\ud7af'
+_TOKEN_RE = re.compile(r'[a-z0-9]+|[' + _CJK_RANGES + r']+')
+_CJK_RE = re.compile(r'[' + _CJK_RANGES + r']')
+
+# term_counts 使用的分项正则（全部在 C 中完成匹配）
+_WORD_RE = re.compile(r'[a-z0-9]+')
+_CJK_BIGRAM_RE = re.compile(r'(?=([' + _CJK_RANGES + r']{2}))')
+_CJK_SINGLE_RE = re.compile(r'(?<![' + _CJK_RANGES + r'])[' + _CJK_RANGES + r'](?![' + _CJK_RANGES + r'])')
+
+
+def plain_text(markdown: str, keep_code: bool = False) -> str:
+    """粗略去除 Markdown 语法，得到用于搜索的纯文本"""
+    text = markdown if keep_code else _CODE_BLOCK_RE.sub(' ', markdown)
+    text = _IMAGE_RE.sub(' ', text)
+    text = _LINK_RE.sub(r'\1', text)
+    text = _HTML_TAG_RE.sub(' ', text)
+    text = _MARKUP_RE.sub(' ', text)
+    return _SPACE_RE.sub(' ', text).strip()
+
+
+def is_cjk(text: str) -> bool:
+    return bool(_CJK_RE.match(text))
+
+
+def tokenize(text: str) -> List[str]:
+    """分词: 英文/数字按单词，中文按相邻二字组（单字成词时保留单字）"""
+    tokens = []
+    for match in _TOKEN_RE.finditer(text.lower()):
+        word = match.group()
+        if not is_cjk(word):
+            tokens.append(word)
+        elif len(word) == 1:
+            tokens.append(word)
+        else:
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return tokens
+
+
+def term_counts(text: str) -> Counter:
+    """词频统计，结果与 Counter(tokenize(text)) 相同，但不在 Python 中逐词循环"""
+    text = text.lower()
+    return Counter(_WORD_RE.findall(text) + _CJK_BIGRAM_RE.findall(text) + _CJK_SINGLE_RE.findall(text))
+
+
+_SLUG_STRIP_RE = re.compile(r'[^\w\s-]')
+_SLUG_SEP_RE = re.compile(r'[-\s_]+')
+
+
+def slugify(text: str, max_length: int = 80) -> str:
+    """标题 -> 文件名用的 slug（保留中日韩字符，去掉标点与路径分隔符，空白转为连字符）"""
+    slug = _SLUG_SEP_RE.sub('-', _SLUG_STRIP_RE.sub('', text.lower())).strip('-')
+    return slug[:max_length].rstrip('-')
@@ -0,0 +1,75 @@
+"""
+分阶段计时
+
+记录一次请求（或一次命令）在各阶段花费的时间，例如:
+
+    with phase('scan'):
+        ...
+
+阶段按线程记录，仅在调用 start_recording() 之后生效，否则 phase() 几乎没有开销。
+阶段可以嵌套，内层阶段的时间不计入外层（记录的是各阶段自身的耗时），
+因此各阶段之和不超过总耗时。
+
+常用阶段: scan（目录遍历/文件读取）、parse（front matter 解析）、git、subprocess、render（模板渲染）
+"""
+
+import time
+import threading
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+_local = threading.local()
+
+
+class PhaseRecorder:
+    """单个线程上的阶段计时器"""
+
+    def __init__(self):
+        self.totals: Dict[str, float] = {}
+        self.counts: Dict[str, int] = {}
+        self._stack = []
+        self._mark = time.perf_counter()
+
+    def _charge(self, now: float):
+        if self._stack:
+            name = self._stack[-1]
+            self.totals[name] = self.totals.get(name, 0.0) + (now - self._mark)
+        self._mark = now
+
+    def enter(self, name: str):
+        self._charge(time.perf_counter())
+        self._stack.append(name)
+        self.counts[name] = self.counts.get(name, 0) + 1
+
+    def exit(self):
+        self._charge(time.perf_counter())
+        self._stack.pop()
+
+
+def start_recording() -> PhaseRecorder:
+    """在当前线程开始记录阶段耗时"""
+    recorder = PhaseRecorder()
+    _local.recorder = recorder
+    return recorder
+
+
+def stop_recording() -> Optional[PhaseRecorder]:
+    """停止记录并返回当前线程的计时器"""
+    recorder = getattr(_local, 'recorder', None)
+    _local.recorder = None
+    return recorder
+
+
+@contextmanager
+def phase(name: str):
+    """把代码块的耗时计入指定阶段"""
+    recorder = getattr(_local, 'recorder', None)
+    if recorder is None:
+        yield
+        return
+
+    recorder.enter(name)
+    try:
+        yield
+    finally:
+        recorder.exit()
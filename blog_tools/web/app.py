@@ -7,54 +7,148 @@ Hexo 博客写作工具 - Web界面
 import os
 import sys
 import json
+import secrets
+import itertools
 import subprocess
-from datetime import datetime
 from pathlib import Path
-from flask import Flask, render_template, request, jsonify, redirect, url_for, flash
+import flask
+from flask import Flask, request, jsonify, redirect, url_for, flash
 import git
 
 # 添加项目根目录到路径
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
 from blog_writer import HexoBlogWriter
+from blog_tools.build_scheduler import DEFAULT_MAX_WAIT, DEFAULT_QUIET, BuildScheduler, HexoBuild
+from blog_tools.coordination import InterProcessLock, ServerRegistry
+from blog_tools.drafts import new_session_id
+from blog_tools.git_timeline import format_timestamp
+from blog_tools.instrumentation import init_instrumentation
+from blog_tools.patching import PATCH_FIELDS, PatchConflict, content_hash, split_document, utf16_length
+from blog_tools.project_info import ProjectInfo
+from blog_tools.revisions import WORKING
+from blog_tools.timing import phase
 
 app = Flask(__name__)
-app.secret_key = 'your-secret-key-here'  # 用于flash消息
 
-# 全局博客管理器
-blog_writer = None
+# 请求计时、/metrics（各 worker 的计数经 .blog_cache/metrics 汇总）与采样分析
+_instrumentation_dir = Path(__file__).resolve().parent.parent.parent / '.blog_cache'
+init_instrumentation(app, profile_dir=_instrumentation_dir / 'profiles', metrics_dir=_instrumentation_dir / 'metrics')
 
-# 全局服务器进程跟踪
-hexo_server_processes = {}
+# 全局博客管理器（每个 worker 进程一个，启动时初始化，之后只读）
+blog_writer = None
 
-def init_blog_writer():
-    """初始化博客管理器"""
-    global blog_writer
+# 本工具启动的 Hexo 服务器登记表（SQLite，多个 worker 共享）
+server_registry = None
+
+# Git 操作锁（线程间 + 进程间）
+git_lock = None
+
+# 项目信息缓存（/api/project_info）
+project_info = None
+
+# Hexo 构建调度（合并连续保存触发的构建，同一时刻只运行一个构建）
+build_scheduler = None
+
+# 保存文章/页面后是否自动排入构建
+build_on_save = False
+
+# 显式请求的构建最长等待时间（秒）
+BUILD_TIMEOUT = 600
+
+def render_template(template_name, **context):
+    """渲染模板（耗时计入 render 阶段）"""
+    with phase('render'):
+        return flask.render_template(template_name, **context)
+
+def _env_flag(name: str) -> bool:
+    return os.environ.get(name, '').lower() in ('1', 'true', 'yes', 'on')
+
+def init_build_scheduler(on_save: bool = None, quiet: float = None, max_wait: float = None):
+    """创建构建调度器；on_save 为 True 时文章/页面的每次修改都会排入构建
+
+    未指定的参数取环境变量 BLOG_BUILD_ON_SAVE、BLOG_BUILD_QUIET、BLOG_BUILD_MAX_WAIT。
+    """
+    global build_scheduler, build_on_save
+    build_on_save = _env_flag('BLOG_BUILD_ON_SAVE') if on_save is None else on_save
+    if quiet is None:
+        quiet = float(os.environ.get('BLOG_BUILD_QUIET', DEFAULT_QUIET))
+    if max_wait is None:
+        max_wait = float(os.environ.get('BLOG_BUILD_MAX_WAIT', max(DEFAULT_MAX_WAIT, quiet)))
+
+    build_scheduler = BuildScheduler(HexoBuild(blog_writer.blog_path, blog_writer.cache_dir),
+                                     quiet=quiet, max_wait=max_wait)
+    if build_on_save:
+        # 先加载索引，启动时追平缓存产生的变更不触发构建
+        blog_writer.index.ensure_loaded()
+        blog_writer.page_index.ensure_loaded()
+        blog_writer.index.add_listener(lambda post_id, old, new: build_scheduler.notify(post_id))
+        blog_writer.page_index.add_listener(lambda slug, old, new: build_scheduler.notify(f"page:{slug}"))
+
+def load_secret_key(cache_dir: Path) -> str:
+    """flash 消息与会话 cookie 的签名密钥
+
+    优先取环境变量 BLOG_SECRET_KEY；否则首次启动时随机生成并保存到 .blog_cache/secret_key
+    （多个 worker 同时启动时只有一个生成的密钥会被采用，其余 worker 读取同一个文件）。
+    """
+    key = os.environ.get('BLOG_SECRET_KEY')
+    if key:
+        return key
+
+    key_file = Path(cache_dir) / "secret_key"
+    if not key_file.exists():
+        key_file.parent.mkdir(parents=True, exist_ok=True)
+        temp_file = key_file.with_name(f"secret_key.{os.getpid()}.tmp")
+        fd = os.open(temp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(secrets.token_hex(32))
+        try:
+            # 链接不会覆盖已有文件，先到者的密钥生效
+            os.link(temp_file, key_file)
+        except FileExistsError:
+            pass
+        finally:
+            temp_file.unlink()
+    return key_file.read_text(encoding='utf-8').strip()
+
+def init_blog_writer(blog_path: str = None, build_options: dict = None):
+    """初始化博客管理器（build_options 为 init_build_scheduler 的参数）"""
+    global blog_writer, server_registry, git_lock, project_info
     try:
-        # 使用绝对路径，从web目录向上3级到项目根目录
+        # 默认从web目录向上3级到项目根目录
         # __file__ 是 /path/to/blog_tools/web/app.py
-        current_path = Path(__file__).resolve()
-        blog_path = current_path.parent.parent.parent
+        if not blog_path:
+            blog_path = os.environ.get('BLOG_PATH') or Path(__file__).resolve().parent.parent.parent
+        blog_path = Path(blog_path).resolve()
         print(f"尝试博客路径: {blog_path}")
         print(f"博客路径存在: {blog_path.exists()}")
         print(f"文章目录存在: {(blog_path / 'source' / '_posts').exists()}")
 
-        # 切换工作目录到博客根目录，确保Git操作正确
-        original_cwd = os.getcwd()
-        os.chdir(str(blog_path))
-
+        # 不切换进程工作目录：所有路径与 Git 操作都基于 blog_path
         blog_writer = HexoBlogWriter(str(blog_path))
-
-        # 恢复原始工作目录
-        os.chdir(original_cwd)
+        blog_writer.resident = True
+        app.secret_key = load_secret_key(blog_writer.cache_dir)
+        server_registry = ServerRegistry(blog_writer.cache_dir / "servers.sqlite3")
+        git_lock = InterProcessLock(blog_writer.cache_dir / "git.lock")
+        project_info = ProjectInfo(blog_writer)
+        init_build_scheduler(**(build_options or {}))
 
         return True
     except Exception as e:
         print(f"初始化博客管理器失败: {e}")
         print(f"当前文件路径: {__file__}")
-        print(f"尝试路径: {Path(__file__).parent.parent.parent}")
         return False
 
+def create_app(blog_path: str = None) -> Flask:
+    """WSGI 应用工厂
+
+    gunicorn -w 4 --chdir blog_tools/web 'app:create_app()'
+    waitress-serve --call app:create_app     (在 blog_tools/web 目录下)
+    """
+    if blog_writer is None and not init_blog_writer(blog_path):
+        raise RuntimeError("无法初始化博客管理器")
+    return app
+
 @app.route('/')
 def index():
     """主页 - 显示文章列表"""
@@ -97,26 +191,8 @@ def create_page():
             flash('页面标题不能为空', 'error')
             return redirect(url_for('new_page'))
 
-        # 创建页面
-        file_path = blog_writer.create_page(title, layout)
-
-        # 如果有内容，写入文件
-        if content:
-            page_info = blog_writer.get_page_info(title.lower().replace(' ', '-'))
-            page_file = blog_writer.pages_dir / title.lower().replace(' ', '-') / 'index.md'
-
-            with open(page_file, 'r', encoding='utf-8') as f:
-                file_content = f.read()
-
-            # 在front matter后插入内容
-            front_matter_end = file_content.find('\n\n')
-            if front_matter_end != -1:
-                new_content = file_content[:front_matter_end + 2] + content + '\n\n' + file_content[front_matter_end + 2:]
-            else:
-                new_content = file_content + '\n\n' + content
-
-            with open(page_file, 'w', encoding='utf-8') as f:
-                f.write(new_content)
+        # 创建页面（正文与 front matter 一次写入）
+        blog_writer.create_page(title, layout, content=content or None)
 
         flash(f'页面 "{title}" 创建成功！', 'success')
         return redirect(url_for('pages'))
@@ -125,6 +201,29 @@ def create_page():
         flash(f'创建页面失败: {str(e)}', 'error')
         return redirect(url_for('new_page'))
 
+@app.route('/api/pages')
+def api_pages():
+    """页面列表（来自页面索引）；带 q 参数时按标题与内容搜索"""
+    try:
+        keyword = request.args.get('q', '').strip()
+        pages = blog_writer.find_pages(keyword) if keyword else blog_writer.list_pages()
+        return jsonify({'success': True, 'pages': pages})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/pages/batch', methods=['POST'])
+def api_pages_batch():
+    """批量获取页面: {"slugs": ["about", ...], "content": true}，不存在的页面为 null"""
+    try:
+        data = request.get_json(silent=True) or {}
+        slugs = data.get('slugs')
+        if not isinstance(slugs, list) or not all(isinstance(slug, str) for slug in slugs):
+            return jsonify({'success': False, 'error': '缺少 slugs 列表'}), 400
+        pages = blog_writer.get_pages(slugs, content=bool(data.get('content')))
+        return jsonify({'success': True, 'pages': pages})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
 @app.route('/edit_page/<page_slug>')
 def edit_page(page_slug):
     """编辑页面"""
@@ -199,24 +298,8 @@ def create_post():
             flash('标题不能为空', 'error')
             return redirect(url_for('new_post'))
 
-        # 创建文章
-        file_path = blog_writer.create_post(title, tags, categories)
-
-        # 如果有内容，写入文件
-        if content:
-            post_path = Path(file_path)
-            with open(post_path, 'r', encoding='utf-8') as f:
-                file_content = f.read()
-
-            # 在front matter后插入内容
-            front_matter_end = file_content.find('\n\n')
-            if front_matter_end != -1:
-                new_content = file_content[:front_matter_end + 2] + content + '\n\n' + file_content[front_matter_end + 2:]
-            else:
-                new_content = file_content + '\n\n' + content
-
-            with open(post_path, 'w', encoding='utf-8') as f:
-                f.write(new_content)
+        # 创建文章（front matter 与正文一次写入，不等待终端输入）
+        blog_writer.create_post(title, tags, categories, content=content or None, interactive=False)
 
         flash(f'文章 "{title}" 创建成功！', 'success')
         return redirect(url_for('index'))
@@ -229,7 +312,7 @@ def create_post():
 def edit_post(filename):
     """编辑文章页面"""
     try:
-        file_path = blog_writer.posts_dir / filename
+        file_path = blog_writer.post_path(filename)
         if not file_path.exists():
             flash('文章不存在', 'error')
             return redirect(url_for('index'))
@@ -239,6 +322,27 @@ def edit_post(filename):
 
         post_info = blog_writer._parse_post_info(file_path)
 
+        # 编辑器增量保存/自动保存时以此版本为基准
+        source = file_path.read_bytes().decode('utf-8')
+        post_info['content_hash'] = content_hash(source)
+
+        # 保存时编辑器提交相对于文件正文的修改
+        post_info['base_content'] = split_document(source)[2]
+        post_info['draft_fields'] = []
+
+        # 恢复上次未保存的自动保存草稿
+        draft = blog_writer.drafts.recover(file_path.stem, post_info['content_hash'], source)
+        post_info['draft_recovered'] = draft is not None
+        if draft is not None:
+            full_content = draft
+            draft_info = blog_writer._parse_post_content(file_path, draft)
+            # 草稿中改过的字段，保存时即使表单未再修改也要提交
+            post_info['draft_fields'] = [key for key in PATCH_FIELDS if draft_info.get(key) != post_info.get(key)]
+            post_info.update(draft_info)
+            post_info['draft_session'] = blog_writer.drafts.snapshot(file_path.stem, post_info['content_hash'], draft)
+        else:
+            post_info['draft_session'] = new_session_id()
+
         # 分离 front matter 和正文内容
         import re
         front_matter_pattern = r'^---\n(.*?)\n---\n(.*)$'
@@ -259,9 +363,9 @@ def edit_post(filename):
 
 @app.route('/update/<filename>', methods=['POST'])
 def update_post(filename):
-    """更新文章"""
+    """更新文章（未启用脚本时的表单提交；编辑器通过 /api/posts/<filename>/patch 只提交修改）"""
     try:
-        file_path = blog_writer.posts_dir / filename
+        file_path = blog_writer.post_path(filename)
 
         # 获取表单数据
         title = request.form.get('title', '').strip()
@@ -275,47 +379,127 @@ def update_post(filename):
         tags = [tag.strip() for tag in tags_str.split(',') if tag.strip()] if tags_str else []
         categories = [cat.strip() for cat in categories_str.split(',') if cat.strip()] if categories_str else []
 
-        # 读取现有文件内容
-        with open(file_path, 'r', encoding='utf-8') as f:
-            full_content = f.read()
+        # 只改写表单中的字段，其他 front matter 原样保留；标题、日期为空时不覆盖
+        fields = {'layout': layout, 'tags': tags, 'categories': categories}
+        if title:
+            fields['title'] = title
+        if date:
+            fields['date'] = date
+
+        # 以编辑页面打开时的版本为基准整体替换正文（原子写入，文件已被修改时拒绝覆盖）
+        source = file_path.read_bytes().decode('utf-8')
+        base_hash = request.form.get('base_hash') or content_hash(source)
+        _, _, body, _ = split_document(source)
+        ops = [{'start': 0, 'end': utf16_length(body), 'text': content}]
+        blog_writer.patch_post(filename, base_hash, ops, fields)
+
+        flash(f'文章 "{title or file_path.stem}" 更新成功！', 'success')
+        return redirect(url_for('index'))
 
-        # 分离 front matter 和正文内容
-        import re
-        front_matter_pattern = r'^---\n(.*?)\n---\n(.*)$'
-        match = re.match(front_matter_pattern, full_content, re.DOTALL)
+    except Exception as e:
+        flash(f'更新文章失败: {str(e)}', 'error')
+        return redirect(url_for('edit_post', filename=filename))
 
-        # 构建新的front matter
-        tags_array = ', '.join([f"'{tag}'" for tag in tags]) if tags else ''
-        categories_array = ', '.join([f"'{cat}'" for cat in categories]) if categories else ''
+@app.route('/api/posts/<filename>/patch', methods=['POST'])
+def api_patch_post(filename):
+    """增量保存文章：提交相对于 base_hash 版本的修改"""
+    try:
+        data = request.get_json(silent=True) or {}
+        base_hash = data.get('base_hash', '')
+        if not base_hash:
+            return jsonify({'success': False, 'error': '缺少 base_hash'}), 400
+
+        result = blog_writer.patch_post(filename, base_hash, data.get('ops'), data.get('fields'))
+        return jsonify({'success': True, **result})
+
+    except PatchConflict as e:
+        return jsonify({'success': False, 'error': str(e), 'hash': e.current_hash}), 409
+    except FileNotFoundError as e:
+        return jsonify({'success': False, 'error': str(e)}), 404
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
 
-        new_front_matter = f"""---
-title: {title}
-date: {date}
-tags: [{tags_array}]
-categories: [{categories_array}]
-layout: {layout}
----
+@app.route('/api/posts/<filename>/autosave', methods=['POST'])
+def api_autosave_post(filename):
+    """自动保存：记录到草稿日志（不修改文章文件）"""
+    try:
+        data = request.get_json(silent=True) or {}
+        if not filename.endswith('.md') or not blog_writer.post_path(filename).exists():
+            return jsonify({'success': False, 'error': '文章不存在'}), 404
 
-"""
+        seq = data.get('seq')
+        blog_writer.drafts.append(Path(filename).stem, data.get('session', ''), seq,
+                                  data.get('base_hash', ''), data.get('ops'), data.get('fields'))
+        return jsonify({'success': True, 'seq': seq})
 
-        # 写入新内容 - 只使用表单中的内容，不保留任何原有内容
-        new_content = new_front_matter + content + '\n'
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
 
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(new_content)
+@app.route('/api/posts/batch', methods=['POST'])
+def api_create_posts():
+    """批量创建文章: {"posts": [{"title": ..., "tags": [...], "content": ...}, ...], "on_conflict": "rename"}"""
+    try:
+        data = request.get_json(silent=True) or {}
+        posts = data.get('posts')
+        if not isinstance(posts, list) or not posts:
+            return jsonify({'success': False, 'error': '缺少 posts 列表'}), 400
+
+        result = blog_writer.create_posts(posts, on_conflict=data.get('on_conflict', 'rename'))
+        return jsonify({'success': True, 'created': result['created'], 'skipped': result['skipped'],
+                        'files': [Path(path).name for path in result['files']]})
+
+    except FileExistsError as e:
+        return jsonify({'success': False, 'error': str(e)}), 409
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
 
-        flash(f'文章 "{title}" 更新成功！', 'success')
-        return redirect(url_for('index'))
+@app.route('/api/posts/<filename>/revisions')
+def api_post_revisions(filename):
+    """API: 文章的历史版本（从新到旧）"""
+    try:
+        if not blog_writer.history:
+            return jsonify({'success': False, 'error': 'Git仓库未初始化'})
 
+        revisions = blog_writer.history.revisions(blog_writer.post_path(filename))
+        for revision in revisions:
+            revision['date'] = format_timestamp(revision['timestamp'])
+        return jsonify({'success': True, 'revisions': revisions})
     except Exception as e:
-        flash(f'更新文章失败: {str(e)}', 'error')
-        return redirect(url_for('edit_post', filename=filename))
+        return jsonify({'success': False, 'error': str(e)})
+
+@app.route('/api/posts/<filename>/diff')
+def api_post_diff(filename):
+    """API: 两个版本之间的统一差异（from/to 为提交哈希或 working，结果流式返回）"""
+    try:
+        if not blog_writer.history:
+            return jsonify({'success': False, 'error': 'Git仓库未初始化'})
+
+        old = request.args.get('from', '').strip()
+        new = request.args.get('to', WORKING).strip()
+        if not old:
+            return jsonify({'success': False, 'error': '缺少 from 参数'}), 400
+
+        lines = blog_writer.history.diff(blog_writer.post_path(filename), old, new)
+        # 先取第一段，版本不存在等错误在这里返回，而不是在流式响应中途
+        first = next(lines, '')
+        return flask.Response(flask.stream_with_context(itertools.chain([first], lines)),
+                              content_type='text/x-diff; charset=utf-8')
+    except KeyError as e:
+        return jsonify({'success': False, 'error': e.args[0]}), 404
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)})
 
 @app.route('/delete/<filename>', methods=['POST'])
 def delete_post(filename):
     """删除文章"""
     try:
-        file_path = blog_writer.posts_dir / filename
+        file_path = blog_writer.post_path(filename)
 
         if not file_path.exists():
             flash('文章不存在', 'error')
@@ -327,6 +511,8 @@ def delete_post(filename):
 
         # 删除文件
         file_path.unlink()
+        blog_writer.index.remove_file(file_path)
+        blog_writer.drafts.discard(file_path.stem)
 
         flash(f'文章 "{title}" 已删除！', 'success')
         return redirect(url_for('index'))
@@ -344,9 +530,9 @@ def preview():
 def debug():
     """调试页面"""
     try:
-        # 生成静态文件
-        blog_writer.generate_site()
-        flash('博客生成成功！', 'success')
+        # 生成静态文件（排入构建队列，与其他构建请求合并，不阻塞页面）
+        build_scheduler.request('打开调试页面')
+        flash('已加入构建队列', 'success')
         return render_template('debug.html')
     except Exception as e:
         flash(f'生成失败: {str(e)}', 'error')
@@ -357,7 +543,8 @@ def git_status():
     """Git状态"""
     try:
         if blog_writer and blog_writer.repo:
-            status = blog_writer.git_status()
+            with git_lock():
+                status = blog_writer.git_status()
             return jsonify(status)
         else:
             return jsonify({'error': '博客管理器未初始化'})
@@ -371,20 +558,19 @@ def git_commit():
         if not blog_writer or not blog_writer.repo:
             return jsonify({'success': False, 'error': '博客仓库未初始化'})
 
-        repo = blog_writer.repo
-        message = request.json.get('message', '更新博客')
+        data = request.json or {}
+        message = data.get('message', '更新博客')
 
-        # 添加所有文件
-        repo.git.add('--all')
+        with git_lock():
+            # 只暂存博客源文件（可通过 include/exclude 调整范围）
+            result = blog_writer.commit_changes(message, include=data.get('include'), exclude=data.get('exclude'))
 
-        # 检查是否有需要提交的内容
-        if repo.is_dirty(untracked_files=True):
-            repo.index.commit(message)
+        if result['committed']:
             flash('提交成功！', 'success')
         else:
             flash('没有需要提交的更改', 'info')
 
-        return jsonify({'success': True})
+        return jsonify({'success': True, **result})
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
 
@@ -399,7 +585,8 @@ def git_push():
         origin = repo.remote(name='origin')
 
         # 推送到远程
-        origin.push()
+        with git_lock(), phase('git'):
+            origin.push()
 
         flash('推送成功！博客将在几分钟后部署完成。', 'success')
         return jsonify({'success': True})
@@ -410,7 +597,8 @@ def git_push():
 def api_posts():
     """API: 获取文章列表"""
     try:
-        posts = blog_writer.list_posts(limit=100)
+        # 与 list_posts 返回相同的数据，但不在服务端打印列表
+        posts = blog_writer.annotate_history(blog_writer.index.filter_posts())
         return jsonify(posts)
     except Exception as e:
         return jsonify({'error': str(e)})
@@ -423,15 +611,43 @@ def api_search():
         return jsonify({'error': '搜索关键词不能为空'})
 
     try:
-        results = blog_writer.search_posts(keyword)
+        if request.args.get('mode') == 'regex':
+            results = blog_writer.find_posts_regex(keyword)
+        else:
+            results = blog_writer.find_posts(keyword)
         return jsonify(results)
     except Exception as e:
         return jsonify({'error': str(e)})
 
+@app.route('/api/taxonomy')
+def api_taxonomy():
+    """API: 获取标签/分类聚合索引（含文章数）"""
+    try:
+        return jsonify(blog_writer.get_taxonomy())
+    except Exception as e:
+        return jsonify({'error': str(e)})
+
+@app.route('/api/tags/<tag>')
+def api_tag_posts(tag):
+    """API: 获取指定标签下的文章"""
+    try:
+        posts = blog_writer.index.posts_by_tag(tag)
+        return jsonify({'tag': tag, 'count': len(posts), 'posts': posts})
+    except Exception as e:
+        return jsonify({'error': str(e)})
+
+@app.route('/api/categories/<path:category>')
+def api_category_posts(category):
+    """API: 获取指定分类下的文章（支持 A/B 层级路径）"""
+    try:
+        posts = blog_writer.index.posts_by_category(category)
+        return jsonify({'category': category, 'count': len(posts), 'posts': posts})
+    except Exception as e:
+        return jsonify({'error': str(e)})
+
 @app.route('/api/server_status')
 def api_server_status():
     """API: 检查本地服务器状态"""
-    import psutil
     import socket
 
     # 检查端口4000是否被占用
@@ -445,16 +661,8 @@ def api_server_status():
             result = s.connect_ex(('localhost', 4000))
             port_4000_in_use = (result == 0)
 
-        # 检查是否是我们启动的服务器
-        for port, process_info in hexo_server_processes.items():
-            process = process_info['process']
-            if process and process.poll() is None:  # 进程还在运行
-                if port == 4000:
-                    our_server_running = True
-                    break
-            else:
-                # 清理已结束的进程
-                del hexo_server_processes[port]
+        # 检查是否是我们启动的服务器（任一 worker 启动的都算，已退出的记录会被清理）
+        our_server_running = server_registry.get(4000) is not None
 
     except Exception as e:
         print(f"检查服务器状态时出错: {e}")
@@ -489,41 +697,37 @@ def api_server_start():
         port = data.get('port', 4000)
 
         # 检查端口是否已被我们的服务器占用
-        if port in hexo_server_processes:
-            process_info = hexo_server_processes[port]
-            process = process_info['process']
-            if process and process.poll() is None:
-                return jsonify({
-                    'success': False,
-                    'error': f'端口 {port} 上的服务器已经在运行'
-                })
-
-        # 启动Hexo服务器
-        import subprocess
-
-        # 生成静态文件
-        generate_result = subprocess.run(['npx', 'hexo', 'generate'],
-                                      capture_output=True, text=True,
-                                      cwd=blog_writer.blog_path)
-
-        if generate_result.returncode != 0:
+        if server_registry.get(port):
             return jsonify({
                 'success': False,
-                'error': f'生成静态文件失败: {generate_result.stderr}'
+                'error': f'端口 {port} 上的服务器已经在运行'
             })
 
-        # 启动服务器
-        process = subprocess.Popen(['npx', 'hexo', 'server', '-p', str(port)],
-                                 cwd=blog_writer.blog_path,
-                                 stdout=subprocess.PIPE,
-                                 stderr=subprocess.PIPE)
+        # 生成静态文件（经构建调度器，与正在进行或排队中的构建合并）
+        with phase('subprocess'):
+            build = build_scheduler.request(f'启动服务器 :{port}', wait=True, timeout=BUILD_TIMEOUT)
 
-        # 记录进程信息
-        hexo_server_processes[port] = {
-            'process': process,
-            'start_time': datetime.datetime.now().isoformat(),
-            'port': port
-        }
+        if build is None or not build['success']:
+            return jsonify({
+                'success': False,
+                'error': f"生成静态文件失败: {build['output'] if build else '构建超时'}"
+            })
+
+        def _launch():
+            # 服务器可能比启动它的 worker 活得更久：独立进程组，输出不接管道
+            process = subprocess.Popen(['npx', 'hexo', 'server', '-p', str(port)],
+                                     cwd=blog_writer.blog_path,
+                                     stdout=subprocess.DEVNULL,
+                                     stderr=subprocess.DEVNULL,
+                                     start_new_session=True)
+            return process.pid
+
+        # 登记与启动在同一个数据库写锁内完成，并发请求只会启动一个服务器
+        if server_registry.start(port, _launch) is None:
+            return jsonify({
+                'success': False,
+                'error': f'端口 {port} 上的服务器已经在运行'
+            })
 
         return jsonify({
             'success': True,
@@ -544,34 +748,17 @@ def api_server_stop():
         data = request.get_json()
         port = data.get('port', 4000)
 
-        if port in hexo_server_processes:
-            process_info = hexo_server_processes[port]
-            process = process_info['process']
-
-            if process and process.poll() is None:
-                # 尝试优雅地停止进程
-                process.terminate()
-
-                # 等待进程结束
-                try:
-                    process.wait(timeout=5)
-                except subprocess.TimeoutExpired:
-                    # 如果进程没有优雅结束，强制杀死
-                    process.kill()
-                    process.wait()
-
-                del hexo_server_processes[port]
-
-                return jsonify({
-                    'success': True,
-                    'message': f'端口 {port} 上的Hexo服务器已停止'
-                })
-            else:
-                del hexo_server_processes[port]
-                return jsonify({
-                    'success': False,
-                    'error': f'端口 {port} 上的服务器未在运行'
-                })
+        stopped = server_registry.stop(port)
+        if stopped:
+            return jsonify({
+                'success': True,
+                'message': f'端口 {port} 上的Hexo服务器已停止'
+            })
+        elif stopped is False:
+            return jsonify({
+                'success': False,
+                'error': f'端口 {port} 上的服务器未在运行'
+            })
         else:
             return jsonify({
                 'success': False,
@@ -588,37 +775,8 @@ def api_server_stop():
 def api_project_info():
     """API: 获取项目信息"""
     try:
-        # 获取 Hexo 版本信息
-        result = subprocess.run(['npx', 'hexo', 'version'],
-                              capture_output=True, text=True,
-                              cwd=blog_writer.blog_path)
-        hexo_version = result.stdout.split('\n')[0] if result.returncode == 0 else 'Unknown'
-
-        # 获取 Node.js 版本
-        result = subprocess.run(['node', '--version'],
-                              capture_output=True, text=True)
-        node_version = result.stdout.strip() if result.returncode == 0 else 'Unknown'
-
-        # 获取文章数量
-        posts = blog_writer.list_posts(limit=1000)
-
-        # 读取主题配置
-        theme = 'Unknown'
-        config_file = blog_writer.blog_path / '_config.yml'
-        if config_file.exists():
-            with open(config_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-                for line in content.split('\n'):
-                    if line.strip().startswith('theme:'):
-                        theme = line.split(':')[1].strip()
-                        break
-
-        return jsonify({
-            'hexo_version': hexo_version.replace('hexo-cli: ', ''),
-            'node_version': node_version,
-            'post_count': len(posts),
-            'theme': theme
-        })
+        # 工具链版本每个进程只检测一次，主题按 _config.yml 修改时间缓存，文章数来自索引
+        return jsonify(project_info.get())
     except Exception as e:
         return jsonify({'error': str(e)})
 
@@ -632,10 +790,21 @@ def api_execute_command():
         if not command:
             return jsonify({'success': False, 'error': '命令不能为空'})
 
+        if command == 'generate':
+            # 同时到达的多个生成请求只构建一次
+            with phase('subprocess'):
+                build = build_scheduler.request('hexo generate', wait=True, timeout=BUILD_TIMEOUT)
+            if build is None:
+                return jsonify({'success': False, 'error': '构建超时'})
+            if build['success']:
+                return jsonify({'success': True, 'output': build['output']})
+            return jsonify({'success': False, 'error': build['output']})
+
         # 执行命令
-        result = subprocess.run(['npx', 'hexo', command],
-                              capture_output=True, text=True,
-                              cwd=blog_writer.blog_path)
+        with phase('subprocess'):
+            result = subprocess.run(['npx', 'hexo', command],
+                                  capture_output=True, text=True,
+                                  cwd=blog_writer.blog_path)
 
         if result.returncode == 0:
             return jsonify({
@@ -650,21 +819,59 @@ def api_execute_command():
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
 
+@app.route('/api/build_status')
+def api_build_status():
+    """API: 构建队列状态（队列深度、当前构建、最近构建耗时）"""
+    status = build_scheduler.status()
+    status['build_on_save'] = build_on_save
+    return jsonify(status)
+
+@app.route('/api/build', methods=['POST'])
+def api_build():
+    """API: 请求一次构建（不等待安静窗口；正在构建时合并到下一次）"""
+    build_scheduler.request('手动构建')
+    return jsonify({'success': True, 'status': build_scheduler.status()})
+
 @app.route('/git_pull', methods=['POST'])
 def git_pull():
     """Git拉取"""
     try:
-        repo = git.Repo(blog_writer.blog_path)
-        origin = repo.remote(name='origin')
-        origin.pull()
+        with git_lock(), phase('git'):
+            repo = git.Repo(blog_writer.blog_path)
+            origin = repo.remote(name='origin')
+            origin.pull()
         flash('拉取成功！', 'success')
         return jsonify({'success': True})
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
 
 if __name__ == '__main__':
-    if not init_blog_writer():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Hexo 博客写作工具 - Web界面')
+    parser.add_argument('--host', default='127.0.0.1', help='监听地址')
+    parser.add_argument('--port', type=int, default=5000, help='端口号')
+    parser.add_argument('--path', help='博客路径 (默认: 项目根目录)')
+    parser.add_argument('--production', action='store_true', help='使用 waitress 多线程服务（非调试模式）')
+    parser.add_argument('--threads', type=int, default=8, help='waitress 线程数')
+    parser.add_argument('--build-on-save', action='store_true', help='保存文章/页面后自动构建（合并连续保存）')
+    parser.add_argument('--build-quiet', type=float, help=f'最后一次修改后等待多少秒再构建 (默认: {DEFAULT_QUIET})')
+    parser.add_argument('--build-max-wait', type=float, help=f'持续修改时最长等待秒数 (默认: {DEFAULT_MAX_WAIT})')
+    args = parser.parse_args()
+
+    build_options = {'on_save': args.build_on_save or None, 'quiet': args.build_quiet,
+                     'max_wait': args.build_max_wait}
+    if not init_blog_writer(args.path, build_options):
         print("无法初始化博客管理器")
         sys.exit(1)
 
-    app.run(host='127.0.0.1', port=5000, debug=True)
\ No newline at end of file
+    if args.production:
+        try:
+            from waitress import serve
+        except ImportError:
+            print("❌ 未安装waitress，请运行: pip install waitress")
+            sys.exit(1)
+        print(f"🚀 生产模式: http://{args.host}:{args.port} ({args.threads} 线程)")
+        serve(app, host=args.host, port=args.port, threads=args.threads)
+    else:
+        app.run(host=args.host, port=args.port, debug=True)
\ No newline at end of file
@@ -22,11 +22,21 @@ import argparse
 import subprocess
 import datetime
 import time
-import webbrowser
 import threading
 from pathlib import Path
 from typing import List, Optional, Dict
-import git
+
+from blog_tools.coordination import InterProcessLock
+from blog_tools.fileutil import atomic_write_text
+from blog_tools.front_matter import render_front_matter, unquote
+from blog_tools.post_files import PageTree, iter_post_files, page_id_for
+from blog_tools.post_index import PostIndex, is_post_file
+from blog_tools.timing import phase
+
+# 其余 blog_tools 模块（草稿、补丁、Git 历史、提交）在用到时才导入，保持命令行启动开销最小
+
+# 尚未初始化的延迟属性
+_UNSET = object()
 
 
 class HexoBlogWriter:
@@ -39,71 +49,154 @@ class HexoBlogWriter:
         if not self.posts_dir.exists():
             raise FileNotFoundError(f"博客目录不存在: {self.posts_dir}")
 
-        # 初始化Git仓库
-        try:
-            self.repo = git.Repo(str(self.blog_path))
-            print(f"Git仓库初始化成功: {self.repo.git_dir}")
-        except Exception as e:
-            print(f"Git仓库初始化失败: {e}")
-            # 尝试查找上级目录的Git仓库
-            try:
-                current_path = self.blog_path
-                for _ in range(5):  # 最多向上查找5级目录
-                    parent = current_path.parent
-                    if (parent / '.git').exists():
-                        self.repo = git.Repo(str(parent))
-                        print(f"在上级目录找到Git仓库: {parent}")
-                        break
-                    current_path = parent
-                else:
-                    self.repo = None
-            except Exception:
-                self.repo = None
+        # Git 仓库在第一次用到时才查找与打开（list/search 等命令不需要导入 GitPython）
+        self._repo = _UNSET
+        self._repo_dir = _UNSET
+        self._timeline = _UNSET
+        self._history = _UNSET
+        self._drafts = _UNSET
+        self._duplicates = _UNSET
+
+        # 文章元数据索引（标签/分类聚合、增量刷新）
+        self.cache_dir = self.blog_path / ".blog_cache"
+        self.index = PostIndex(self.posts_dir, self._parse_post_record,
+                               cache_file=self.cache_dir / "post_index.json")
+        # 页面索引（source/<slug>/index.md，与文章索引共用实现与缓存机制）
+        self.page_index = PostIndex(self.pages_dir, self._parse_page_record,
+                                    cache_file=self.cache_dir / "page_index.json",
+                                    tree=PageTree(self.pages_dir), id_for=page_id_for)
+        # 文章增量保存的读-改-写临界区（多个 worker 之间互斥）
+        self._post_lock = InterProcessLock(self.cache_dir / "posts.lock")
+        # (用途, 文件路径) -> ((mtime, size), 派生结果)；常驻进程/Web 进程中重复的搜索与验证不再重新读取解析
+        self._file_cache: Dict[tuple, tuple] = {}
+        # 常驻进程（daemon/Web）中为 True：正则搜索使用内存中的三字母组索引
+        self.resident = False
+        self._regex_index = None
+        self._regex_indexing = False
+        self._regex_lock = threading.Lock()
+
+    @property
+    def repo_dir(self) -> Optional[Path]:
+        """Git 工作区根目录：博客目录本身或最多向上 5 级的上级目录（只检查 .git，不导入 GitPython）"""
+        if self._repo_dir is _UNSET:
+            self._repo_dir = None
+            candidate = self.blog_path
+            for _ in range(6):
+                if (candidate / '.git').exists():
+                    self._repo_dir = candidate
+                    break
+                candidate = candidate.parent
+        return self._repo_dir
+
+    @property
+    def repo(self):
+        """GitPython 仓库对象（首次访问时打开）"""
+        if self._repo is _UNSET:
+            self._repo = None
+            if self.repo_dir is None:
+                print(f"Git仓库初始化失败: 未找到Git仓库 ({self.blog_path})")
+            else:
+                try:
+                    import git
+                    self._repo = git.Repo(str(self.repo_dir))
+                    if self.repo_dir == self.blog_path:
+                        print(f"Git仓库初始化成功: {self._repo.git_dir}")
+                    else:
+                        print(f"在上级目录找到Git仓库: {self.repo_dir}")
+                except Exception as e:
+                    print(f"Git仓库初始化失败: {e}")
+        return self._repo
+
+    @repo.setter
+    def repo(self, value):
+        self._repo = value
+
+    @property
+    def drafts(self):
+        """编辑器自动保存日志（与文章文件分开，显式保存后清除）"""
+        if self._drafts is _UNSET:
+            from blog_tools.drafts import DraftJournal
+            self._drafts = DraftJournal(self.cache_dir / "drafts", source=self._read_post_source)
+        return self._drafts
+
+    @property
+    def timeline(self):
+        """文章的首次/最后提交时间与修改次数（一次 git log 遍历，之后增量更新）"""
+        if self._timeline is _UNSET:
+            self._timeline = None
+            if self.repo_dir is not None:
+                from blog_tools.git_timeline import GitTimeline
+                try:
+                    self._timeline = GitTimeline(self.repo_dir, self.posts_dir,
+                                                 cache_file=self.cache_dir / "git_timeline.json")
+                except ValueError:
+                    # 文章目录不在仓库工作区内
+                    pass
+        return self._timeline
+
+    @property
+    def history(self):
+        """文章历史版本与差异（常驻 git cat-file 进程读取内容）"""
+        if self._history is _UNSET:
+            from blog_tools.revisions import PostHistory
+            self._history = PostHistory(self.repo_dir) if self.timeline is not None else None
+        return self._history
 
     def create_post(self, title: str, tags: List[str] = None, categories: List[str] = None,
-                   layout: str = "post", draft: bool = False) -> str:
-        """创建新博客文章"""
-        if not title:
-            raise ValueError("标题不能为空")
+                    layout: str = "post", draft: bool = False, content: str = None,
+                    interactive: bool = True) -> str:
+        """创建新博客文章（interactive 为 False 或不在终端中运行时不询问是否打开编辑器）"""
+        from blog_tools.creation import PostCreator
 
-        # 生成文件名 (日期 + 标题)
-        date_str = datetime.datetime.now().strftime("%Y-%m-%d")
-        filename = f"{date_str}-{title.lower().replace(' ', '-')}.md"
+        file_path = PostCreator(self).create({
+            'title': title, 'tags': tags, 'categories': categories,
+            'layout': layout, 'draft': draft, 'content': content
+        })
 
-        if draft:
-            filename = f"draft-{filename}"
+        print(f"✅ 文章创建成功: {file_path.name}")
+        print(f"📁 路径: {file_path}")
+
+        # 询问是否用编辑器打开
+        if interactive and sys.stdin.isatty():
+            try:
+                response = input("是否现在用编辑器打开文章? (y/N): ").strip().lower()
+                if response in ['y', 'yes']:
+                    self._open_editor(file_path)
+            except (KeyboardInterrupt, EOFError):
+                print("\n操作已取消")
 
-        file_path = self.posts_dir / filename
+        return str(file_path)
 
-        if file_path.exists():
-            raise FileExistsError(f"文章已存在: {filename}")
+    def create_posts(self, specs, on_conflict: str = 'rename', workers: int = None) -> Dict:
+        """批量创建文章（specs 为字典列表，或 JSONL/CSV 清单文件路径），不询问用户"""
+        from blog_tools.creation import PostCreator, load_manifest
 
-        # 生成 front matter
-        front_matter = self._generate_front_matter(title, tags, categories, layout)
+        if isinstance(specs, (str, Path)):
+            specs = load_manifest(Path(specs))
+        result = PostCreator(self).create_many(specs, on_conflict=on_conflict, workers=workers)
 
-        # 创建文件
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(front_matter)
-            f.write(f"\n\n# {title}\n\n")
-            f.write("在这里开始写你的内容...\n\n")
-            f.write("<!-- more -->\n\n")
-            f.write("## 继续你的内容\n\n")
+        print(f"✅ 批量创建完成: {result['created']} 篇文章，跳过 {result['skipped']} 篇 "
+              f"({result['elapsed']:.2f}s，{result['posts_per_second'] or 0:.0f} 篇/秒)")
+        return result
 
-        print(f"✅ 文章创建成功: {filename}")
-        print(f"📁 路径: {file_path}")
+    def import_posts(self, fmt: str, source: str, include_drafts: bool = False, commit: bool = True,
+                     workers: int = None) -> Dict:
+        """从 WordPress/Ghost 导出文件或 Markdown 目录批量导入文章（流式解析，最后提交一次）"""
+        from blog_tools.importer import PostImporter
 
-        # 询问是否用编辑器打开
-        try:
-            response = input("是否现在用编辑器打开文章? (y/N): ").strip().lower()
-            if response in ['y', 'yes']:
-                self._open_editor(file_path)
-        except KeyboardInterrupt:
-            print("\n操作已取消")
+        importer = PostImporter(self, include_drafts=include_drafts, workers=workers)
+        print(f"📥 开始导入 ({fmt}): {source}")
+        result = importer.run(fmt, Path(source), commit=commit,
+                              progress=lambda count: print(f"   已写入 {count} 篇..."))
 
-        return str(file_path)
+        print(f"✅ 导入完成: {result['imported']} 篇文章（草稿 {result['drafts']} 篇），"
+              f"跳过 {result['skipped']} 篇，重命名 {result['renamed']} 篇 ({result['elapsed']:.1f}s)")
+        if result['commit']:
+            print(f"📝 已提交: {result['commit'][:7]}")
+        return result
 
-    def create_page(self, title: str, layout: str = "page") -> str:
-        """创建新页面"""
+    def create_page(self, title: str, layout: str = "page", content: str = None) -> str:
+        """创建新页面（content 为空时使用默认正文），一次原子写入并更新页面索引"""
         if not title:
             raise ValueError("页面标题不能为空")
 
@@ -111,32 +204,24 @@ class HexoBlogWriter:
         import re
         page_slug = re.sub(r'[^\w\s-]', '', title.lower())
         page_slug = re.sub(r'[-\s]+', '-', page_slug).strip('-')
+        # Hexo 忽略以 _ 开头的目录（_posts、_drafts 等）
+        if not page_slug or page_slug.startswith('_'):
+            raise ValueError(f"无法从标题生成页面目录名: {title}")
 
-        # 创建页面目录
-        page_dir = self.pages_dir / page_slug
-        page_dir.mkdir(exist_ok=True)
-
-        # 创建页面文件
-        page_file = page_dir / "index.md"
+        page_file = self.pages_dir / page_slug / "index.md"
 
         if page_file.exists():
             raise FileExistsError(f"页面已存在: {page_slug}")
 
         # 生成 front matter
         date_str = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        front_matter = f"""---
-title: {title}
-date: {date_str}
-layout: {layout}
----
-
-"""
+        front_matter = render_front_matter([('title', title), ('date', date_str), ('layout', layout)]) + "\n"
+        body = f"{content}\n" if content else f"# {title}\n\n在这里开始写页面内容...\n\n"
+        page_content = front_matter + body
 
-        # 创建文件
-        with open(page_file, 'w', encoding='utf-8') as f:
-            f.write(front_matter)
-            f.write(f"# {title}\n\n")
-            f.write("在这里开始写页面内容...\n\n")
+        # 创建文件（目录由原子写入创建）
+        atomic_write_text(page_file, page_content)
+        self.page_index.update_records([(page_file, self._page_record_from_content(page_file, page_content))])
 
         print(f"✅ 页面创建成功: {page_slug}")
         print(f"📁 路径: {page_file}")
@@ -144,33 +229,63 @@ layout: {layout}
         return str(page_file)
 
     def list_pages(self) -> List[Dict]:
-        """列出所有页面"""
-        pages = []
+        """列出所有页面（按日期倒序，来自页面索引）"""
+        return self.page_index.all_posts()
 
-        # 查找所有页面目录（排除 _posts）
-        for item in self.pages_dir.iterdir():
-            if item.is_dir() and item.name != "_posts":
-                page_file = item / "index.md"
-                if page_file.exists():
-                    page_info = self._parse_post_info(page_file)
-                    page_info['page_slug'] = item.name
-                    pages.append(page_info)
-
-        # 按日期排序
-        pages.sort(key=lambda x: x.get('date', ''), reverse=True)
+    def get_page_info(self, page_slug: str) -> Dict:
+        """获取页面信息"""
+        page_info = self.page_index.get(page_slug)
+        if page_info is None:
+            raise FileNotFoundError(f"页面不存在: {page_slug}")
+        return page_info
 
+    def get_pages(self, page_slugs: List[str], content: bool = False) -> Dict[str, Optional[Dict]]:
+        """批量获取页面信息（不存在的页面为 None）；content=True 时附带正文"""
+        pages = {}
+        for page_slug in page_slugs:
+            page_info = self.page_index.get(page_slug)
+            if page_info is not None and content:
+                try:
+                    page_info['content'] = self._cached_file(
+                        'page', page_info['path'], lambda text: self._split_front_matter(text)[1])
+                except (OSError, UnicodeDecodeError):
+                    page_info = None
+            pages[page_slug] = page_info
         return pages
 
-    def get_page_info(self, page_slug: str) -> Dict:
-        """获取页面信息"""
-        page_file = self.pages_dir / page_slug / "index.md"
+    def find_pages(self, keyword: str) -> List[Dict]:
+        """查找标题或内容包含关键词的页面"""
+        keyword = keyword.lower()
+        results = []
+        for page_info in self.page_index.all_posts():
+            try:
+                content = self._cached_file('page_search', page_info['path'], str.lower)
+            except (OSError, UnicodeDecodeError) as e:
+                print(f"⚠️  读取文件失败 {page_info['path']}: {e}")
+                continue
 
-        if not page_file.exists():
-            raise FileNotFoundError(f"页面不存在: {page_slug}")
+            if keyword in content or keyword in str(page_info.get('title', '')).lower():
+                page_info['matches'] = [line.strip() for line in content.split('\n') if keyword in line][:3]
+                results.append(page_info)
+        return results
 
-        page_info = self._parse_post_info(page_file)
-        page_info['page_slug'] = page_slug
-        return page_info
+    def show_pages(self, keyword: str = None) -> List[Dict]:
+        """列出（或搜索）页面并输出"""
+        pages = self.find_pages(keyword) if keyword else self.list_pages()
+        if not pages:
+            print(f"❌ 没有找到包含 '{keyword}' 的页面" if keyword else "📄 还没有页面")
+            return pages
+
+        print(f"📄 找到 {len(pages)} 个页面:")
+        print("-" * 80)
+        for i, page in enumerate(pages, 1):
+            print(f"{i:2d}. {page.get('title', page['page_slug'])}")
+            print(f"     📁 {page['page_slug']}/index.md")
+            print(f"     📆 {page.get('date', '未知日期')}")
+            for match in page.get('matches', []):
+                print(f"      ...{match}...")
+            print()
+        return pages
 
     def update_page(self, page_slug: str, title: str = None, layout: str = None, content: str = None) -> bool:
         """更新页面"""
@@ -182,7 +297,8 @@ layout: {layout}
 
             # 读取现有内容
             with open(page_file, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
+                old_content = f.read()
+            lines = old_content.splitlines(keepends=True)
 
             # 找到front matter的结束位置
             front_matter_end = -1
@@ -193,20 +309,18 @@ layout: {layout}
                         break
 
             # 解析现有front matter
-            existing_info = self._parse_post_info(page_file)
+            existing_info = self._parse_post_content(page_file, old_content)
 
             # 更新信息
             new_title = title if title else existing_info.get('title', 'Untitled')
             new_layout = layout if layout else existing_info.get('layout', 'page')
 
             # 构建新的front matter
-            new_front_matter = f"""---
-title: {new_title}
-date: {existing_info.get('date', '')}
-layout: {new_layout}
----
-
-"""
+            fields = [('title', new_title)]
+            if existing_info.get('date'):
+                fields.append(('date', existing_info['date']))
+            fields.append(('layout', new_layout))
+            new_front_matter = render_front_matter(fields) + "\n"
 
             # 写入新内容
             if front_matter_end != -1:
@@ -215,10 +329,10 @@ layout: {new_layout}
                 new_content = new_front_matter + (content if content else content_after_front_matter)
             else:
                 # 如果没有front matter，直接添加
-                new_content = new_front_matter + (content if content else ''.join(lines))
+                new_content = new_front_matter + (content if content else old_content)
 
-            with open(page_file, 'w', encoding='utf-8') as f:
-                f.write(new_content)
+            atomic_write_text(page_file, new_content)
+            self.page_index.update_records([(page_file, self._page_record_from_content(page_file, new_content))])
 
             return True
         except Exception as e:
@@ -235,32 +349,64 @@ layout: {new_layout}
 
             import shutil
             shutil.rmtree(page_dir)
+            self.page_index.remove_file(page_dir / "index.md")
             print(f"✅ 页面删除成功: {page_slug}")
             return True
         except Exception as e:
             print(f"删除页面失败: {e}")
             return False
 
-    def list_posts(self, limit: int = 10, category: str = None, tag: str = None) -> List[Dict]:
-        """列出博客文章"""
-        posts = []
-
-        for file_path in self.posts_dir.glob("*.md"):
-            if file_path.name.startswith("draft-"):
-                continue
-
-            post_info = self._parse_post_info(file_path)
-
-            # 过滤条件
-            if category and category not in post_info.get('categories', []):
-                continue
-            if tag and tag not in post_info.get('tags', []):
-                continue
+    def patch_post(self, filename: str, base_hash: str, ops: List[Dict] = None,
+                   fields: Dict = None) -> Dict:
+        """增量保存文章（见 blog_tools/patching.py）
+
+        基准哈希与当前文件不一致时抛出 PatchConflict；只有内容确实变化时才写文件，
+        索引只更新变化的字段。
+        """
+        from blog_tools.patching import PatchConflict, apply_patch, content_hash
+
+        if Path(filename).name != filename or not filename.endswith('.md'):
+            raise ValueError(f"无效的文章文件名: {filename}")
+        file_path = self.post_path(filename)
+
+        with self._post_lock():
+            if not file_path.exists():
+                raise FileNotFoundError(f"文章不存在: {filename}")
+            content = file_path.read_bytes().decode('utf-8')
+            current_hash = content_hash(content)
+            if base_hash != current_hash:
+                raise PatchConflict(current_hash)
+
+            new_content, front_matter_changed = apply_patch(content, ops, fields)
+            # 显式保存后自动保存的草稿失效（内容未变化时也一样）
+            self.drafts.discard(file_path.stem)
+            if new_content == content:
+                return {'hash': current_hash, 'changed': False, 'fields': []}
+
+            atomic_write_text(file_path, new_content)
+            changed_fields = []
+            if is_post_file(filename):
+                changed_fields = self.index.update_record(
+                    file_path, self._record_from_content(file_path, new_content))
+
+        return {
+            'hash': content_hash(new_content),
+            'changed': True,
+            'front_matter_changed': front_matter_changed,
+            'fields': changed_fields
+        }
 
-            posts.append(post_info)
+    def _read_post_source(self, post_id: str) -> Optional[str]:
+        """读取文章文件原文（不转换换行符），文件不存在时返回 None"""
+        try:
+            return self.post_path(f"{post_id}.md").read_bytes().decode('utf-8')
+        except (OSError, UnicodeDecodeError):
+            return None
 
-        # 按日期排序
-        posts.sort(key=lambda x: x.get('date', ''), reverse=True)
+    def list_posts(self, limit: int = 10, category: str = None, tag: str = None) -> List[Dict]:
+        """列出博客文章"""
+        # 通过索引的标签/分类倒排列表过滤（已按日期倒序）
+        posts = self.annotate_history(self.index.filter_posts(category=category, tag=tag))
 
         # 显示结果
         if posts:
@@ -274,6 +420,8 @@ layout: {new_layout}
                 print(f"{i:2d}. {status} {post['title']}")
                 print(f"     📁 {post['filename']}")
                 print(f"     📆 {post.get('date', '未知日期')}")
+                if post.get('modified'):
+                    print(f"     🕒 最后修改 {post['modified']}（{post['revisions']} 次提交）")
                 print(f"     🏷️  {tags_str}")
                 print(f"     📂 {categories_str}")
                 print()
@@ -282,36 +430,28 @@ layout: {new_layout}
 
         return posts
 
-    def search_posts(self, keyword: str) -> List[Dict]:
-        """搜索文章"""
-        results = []
-
-        for file_path in self.posts_dir.glob("*.md"):
-            if file_path.name.startswith("draft-"):
-                continue
-
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read().lower()
-
-                if keyword.lower() in content:
-                    post_info = self._parse_post_info(file_path)
-                    # 添加匹配内容预览
-                    lines = content.split('\n')
-                    preview_lines = []
-                    for line in lines:
-                        if keyword.lower() in line:
-                            preview_lines.append(line.strip())
-
-                    post_info['matches'] = preview_lines[:3]  # 只显示前3个匹配
-                    results.append(post_info)
+    def annotate_history(self, posts: List[Dict]) -> List[Dict]:
+        """为文章记录加上 Git 提交历史：created/modified（提交时间）与 revisions（提交数）"""
+        for post in posts:
+            history = self.timeline.get(Path(post['path'])) if self.timeline else None
+            post.update(history or {'created': '', 'modified': '', 'revisions': 0})
+        return posts
 
-            except Exception as e:
-                print(f"⚠️  读取文件失败 {file_path}: {e}")
+    def search_posts(self, keyword: str, regex: bool = False, timeout: float = None) -> List[Dict]:
+        """搜索文章（regex=True 时 keyword 为正则表达式）"""
+        start = time.perf_counter()
+        if regex:
+            results = self.find_posts_regex(keyword, timeout=timeout)
+        else:
+            results = self.find_posts(keyword)
+        elapsed = (time.perf_counter() - start) * 1000
 
         # 显示结果
         if results:
-            print(f"\n🔍 搜索 '{keyword}' 找到 {len(results)} 篇文章:")
+            if regex:
+                print(f"\n🔍 正则 /{keyword}/ 找到 {len(results)} 篇文章 ({elapsed:.1f}ms):")
+            else:
+                print(f"\n🔍 搜索 '{keyword}' 找到 {len(results)} 篇文章:")
             print("-" * 80)
             for i, post in enumerate(results, 1):
                 print(f"{i}. 📝 {post['title']}")
@@ -323,10 +463,142 @@ layout: {new_layout}
                         print(f"      ...{match}...")
                 print()
         else:
-            print(f"❌ 没有找到包含 '{keyword}' 的文章")
+            if regex:
+                print(f"❌ 没有找到匹配 /{keyword}/ 的文章")
+            else:
+                print(f"❌ 没有找到包含 '{keyword}' 的文章")
+
+        return results
+
+    def find_posts(self, keyword: str) -> List[Dict]:
+        """查找包含关键词的文章（不输出，供 Web/API 调用）"""
+        results = []
+
+        for path, name, st in self._post_files():
+            try:
+                content, post_info = self._cached_file('search', path, lambda text: (
+                    text.lower(), self._parse_post_content(Path(path), text)), st)
+
+                if keyword.lower() in content:
+                    post_info = dict(post_info)
+                    # 添加匹配内容预览（只显示前3个匹配）
+                    preview_lines = []
+                    for line in content.split('\n'):
+                        if keyword.lower() in line:
+                            preview_lines.append(line.strip())
+                            if len(preview_lines) == 3:
+                                break
+
+                    post_info['matches'] = preview_lines
+                    results.append(post_info)
+
+            except Exception as e:
+                print(f"⚠️  读取文件失败 {path}: {e}")
 
         return results
 
+    def find_posts_regex(self, pattern: str, timeout: float = None) -> List[Dict]:
+        """查找内容匹配正则表达式的文章（先用三字母组索引筛选候选，再完整匹配）
+
+        表达式无效、可能灾难性回溯或超时时抛出 RegexSearchError。
+        """
+        from blog_tools.regex_search import REGEX_TIMEOUT, RegexQuery
+
+        query = RegexQuery(pattern, timeout=timeout or REGEX_TIMEOUT)
+        files = self._post_files()
+        candidates = self._regex_candidates(files, query.query) if self.resident else None
+
+        results = []
+        with query.running():
+            for path, name, st in files:
+                if candidates is not None and path not in candidates:
+                    continue
+                try:
+                    with phase('scan'), open(path, 'r', encoding='utf-8') as f:
+                        content = f.read()
+                except (OSError, UnicodeDecodeError) as e:
+                    print(f"⚠️  读取文件失败 {path}: {e}")
+                    continue
+
+                matches = query.matching_lines(content)
+                if matches:
+                    with phase('parse'):
+                        post_info = self._parse_post_content(Path(path), content)
+                    post_info['matches'] = matches
+                    results.append(post_info)
+
+        return results
+
+    def _regex_candidates(self, files: List[tuple], query) -> Optional[set]:
+        """增量更新三字母组索引并返回候选文章路径（None 表示需要检查全部文章）
+
+        首次建立索引或大量文章变化时在后台线程中进行，完成前的查询直接扫描全部文章。
+        """
+        from blog_tools.regex_search import INDEX_SYNC_LIMIT, TrigramIndex
+
+        with self._regex_lock:
+            if self._regex_index is None:
+                self._regex_index = TrigramIndex()
+            index = self._regex_index
+            if self._regex_indexing:
+                return None
+            stale = [(path, st) for path, _, st in files
+                     if index.signature(path) != (st.st_mtime_ns, st.st_size)]
+            if len(stale) > INDEX_SYNC_LIMIT:
+                self._regex_indexing = True
+                threading.Thread(target=self._index_regex_files, args=(index, stale, files),
+                                 daemon=True).start()
+                return None
+
+        self._index_regex_files(index, stale, files)
+        return index.candidates(query)
+
+    def _index_regex_files(self, index, stale: List[tuple], files: List[tuple]):
+        try:
+            with phase('parse'):
+                for path, st in stale:
+                    try:
+                        content = self._cached_file('search', path, lambda text: (
+                            text.lower(), self._parse_post_content(Path(path), text)), st)[0]
+                    except (OSError, UnicodeDecodeError):
+                        continue
+                    index.update(path, (st.st_mtime_ns, st.st_size), content)
+                index.retain(path for path, _, _ in files)
+        finally:
+            self._regex_indexing = False
+
+    def _post_files(self) -> List[tuple]:
+        """文章目录（含子目录）下的 *.md 文件（不含 draft-*），返回 [(路径字符串, 文件名, stat)]"""
+        with phase('scan'):
+            return list(iter_post_files(self.posts_dir))
+
+    def post_path(self, filename: str) -> Path:
+        """文章文件的实际路径（文章可以在 _posts 的子目录中；索引中没有时为 _posts/文件名）"""
+        name = Path(filename).name
+        if name.endswith('.md'):
+            record = self.index.get(name[:-3])
+            if record and Path(record['path']).name == name:
+                return Path(record['path'])
+        return self.posts_dir / name
+
+    def _cached_file(self, purpose: str, path: str, build, st: os.stat_result = None):
+        """读取文件并返回 build(内容)；文件的 mtime/大小未变时直接返回上次的结果"""
+        if st is None:
+            with phase('scan'):
+                st = os.stat(path)
+        key = (purpose, path)
+        signature = (st.st_mtime_ns, st.st_size)
+        cached = self._file_cache.get(key)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        with phase('scan'), open(path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        with phase('parse'):
+            result = build(content)
+        self._file_cache[key] = (signature, result)
+        return result
+
     def preview_server(self, port: int = 4000):
         """启动本地预览服务器"""
         print(f"🚀 启动 Hexo 本地服务器...")
@@ -347,12 +619,13 @@ layout: {new_layout}
         print("🔨 正在生成静态网站...")
 
         try:
-            # 清理
-            subprocess.run(["npx", "hexo", "clean"], cwd=self.blog_path, check=True)
-            print("✅ 清理完成")
+            with phase('subprocess'):
+                # 清理
+                subprocess.run(["npx", "hexo", "clean"], cwd=self.blog_path, check=True)
+                print("✅ 清理完成")
 
-            # 生成
-            subprocess.run(["npx", "hexo", "generate"], cwd=self.blog_path, check=True)
+                # 生成
+                subprocess.run(["npx", "hexo", "generate"], cwd=self.blog_path, check=True)
             print("✅ 网站生成完成")
             print(f"📁 静态文件位于: {self.blog_path / 'public'}")
 
@@ -366,7 +639,8 @@ layout: {new_layout}
         print("🚀 正在部署网站...")
 
         try:
-            subprocess.run(["npx", "hexo", "deploy"], cwd=self.blog_path, check=True)
+            with phase('subprocess'):
+                subprocess.run(["npx", "hexo", "deploy"], cwd=self.blog_path, check=True)
             print("✅ 部署完成")
 
         except subprocess.CalledProcessError as e:
@@ -375,61 +649,24 @@ layout: {new_layout}
             print("❌ 未找到 Hexo 命令，请确保已安装依赖")
 
     def _generate_front_matter(self, title: str, tags: List[str] = None,
-                              categories: List[str] = None, layout: str = "post") -> str:
-        """生成 front matter"""
-        now = datetime.datetime.now()
-        date_str = now.strftime("%Y-%m-%d %H:%M:%S")
-
-        front_matter = "---\n"
-        front_matter += f"title: {title}\n"
-        front_matter += f"date: {date_str}\n"
+                              categories: List[str] = None, layout: str = "post", date: str = None) -> str:
+        """生成 front matter（date 默认为当前时间）"""
+        date_str = date or datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
+        fields = [('title', title), ('date', date_str)]
         if tags:
-            front_matter += f"tags: [{', '.join([f'{tag}' for tag in tags])}]\n"
-
+            fields.append(('tags', tags))
         if categories:
-            front_matter += f"categories: [{', '.join([f'{cat}' for cat in categories])}]\n"
-
-        front_matter += f"layout: {layout}\n"
-        front_matter += "---\n"
-
-        return front_matter
+            fields.append(('categories', categories))
+        fields.append(('layout', layout))
+        return render_front_matter(fields)
 
     def _parse_post_info(self, file_path: Path) -> Dict:
         """解析文章信息"""
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
                 content = f.read()
-
-            # 解析 front matter
-            front_matter = {}
-            if content.startswith('---'):
-                end_idx = content.find('---', 3)
-                if end_idx != -1:
-                    fm_text = content[3:end_idx].strip()
-                    for line in fm_text.split('\n'):
-                        if ':' in line:
-                            key, value = line.split(':', 1)
-                            key = key.strip()
-                            value = value.strip().strip('"\'')
-
-                            # 处理数组格式
-                            if value.startswith('[') and value.endswith(']'):
-                                value = value[1:-1].split(',')
-                                value = [v.strip().strip('"\'') for v in value if v.strip()]
-
-                            front_matter[key] = value
-
-            return {
-                'filename': file_path.name,
-                'path': str(file_path),
-                'title': front_matter.get('title', file_path.stem),
-                'date': front_matter.get('date', ''),
-                'tags': front_matter.get('tags', []),
-                'categories': front_matter.get('categories', []),
-                'layout': front_matter.get('layout', 'post'),
-                'published': front_matter.get('published', True)
-            }
+            return self._parse_post_content(file_path, content)
 
         except Exception as e:
             return {
@@ -443,6 +680,138 @@ layout: {new_layout}
                 'published': True
             }
 
+    def _parse_post_content(self, file_path: Path, content: str) -> Dict:
+        """从文件内容解析文章信息"""
+        front_matter = self._parse_front_matter(content)
+
+        return {
+            'filename': file_path.name,
+            'path': str(file_path),
+            'title': front_matter.get('title', file_path.stem),
+            'date': front_matter.get('date', ''),
+            'tags': front_matter.get('tags', []),
+            'categories': front_matter.get('categories', []),
+            'layout': front_matter.get('layout', 'post'),
+            'published': front_matter.get('published', True)
+        }
+
+    def _parse_front_matter(self, content: str) -> Dict:
+        """解析 front matter（支持 [a, b] 与 "- item" 两种列表写法）"""
+        front_matter = {}
+        if not content.startswith('---'):
+            return front_matter
+
+        end_idx = content.find('---', 3)
+        if end_idx == -1:
+            return front_matter
+
+        fm_text = content[3:end_idx].strip()
+        last_key = None
+        for line in fm_text.split('\n'):
+            stripped = line.strip()
+
+            # YAML 块列表: 上一个键的值为空时，后续 "- item" 行作为列表元素
+            if stripped.startswith('- ') and last_key is not None:
+                current = front_matter.get(last_key)
+                if not isinstance(current, list):
+                    current = []
+                    front_matter[last_key] = current
+                current.append(unquote(stripped[2:].strip()))
+                continue
+
+            if ':' in line:
+                key, value = line.split(':', 1)
+                key = key.strip()
+                raw = value.strip()
+                value = unquote(raw)
+
+                # 处理数组格式（加引号的 "[...]" 是字符串）
+                if raw.startswith('[') and raw.endswith(']'):
+                    value = raw[1:-1].split(',')
+                    value = [v.strip().strip('"\'') for v in value if v.strip()]
+
+                front_matter[key] = value
+                last_key = key if value == '' else None
+
+        return front_matter
+
+    def _parse_post_record(self, file_path: Path) -> Dict:
+        """解析索引用的文章记录（文章信息 + 字数），只读取一次文件"""
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                content = f.read()
+        except Exception:
+            record = self._parse_post_info(file_path)
+            record['word_count'] = 0
+            return record
+        return self._record_from_content(file_path, content)
+
+    def _parse_page_record(self, file_path: Path) -> Dict:
+        """解析页面索引记录（source/<slug>/index.md）"""
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                content = f.read()
+        except Exception:
+            record = self._parse_post_info(file_path)
+            record['word_count'] = 0
+            record['page_slug'] = file_path.parent.name
+            return record
+        return self._page_record_from_content(file_path, content)
+
+    def _page_record_from_content(self, file_path: Path, content: str) -> Dict:
+        record = self._record_from_content(file_path, content)
+        record['page_slug'] = file_path.parent.name
+        return record
+
+    def _record_from_content(self, file_path: Path, content: str) -> Dict:
+        """从已读入的文章内容构建索引记录"""
+        record = self._parse_post_content(file_path, content)
+        record['word_count'] = self._count_words(content)
+
+        # 前端导出需要的附加字段
+        front_matter = self._parse_front_matter(content)
+        record['updated'] = front_matter.get('updated', '') or record['date']
+        record['author'] = front_matter.get('author', '')
+        record['cover'] = front_matter.get('cover', '') or front_matter.get('coverImage', '')
+        record['sticky'] = str(front_matter.get('sticky', front_matter.get('pin', ''))).lower() in ('true', 'yes', '1')
+        record['excerpt'] = self._extract_excerpt(self._split_front_matter(content)[1])
+        return record
+
+    @staticmethod
+    def _split_front_matter(content: str) -> tuple:
+        """拆分 front matter 与正文，返回 (front matter 文本, 正文)"""
+        if content.startswith('---'):
+            end_idx = content.find('\n---', 3)
+            if end_idx != -1:
+                body_start = content.find('\n', end_idx + 4)
+                body = content[body_start + 1:] if body_start != -1 else ''
+                return content[3:end_idx].strip(), body
+        return '', content
+
+    @staticmethod
+    def _extract_excerpt(body: str) -> str:
+        """摘要: <!-- more --> 之前的内容"""
+        marker = body.find('<!-- more -->')
+        return body[:marker].strip() if marker != -1 else ''
+
+    @staticmethod
+    def _count_words(content: str) -> int:
+        """统计字数（去除front matter与Markdown语法）"""
+        import re
+
+        front_matter_end = content.find('---', 3)
+        if front_matter_end != -1:
+            content_text = content[front_matter_end + 3:]
+        else:
+            content_text = content
+
+        # 移除Markdown语法
+        content_text = re.sub(r'[#*`\[\]()]', '', content_text)
+        content_text = re.sub(r'!\[.*?\]\(.*?\)', '', content_text)
+        content_text = re.sub(r'\[.*?\]\(.*?\)', '', content_text)
+
+        return len(content_text.split())
+
     def _open_editor(self, file_path: Path):
         """用默认编辑器打开文件"""
         import subprocess
@@ -465,46 +834,48 @@ layout: {new_layout}
             return {"error": "Git仓库未初始化"}
 
         try:
-            # 检查是否有未提交的更改
-            is_clean = not self.repo.is_dirty(untracked_files=True)
-
-            # 确保我们在正确的工作目录
-            import os
-            original_cwd = os.getcwd()
-            os.chdir(str(self.blog_path))
-
-            status = {
-                "is_clean": is_clean,
-                "branch": self.repo.active_branch.name,
-                "untracked_files": list(self.repo.untracked_files),
-                "modified_files": [item.a_path for item in self.repo.index.diff(None)],
-                "staged_files": [item.a_path for item in self.repo.index.diff("HEAD")]
-            }
-
-            # 恢复工作目录
-            os.chdir(original_cwd)
-
-            return status
+            with phase('git'):
+                # 检查是否有未提交的更改
+                is_clean = not self.repo.is_dirty(untracked_files=True)
+
+                # GitPython 的命令都在仓库工作目录中执行，无需切换进程工作目录
+                status = {
+                    "is_clean": is_clean,
+                    "branch": self.repo.active_branch.name,
+                    "untracked_files": list(self.repo.untracked_files),
+                    "modified_files": [item.a_path for item in self.repo.index.diff(None)],
+                    "staged_files": [item.a_path for item in self.repo.index.diff("HEAD")]
+                }
+
+                return status
         except Exception as e:
             return {"error": str(e)}
 
-    def git_commit(self, message: str = "更新博客") -> bool:
+    def commit_changes(self, message: str = "更新博客", include: List[str] = None,
+                       exclude: List[str] = None) -> Dict:
+        """只暂存并提交博客源文件的变更（规则见 blog_tools/commit_engine.py），返回暂存文件与耗时"""
+        if not self.repo:
+            raise RuntimeError("Git仓库未初始化")
+        from blog_tools.commit_engine import CommitEngine
+
+        engine = CommitEngine(self.repo, self.blog_path, include=include, exclude=exclude)
+        return engine.commit(message)
+
+    def git_commit(self, message: str = "更新博客", include: List[str] = None,
+                   exclude: List[str] = None) -> bool:
         """Git提交"""
         if not self.repo:
             print("❌ Git仓库未初始化")
             return False
 
         try:
-            # 添加所有文件
-            self.repo.git.add('--all')
-
-            # 检查是否有需要提交的内容
-            if self.repo.is_dirty(untracked_files=True):
-                self.repo.index.commit(message)
-                print("✅ 提交成功")
+            result = self.commit_changes(message, include=include, exclude=exclude)
+            timings = ', '.join(f"{name} {seconds * 1000:.0f}ms" for name, seconds in result['timings'].items())
+            if result['committed']:
+                print(f"✅ 提交成功: {result['commit'][:7]}（暂存 {len(result['staged_files'])} 个文件，{timings}）")
                 return True
             else:
-                print("ℹ️  没有需要提交的更改")
+                print(f"ℹ️  没有需要提交的更改（{timings}）")
                 return False
 
         except Exception as e:
@@ -518,8 +889,9 @@ layout: {new_layout}
             return False
 
         try:
-            origin = self.repo.remote(name='origin')
-            origin.push()
+            with phase('git'):
+                origin = self.repo.remote(name='origin')
+                origin.push()
             print("✅ 推送成功")
             return True
 
@@ -534,8 +906,9 @@ layout: {new_layout}
             return False
 
         try:
-            origin = self.repo.remote(name='origin')
-            origin.pull()
+            with phase('git'):
+                origin = self.repo.remote(name='origin')
+                origin.pull()
             print("✅ 拉取成功")
             return True
 
@@ -559,6 +932,8 @@ layout: {new_layout}
             except FileNotFoundError:
                 print("❌ 未找到Hexo命令，请确保已安装依赖")
 
+        import webbrowser
+
         # 在新线程中启动服务器
         server_thread = threading.Thread(target=_run_server, daemon=True)
         server_thread.start()
@@ -576,9 +951,8 @@ layout: {new_layout}
         """检查文章中的链接"""
         issues = []
 
-        for file_path in self.posts_dir.glob("*.md"):
-            if file_path.name.startswith("draft-"):
-                continue
+        for path, _, _ in self._post_files():
+            file_path = Path(path)
 
             try:
                 with open(file_path, 'r', encoding='utf-8') as f:
@@ -632,123 +1006,207 @@ layout: {new_layout}
             "missing_title": [],
             "missing_date": [],
             "invalid_date": [],
-            "duplicate_titles": []
+            "duplicate_titles": [],
+            "duplicate_ids": []
         }
 
         titles = set()
+        # 文章ID（文件名）-> 相对路径；不同目录中的同名文章会共用一个ID，索引只保留其中一篇
+        ids: Dict[str, List[str]] = {}
 
-        for file_path in self.posts_dir.glob("*.md"):
-            if file_path.name.startswith("draft-"):
-                continue
+        for path, name, st in self._post_files():
+            ids.setdefault(name[:-3], []).append(os.path.relpath(path, self.posts_dir))
 
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-
-                # 检查front matter
-                if not content.startswith('---'):
-                    issues["missing_front_matter"].append(file_path.name)
-                    continue
-
-                # 解析front matter
-                end_idx = content.find('---', 3)
-                if end_idx == -1:
-                    issues["missing_front_matter"].append(file_path.name)
-                    continue
+                problems, title = self._cached_file('validate', path, self._validate_content, st)
+            except Exception as e:
+                issues["missing_front_matter"].append(f"{name}: {e}")
+                continue
 
-                fm_text = content[3:end_idx].strip()
-                front_matter = {}
+            for problem in problems:
+                issues[problem].append(name)
+            if title is None:
+                continue
 
-                for line in fm_text.split('\n'):
-                    if ':' in line:
-                        key, value = line.split(':', 1)
-                        front_matter[key.strip()] = value.strip().strip('"\'')
+            # 检查重复标题
+            if title in titles:
+                issues["duplicate_titles"].append(title)
+            titles.add(title)
 
-                # 检查必需字段
-                if 'title' not in front_matter:
-                    issues["missing_title"].append(file_path.name)
+        for post_id, paths in ids.items():
+            if len(paths) > 1:
+                issues["duplicate_ids"].append(f"{post_id}: {', '.join(sorted(paths))}")
 
-                if 'date' not in front_matter:
-                    issues["missing_date"].append(file_path.name)
-                else:
-                    # 验证日期格式
-                    try:
-                        datetime.datetime.strptime(front_matter['date'], '%Y-%m-%d %H:%M:%S')
-                    except ValueError:
-                        issues["invalid_date"].append(file_path.name)
+        return issues
 
-                # 检查重复标题
-                title = front_matter.get('title', '')
-                if title in titles:
-                    issues["duplicate_titles"].append(title)
-                titles.add(title)
+    @staticmethod
+    def _validate_content(content: str) -> tuple:
+        """单篇文章的格式问题，返回 (问题类型列表, 标题)；没有 front matter 时标题为 None"""
+        # 检查front matter
+        if not content.startswith('---'):
+            return ["missing_front_matter"], None
+
+        # 解析front matter
+        end_idx = content.find('---', 3)
+        if end_idx == -1:
+            return ["missing_front_matter"], None
+
+        fm_text = content[3:end_idx].strip()
+        front_matter = {}
+
+        for line in fm_text.split('\n'):
+            if ':' in line:
+                key, value = line.split(':', 1)
+                front_matter[key.strip()] = value.strip().strip('"\'')
+
+        problems = []
+        # 检查必需字段
+        if 'title' not in front_matter:
+            problems.append("missing_title")
+
+        if 'date' not in front_matter:
+            problems.append("missing_date")
+        else:
+            # 验证日期格式
+            try:
+                datetime.datetime.strptime(front_matter['date'], '%Y-%m-%d %H:%M:%S')
+            except ValueError:
+                problems.append("invalid_date")
 
-            except Exception as e:
-                issues["missing_front_matter"].append(f"{file_path.name}: {e}")
+        return problems, front_matter.get('title', '')
 
-        return issues
+    def find_near_duplicates(self, threshold: float = 0.8) -> Dict:
+        """近似重复文章（MinHash + LSH，签名按文章增量缓存），返回相似度不低于 threshold 的文章簇"""
+        if self._duplicates is _UNSET:
+            from blog_tools.duplicates import DuplicateDetector
+            self._duplicates = DuplicateDetector(self)
+        return self._duplicates.find(threshold)
 
     def get_blog_stats(self) -> Dict:
         """获取博客统计信息"""
-        stats = {
-            "total_posts": 0,
-            "total_tags": set(),
-            "total_categories": set(),
-            "last_updated": None,
-            "word_count": 0
-        }
+        posts = self.index.all_posts()
+        tag_counts = self.index.tag_counts()
+        category_counts = self.index.category_counts()
 
         latest_date = None
+        for post_info in posts:
+            # 找到最新更新时间
+            post_date = post_info.get('date', '')
+            if post_date:
+                try:
+                    current_date = datetime.datetime.strptime(post_date, '%Y-%m-%d %H:%M:%S')
+                    if not latest_date or current_date > latest_date:
+                        latest_date = current_date
+                except ValueError:
+                    pass
+
+        # 有 Git 历史时以最后一次提交时间为准
+        last_commit = self.timeline.last_modified() if self.timeline else None
+        if last_commit:
+            latest_date = datetime.datetime.strptime(last_commit, '%Y-%m-%d %H:%M:%S')
+
+        return {
+            "total_posts": len(posts),
+            "total_tags": list(tag_counts),
+            "total_categories": list(category_counts),
+            "tag_counts": tag_counts,
+            "category_counts": category_counts,
+            "last_updated": latest_date.strftime('%Y-%m-%d %H:%M:%S') if latest_date else None,
+            "word_count": sum(post.get('word_count', 0) for post in posts)
+        }
 
-        for file_path in self.posts_dir.glob("*.md"):
-            if file_path.name.startswith("draft-"):
-                continue
+    def get_taxonomy(self) -> Dict:
+        """获取标签/分类聚合索引（含文章数与文章ID列表）"""
+        return self.index.taxonomy()
+
+    def export_taxonomy(self, output_file: str = None) -> str:
+        """导出标签/分类聚合索引为 JSON，供 Next.js 前端使用"""
+        output_path = Path(output_file) if output_file else self.blog_path / "public" / "data" / "taxonomy.json"
+        taxonomy = self.get_taxonomy()
+        taxonomy['generated'] = datetime.datetime.now().isoformat()
+
+        atomic_write_text(output_path, json.dumps(taxonomy, indent=2, ensure_ascii=False))
+        print(f"✅ 标签/分类索引已导出: {output_path}")
+        return str(output_path)
+
+    def export_data(self, output_dir: str = None, page_size: int = 20, legacy: bool = True,
+                    related: bool = True) -> Dict:
+        """导出前端 JSON 数据包（分页列表、单篇文章、标签/分类、搜索分片）"""
+        from blog_tools.export import DataExporter
+
+        exporter = DataExporter(self, Path(output_dir) if output_dir else None,
+                                page_size=page_size, legacy=legacy, related=related)
+        result = exporter.export()
+
+        print(f"✅ 导出完成: {result['posts']} 篇文章")
+        print(f"   新写入 {result['written']} 个文件，复用 {result['reused']} 个，清理 {result['removed']} 个")
+        if result['related'] is None:
+            print("   未计算相关文章 (--no-related)")
+        else:
+            print(f"   {result['related']} 篇文章带相关文章")
+        print(f"📁 入口文件: {result['manifest']}")
+        return result
 
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
+    def build_search_index(self, output_dir: str = None, max_shard_kb: int = 32) -> Dict:
+        """生成前端静态搜索索引（按前缀分片，增量构建）"""
+        from blog_tools.search_index import SearchIndexBuilder
 
-                post_info = self._parse_post_info(file_path)
-                stats["total_posts"] += 1
+        builder = SearchIndexBuilder(self, Path(output_dir) if output_dir else None,
+                                     max_shard_bytes=max_shard_kb * 1024)
+        result = builder.build()
 
-                # 收集标签和分类
-                stats["total_tags"].update(post_info.get('tags', []))
-                stats["total_categories"].update(post_info.get('categories', []))
+        print(f"✅ 搜索索引生成完成: {result['docs']} 篇文章，{result['terms']} 个词")
+        print(f"   {result['shards']} 个分片（最大 {result['max_shard_bytes'] / 1024:.1f} KB），"
+              f"重新分词 {result['tokenized']} 篇")
+        print(f"   新写入 {result['written']} 个分片，复用 {result['reused']} 个，清理 {result['removed']} 个")
+        print(f"📁 入口文件: {result['manifest']}")
+        return result
 
-                # 统计字数（去除front matter）
-                front_matter_end = content.find('---', 3)
-                if front_matter_end != -1:
-                    content_text = content[front_matter_end + 3:]
-                else:
-                    content_text = content
+    def build_related(self, k: int = 5, force: bool = False) -> Dict:
+        """计算每篇文章的相关文章（TF-IDF 余弦相似度，增量更新）"""
+        from blog_tools.related import RelatedPosts
 
-                # 移除Markdown语法
-                import re
-                content_text = re.sub(r'[#*`\[\]()]', '', content_text)
-                content_text = re.sub(r'!\[.*?\]\(.*?\)', '', content_text)
-                content_text = re.sub(r'\[.*?\]\(.*?\)', '', content_text)
+        result = RelatedPosts(self, k=k).build(force=force)
 
-                stats["word_count"] += len(content_text.split())
+        mode = "全量计算" if result['full'] else f"增量计算 {result['recomputed']} 篇"
+        print(f"✅ 相关文章计算完成: {result['posts']} 篇文章，{mode} ({result['backend']}, {result['elapsed']:.2f}s)")
+        print(f"   新增/修改 {result['changed']} 篇，删除 {result['removed']} 篇")
+        return result
 
-                # 找到最新更新时间
-                post_date = post_info.get('date', '')
-                if post_date:
-                    try:
-                        current_date = datetime.datetime.strptime(post_date, '%Y-%m-%d %H:%M:%S')
-                        if not latest_date or current_date > latest_date:
-                            latest_date = current_date
-                    except ValueError:
-                        pass
+    def get_related(self, post_id: str, k: int = 5) -> List[Dict]:
+        """文章的相关文章（先增量更新）"""
+        from blog_tools.related import RelatedPosts
+
+        engine = RelatedPosts(self, k=k)
+        engine.build()
+        return engine.get(post_id)
+
+    def build_feeds(self, output_dir: str = None, site_url: str = None, force: bool = False) -> Dict:
+        """增量生成 sitemap.xml 与 RSS/Atom 订阅源"""
+        from blog_tools.feeds import FeedBuilder, SITE_URL
+
+        builder = FeedBuilder(self, Path(output_dir) if output_dir else None, site_url=site_url or SITE_URL)
+        result = builder.build(force=force)
 
-            except Exception:
-                pass
+        if result['written']:
+            print(f"✅ 已更新: {', '.join(result['written'])} ({result['posts']} 篇文章)")
+        else:
+            print("ℹ️  站点地图与订阅源无变化，跳过生成")
+        return result
+
+    def process_assets(self, widths: List[int] = None, quality: int = 80, workers: int = None) -> Dict:
+        """生成文章图片的响应式版本与 WebP 版本（按源文件哈希缓存）"""
+        from blog_tools.assets import AssetPipeline, DEFAULT_WIDTHS
 
-        # 转换set为list以便JSON序列化
-        stats["total_tags"] = list(stats["total_tags"])
-        stats["total_categories"] = list(stats["total_categories"])
-        stats["last_updated"] = latest_date.strftime('%Y-%m-%d %H:%M:%S') if latest_date else None
+        pipeline = AssetPipeline(self, widths=tuple(widths or DEFAULT_WIDTHS), quality=quality, workers=workers)
+        result = pipeline.run()
 
-        return stats
+        print(f"✅ 图片处理完成: 共 {result['images']} 个引用")
+        print(f"   新处理 {result['processed']} 张，命中缓存 {result['cached']} 张，清理 {result['removed']} 个旧目录")
+        for failure in result['failed']:
+            print(f"   ⚠️  处理失败 {failure}")
+        print(f"📁 srcset 元数据: {result['metadata']}")
+        return result
 
     def backup_blog(self, backup_dir: str = None) -> str:
         """备份博客"""
@@ -783,7 +1241,7 @@ layout: {new_layout}
             # 创建备份信息文件
             backup_info = {
                 "backup_time": datetime.datetime.now().isoformat(),
-                "total_posts": len(list(self.posts_dir.glob("*.md"))),
+                "total_posts": sum(1 for _ in iter_post_files(self.posts_dir, drafts=True)),
                 "blog_path": str(self.blog_path)
             }
 
@@ -797,8 +1255,8 @@ layout: {new_layout}
             print(f"❌ 备份失败: {e}")
             raise
 
-    def start_web_interface(self, port: int = 5000) -> None:
-        """启动Web界面"""
+    def start_web_interface(self, port: int = 5000, production: bool = False, build_on_save: bool = False) -> None:
+        """启动Web界面（production 为 True 时使用 waitress 多线程服务；build_on_save 为 True 时保存后自动构建）"""
         web_app_path = self.blog_path / "blog_tools" / "web"
         app_file = web_app_path / "app.py"
 
@@ -814,9 +1272,12 @@ layout: {new_layout}
             print("💡 按 Ctrl+C 停止Web界面")
 
             # 在子进程中启动Flask应用
-            subprocess.run([
-                sys.executable, str(app_file)
-            ], cwd=str(web_app_path))
+            command = [sys.executable, str(app_file), '--port', str(port), '--path', str(self.blog_path)]
+            if production:
+                command.append('--production')
+            if build_on_save:
+                command.append('--build-on-save')
+            subprocess.run(command, cwd=str(web_app_path))
 
         except ImportError:
             print("❌ 未安装Flask，请运行: pip install flask")
@@ -826,9 +1287,14 @@ layout: {new_layout}
             print("\n⏹️  Web界面已停止")
 
 
-def main():
+# 可以转发给常驻进程执行的命令（只读，不需要交互输入）
+DAEMON_COMMANDS = {('list', None), ('search', None), ('pages', None), ('debug', 'validate'), ('debug', 'duplicates')}
+
+
+def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description='Hexo 博客写作工具')
     parser.add_argument('--path', default='.', help='博客路径 (默认: 当前目录)')
+    parser.add_argument('--no-daemon', action='store_true', help='不转发给常驻进程，直接在本进程内执行')
 
     subparsers = parser.add_subparsers(dest='command', help='可用命令')
 
@@ -839,6 +1305,14 @@ def main():
     create_parser.add_argument('--categories', nargs='*', help='文章分类')
     create_parser.add_argument('--layout', default='post', help='布局类型')
     create_parser.add_argument('--draft', action='store_true', help='创建为草稿')
+    create_parser.add_argument('--no-edit', action='store_true', help='不询问是否打开编辑器')
+
+    # 批量创建命令
+    batch_parser = subparsers.add_parser('new-batch', help='从 JSONL/CSV 清单批量创建文章')
+    batch_parser.add_argument('manifest', help='清单文件 (.jsonl 或 .csv)')
+    batch_parser.add_argument('--on-conflict', choices=['error', 'rename', 'skip'], default='rename',
+                              help='文件名重复时: 报错 / 加序号 / 跳过 (默认: rename)')
+    batch_parser.add_argument('--workers', type=int, help='并行写入线程数')
 
     # 列出文章命令
     list_parser = subparsers.add_parser('list', help='列出文章')
@@ -848,7 +1322,13 @@ def main():
 
     # 搜索命令
     search_parser = subparsers.add_parser('search', help='搜索文章')
-    search_parser.add_argument('keyword', help='搜索关键词')
+    search_parser.add_argument('keyword', help='搜索关键词（--regex 时为正则表达式）')
+    search_parser.add_argument('--regex', action='store_true', help='按正则表达式搜索（如 "CVE-20\\d\\d-\\d+"）')
+    search_parser.add_argument('--timeout', type=float, default=2.0, help='正则搜索超时秒数 (默认: 2)')
+
+    # 页面命令
+    pages_parser = subparsers.add_parser('pages', help='列出页面')
+    pages_parser.add_argument('--search', metavar='KEYWORD', help='按标题与内容搜索页面')
 
     # 预览命令
     preview_parser = subparsers.add_parser('serve', help='启动本地服务器')
@@ -864,7 +1344,9 @@ def main():
     git_parser = subparsers.add_parser('git', help='Git操作')
     git_subparsers = git_parser.add_subparsers(dest='git_command', help='Git命令')
     git_subparsers.add_parser('status', help='查看Git状态')
-    git_subparsers.add_parser('commit', help='提交更改')
+    commit_parser = git_subparsers.add_parser('commit', help='提交更改（只提交博客源文件）')
+    commit_parser.add_argument('--include', nargs='+', help='提交范围（相对博客根目录的 glob，默认 source/** 与配置文件）')
+    commit_parser.add_argument('--exclude', nargs='+', help='额外排除的 glob')
     git_subparsers.add_parser('push', help='推送到远程')
     git_subparsers.add_parser('pull', help='拉取更改')
 
@@ -874,145 +1356,353 @@ def main():
     debug_subparsers.add_parser('links', help='检查链接')
     debug_subparsers.add_parser('validate', help='验证文章格式')
     debug_subparsers.add_parser('stats', help='显示统计信息')
+    duplicates_parser = debug_subparsers.add_parser('duplicates', help='检查近似重复的文章')
+    duplicates_parser.add_argument('--threshold', type=float, default=0.8, help='相似度阈值 (0-1，默认: 0.8)')
+
+    # 标签/分类索引命令
+    taxonomy_parser = subparsers.add_parser('taxonomy', help='导出标签/分类聚合索引 (JSON)')
+    taxonomy_parser.add_argument('--output', help='输出文件 (默认: public/data/taxonomy.json)')
+
+    # 前端数据导出命令
+    export_parser = subparsers.add_parser('export', help='导出前端 JSON 数据包')
+    export_parser.add_argument('--output', help='输出目录 (默认: public/data)')
+    export_parser.add_argument('--page-size', type=int, default=20, help='文章列表每页数量')
+    export_parser.add_argument('--no-legacy', action='store_true',
+                               help='不生成兼容旧页面的 index.json 与 posts/*.json')
+    export_parser.add_argument('--no-related', action='store_true', help='不计算相关文章')
+
+    # 导入命令
+    import_parser = subparsers.add_parser('import', help='从 WordPress/Ghost/Markdown 目录批量导入文章')
+    import_parser.add_argument('format', choices=['wordpress', 'ghost', 'markdown'], help='导入格式')
+    import_parser.add_argument('source', help='导出文件 (WXR/JSON) 或 Markdown 目录')
+    import_parser.add_argument('--drafts', action='store_true', help='同时导入草稿 (写为 draft-*.md)')
+    import_parser.add_argument('--no-commit', action='store_true', help='导入后不提交 Git')
+    import_parser.add_argument('--workers', type=int, help='并行写入线程数')
+
+    # 相关文章命令
+    related_parser = subparsers.add_parser('related', help='计算相关文章 (TF-IDF)')
+    related_parser.add_argument('post_id', nargs='?', help='只显示这篇文章的相关文章')
+    related_parser.add_argument('--k', type=int, default=5, help='每篇文章保留的相关文章数')
+    related_parser.add_argument('--rebuild', action='store_true', help='忽略上次结果，全量计算')
+
+    # 静态搜索索引命令
+    search_index_parser = subparsers.add_parser('build-search-index', help='生成前端静态搜索索引')
+    search_index_parser.add_argument('--output', help='输出目录 (默认: public/search)')
+    search_index_parser.add_argument('--max-shard-kb', type=int, default=32, help='单个分片大小上限 (KB)')
+
+    # 站点地图/订阅源命令
+    feeds_parser = subparsers.add_parser('feeds', help='生成 sitemap.xml 与 RSS/Atom 订阅源')
+    feeds_parser.add_argument('--output', help='输出目录 (默认: public)')
+    feeds_parser.add_argument('--site-url', help='站点地址 (默认: https://jimmy.wiki)')
+    feeds_parser.add_argument('--force', action='store_true', help='忽略缓存，全部重新生成')
+
+    # 图片处理命令
+    assets_parser = subparsers.add_parser('assets', help='生成响应式图片与 WebP 版本')
+    assets_parser.add_argument('--widths', type=int, nargs='*', help='输出宽度 (默认: 480 960 1600)')
+    assets_parser.add_argument('--quality', type=int, default=80, help='压缩质量')
+    assets_parser.add_argument('--workers', type=int, help='并行进程数 (默认: CPU 核数)')
 
     # 备份命令
     backup_parser = subparsers.add_parser('backup', help='备份博客')
     backup_parser.add_argument('--dir', help='备份目录路径')
 
     # Web界面命令
-    subparsers.add_parser('web', help='启动Web界面')
+    web_parser = subparsers.add_parser('web', help='启动Web界面')
+    web_parser.add_argument('--port', type=int, default=5000, help='端口号')
+    web_parser.add_argument('--production', action='store_true', help='生产模式（waitress，多线程）')
+    web_parser.add_argument('--build-on-save', action='store_true', help='保存文章/页面后自动执行 hexo generate（合并连续保存）')
+
+    # 常驻进程命令
+    daemon_parser = subparsers.add_parser('daemon', help='常驻进程（保持索引常驻，加速 list/search/validate）')
+    daemon_subparsers = daemon_parser.add_subparsers(dest='daemon_command', help='常驻进程命令')
+    daemon_start_parser = daemon_subparsers.add_parser('start', help='在后台启动常驻进程')
+    daemon_start_parser.add_argument('--idle-timeout', type=float, default=1800, help='空闲多少秒后自动退出 (默认: 1800)')
+    daemon_start_parser.add_argument('--foreground', action='store_true', help='在前台运行')
+    daemon_subparsers.add_parser('stop', help='停止常驻进程')
+    daemon_subparsers.add_parser('status', help='查看常驻进程状态')
+
+    return parser
+
 
-    args = parser.parse_args()
+def _daemon_key(args) -> tuple:
+    return args.command, getattr(args, 'debug_command', None) if args.command == 'debug' else None
+
+
+def main():
+    parser = build_parser()
+    argv = sys.argv[1:]
+    args = parser.parse_args(argv)
 
     if not args.command:
         parser.print_help()
         return
 
+    if not args.no_daemon and _daemon_key(args) in DAEMON_COMMANDS:
+        from blog_tools import daemon
+        code = daemon.forward(Path(args.path), argv)
+        if code is not None:
+            sys.exit(code)
+
     try:
         writer = HexoBlogWriter(args.path)
+        run_command(writer, args, parser)
+    except Exception as e:
+        print(f"❌ 错误: {e}")
+        sys.exit(1)
+
+
+def run_daemon(writer: HexoBlogWriter, parser: argparse.ArgumentParser, idle_timeout: float):
+    """在前台运行常驻进程：预先加载索引，之后串行执行转发来的命令"""
+    from blog_tools import daemon
 
-        if args.command == 'new':
-            writer.create_post(
-                title=args.title,
-                tags=args.tags,
-                categories=args.categories,
-                layout=args.layout,
-                draft=args.draft
-            )
-
-        elif args.command == 'list':
-            writer.list_posts(
-                limit=args.limit,
-                category=args.category,
-                tag=args.tag
-            )
-
-        elif args.command == 'search':
-            writer.search_posts(args.keyword)
-
-        elif args.command == 'serve':
-            writer.preview_server(port=args.port)
-
-        elif args.command == 'generate':
-            writer.generate_site()
-
-        elif args.command == 'deploy':
-            writer.deploy_site()
-
-        # Git命令
-        elif args.command == 'git':
-            if args.git_command == 'status':
-                status = writer.git_status()
-                if 'error' in status:
-                    print(f"❌ {status['error']}")
-                else:
-                    print("📋 Git状态:")
-                    print(f"   分支: {status['branch']}")
-                    print(f"   状态: {'✅ 干净' if status['is_clean'] else '⚠️  有更改'}")
-                    if status['untracked_files']:
-                        print(f"   未跟踪文件: {len(status['untracked_files'])} 个")
-                        for file in status['untracked_files'][:5]:
-                            print(f"     • {file}")
-                        if len(status['untracked_files']) > 5:
-                            print(f"     ... 还有 {len(status['untracked_files']) - 5} 个文件")
-                    if status['modified_files']:
-                        print(f"   修改文件: {len(status['modified_files'])} 个")
-                        for file in status['modified_files'][:5]:
-                            print(f"     • {file}")
-                        if len(status['modified_files']) > 5:
-                            print(f"     ... 还有 {len(status['modified_files']) - 5} 个文件")
-
-            elif args.git_command == 'commit':
-                message = input("请输入提交信息 (默认: 更新博客): ").strip()
-                message = message or "更新博客"
-                writer.git_commit(message)
-
-            elif args.git_command == 'push':
-                writer.git_push()
-
-            elif args.git_command == 'pull':
-                writer.git_pull()
+    def _handle(argv: List[str]) -> int:
+        args = parser.parse_args(argv)
+        try:
+            run_command(writer, args, parser)
+        except Exception as e:
+            print(f"❌ 错误: {e}")
+            return 1
+        return 0
+
+    root = Path(__file__).resolve().parent
+    server = daemon.DaemonServer(daemon.socket_path(writer.blog_path), _handle, idle_timeout=idle_timeout,
+                                 watch_files=[root / "blog_writer.py", *sorted((root / "blog_tools").glob("*.py"))])
+    if not server.bind():
+        print(f"✅ 常驻进程已在运行: {server.path}")
+        return
+
+    writer.resident = True
+    writer.index.refresh()
+    print(f"🚀 常驻进程已启动 (pid {os.getpid()}): {server.path}")
+    sys.stdout.flush()
+    server.serve_forever()
+
+
+def daemon_command(writer: HexoBlogWriter, args, parser: argparse.ArgumentParser):
+    from blog_tools import daemon
+
+    if args.daemon_command == 'start':
+        if args.foreground:
+            run_daemon(writer, parser, args.idle_timeout)
+            return
+        if daemon.is_running(writer.blog_path):
+            print(f"✅ 常驻进程已在运行: {daemon.socket_path(writer.blog_path)}")
+            return
 
+        writer.cache_dir.mkdir(parents=True, exist_ok=True)
+        with open(writer.cache_dir / "daemon.log", 'ab') as log:
+            subprocess.Popen([sys.executable, str(Path(__file__).resolve()), '--path', str(writer.blog_path),
+                              'daemon', 'start', '--foreground', '--idle-timeout', str(args.idle_timeout)],
+                             stdin=subprocess.DEVNULL, stdout=log, stderr=log, start_new_session=True)
+
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline:
+            if daemon.is_running(writer.blog_path):
+                print(f"🚀 常驻进程已启动: {daemon.socket_path(writer.blog_path)}")
+                return
+            time.sleep(0.05)
+        print(f"❌ 常驻进程启动失败，请查看日志: {writer.cache_dir / 'daemon.log'}")
+
+    elif args.daemon_command == 'stop':
+        if daemon.stop(writer.blog_path):
+            print("✅ 常驻进程已停止")
+        else:
+            print("ℹ️  常驻进程未运行")
+
+    elif args.daemon_command == 'status':
+        info = daemon.status(writer.blog_path)
+        if info:
+            uptime = int(time.time() - info['started'])
+            print("📋 常驻进程状态:")
+            print(f"   PID: {info['pid']}")
+            print(f"   套接字: {info['socket']}")
+            print(f"   运行时间: {uptime // 60} 分 {uptime % 60} 秒")
+            print(f"   已处理命令: {info['requests']}")
+            print(f"   空闲退出: {int(info['idle_timeout'])} 秒")
+        else:
+            print("ℹ️  常驻进程未运行")
+
+    else:
+        print("❌ 请指定常驻进程命令 (start, stop, status)")
+
+
+def run_command(writer: HexoBlogWriter, args, parser: argparse.ArgumentParser):
+    """执行一条已解析的命令（命令行与常驻进程共用）"""
+    if args.command == 'new':
+        writer.create_post(
+            title=args.title,
+            tags=args.tags,
+            categories=args.categories,
+            layout=args.layout,
+            draft=args.draft,
+            interactive=not args.no_edit
+        )
+
+    elif args.command == 'new-batch':
+        writer.create_posts(args.manifest, on_conflict=args.on_conflict, workers=args.workers)
+
+    elif args.command == 'list':
+        writer.list_posts(
+            limit=args.limit,
+            category=args.category,
+            tag=args.tag
+        )
+
+    elif args.command == 'search':
+        writer.search_posts(args.keyword, regex=args.regex, timeout=args.timeout)
+
+    elif args.command == 'pages':
+        writer.show_pages(args.search)
+
+    elif args.command == 'serve':
+        writer.preview_server(port=args.port)
+
+    elif args.command == 'generate':
+        writer.generate_site()
+
+    elif args.command == 'deploy':
+        writer.deploy_site()
+
+    # Git命令
+    elif args.command == 'git':
+        if args.git_command == 'status':
+            status = writer.git_status()
+            if 'error' in status:
+                print(f"❌ {status['error']}")
             else:
-                print("❌ 请指定Git命令 (status, commit, push, pull)")
-
-        # 调试命令
-        elif args.command == 'debug':
-            if args.debug_command == 'links':
-                print("🔍 检查文章链接...")
-                issues = writer.check_links()
-                if issues:
-                    print(f"❌ 发现 {len(issues)} 个问题:")
-                    for issue in issues:
-                        print(f"   • {issue}")
-                else:
-                    print("✅ 所有链接检查通过")
-
-            elif args.debug_command == 'validate':
-                print("🔍 验证文章格式...")
-                issues = writer.validate_posts()
-                total_issues = sum(len(issue_list) for issue_list in issues.values())
-
-                if total_issues > 0:
-                    print(f"❌ 发现 {total_issues} 个问题:")
-                    for issue_type, issue_list in issues.items():
-                        if issue_list:
-                            print(f"\n   {issue_type.replace('_', ' ').title()}:")
-                            for item in issue_list:
-                                print(f"     • {item}")
-                else:
-                    print("✅ 所有文章格式验证通过")
-
-            elif args.debug_command == 'stats':
-                print("📊 博客统计信息:")
-                stats = writer.get_blog_stats()
-                print(f"   文章总数: {stats['total_posts']}")
-                print(f"   总字数: {stats['word_count']:,}")
-                print(f"   标签数量: {len(stats['total_tags'])}")
-                print(f"   分类数量: {len(stats['total_categories'])}")
-                if stats['last_updated']:
-                    print(f"   最后更新: {stats['last_updated']}")
-
-                if stats['total_tags']:
-                    print(f"\n   标签列表: {', '.join(stats['total_tags'])}")
-                if stats['total_categories']:
-                    print(f"\n   分类列表: {', '.join(stats['total_categories'])}")
+                print("📋 Git状态:")
+                print(f"   分支: {status['branch']}")
+                print(f"   状态: {'✅ 干净' if status['is_clean'] else '⚠️  有更改'}")
+                if status['untracked_files']:
+                    print(f"   未跟踪文件: {len(status['untracked_files'])} 个")
+                    for file in status['untracked_files'][:5]:
+                        print(f"     • {file}")
+                    if len(status['untracked_files']) > 5:
+                        print(f"     ... 还有 {len(status['untracked_files']) - 5} 个文件")
+                if status['modified_files']:
+                    print(f"   修改文件: {len(status['modified_files'])} 个")
+                    for file in status['modified_files'][:5]:
+                        print(f"     • {file}")
+                    if len(status['modified_files']) > 5:
+                        print(f"     ... 还有 {len(status['modified_files']) - 5} 个文件")
+
+        elif args.git_command == 'commit':
+            message = input("请输入提交信息 (默认: 更新博客): ").strip()
+            message = message or "更新博客"
+            writer.git_commit(message, include=args.include, exclude=args.exclude)
+
+        elif args.git_command == 'push':
+            writer.git_push()
+
+        elif args.git_command == 'pull':
+            writer.git_pull()
 
+        else:
+            print("❌ 请指定Git命令 (status, commit, push, pull)")
+
+    # 调试命令
+    elif args.command == 'debug':
+        if args.debug_command == 'links':
+            print("🔍 检查文章链接...")
+            issues = writer.check_links()
+            if issues:
+                print(f"❌ 发现 {len(issues)} 个问题:")
+                for issue in issues:
+                    print(f"   • {issue}")
             else:
-                print("❌ 请指定调试命令 (links, validate, stats)")
+                print("✅ 所有链接检查通过")
+
+        elif args.debug_command == 'validate':
+            print("🔍 验证文章格式...")
+            issues = writer.validate_posts()
+            total_issues = sum(len(issue_list) for issue_list in issues.values())
+
+            if total_issues > 0:
+                print(f"❌ 发现 {total_issues} 个问题:")
+                for issue_type, issue_list in issues.items():
+                    if issue_list:
+                        print(f"\n   {issue_type.replace('_', ' ').title()}:")
+                        for item in issue_list:
+                            print(f"     • {item}")
+            else:
+                print("✅ 所有文章格式验证通过")
+
+        elif args.debug_command == 'duplicates':
+            print("🔍 检查近似重复的文章...")
+            result = writer.find_near_duplicates(args.threshold)
+            clusters = result['clusters']
+            if clusters:
+                print(f"⚠️  发现 {len(clusters)} 组近似重复的文章 (相似度 ≥ {result['threshold']:.2f}):")
+                for cluster in clusters:
+                    print(f"\n   最高相似度 {cluster['max_similarity']:.2f}:")
+                    for post in cluster['posts']:
+                        print(f"     • {post['id']}  {post['title']}")
+            else:
+                print("✅ 没有发现近似重复的文章")
+            print(f"\n   共 {result['posts']} 篇文章，重新计算签名 {result['computed']} 篇，"
+                  f"候选对 {result['candidates']} 个 ({result['elapsed'] * 1000:.0f}ms)")
+
+        elif args.debug_command == 'stats':
+            print("📊 博客统计信息:")
+            stats = writer.get_blog_stats()
+            print(f"   文章总数: {stats['total_posts']}")
+            print(f"   总字数: {stats['word_count']:,}")
+            print(f"   标签数量: {len(stats['total_tags'])}")
+            print(f"   分类数量: {len(stats['total_categories'])}")
+            if stats['last_updated']:
+                print(f"   最后更新: {stats['last_updated']}")
+
+            if stats['total_tags']:
+                print(f"\n   标签列表: {', '.join(stats['total_tags'])}")
+            if stats['total_categories']:
+                print(f"\n   分类列表: {', '.join(stats['total_categories'])}")
 
-        # 备份命令
-        elif args.command == 'backup':
-            print("💾 开始备份博客...")
-            backup_path = writer.backup_blog(args.dir)
+        else:
+            print("❌ 请指定调试命令 (links, validate, stats, duplicates)")
+
+    elif args.command == 'taxonomy':
+        writer.export_taxonomy(args.output)
+
+    elif args.command == 'export':
+        writer.export_data(args.output, page_size=args.page_size, legacy=not args.no_legacy,
+                           related=not args.no_related)
+
+    elif args.command == 'import':
+        writer.import_posts(args.format, args.source, include_drafts=args.drafts,
+                            commit=not args.no_commit, workers=args.workers)
+
+    elif args.command == 'related':
+        if args.post_id:
+            related = writer.get_related(args.post_id, k=args.k)
+            if related:
+                print(f"🔗 {args.post_id} 的相关文章:")
+                for item in related:
+                    print(f"   {item['score']:.3f}  {item['slug']}  {item['title']}")
+            else:
+                print(f"ℹ️  没有找到 {args.post_id} 的相关文章")
+        else:
+            writer.build_related(k=args.k, force=args.rebuild)
 
-        elif args.command == 'web':
-            # 启动Web界面
-            writer.start_web_interface()
+    elif args.command == 'build-search-index':
+        writer.build_search_index(args.output, max_shard_kb=args.max_shard_kb)
 
-    except Exception as e:
-        print(f"❌ 错误: {e}")
-        sys.exit(1)
+    elif args.command == 'feeds':
+        writer.build_feeds(args.output, site_url=args.site_url, force=args.force)
+
+    elif args.command == 'assets':
+        writer.process_assets(args.widths, quality=args.quality, workers=args.workers)
+
+    # 备份命令
+    elif args.command == 'backup':
+        print("💾 开始备份博客...")
+        backup_path = writer.backup_blog(args.dir)
+
+    elif args.command == 'web':
+        # 启动Web界面
+        writer.start_web_interface(args.port, production=args.production, build_on_save=args.build_on_save)
+
+    elif args.command == 'daemon':
+        daemon_command(writer, args, parser)
 
 
 if __name__ == "__main__":
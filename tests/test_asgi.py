@@ -0,0 +1,54 @@
+"""异步 API 只提供读取接口"""
+
+import sys
+import json
+import asyncio
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from blog_tools.asgi import create_asgi_app  # noqa: E402
+
+
+async def call(app, method: str, path: str, body: bytes = b''):
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': body, 'more_body': False}
+
+    async def send(message):
+        messages.append(message)
+
+    await app({'type': 'http', 'method': method, 'path': path, 'query_string': b''}, receive, send)
+    return messages[0]['status'], json.loads(messages[1]['body'])
+
+
+class ReadOnlyApiTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        posts = Path(self.tmp.name) / 'source' / '_posts'
+        posts.mkdir(parents=True)
+        (posts / 'hello.md').write_text("---\ntitle: Hello\ndate: 2024-05-01 10:00:00\n---\n\nbody\n",
+                                        encoding='utf-8')
+        self.app = create_asgi_app(self.tmp.name)
+
+    def tearDown(self):
+        self.app.executor.shutdown(wait=True)
+        self.tmp.cleanup()
+
+    def test_posts(self):
+        status, payload = asyncio.run(call(self.app, 'GET', '/api/posts'))
+        self.assertEqual(status, 200)
+        self.assertIn('Hello', json.dumps(payload, ensure_ascii=False))
+
+    def test_execute_is_not_exposed(self):
+        status, _ = asyncio.run(call(self.app, 'POST', '/api/execute', b'{"command": "clean"}'))
+        self.assertEqual(status, 404)
+        self.assertTrue(all(method == 'GET' for method, _ in self.app.routes))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+"""构建调度：防抖、最长等待、显式请求与构建期间修改的合并"""
+
+import sys
+import json
+import time
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from blog_tools.build_scheduler import BuildScheduler, HexoBuild  # noqa: E402
+
+
+class FakeBuild:
+    """记录每次构建包含的修改；gate 未打开时构建阻塞"""
+
+    def __init__(self):
+        self.calls = []
+        self.gate = threading.Event()
+        self.gate.set()
+        self.started = threading.Event()
+
+    def __call__(self, changes):
+        self.calls.append((time.monotonic(), list(changes)))
+        self.started.set()
+        self.gate.wait(5)
+        return True, f"built {len(changes)}"
+
+
+class BuildSchedulerTest(unittest.TestCase):
+
+    def make(self, quiet: float, max_wait: float) -> BuildScheduler:
+        self.build = FakeBuild()
+        scheduler = BuildScheduler(self.build, quiet=quiet, max_wait=max_wait)
+        self.addCleanup(scheduler.stop)
+        return scheduler
+
+    def test_invalid_windows(self):
+        with self.assertRaises(ValueError):
+            BuildScheduler(FakeBuild(), quiet=-1)
+        with self.assertRaises(ValueError):
+            BuildScheduler(FakeBuild(), quiet=2, max_wait=1)
+
+    def test_burst_is_debounced_into_one_build(self):
+        scheduler = self.make(quiet=0.1, max_wait=5)
+        for change in ('a', 'b', 'a'):
+            scheduler.notify(change)
+        self.assertEqual(scheduler.status()['state'], 'waiting')
+        self.assertEqual(scheduler.status()['queue_depth'], 2)
+
+        record = scheduler.wait_for(1, timeout=5)
+        self.assertEqual(self.build.calls[0][1], ['a', 'b'])
+        self.assertEqual((record['changes'], record['events'], record['success']), (2, 3, True))
+        time.sleep(0.2)
+        self.assertEqual(len(self.build.calls), 1)
+        self.assertEqual(scheduler.status()['state'], 'idle')
+
+    def test_max_wait_bounds_continuous_changes(self):
+        scheduler = self.make(quiet=0.2, max_wait=0.4)
+        start = time.monotonic()
+        # 修改间隔小于安静窗口，只有最长等待能触发构建
+        while time.monotonic() - start < 1.0:
+            scheduler.notify('a')
+            time.sleep(0.05)
+        self.assertIsNotNone(scheduler.wait_for(1, timeout=5))
+        self.assertLess(self.build.calls[0][0] - start, 0.9)
+        self.assertLessEqual(scheduler.status()['builds'][-1]['waited'], 0.6)
+
+    def test_request_skips_quiet_window(self):
+        scheduler = self.make(quiet=30, max_wait=60)
+        scheduler.notify('a')
+        record = scheduler.request('手动构建', wait=True, timeout=5)
+        self.assertIsNotNone(record)
+        self.assertEqual(self.build.calls[0][1], ['a', '手动构建'])
+
+    def test_changes_during_build_go_into_next_build(self):
+        scheduler = self.make(quiet=0.05, max_wait=1)
+        self.build.gate.clear()
+        scheduler.request('first')
+        self.assertTrue(self.build.started.wait(5))
+        self.assertEqual(scheduler.status()['state'], 'building')
+
+        scheduler.notify('b')
+        scheduler.notify('c')
+        self.build.gate.set()
+        self.assertIsNotNone(scheduler.wait_for(2, timeout=5))
+        self.assertEqual([changes for _, changes in self.build.calls], [['first'], ['b', 'c']])
+        self.assertEqual(scheduler.status()['total_builds'], 2)
+
+    def test_failed_build_is_recorded(self):
+        def broken(changes):
+            raise RuntimeError('hexo 不存在')
+
+        scheduler = BuildScheduler(broken, quiet=0, max_wait=1)
+        self.addCleanup(scheduler.stop)
+        record = scheduler.request(wait=True, timeout=5)
+        self.assertFalse(record['success'])
+        self.assertIn('hexo 不存在', record['output'])
+        self.assertNotIn('output', scheduler.status()['builds'][0])
+
+
+class HexoBuildTest(unittest.TestCase):
+
+    def test_skips_when_another_process_already_built(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache_dir = Path(tmp) / '.blog_cache'
+            cache_dir.mkdir()
+            (cache_dir / 'build.json').write_text(json.dumps({
+                'started': time.time() + 60, 'success': True, 'pid': 1
+            }), encoding='utf-8')
+            build = HexoBuild(tmp, cache_dir)
+            success, output = build(['a'])
+            self.assertTrue(success)
+            self.assertEqual(build.skipped, 1)
+            self.assertIn('跳过', output)
+
+
+if __name__ == '__main__':
+    unittest.main()
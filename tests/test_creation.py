@@ -0,0 +1,59 @@
+"""新建文章：front matter 能被 YAML 解析器与 _parse_front_matter 还原，重名时自动改名"""
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from blog_writer import HexoBlogWriter  # noqa: E402
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+SPECS = [
+    {'title': 'Foo: Bar #1', 'tags': ["it's", 'a, b', '#hash'], 'categories': ['CTF', 'web: xss'],
+     'date': '2024-05-01 10:00:00', 'slug': 'foo', 'content': 'body'},
+    {'title': 'Foo: Bar #1', 'slug': 'foo', 'date': '2024-05-02 10:00:00'},
+]
+
+
+def front_matter_text(content: str) -> str:
+    return content.split('---\n', 2)[1]
+
+
+class CreatePostsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        (Path(self.tmp.name) / 'source' / '_posts').mkdir(parents=True)
+        self.writer = HexoBlogWriter(self.tmp.name)
+        self.result = self.writer.create_posts(SPECS)
+        self.contents = [Path(path).read_text(encoding='utf-8') for path in self.result['files']]
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_conflicting_slug_is_renamed(self):
+        self.assertEqual([Path(path).name for path in self.result['files']], ['foo.md', 'foo-2.md'])
+
+    @unittest.skipIf(yaml is None, 'PyYAML 未安装')
+    def test_yaml_safe_load(self):
+        data = yaml.safe_load(front_matter_text(self.contents[0]))
+        self.assertEqual(data['title'], 'Foo: Bar #1')
+        self.assertEqual(data['tags'], ["it's", 'a, b', '#hash'])
+        self.assertEqual(data['categories'], ['CTF', 'web: xss'])
+        self.assertEqual(data['layout'], 'post')
+
+    def test_index_sees_parsed_values(self):
+        post = self.writer.index.posts['foo']
+        self.assertEqual(post['title'], 'Foo: Bar #1')
+        self.assertEqual(post['tags'], ["it's", 'a, b', '#hash'])
+        self.assertEqual(post['date'], '2024-05-01 10:00:00')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+"""自动保存日志：批量写入、按 seq 重放、快照、压缩与丢弃"""
+
+import sys
+import json
+import time
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from blog_tools.drafts import DraftJournal  # noqa: E402
+from blog_tools.patching import content_hash, split_document  # noqa: E402
+
+DOC = "---\ntitle: Hello\n---\n\nbody\n"
+BASE = content_hash(DOC)
+
+
+def insert(at: int, text: str) -> list:
+    return [{'start': at, 'end': at, 'text': text}]
+
+
+class DraftJournalTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.published = {'hello': DOC}
+        self.journal = DraftJournal(Path(self.tmp.name) / 'drafts', source=self.published.get,
+                                    flush_interval=3600)
+        self.path = Path(self.tmp.name) / 'drafts' / 'hello.journal'
+
+    def tearDown(self):
+        self.journal.discard('hello')
+        self.tmp.cleanup()
+
+    def body(self, content: str) -> str:
+        return split_document(content)[2]
+
+    def test_records_are_buffered_until_flush(self):
+        self.journal.append('hello', 's1', 1, BASE, insert(4, '!'))
+        self.assertFalse(self.path.exists())
+        self.journal.flush()
+        self.assertEqual(len(self.path.read_text(encoding='utf-8').splitlines()), 1)
+
+    def test_replay_in_seq_order(self):
+        # 多个 worker 的写入顺序不一定与 seq 一致
+        self.journal.append('hello', 's1', 2, BASE, insert(5, '?'))
+        self.journal.append('hello', 's1', 1, BASE, insert(4, '!'), {'title': 'Draft'})
+        recovered = self.journal.recover('hello', BASE, DOC)
+        self.assertEqual(self.body(recovered), 'body!?')
+        self.assertIn('title: Draft\n', recovered)
+
+    def test_replay_stops_at_gap(self):
+        self.journal.append('hello', 's1', 1, BASE, insert(4, '!'))
+        self.journal.append('hello', 's1', 3, BASE, insert(0, 'lost '))
+        self.assertEqual(self.body(self.journal.recover('hello', BASE, DOC)), 'body!')
+
+    def test_latest_session_wins(self):
+        self.journal.append('hello', 'old', 1, BASE, insert(4, ' old'))
+        self.journal.flush()
+        time.sleep(0.01)
+        self.journal.append('hello', 'new', 1, BASE, insert(4, ' new'))
+        self.assertEqual(self.body(self.journal.recover('hello', BASE, DOC)), 'body new')
+
+    def test_stale_base_is_ignored(self):
+        self.journal.append('hello', 's1', 1, content_hash('older'), insert(0, 'x'))
+        self.assertIsNone(self.journal.recover('hello', BASE, DOC))
+
+    def test_truncated_last_line_is_ignored(self):
+        self.journal.append('hello', 's1', 1, BASE, insert(4, '!'))
+        self.journal.flush()
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write('{"session": "s1", "seq": 2, ')
+        self.assertEqual(self.body(self.journal.recover('hello', BASE, DOC)), 'body!')
+
+    def test_snapshot_starts_new_session(self):
+        self.journal.append('hello', 's1', 1, BASE, insert(4, '!'))
+        self.journal.flush()
+        session = self.journal.snapshot('hello', BASE, DOC.replace('body', 'restored'))
+        self.assertEqual(len(self.path.read_text(encoding='utf-8').splitlines()), 1)
+        self.journal.append('hello', session, 1, BASE, insert(8, '.'))
+        self.assertEqual(self.body(self.journal.recover('hello', BASE, DOC)), 'restored.')
+
+    def test_compaction_keeps_recovered_content(self):
+        self.journal.compact_bytes = 512
+        for seq in range(1, 21):
+            self.journal.append('hello', 's1', seq, BASE, insert(4 + seq - 1, str(seq % 10)))
+        self.journal.append('hello', 's1', 30, BASE, insert(0, 'later '))
+        self.journal.flush()
+
+        records = [json.loads(line) for line in self.path.read_text(encoding='utf-8').splitlines()]
+        self.assertEqual([(r['seq'], 'content' in r) for r in records], [(20, True), (30, False)])
+        self.assertEqual(self.body(self.journal.recover('hello', BASE, DOC)), 'body12345678901234567890')
+
+    def test_compaction_drops_journal_when_post_changed(self):
+        self.journal.compact_bytes = 0
+        self.published['hello'] = DOC.replace('body', 'saved elsewhere')
+        self.journal.append('hello', 's1', 1, BASE, insert(4, '!'))
+        self.journal.flush()
+        self.assertFalse(self.path.exists())
+
+    def test_discard(self):
+        self.journal.append('hello', 's1', 1, BASE, insert(4, '!'))
+        self.journal.flush()
+        self.journal.append('hello', 's1', 2, BASE, insert(5, '!'))
+        self.journal.discard('hello')
+        self.assertFalse(self.path.exists())
+        self.assertIsNone(self.journal.recover('hello', BASE, DOC))
+
+    def test_timer_flushes_in_background(self):
+        journal = DraftJournal(Path(self.tmp.name) / 'drafts', flush_interval=0.01)
+        journal.append('hello', 's1', 1, BASE, insert(4, '!'))
+        deadline = time.monotonic() + 5
+        while not self.path.exists() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertTrue(self.path.exists())
+
+    def test_invalid_arguments(self):
+        for post_id in ('../x', '.hidden', 'a/b'):
+            with self.assertRaises(ValueError, msg=post_id):
+                self.journal.append(post_id, 's1', 1, BASE)
+        with self.assertRaises(ValueError):
+            self.journal.append('hello', 's1', 0, BASE)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+"""前端数据导出：ISO 8601 日期、兼容文件的正文来源与已删除文章的清理"""
+
+import sys
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from blog_tools.export import DataExporter, iso_date  # noqa: E402
+from blog_writer import HexoBlogWriter  # noqa: E402
+
+
+def post(title: str, body: str) -> str:
+    return f"---\ntitle: {title}\ndate: 2024-05-01 10:00:00\n---\n\n{body}\n"
+
+
+class IsoDateTest(unittest.TestCase):
+
+    def test_front_matter_formats(self):
+        self.assertEqual(iso_date('2024-05-01 10:00:00'), '2024-05-01T10:00:00.000Z')
+        self.assertEqual(iso_date('2024-05-01T10:00'), '2024-05-01T10:00:00.000Z')
+        self.assertEqual(iso_date('2024-05-01'), '2024-05-01T00:00:00.000Z')
+
+    def test_unparseable_is_kept(self):
+        self.assertEqual(iso_date(''), '')
+        self.assertEqual(iso_date('someday'), 'someday')
+
+
+class LegacyExportTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.posts = Path(self.tmp.name) / 'source' / '_posts'
+        self.posts.mkdir(parents=True)
+        (self.posts / 'a.md').write_text(post('A', 'first body'), encoding='utf-8')
+        (self.posts / 'b.md').write_text(post('B', 'other'), encoding='utf-8')
+        self.writer = HexoBlogWriter(self.tmp.name)
+        self.legacy_dir = Path(self.tmp.name) / 'public' / 'data' / 'posts'
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def export(self, legacy: bool = True):
+        DataExporter(self.writer, legacy=legacy, related=False).export()
+
+    def legacy(self, post_id: str) -> dict:
+        with open(self.legacy_dir / f"{post_id}.json", 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def test_dates_are_iso(self):
+        self.export()
+        self.assertEqual(self.legacy('a')['date'], '2024-05-01T10:00:00.000Z')
+        self.assertEqual(self.legacy('a')['updated'], '2024-05-01T10:00:00.000Z')
+
+    def test_body_is_not_copied_from_stale_legacy_file(self):
+        self.export()
+        (self.posts / 'a.md').write_text(post('A', 'edited body, longer than before'), encoding='utf-8')
+        self.export(legacy=False)
+        # 这次导出中 a 没有变化，正文应来自与文章文件一致的数据，而不是旧的兼容文件
+        self.export()
+        self.assertEqual(self.legacy('a')['content'].strip(), 'edited body, longer than before')
+
+    def test_deleted_posts_are_pruned(self):
+        self.export()
+        (self.posts / 'b.md').unlink()
+        self.export()
+        self.assertFalse((self.legacy_dir / 'b.json').exists())
+        self.assertTrue((self.legacy_dir / 'a.json').exists())
+
+
+if __name__ == '__main__':
+    unittest.main()
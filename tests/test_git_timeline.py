@@ -0,0 +1,119 @@
+"""提交时间线：流式解析 git log、增量刷新、重命名合并与直接读取 HEAD"""
+
+import os
+import sys
+import shutil
+import datetime
+import tempfile
+import unittest
+import subprocess
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from blog_tools.git_timeline import GitTimeline, parse_log  # noqa: E402
+
+
+def git(repo: Path, *args, date: str = '2024-05-01T10:00:00+00:00') -> str:
+    env = dict(os.environ, GIT_AUTHOR_DATE=date, GIT_COMMITTER_DATE=date)
+    result = subprocess.run(['git', '-c', 'user.name=a', '-c', 'user.email=a@example.com', *args],
+                            cwd=str(repo), env=env, check=True, capture_output=True, text=True)
+    return result.stdout.strip()
+
+
+def timestamp(date: str) -> int:
+    return int(datetime.datetime.fromisoformat(date).timestamp())
+
+
+class ParseLogTest(unittest.TestCase):
+
+    OUTPUT = (b"\x01" + b"c" * 40 + b" 300\0\nM\0posts/b.md\0R100\0posts/old.md\0posts/new.md\0"
+              b"\x01" + b"a" * 40 + b" 100\0\nA\0posts/\xe4\xb8\xad.md\0")
+
+    def test_entries(self):
+        self.assertEqual(list(parse_log(iter([self.OUTPUT]))), [
+            (300, 'M', ['posts/b.md']),
+            (300, 'R100', ['posts/old.md', 'posts/new.md']),
+            (100, 'A', ['posts/中.md']),
+        ])
+
+    def test_tokens_split_across_chunks(self):
+        chunks = [self.OUTPUT[i:i + 3] for i in range(0, len(self.OUTPUT), 3)]
+        self.assertEqual(list(parse_log(iter(chunks))), list(parse_log(iter([self.OUTPUT]))))
+
+
+@unittest.skipIf(shutil.which('git') is None, 'git 未安装')
+class GitTimelineTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.repo = Path(self.tmp.name)
+        self.posts = self.repo / 'source' / '_posts'
+        self.posts.mkdir(parents=True)
+        git(self.repo, 'init', '-q')
+        self.commit('old.md', 'one\n', '2024-05-01T10:00:00+00:00')
+        self.commit('other.md', 'x\n', '2024-05-02T10:00:00+00:00')
+        self.cache_file = self.repo / '.blog_cache' / 'git_timeline.json'
+        self.timeline = GitTimeline(self.repo, self.posts, cache_file=self.cache_file, refresh_interval=0)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def commit(self, name: str, content: str, date: str):
+        (self.posts / name).write_text(content, encoding='utf-8')
+        git(self.repo, 'add', '-A')
+        git(self.repo, 'commit', '-q', '-m', name, date=date)
+
+    def entry(self, name: str):
+        return self.timeline.paths.get(f'source/_posts/{name}')
+
+    def test_full_scan(self):
+        self.assertTrue(self.timeline.refresh())
+        self.assertEqual(self.entry('old.md'), [timestamp('2024-05-01T10:00:00+00:00')] * 2 + [1])
+        self.assertEqual(self.timeline.get(self.posts / 'other.md')['revisions'], 1)
+        self.assertIsNone(self.timeline.get(self.posts / 'missing.md'))
+
+    def test_incremental_refresh_merges_renames(self):
+        self.timeline.refresh()
+        git(self.repo, 'mv', 'source/_posts/old.md', 'source/_posts/new.md')
+        git(self.repo, 'commit', '-q', '-m', 'rename', date='2024-05-03T10:00:00+00:00')
+        self.commit('new.md', 'one\ntwo\n', '2024-05-04T10:00:00+00:00')
+
+        self.assertTrue(self.timeline.refresh())
+        self.assertIsNone(self.entry('old.md'))
+        self.assertEqual(self.entry('new.md'), [timestamp('2024-05-01T10:00:00+00:00'),
+                                               timestamp('2024-05-04T10:00:00+00:00'), 3])
+        self.assertFalse(self.timeline.refresh())
+
+        # 从头构建的结果与增量结果一致
+        fresh = GitTimeline(self.repo, self.posts)
+        fresh.refresh()
+        self.assertEqual(fresh.paths, self.timeline.paths)
+
+    def test_cache_is_reused(self):
+        self.timeline.refresh()
+        other = GitTimeline(self.repo, self.posts, cache_file=self.cache_file)
+        other._scan = None  # 缓存的 HEAD 与当前一致时不应再遍历提交
+        self.assertFalse(other.refresh())
+        self.assertEqual(other.paths, self.timeline.paths)
+
+    def test_rewritten_history_is_rebuilt(self):
+        self.timeline.refresh()
+        git(self.repo, 'reset', '-q', '--hard', 'HEAD~1')
+        self.commit('third.md', 'y\n', '2024-05-05T10:00:00+00:00')
+        self.assertTrue(self.timeline.refresh())
+        self.assertIsNone(self.entry('other.md'))
+        self.assertIsNotNone(self.entry('third.md'))
+
+    def test_read_head_from_refs_and_packed_refs(self):
+        head = git(self.repo, 'rev-parse', 'HEAD')
+        self.assertEqual(self.timeline._read_head(), head)
+        git(self.repo, 'pack-refs', '--all', '--prune')
+        self.assertFalse(any((self.repo / '.git' / 'refs' / 'heads').iterdir()))
+        self.assertEqual(self.timeline._read_head(), head)
+        git(self.repo, 'checkout', '-q', '--detach')
+        self.assertEqual(self.timeline._read_head(), head)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+"""render_post 生成的 front matter 能被 YAML 解析器与 _parse_front_matter 还原"""
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from blog_tools.importer import render_post  # noqa: E402
+from blog_writer import HexoBlogWriter  # noqa: E402
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+POST = {
+    'title': 'Docker: a guide #1',
+    'date': '2024-05-01 10:00:00',
+    'author': '@bob',
+    'tags': ['[wip]', 'a: b', 'c, d'],
+    'categories': ['"quoted"', '中文'],
+    'content': 'body\n',
+    'extra': {'subtitle': "it's {x}", 'keywords': ['- dash', '*star'], 'bad key': 'dropped'}
+}
+
+EXPECTED = {
+    'title': 'Docker: a guide #1',
+    'author': '@bob',
+    'tags': ['[wip]', 'a: b', 'c, d'],
+    'categories': ['"quoted"', '中文'],
+    'subtitle': "it's {x}",
+    'keywords': ['- dash', '*star'],
+    'layout': 'post'
+}
+
+
+def front_matter_text(content: str) -> str:
+    return content.split('---\n', 2)[1]
+
+
+class RenderPostRoundTrip(unittest.TestCase):
+
+    @unittest.skipIf(yaml is None, 'PyYAML 未安装')
+    def test_yaml_safe_load(self):
+        data = yaml.safe_load(front_matter_text(render_post(POST)))
+        for key, value in EXPECTED.items():
+            self.assertEqual(data[key], value, key)
+        self.assertNotIn('bad key', data)
+
+    def test_writer_parser(self):
+        writer = HexoBlogWriter.__new__(HexoBlogWriter)
+        data = writer._parse_front_matter(render_post(POST))
+        for key in ('title', 'author', 'tags', 'keywords', 'layout'):
+            self.assertEqual(data[key], EXPECTED[key], key)
+
+
+if __name__ == '__main__':
+    unittest.main()
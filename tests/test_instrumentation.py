@@ -0,0 +1,93 @@
+"""请求监控：多个 worker 的 /metrics 计数经共享目录汇总，采样分析文件有数量上限"""
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+try:
+    from flask import Flask
+    from blog_tools.instrumentation import Metrics, _prune_profiles, init_instrumentation
+except ImportError:  # Flask 未安装
+    Flask = None
+
+
+def metric_value(text: str, prefix: str) -> str:
+    for line in text.splitlines():
+        if line.startswith(prefix):
+            return line.rsplit(' ', 1)[1]
+    return ''
+
+
+@unittest.skipIf(Flask is None, 'Flask 未安装')
+class SharedMetricsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.metrics_dir = Path(self.tmp.name) / 'metrics'
+        self.app = Flask(__name__)
+        self.metrics = init_instrumentation(self.app, profile_dir=Path(self.tmp.name) / 'profiles',
+                                            metrics_dir=self.metrics_dir)
+
+        @self.app.route('/ping')
+        def ping():
+            return 'pong'
+
+        self.client = self.app.test_client()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def scrape(self) -> str:
+        return self.client.get('/metrics').get_data(as_text=True)
+
+    def test_other_workers_are_included(self):
+        self.client.get('/ping')
+        self.client.get('/ping')
+
+        # 另一个 worker 进程写入的计数
+        other = Metrics(self.metrics_dir)
+        other.start_time -= 60
+        other.requests.inc('GET', '/ping', '200', amount=3)
+        other.latency.observe(0.2, 'GET', '/ping')
+        other.flush()
+
+        text = self.scrape()
+        prefix = 'blog_http_requests_total{method="GET",endpoint="/ping",status="200"}'
+        self.assertEqual(metric_value(text, prefix), '5')
+        self.assertEqual(metric_value(text, 'blog_http_request_duration_seconds_count{method="GET",'
+                                            'endpoint="/ping"}'), '3')
+        self.assertEqual(metric_value(text, 'blog_metrics_workers'), '2')
+        self.assertEqual(float(metric_value(text, 'blog_process_start_time_seconds')),
+                         round(other.start_time, 3))
+
+    def test_scrape_writes_own_counts(self):
+        self.client.get('/ping')
+        self.scrape()
+        self.assertEqual(len(list(self.metrics_dir.glob('*.json'))), 1)
+
+    def test_unreadable_file_is_skipped(self):
+        self.metrics_dir.mkdir(parents=True, exist_ok=True)
+        (self.metrics_dir / '1-0.json').write_text('{', encoding='utf-8')
+        self.client.get('/ping')
+        prefix = 'blog_http_requests_total{method="GET",endpoint="/ping",status="200"}'
+        self.assertEqual(metric_value(self.scrape(), prefix), '1')
+
+
+@unittest.skipIf(Flask is None, 'Flask 未安装')
+class ProfileRetentionTest(unittest.TestCase):
+
+    def test_oldest_profiles_are_removed(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            profile_dir = Path(tmp)
+            names = [f"20240501-1000{i:02d}-000000-search.folded" for i in range(5)]
+            for name in names:
+                (profile_dir / name).write_text('main 1\n', encoding='utf-8')
+            _prune_profiles(profile_dir, keep=3)
+            self.assertEqual(sorted(p.name for p in profile_dir.glob('*.folded')), names[2:])
+
+
+if __name__ == '__main__':
+    unittest.main()
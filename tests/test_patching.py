@@ -0,0 +1,140 @@
+"""增量保存：正文修改（UTF-16 下标）、front matter 字段改写与基准版本冲突"""
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from blog_tools.patching import (  # noqa: E402
+    PatchConflict, PatchError, apply_ops, apply_patch, content_hash, split_document
+)
+from blog_writer import HexoBlogWriter  # noqa: E402
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+DOC = "---\ntitle: Hello\ndate: 2024-05-01 10:00:00\ntags: [a]\ncover: /img/x.png\n---\n\nbody text\n\n"
+
+FIELDS = {
+    'title': 'CVE-2024: RCE #1',
+    'tags': ["it's", 'b'],
+    'categories': 'a, "b", c: d',
+    'date': '2024-05-02T08:30'
+}
+
+
+def front_matter_text(content: str) -> str:
+    return content.split('---\n', 2)[1]
+
+
+class SplitDocumentTest(unittest.TestCase):
+
+    def test_parts_concatenate_to_original(self):
+        head, lead, body, trail = split_document(DOC)
+        self.assertEqual(head + lead + body + trail, DOC)
+        self.assertTrue(head.startswith('---\n') and head.endswith('---\n'))
+        self.assertEqual((lead, body, trail), ('\n', 'body text', '\n\n'))
+
+    def test_without_front_matter(self):
+        self.assertEqual(split_document("  just text \n"), ('', '  ', 'just text', ' \n'))
+
+    def test_empty_body(self):
+        self.assertEqual(split_document("---\ntitle: x\n---\n\n"), ("---\ntitle: x\n---\n", '\n', '', ''))
+
+
+class ApplyOpsTest(unittest.TestCase):
+
+    def test_offsets_are_utf16_code_units(self):
+        # 😀 占两个 UTF-16 码元
+        self.assertEqual(apply_ops('a😀b中', [{'start': 3, 'end': 4, 'text': 'B'}]), 'a😀B中')
+        self.assertEqual(apply_ops('a😀b', [{'start': 1, 'end': 3, 'text': ''}]), 'ab')
+
+    def test_multiple_ops_are_applied_against_original(self):
+        ops = [{'start': 0, 'end': 1, 'text': 'X'}, {'start': 2, 'end': 2, 'text': '--'}, {'start': 3, 'end': 4}]
+        self.assertEqual(apply_ops('abcd', ops), 'Xb--c')
+
+    def test_split_surrogate_pair_is_rejected(self):
+        with self.assertRaises(PatchError):
+            apply_ops('a😀b', [{'start': 2, 'end': 2, 'text': 'x'}])
+
+    def test_overlapping_or_out_of_range_ops_are_rejected(self):
+        for ops in ([{'start': 0, 'end': 2}, {'start': 1, 'end': 3}],
+                    [{'start': 2, 'end': 1}],
+                    [{'start': 0, 'end': 10}],
+                    [{'start': '0', 'end': 1}],
+                    {'start': 0}):
+            with self.assertRaises(PatchError, msg=ops):
+                apply_ops('abcd', ops)
+
+
+class FieldsTest(unittest.TestCase):
+
+    def test_other_lines_are_kept(self):
+        content, changed = apply_patch(DOC, fields={'title': 'New'})
+        self.assertTrue(changed)
+        self.assertIn('cover: /img/x.png\n', content)
+        self.assertIn('title: New\n', content)
+        self.assertTrue(content.endswith('\n\nbody text\n\n'))
+
+    def test_block_list_is_replaced_with_continuation_lines(self):
+        doc = "---\ntitle: x\ntags:\n  - a\n  - b\nlayout: post\n---\nbody\n"
+        content, _ = apply_patch(doc, fields={'tags': []})
+        self.assertEqual(front_matter_text(content), "title: x\ntags: []\nlayout: post\n")
+
+    @unittest.skipIf(yaml is None, 'PyYAML 未安装')
+    def test_yaml_round_trip(self):
+        content, _ = apply_patch(DOC, fields=FIELDS)
+        data = yaml.safe_load(front_matter_text(content))
+        self.assertEqual(data['title'], 'CVE-2024: RCE #1')
+        self.assertEqual(data['tags'], ["it's", 'b'])
+        self.assertEqual(data['categories'], ['a', '"b"', 'c: d'])
+        self.assertEqual(data['cover'], '/img/x.png')
+
+    def test_writer_parser_round_trip(self):
+        content, _ = apply_patch(DOC, fields=FIELDS)
+        writer = HexoBlogWriter.__new__(HexoBlogWriter)
+        data = writer._parse_front_matter(content)
+        self.assertEqual(data['title'], 'CVE-2024: RCE #1')
+        self.assertEqual(data['tags'], ["it's", 'b'])
+        self.assertEqual(data['categories'], ['a', '"b"', 'c: d'])
+        self.assertEqual(data['date'], '2024-05-02T08:30')
+
+
+class PatchPostTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        posts = Path(self.tmp.name) / 'source' / '_posts'
+        posts.mkdir(parents=True)
+        self.file = posts / 'hello.md'
+        self.file.write_text(DOC, encoding='utf-8')
+        self.writer = HexoBlogWriter(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_patch_then_stale_base_conflicts(self):
+        base = content_hash(DOC)
+        result = self.writer.patch_post('hello.md', base, [{'start': 0, 'end': 4, 'text': 'new'}])
+        self.assertTrue(result['changed'])
+        self.assertEqual(split_document(self.file.read_text(encoding='utf-8'))[2], 'new text')
+        self.assertEqual(result['hash'], content_hash(self.file.read_text(encoding='utf-8')))
+
+        with self.assertRaises(PatchConflict) as ctx:
+            self.writer.patch_post('hello.md', base, [{'start': 0, 'end': 3, 'text': 'x'}])
+        self.assertEqual(ctx.exception.current_hash, result['hash'])
+        self.assertEqual(split_document(self.file.read_text(encoding='utf-8'))[2], 'new text')
+
+    def test_unchanged_patch_does_not_write(self):
+        mtime = self.file.stat().st_mtime_ns
+        result = self.writer.patch_post('hello.md', content_hash(DOC), [], {})
+        self.assertFalse(result['changed'])
+        self.assertEqual(self.file.stat().st_mtime_ns, mtime)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,188 @@
+"""文章索引：增量刷新、标签/分类聚合、缓存复用，以及分层目录中的移动与重名"""
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from blog_tools.post_files import PostTree, iter_post_files  # noqa: E402
+from blog_tools.post_index import PostIndex  # noqa: E402
+
+
+def post(date: str, tags=(), categories=(), title: str = 'x') -> str:
+    return (f"---\ntitle: {title}\ndate: {date}\ntags: [{', '.join(tags)}]\n"
+            f"categories: [{', '.join(categories)}]\n---\n\nbody\n")
+
+
+class CountingParser:
+    """极简 front matter 解析，记录被解析的文件"""
+
+    def __init__(self):
+        self.parsed = []
+
+    def __call__(self, file_path: Path) -> dict:
+        self.parsed.append(file_path.name)
+        record = {'path': str(file_path)}
+        text = file_path.read_text(encoding='utf-8').split('---\n')[1]
+        for line in text.splitlines():
+            key, _, value = line.partition(': ')
+            if value.startswith('['):
+                record[key] = [item.strip() for item in value.strip('[]').split(',') if item.strip()]
+            else:
+                record[key] = value
+        return record
+
+
+class PostIndexTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.posts = Path(self.tmp.name) / 'source' / '_posts'
+        self.posts.mkdir(parents=True)
+        self.cache_file = Path(self.tmp.name) / '.blog_cache' / 'post_index.json'
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, relative: str, content: str) -> Path:
+        path = self.posts / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding='utf-8')
+        return path
+
+    def make_index(self) -> PostIndex:
+        self.parser = CountingParser()
+        index = PostIndex(self.posts, self.parser, cache_file=self.cache_file)
+        index.ensure_loaded()
+        return index
+
+
+class RefreshTest(PostIndexTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.write('a.md', post('2024-05-01 10:00:00', ['py', 'web'], ['CTF', 'Web']))
+        self.write('b.md', post('2024-05-03 10:00:00', ['py'], ['CTF', 'Pwn']))
+        self.write('c.md', post('2024-05-02 10:00:00', [], ['Notes']))
+        self.write('draft-d.md', post('2024-05-04 10:00:00', ['py']))
+        self.index = self.make_index()
+
+    def test_aggregates(self):
+        self.assertEqual(self.index.post_ids(), ['b', 'c', 'a'])
+        self.assertEqual(self.index.tag_counts(), {'py': 2, 'web': 1})
+        self.assertEqual(self.index.category_counts(), {'CTF': 2, 'Web': 1, 'Pwn': 1, 'Notes': 1})
+        self.assertEqual([p['id'] for p in self.index.posts_by_category('CTF/Web')], ['a'])
+        self.assertEqual([p['id'] for p in self.index.filter_posts(category='CTF', tag='py')], ['b', 'a'])
+        tree = self.index.category_tree()
+        self.assertEqual(tree[0]['path'], 'CTF')
+        self.assertEqual(sorted(child['path'] for child in tree[0]['children']), ['CTF/Pwn', 'CTF/Web'])
+
+    def test_drafts_only_reserve_names(self):
+        self.assertNotIn('draft-d', self.index.posts)
+        self.assertTrue(self.index.name_taken('draft-d'))
+
+    def test_only_changed_files_are_parsed(self):
+        self.parser.parsed.clear()
+        self.write('a.md', post('2024-05-05 10:00:00', ['go'], ['CTF', 'Web'], title='longer title'))
+        self.assertEqual(self.index.refresh(force=True), ['a'])
+        self.assertEqual(self.parser.parsed, ['a.md'])
+        self.assertEqual(self.index.post_ids(), ['a', 'b', 'c'])
+        self.assertEqual(self.index.tag_counts(), {'py': 1, 'go': 1})
+
+    def test_deleted_post_is_removed(self):
+        (self.posts / 'b.md').unlink()
+        self.assertEqual(self.index.refresh(force=True), ['b'])
+        self.assertEqual(self.index.category_counts(), {'CTF': 1, 'Web': 1, 'Notes': 1})
+        self.assertNotIn('CTF/Pwn', self.index.category_paths)
+        self.assertFalse(self.index.name_taken('b'))
+
+    def test_unchanged_refresh_parses_nothing(self):
+        self.parser.parsed.clear()
+        self.assertEqual(self.index.refresh(force=True), [])
+        self.assertEqual(self.parser.parsed, [])
+
+    def test_listener_sees_old_and_new_records(self):
+        events = []
+        self.index.add_listener(lambda post_id, old, new: events.append((post_id, old, new)))
+        self.write('c.md', post('2024-05-02 10:00:00', ['new'], ['Notes']))
+        (self.posts / 'a.md').unlink()
+        self.index.refresh(force=True)
+        events = {post_id: (old, new) for post_id, old, new in events}
+        self.assertEqual(events['c'][0]['tags'], [])
+        self.assertEqual(events['c'][1]['tags'], ['new'])
+        self.assertIsNone(events['a'][1])
+
+    def test_cache_is_reused_by_another_process(self):
+        other = self.make_index()
+        other_parsed = self.parser.parsed
+        self.assertEqual(other_parsed, [])
+        self.assertEqual(other.post_ids(), ['b', 'c', 'a'])
+
+        # 另一个进程解析并写入缓存后，这里直接采用，不再解析
+        self.write('c.md', post('2024-05-02 10:00:00', ['cached'], ['Notes']))
+        self.index.refresh(force=True)
+        self.assertEqual(other.refresh(force=True), ['c'])
+        self.assertEqual(other_parsed, [])
+        self.assertEqual(other.tag_counts()['cached'], 1)
+
+
+
+class NestedDirectoriesTest(PostIndexTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.write('2024/05/a.md', post('2024-05-01 10:00:00', ['py']))
+        self.write('b.md', post('2024-05-02 10:00:00'))
+        # 文章资源目录（与 b.md 同名）中的文件不是文章
+        self.write('b/note.md', post('2024-05-03 10:00:00'))
+        self.write('.hidden/c.md', post('2024-05-03 10:00:00'))
+        self.index = self.make_index()
+
+    def test_nested_posts_are_indexed(self):
+        self.assertEqual(sorted(self.index.posts), ['a', 'b'])
+        self.assertEqual(self.index.posts['a']['path'], str(self.posts / '2024' / '05' / 'a.md'))
+        self.assertEqual(sorted(name for _, name, _ in iter_post_files(self.posts)), ['a.md', 'b.md'])
+
+    def test_moved_post_is_reindexed(self):
+        # 重命名不改变 mtime/size，只能通过路径发现
+        target = self.posts / '2023' / 'a.md'
+        target.parent.mkdir()
+        (self.posts / '2024' / '05' / 'a.md').rename(target)
+        self.assertEqual(self.index.refresh(force=True), ['a'])
+        self.assertEqual(self.index.posts['a']['path'], str(target))
+        self.assertEqual(self.index.tag_counts(), {'py': 1})
+
+    def test_new_file_in_subdirectory_found_without_full_scan(self):
+        self.index.full_scan_interval = 3600
+        self.index.refresh_interval = 0
+        self.write('2024/05/new.md', post('2024-05-09 10:00:00'))
+        self.assertEqual(self.index.refresh(), ['new'])
+        self.assertEqual(self.index.post_ids()[0], 'new')
+
+    def test_duplicate_ids_keep_first_path(self):
+        self.write('2025/b.md', post('2025-01-01 10:00:00', ['dup']))
+        self.write('0-old/b.md', post('2020-01-01 10:00:00', ['first']))
+        self.index.refresh(force=True)
+        first = str(self.posts / '0-old' / 'b.md')
+        self.assertEqual(self.index.posts['b']['path'], first)
+        self.assertEqual(self.index.duplicates, {
+            'b': sorted([first, str(self.posts / '2025' / 'b.md'), str(self.posts / 'b.md')])
+        })
+
+        (self.posts / '0-old' / 'b.md').unlink()
+        (self.posts / '2025' / 'b.md').unlink()
+        self.index.refresh(force=True)
+        self.assertEqual(self.index.duplicates, {})
+        self.assertEqual(self.index.posts['b']['path'], str(self.posts / 'b.md'))
+
+    def test_pruned_scan_reuses_unchanged_directories(self):
+        tree = PostTree(self.posts)
+        full = sorted(path for path, _, _ in tree.scan())
+        pruned = sorted(path for path, _, _ in tree.scan(prune=True))
+        self.assertEqual(pruned, full)
+
+
+if __name__ == '__main__':
+    unittest.main()
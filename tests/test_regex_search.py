@@ -0,0 +1,158 @@
+"""正则搜索：三字母组条件提取，以及索引筛选后的结果与完整扫描一致"""
+
+import re
+import sys
+import random
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from blog_tools.regex_search import (  # noqa: E402
+    RegexQuery, RegexSearchError, TrigramIndex, regex_module, trigram_query
+)
+from blog_writer import HexoBlogWriter  # noqa: E402
+
+PATTERNS = [
+    r'CVE-20\d\d-\d+', r'foo|bar', r'a.*b', r'(?i)heap overflow', r'colou?r', r'[Hh]ello',
+    r'x{3}y', r'ab(cd)+ef', r'^## ', r'(?:sql|xss) injection', r'\bRCE\b', r'flag\{[^}]+\}',
+    r'漏洞(分析|复现)', r'[^a-z]{4}', r'(?=abc)abcd', r'café',
+]
+
+WORDS = ['foo', 'bar', 'CVE-2024-1234', 'cve-2023-99', 'Heap', 'HEAP overflow', 'heap overflow', 'color',
+         'colour', 'hello', 'Hello', 'xxxy', 'abcdcdef', 'abef', '## 标题', 'sql injection', 'XSS injection',
+         'RCE', 'rce', 'flag{x}', '漏洞分析', '漏洞复现', '1234', 'abcd', 'café', 'CAFÉ', 'a', 'b']
+
+
+def corpus(count: int = 200, seed: int = 7):
+    rng = random.Random(seed)
+    return {f"doc-{i}": ' '.join(rng.choice(WORDS) for _ in range(rng.randint(1, 8)))
+            + rng.choice(['', '\n', '\nmore text\n']) for i in range(count)}
+
+
+class TrigramQueryTest(unittest.TestCase):
+
+    def test_literal_runs(self):
+        self.assertEqual(trigram_query(r'CVE-20\d\d-\d+'), ('and', ['-20', 'cve', 'e-2', 've-']))
+        self.assertEqual(trigram_query(r'[Hh]ello'), ('and', ['ell', 'hel', 'llo']))
+        self.assertEqual(trigram_query(r'x{3}y'), ('and', ['xxx', 'xxy']))
+
+    def test_alternation(self):
+        op, items = trigram_query(r'foo|bar')
+        self.assertEqual((op, sorted(items)), ('or', ['bar', 'foo']))
+
+    def test_unconstrained(self):
+        for pattern in (r'a.*b', r'\d+', r'(foo)?bar?', r'foo|.'):
+            self.assertIsNone(trigram_query(pattern), pattern)
+
+    def test_invalid_pattern(self):
+        with self.assertRaises(RegexSearchError):
+            trigram_query('(')
+        with self.assertRaises(RegexSearchError):
+            RegexQuery('')
+
+
+class CandidatesTest(unittest.TestCase):
+    """候选集合必须包含所有真正匹配的文章"""
+
+    def setUp(self):
+        self.docs = corpus()
+        self.index = TrigramIndex()
+        for key, text in self.docs.items():
+            self.index.update(key, (0, len(text)), text.lower())
+
+    def assert_superset(self):
+        for pattern in PATTERNS:
+            compiled = re.compile(pattern, re.MULTILINE)
+            expected = {key for key, text in self.docs.items() if compiled.search(text)}
+            candidates = self.index.candidates(trigram_query(pattern))
+            if candidates is None:
+                continue
+            self.assertLessEqual(expected, candidates, pattern)
+            self.assertLessEqual(candidates, set(self.docs), pattern)
+
+    def test_candidates_cover_full_scan(self):
+        self.assert_superset()
+
+    def test_after_updates_and_removal(self):
+        rng = random.Random(11)
+        for key in rng.sample(sorted(self.docs), 60):
+            self.docs[key] = ' '.join(rng.choice(WORDS) for _ in range(5))
+            self.index.update(key, (1, len(self.docs[key])), self.docs[key].lower())
+        for key in rng.sample(sorted(self.docs), 30):
+            del self.docs[key]
+        self.index.retain(self.docs)
+        self.assertEqual(set(self.index.docs), set(self.docs))
+        self.assert_superset()
+
+    def test_compaction_keeps_live_documents(self):
+        # 过期编号超过 1000 后压缩
+        for round_ in range(6):
+            for key, text in self.docs.items():
+                self.index.update(key, (round_, len(text)), text.lower())
+            self.index.retain(self.docs)
+        self.assertEqual(self.index._dead, 0)
+        live = set(self.index.keys)
+        self.assertTrue(all(set(posting) <= live for posting in self.index.postings.values()))
+        self.assertEqual(set(self.index.candidates('foo')),
+                         {key for key, text in self.docs.items() if 'foo' in text.lower()})
+
+
+class WriterRegexSearchTest(unittest.TestCase):
+    """常驻进程（使用索引）与一次性进程（完整扫描）的结果相同"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.posts = Path(self.tmp.name) / 'source' / '_posts'
+        self.posts.mkdir(parents=True)
+        for key, text in corpus(60).items():
+            self.write(key, text)
+        self.scan = HexoBlogWriter(self.tmp.name)
+        self.resident = HexoBlogWriter(self.tmp.name)
+        self.resident.resident = True
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, key: str, text: str):
+        (self.posts / f"{key}.md").write_text(f"---\ntitle: {key}\ndate: 2024-05-01 10:00:00\n---\n\n{text}\n",
+                                              encoding='utf-8')
+
+    def titles(self, writer, pattern):
+        return sorted(post['title'] for post in writer.find_posts_regex(pattern))
+
+    def assert_same(self):
+        for pattern in PATTERNS:
+            self.assertEqual(self.titles(self.resident, pattern), self.titles(self.scan, pattern), pattern)
+
+    def test_resident_matches_full_scan(self):
+        self.assert_same()
+        self.assertIsNotNone(self.resident._regex_index)
+
+    def test_edits_and_deletes_are_picked_up(self):
+        self.assert_same()
+        self.write('doc-1', 'now mentions CVE-2025-0001')
+        (self.posts / 'doc-2.md').unlink()
+        self.assert_same()
+        self.assertIn('doc-1', self.titles(self.resident, r'CVE-2025-\d+'))
+
+    @unittest.skipIf(regex_module is not None, 'regex 模块可中断任意线程中的匹配')
+    def test_nested_repeat_rejected_off_main_thread(self):
+        errors = []
+
+        def run():
+            try:
+                self.scan.find_posts_regex(r'(a+)+$')
+            except RegexSearchError as e:
+                errors.append(e)
+
+        thread = threading.Thread(target=run)
+        thread.start()
+        thread.join()
+        self.assertEqual(len(errors), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+"""文章历史版本：git log 输出解析、跟随重命名的版本列表、版本内容与差异"""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+import subprocess
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from blog_tools.revisions import WORKING, PostHistory, parse_history  # noqa: E402
+
+A = 'a' * 40
+B = 'b' * 40
+C = 'c' * 40
+NULL = '0' * 40
+
+
+def log_output(*commits) -> bytes:
+    """按 git log --follow --raw -z --format=\\x01%H%x00%ct%x00%an%x00%s 的格式拼出输出"""
+    parts = []
+    for commit, timestamp, subject, raw, paths in commits:
+        parts.append(f"\x01{commit}\0{timestamp}\0作者\0{subject}\0\n{raw}\0" + ''.join(p + '\0' for p in paths))
+    return ''.join(parts).encode('utf-8')
+
+
+def git(repo: Path, *args, date: str = '2024-05-01T10:00:00'):
+    env = dict(os.environ, GIT_AUTHOR_DATE=date, GIT_COMMITTER_DATE=date)
+    subprocess.run(['git', '-c', 'user.name=作者', '-c', 'user.email=a@example.com', *args],
+                   cwd=str(repo), env=env, check=True, capture_output=True)
+
+
+class ParseHistoryTest(unittest.TestCase):
+
+    def test_modify_rename_and_add(self):
+        output = log_output(
+            (C, 300, 'fix: typo', f":100644 100644 {B} {C} M", ['source/_posts/new.md']),
+            (B, 200, 'rename', f":100644 100644 {A} {B} R087", ['source/_posts/old.md', 'source/_posts/new.md']),
+            (A, 100, 'add', f":000000 100644 {NULL} {A} A", ['source/_posts/old.md']),
+        )
+        revisions = parse_history(output)
+        self.assertEqual([(r['commit'], r['status'], r['path'], r['blob']) for r in revisions], [
+            (C, 'M', 'source/_posts/new.md', C),
+            (B, 'R', 'source/_posts/new.md', B),
+            (A, 'A', 'source/_posts/old.md', A),
+        ])
+        self.assertEqual((revisions[0]['timestamp'], revisions[0]['author'], revisions[0]['subject']),
+                         (300, '作者', 'fix: typo'))
+
+    def test_deleted_file_has_no_blob(self):
+        output = log_output((B, 200, 'remove', f":100644 000000 {A} {NULL} D", ['x.md']))
+        self.assertIsNone(parse_history(output)[0]['blob'])
+
+    def test_commit_without_raw_entry_is_skipped(self):
+        output = log_output((B, 200, 'merge', '', []), (A, 100, 'add', f":000000 100644 {NULL} {A} A", ['x.md']))
+        self.assertEqual([r['commit'] for r in parse_history(output)], [A])
+
+    def test_empty_output(self):
+        self.assertEqual(parse_history(b''), [])
+
+
+@unittest.skipIf(shutil.which('git') is None, 'git 未安装')
+class PostHistoryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.repo = Path(self.tmp.name)
+        posts = self.repo / 'source' / '_posts'
+        posts.mkdir(parents=True)
+        git(self.repo, 'init', '-q')
+
+        self.old = posts / 'old.md'
+        self.old.write_text("---\ntitle: x\n---\n\nline 1\nline 2\n", encoding='utf-8')
+        git(self.repo, 'add', '-A')
+        git(self.repo, 'commit', '-q', '-m', 'add')
+        git(self.repo, 'mv', 'source/_posts/old.md', 'source/_posts/new.md')
+        git(self.repo, 'commit', '-q', '-m', 'rename', date='2024-05-02T10:00:00')
+        self.new = posts / 'new.md'
+        self.new.write_text("---\ntitle: x\n---\n\nline 1\nline 2 changed\n", encoding='utf-8')
+        git(self.repo, 'commit', '-q', '-am', 'edit', date='2024-05-03T10:00:00')
+
+        self.history = PostHistory(self.repo)
+
+    def tearDown(self):
+        self.history.close()
+        self.tmp.cleanup()
+
+    def test_revisions_follow_rename(self):
+        revisions = self.history.revisions(self.new)
+        self.assertEqual([r['subject'] for r in revisions], ['edit', 'rename', 'add'])
+        self.assertEqual(revisions[-1]['path'], 'source/_posts/old.md')
+        self.assertIs(self.history.revisions(self.new), revisions)
+
+    def test_content_of_old_revision(self):
+        first = self.history.revisions(self.new)[-1]['commit']
+        self.assertIn('line 2\n', self.history.content(self.new, first[:7]))
+        with self.assertRaises(KeyError):
+            self.history.content(self.new, 'deadbeef')
+
+    def test_diff_against_working_tree(self):
+        first = self.history.revisions(self.new)[-1]['commit']
+        self.new.write_text("---\ntitle: x\n---\n\nline 1\nline 2 changed\nline 3", encoding='utf-8')
+        diff = ''.join(self.history.diff(self.new, first))
+        self.assertIn(f"--- {first[:7]}:source/_posts/old.md\n", diff)
+        self.assertIn(f"+++ {WORKING}\n", diff)
+        self.assertIn('-line 2\n', diff)
+        self.assertIn('+line 3\n\\ No newline at end of file\n', diff)
+        # 第二次直接取缓存
+        self.assertEqual(''.join(self.history.diff(self.new, first)), diff)
+        self.assertEqual(len(self.history._diffs), 1)
+
+    def test_new_commit_invalidates_revision_list(self):
+        self.assertEqual(len(self.history.revisions(self.new)), 3)
+        self.new.write_text("---\ntitle: x\n---\n\nagain\n", encoding='utf-8')
+        git(self.repo, 'commit', '-q', '-am', 'again', date='2024-05-04T10:00:00')
+        self.assertEqual(self.history.revisions(self.new)[0]['subject'], 'again')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+"""list/search/validate 不导入只有 git/Web 命令才需要的模块（用 -X importtime 列出导入的模块）"""
+
+import os
+import sys
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+BLOG_WRITER_FILE = ROOT_DIR / 'blog_writer.py'
+
+# 用 git/web/serve 等命令才需要的模块
+FORBIDDEN_IMPORTS = ('git', 'webbrowser', 'flask', 'difflib', 'sqlite3')
+
+COMMANDS = {
+    'list': ['list', '--limit', '1'],
+    'search': ['search', '漏洞'],
+    'validate': ['debug', 'validate'],
+}
+
+
+def imported_modules(stderr: str) -> set:
+    """-X importtime 输出中出现的所有模块（含间接导入）"""
+    modules = set()
+    for line in stderr.splitlines():
+        if line.startswith('import time:') and 'cumulative' not in line:
+            modules.add(line.rsplit('|', 1)[-1].strip())
+    return modules
+
+
+class StartupImportsTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        posts = Path(cls.tmp.name) / 'source' / '_posts'
+        posts.mkdir(parents=True)
+        for i in range(3):
+            (posts / f"post-{i}.md").write_text(
+                f"---\ntitle: 漏洞分析 {i}\ndate: 2024-05-0{i + 1} 10:00:00\ntags: [CTF]\n---\n\n正文 {i}\n",
+                encoding='utf-8')
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def run_command(self, args) -> set:
+        env = dict(os.environ, PYTHONIOENCODING='utf-8')
+        output = subprocess.run([sys.executable, '-X', 'importtime', str(BLOG_WRITER_FILE),
+                                 '--path', self.tmp.name, *args],
+                                env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                                text=True, encoding='utf-8', timeout=60)
+        self.assertEqual(output.returncode, 0, output.stderr[-2000:])
+        return imported_modules(output.stderr)
+
+    def test_commands_do_not_import_heavy_modules(self):
+        for name, args in COMMANDS.items():
+            with self.subTest(command=name):
+                modules = self.run_command(args)
+                # 确认确实解析到了导入记录
+                self.assertIn('blog_tools', modules)
+                forbidden = sorted(module for module in modules if module.split('.')[0] in FORBIDDEN_IMPORTS)
+                self.assertEqual(forbidden, [], f"{name} 导入了不需要的模块")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+"""Web 界面的会话密钥：环境变量优先，否则生成一次并在多个 worker 之间共用"""
+
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+try:
+    from blog_tools.web.app import load_secret_key
+except ImportError:  # Flask/GitPython 未安装
+    load_secret_key = None
+
+
+@unittest.skipIf(load_secret_key is None, 'Web 界面依赖未安装')
+class SecretKeyTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache_dir = Path(self.tmp.name) / '.blog_cache'
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_generated_once_and_persisted(self):
+        with mock.patch.dict(os.environ, {'BLOG_SECRET_KEY': ''}):
+            first = load_secret_key(self.cache_dir)
+            second = load_secret_key(self.cache_dir)
+        self.assertEqual(first, second)
+        self.assertGreaterEqual(len(first), 64)
+        self.assertNotEqual(first, 'your-secret-key-here')
+        self.assertEqual(list(self.cache_dir.iterdir()), [self.cache_dir / 'secret_key'])
+        if os.name == 'posix':
+            self.assertEqual((self.cache_dir / 'secret_key').stat().st_mode & 0o077, 0)
+
+    def test_environment_variable_wins(self):
+        with mock.patch.dict(os.environ, {'BLOG_SECRET_KEY': 'from-env'}):
+            self.assertEqual(load_secret_key(self.cache_dir), 'from-env')
+        self.assertFalse((self.cache_dir / 'secret_key').exists())
+
+
+if __name__ == '__main__':
+    unittest.main()